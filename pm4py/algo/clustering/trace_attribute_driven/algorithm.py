@@ -90,7 +90,7 @@ def apply(log, trace_attribute, variant=VARIANT_DMM_LEVEN, parameters=None):
         logsample = merge_log.log2sublog(log, list_of_vals[i], trace_attribute)
         list_log.append(logsample)
 
-    y = exec_utils.get_variant(variant)(list_log, percent, alpha)
+    y = exec_utils.get_variant(variant)(list_log, percent, alpha, parameters=parameters)
 
     Z = linkage(y, method='average')
 
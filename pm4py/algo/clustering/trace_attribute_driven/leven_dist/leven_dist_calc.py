@@ -1,6 +1,7 @@
 import numpy as np
 from pm4py.algo.clustering.trace_attribute_driven.util import filter_subsets
-from pm4py.util import string_distance
+from pm4py.algo.clustering.trace_attribute_driven.parameters import Parameters
+from pm4py.util import exec_utils, string_distance
 import string
 
 
@@ -21,14 +22,102 @@ def leven_preprocess(list1, list2):
     return str1, str2
 
 
-def leven_dist(log1, log2, percent_1, percent_2):
+class VariantDistances(object):
+    """
+    Normalized Levenshtein distances (divided by the length of the longest variant) between a set of variants,
+    computed at once on the integer-coded variants (see string_distance.levenshtein_matrix).
+
+    The object also keeps the variants (with their count) of the logs, that are computed once per log
+    (hence, the logs should not be modified while the object is in use)
+    """
+
+    def __init__(self, variants, parameters=None):
+        if parameters is None:
+            parameters = {}
+        self.parameters = parameters
+        self.sublogs = {}
+        self.index = {}
+        for v in variants:
+            v = tuple(v)
+            if v not in self.index:
+                self.index[v] = len(self.index)
+        self.matrix = get_normalized_distances(list(self.index), list(self.index), parameters=parameters)
+
+    def get(self, var_list_1, var_list_2):
+        """
+        Gets the matrix of the normalized distances between two lists of variants
+        (the variants that were not provided at construction time are computed on the fly)
+        """
+        idx_1 = [self.index.get(tuple(v), None) for v in var_list_1]
+        idx_2 = [self.index.get(tuple(v), None) for v in var_list_2]
+        if None in idx_1 or None in idx_2:
+            return get_normalized_distances(var_list_1, var_list_2, parameters=self.parameters)
+        return self.matrix[np.ix_(idx_1, idx_2)]
+
+    def sublog_percent(self, log, percent):
+        """
+        Gets the variants (with their count) of a log (see filter_subsets.sublog_percent)
+        """
+        # the log is stored along with the result, so its identifier cannot be reused
+        key = (id(log), percent)
+        if key not in self.sublogs:
+            self.sublogs[key] = (log, filter_subsets.sublog_percent(log, percent))
+        return self.sublogs[key][1]
+
+
+def get_normalized_distances(var_list_1, var_list_2, parameters=None):
+    """
+    Gets the matrix of the Levenshtein distances between two lists of variants (lists of activities),
+    normalized by the length of the longest variant of each couple
+    """
+    activities = {}
+    var_codes_1 = [tuple(activities.setdefault(a, len(activities)) for a in v) for v in var_list_1]
+    var_codes_2 = [tuple(activities.setdefault(a, len(activities)) for a in v) for v in var_list_2]
+    lengths_1 = np.array([len(v) for v in var_codes_1], dtype=np.int64)
+    lengths_2 = np.array([len(v) for v in var_codes_2], dtype=np.int64)
+    dist = string_distance.levenshtein_matrix(var_codes_1, var_codes_2, parameters=parameters)
+    return dist / np.maximum(lengths_1[:, np.newaxis], lengths_2[np.newaxis, :])
+
+
+def get_variant_distances(loglist, percent, parameters=None):
+    """
+    Computes at once the distances between all the variants of the given logs
+    (that are the variants of any log obtained merging them)
+    """
+    sublogs = {}
+    variants = []
+    for log in loglist:
+        sublogs[(id(log), percent)] = (log, filter_subsets.sublog_percent(log, percent))
+        variants.extend(sublogs[(id(log), percent)][1][1])
+    variant_distances = VariantDistances(variants, parameters=parameters)
+    variant_distances.sublogs.update(sublogs)
+    return variant_distances
+
+
+def __sublog_percent(log, percent, parameters):
+    variant_distances = exec_utils.get_param_value(Parameters.VARIANT_DISTANCES, parameters, None)
+    if variant_distances is not None:
+        return variant_distances.sublog_percent(log, percent)
+    return filter_subsets.sublog_percent(log, percent)
+
+
+def __get_distance_matrix(max_var, min_var, parameters):
+    variant_distances = exec_utils.get_param_value(Parameters.VARIANT_DISTANCES, parameters, None)
+    if variant_distances is not None:
+        return variant_distances.get(max_var, min_var)
+    return get_normalized_distances(max_var, min_var, parameters=parameters)
+
+
+def leven_dist(log1, log2, percent_1, percent_2, parameters=None):
     '''
 
     this function compare the levenstein distance between two sublogs via the two lists of variants.
     '''
+    if parameters is None:
+        parameters = {}
 
-    (dataframe_1, var_list_1) = filter_subsets.sublog_percent(log1, percent_1)
-    (dataframe_2, var_list_2) = filter_subsets.sublog_percent(log2, percent_2)
+    (dataframe_1, var_list_1) = __sublog_percent(log1, percent_1, parameters)
+    (dataframe_2, var_list_2) = __sublog_percent(log2, percent_2, parameters)
 
     if len(var_list_1) >= len(var_list_2):
         max_len = len(var_list_1)
@@ -45,75 +134,64 @@ def leven_dist(log1, log2, percent_1, percent_2):
         var_count_max = dataframe_2['count']
         var_count_min = dataframe_1['count']
 
-    dist_matrix = np.zeros((max_len, min_len))
     max_per_var = np.zeros(max_len)
     max_freq = np.zeros(max_len)
     min_freq = np.zeros(min_len)
     min_per_var = np.zeros(min_len)
-    index_rec = set(list(range(min_len)))
 
     if var_list_1 == var_list_2:
         dist = 0
     else:
-        for i in range(max_len):
-            dist_vec = np.zeros(min_len)
-            for j in range(min_len):
-                (str1, str2) = leven_preprocess(max_var[i], min_var[j])
-                max_len = np.max([len(str1), len(str2)])
-                dist_vec[j] = (string_distance.levenshtein(str1, str2)) / max_len
-                dist_matrix[i][j] = dist_vec[j]
-                if j == (min_len - 1):
-                    # max_loc_col = np.argmax(dist_matrix[i, :])  # location of max value
-                    max_loc_col = np.argmin(dist_vec)
-                    if abs(dist_vec[max_loc_col]) <= 1e-8:
-                        index_rec.discard(max_loc_col)
-                        max_freq[i] = var_count_max.iloc[i] * var_count_min.iloc[max_loc_col] * 2
-                        max_per_var[i] = dist_vec[max_loc_col] * max_freq[i] * 2
-                    else:
-                        max_freq[i] = var_count_max.iloc[i] * var_count_min.iloc[max_loc_col]
-                        max_per_var[i] = dist_vec[max_loc_col] * max_freq[i]
-
-        if (len(index_rec) != 0):
-            for i in list(index_rec):
-                min_loc_row = np.argmin(dist_matrix[:, i])
-                min_freq[i] = var_count_max.iloc[min_loc_row] * var_count_min.iloc[i]
-                min_per_var[i] = dist_matrix[min_loc_row, i] * min_freq[i]
+        dist_matrix = __get_distance_matrix(max_var, min_var, parameters)
+        count_max = var_count_max.values
+        count_min = var_count_min.values
+
+        # for each variant of the first list, the closest variant of the second list
+        # (with double weight if the variant is the same)
+        max_loc_col = np.argmin(dist_matrix, axis=1)
+        max_dist = dist_matrix[np.arange(max_len), max_loc_col]
+        same = np.abs(max_dist) <= 1e-8
+        max_freq[:] = count_max * count_min[max_loc_col]
+        max_freq[same] = count_max[same] * count_min[max_loc_col[same]] * 2
+        max_per_var[:] = max_dist * max_freq
+        max_per_var[same] = max_dist[same] * max_freq[same] * 2
+
+        # the variants of the second list that are not equal to any variant of the first list
+        index_rec = np.setdiff1d(np.arange(min_len), max_loc_col[same])
+        if len(index_rec) != 0:
+            min_loc_row = np.argmin(dist_matrix[:, index_rec], axis=0)
+            min_freq[index_rec] = count_max[min_loc_row] * count_min[index_rec]
+            min_per_var[index_rec] = dist_matrix[min_loc_row, index_rec] * min_freq[index_rec]
 
         dist = (np.sum(max_per_var) + np.sum(min_per_var)) / (np.sum(max_freq) + np.sum(min_freq))
 
     return dist
 
 
-def leven_dist_avg(log1, log2, percent_1, percent_2):
-    (dataframe_1, var_list_1) = filter_subsets.sublog_percent(log1, percent_1)
-    (dataframe_2, var_list_2) = filter_subsets.sublog_percent(log2, percent_2)
+def leven_dist_avg(log1, log2, percent_1, percent_2, parameters=None):
+    if parameters is None:
+        parameters = {}
+
+    (dataframe_1, var_list_1) = __sublog_percent(log1, percent_1, parameters)
+    (dataframe_2, var_list_2) = __sublog_percent(log2, percent_2, parameters)
 
     if len(var_list_1) >= len(var_list_2):
-        max_len = len(var_list_1)
-        min_len = len(var_list_2)
         max_var = var_list_1
         min_var = var_list_2
         var_count_max = dataframe_1['count']
         var_count_min = dataframe_2['count']
     else:
-        max_len = len(var_list_2)
-        min_len = len(var_list_1)
         max_var = var_list_2
         min_var = var_list_1
         var_count_max = dataframe_2['count']
         var_count_min = dataframe_1['count']
 
-    dist_matrix = np.zeros((max_len, min_len))
-    col_sum = np.zeros(max_len)
-
-    for i in range(max_len):
-        dist_vec = np.zeros(min_len)
-        for j in range(min_len):
-            (str1, str2) = leven_preprocess(max_var[i], min_var[j])
-            max_len = np.max([len(str1), len(str2)])
-            dist_vec[j] = (string_distance.levenshtein(str1, str2)) / max_len
-            col_sum[i] += dist_vec[j] * var_count_max.iloc[i] * var_count_min.iloc[j]
-            dist_matrix[i][j] = dist_vec[j]
+    col_sum = np.zeros(len(max_var))
+    if len(min_var) > 0:
+        dist_matrix = __get_distance_matrix(max_var, min_var, parameters)
+        # the cumulative sum adds the terms of each row in the same order as a loop
+        col_sum = np.cumsum(dist_matrix * var_count_max.values[:, np.newaxis] * var_count_min.values[np.newaxis, :],
+                            axis=1)[:, -1]
 
     vmax_vec = (var_count_max.values).reshape(-1, 1)
     vmin_vec = (var_count_min.values).reshape(1, -1)
@@ -1,362 +1,154 @@
 import numpy as np
-from scipy.spatial.distance import squareform
 from pm4py.algo.clustering.trace_attribute_driven.leven_dist import leven_dist_calc
 from pm4py.algo.clustering.trace_attribute_driven.merge_log import merge_log
 from pm4py.algo.clustering.trace_attribute_driven.dfg import dfg_dist
+from pm4py.algo.clustering.trace_attribute_driven.parameters import Parameters
 from pm4py.algo.clustering.trace_attribute_driven.variants import act_dist_calc
 from pm4py.algo.clustering.trace_attribute_driven.variants import suc_dist_calc
 
 
-def linkage_dfg_update(loglist, dist_mat, alpha, percent):
-    index_list = []
-    for i in range(len(dist_mat)):
-        for j in range(i + 1, len(dist_mat)):
-            index_list.append([i, j])
+def __get_distances(dist, slots, slot):
+    """
+    Gets the distances between the clusters in the given slots and the cluster in the given slot
+    (only the upper triangle of the matrix is kept)
+    """
+    return np.where(slots < slot, dist[slots, slot], dist[slot, slots])
+
+
+def __agglomerate(dist_mat, cluster_size, merged_distances):
+    """
+    Agglomerative clustering of the observations, updating the distance matrix in place.
+
+    Each cluster occupies a slot (row/column) of the matrix; when two clusters are merged, the new cluster
+    takes the slot of the cluster with the smallest label, and its distances from the other clusters
+    are provided by merged_distances. The couple of clusters at minimum distance is chosen in order of slots
+    (the first one in the condensed distance matrix), as the previous implementation based on the
+    condensed vector.
+
+    Parameters
+    ------------
+    dist_mat
+        Square distance matrix between the observations
+    cluster_size
+        Dictionary associating to each observation its size (updated with the size of the merged clusters)
+    merged_distances
+        Function (labels of the merged clusters, label of the new cluster, labels of the other clusters,
+        distances of the other clusters from the first/second merged cluster) returning the distances
+        between the new cluster and the other clusters
+
+    Returns
+    ------------
+    Z
+        Linkage matrix
+    """
+    n = len(dist_mat)
+    dist = np.array(dist_mat, dtype=float)
+    dist[np.tril_indices(n)] = np.inf
+    labels = np.arange(n)
+    active = np.ones(n, dtype=bool)
+    all_rows = np.arange(n)
+    row_arg = np.argmin(dist, axis=1)
+    row_min = dist[all_rows, row_arg]
 
-    y = squareform(dist_mat)
-    n = len(dist_mat)  # The number of observations.
     Z = []
-    cluster_size = dict(zip(range(n), np.ones(n)))  # record merged cluster size every step
-    k = 1
-    logsindex = list(range(len(loglist)))
-    while (k <= n - 2):
-        min_index = np.argmin(y)
-
-        # update Z
-        temp = []
-        temp.extend(index_list[min_index])
-        temp.append(y[min_index])
-        cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-        temp.append(cluster_size[n - 1 + k])
-
-        Z.append(temp)
-
-        # get index of min in y
-        item = index_list[min_index][::]
-        record1 = []
-        record2 = []
-        for ele in index_list:
-            if item[0] in ele:
-                record1.append(index_list.index(ele))
-                inde = ele.index(item[0])
-                ele[inde] = n - 1 + k
-            if item[1] in ele:  # here if/elif both works
-                record2.append(index_list.index(ele))
-                inde = ele.index(item[1])
-                ele[inde] = n - 1 + k
-            ele.sort()
+    for k in range(1, n):
+        s = int(np.argmin(row_min))
+        t = int(row_arg[s])
+        la, lb = sorted((int(labels[s]), int(labels[t])))
+        new_label = n - 1 + k
+        cluster_size[new_label] = cluster_size[la] + cluster_size[lb]
+        Z.append([la, lb, dist[s, t], cluster_size[new_label]])
+
+        keep, remove = (s, t) if labels[s] == la else (t, s)
+        active[keep] = False
+        active[remove] = False
+        others = np.flatnonzero(active)
+        new_dist = merged_distances(la, lb, new_label, labels[others], __get_distances(dist, others, keep),
+                                    __get_distances(dist, others, remove))
+        active[keep] = True
+
+        dist[remove, :] = np.inf
+        dist[:, remove] = np.inf
+        lower = others < keep
+        dist[others[lower], keep] = new_dist[lower]
+        dist[keep, others[~lower]] = new_dist[~lower]
+        labels[keep] = new_label
+
+        # the minimum of a row changes only if its column of the merged cluster changed
+        recompute = (row_arg == keep) | (row_arg == remove)
+        recompute[keep] = True
+        recompute[remove] = True
+        candidates = others[lower & ~recompute[others]]
+        improved = candidates[(dist[candidates, keep] < row_min[candidates]) | (
+                (dist[candidates, keep] == row_min[candidates]) & (keep < row_arg[candidates]))]
+        row_arg[improved] = keep
+        row_min[improved] = dist[improved, keep]
+        rows = np.flatnonzero(recompute)
+        row_arg[rows] = np.argmin(dist[rows], axis=1)
+        row_min[rows] = dist[rows, row_arg[rows]]
+
+    return np.array(Z)
 
-        record = list(set(record1).union(set(record2)))
 
-        merged1 = merge_log.update_merge([loglist[item[0]], loglist[item[1]]])
-        # here the logsindex is changing
-        diff = list(set(logsindex).difference(set(item)))  # diff is the node number need to be updated
+def linkage_dfg_update(loglist, dist_mat, alpha, percent):
+    cluster_size = dict(zip(range(len(dist_mat)), np.ones(len(dist_mat))))  # record merged cluster size every step
 
-        update_dist = dict()
-        for ele in diff:
+    def merged_distances(la, lb, new_label, others, dist_a, dist_b):
+        merged1 = merge_log.update_merge([loglist[la], loglist[lb]])
+        update_dist = np.zeros(len(others))
+        for i, ele in enumerate(others):
             (dist_act, dist_dfg) = dfg_dist.dfg_dist_calc(merged1, loglist[ele])
-            tempdist = dist_act * alpha + dist_dfg * (1 - alpha)
-            # tempdist = leven_dist_calc.leven_dist_avg(merged1, loglist[ele], percent, percent)
-            update_dist[ele] = tempdist
-
+            update_dist[i] = dist_act * alpha + dist_dfg * (1 - alpha)
         loglist.append(merged1)
-        diff.append(n - 1 + k)
-        logsindex = diff
-
-        del (record1[record1.index(min_index)])
-        del (record2[record2.index(min_index)])
+        return update_dist
 
-        # for i in range(len(record1)):
-        #     y[record1[i]] = (y[record1[i]]*cluster_size[item[0]] + y[record2[i]]*cluster_size[item[1]]) / (cluster_size[item[0]]+cluster_size[item[1]])
-        for ele in record1:
-            uindex = index_list[ele][0]  # record1 is the location if nodes in diff in the index_list
-            y[ele] = update_dist[uindex]
-
-        diff1 = list(set(range(len(index_list))).difference(set(record)))
-        newindex = record1 + diff1
-        newindex.sort()
-
-        range_newindex = range(len(newindex))
-        tempy = list(range_newindex)
-        templist = list(range_newindex)
-        for i in range_newindex:
-            tempy[i] = y[newindex[i]]
-            templist[i] = index_list[newindex[i]]
-
-        index_list = templist
-        y = tempy
-        k = k + 1
-
-    temp = []
-    temp.extend(index_list[0])
-    temp.append(y[0])
-
-    cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-    temp.append(cluster_size[n - 1 + k])
-    Z.append(temp)
-    Z = np.array(Z)
-
-    return Z
+    return __agglomerate(dist_mat, cluster_size, merged_distances)
 
 
 def linkage_avg(loglist, dist_mat, alpha, percent):
-    index_list = []
-    cluster_size = []
-    for i in range(len(dist_mat)):
-        cluster_size.append(len(loglist[i]))
-        for j in range(i + 1, len(dist_mat)):
-            index_list.append([i, j])
+    # record merged cluster size every step
+    cluster_size = dict(zip(range(len(dist_mat)), [len(loglist[i]) for i in range(len(dist_mat))]))
 
-    y = squareform(dist_mat)
-    n = len(dist_mat)  # The number of observations.
-    Z = []
-    cluster_size = dict(zip(range(n), cluster_size))  # record merged cluster size every step
-    k = 1
-    while (k <= n - 2):
-        min_index = np.argmin(y)
+    def merged_distances(la, lb, new_label, others, dist_a, dist_b):
+        # Lance-Williams update for the (weighted by the size of the clusters) average linkage
+        return (dist_a * cluster_size[la] + dist_b * cluster_size[lb]) / (cluster_size[la] + cluster_size[lb])
 
-        # update Z
-        temp = []
-        temp.extend(index_list[min_index])
-        temp.append(y[min_index])
-        cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-        temp.append(cluster_size[n - 1 + k])
-
-        Z.append(temp)
-
-        # get index of min in y
-        item = index_list[min_index][::]
-        record1 = []
-        record2 = []
-        for ele in index_list:
-            if item[0] in ele:
-                record1.append(index_list.index(ele))
-                inde = ele.index(item[0])
-                ele[inde] = n - 1 + k
-            if item[1] in ele:  # here if/elif both works
-                record2.append(index_list.index(ele))
-                inde = ele.index(item[1])
-                ele[inde] = n - 1 + k
-            ele.sort()
-
-        record = list(set(record1).union(set(record2)))
-
-        del (record1[record1.index(min_index)])
-        del (record2[record2.index(min_index)])
-
-        for i in range(len(record1)):
-            y[record1[i]] = (y[record1[i]] * cluster_size[item[0]] + y[record2[i]] * cluster_size[item[1]]) / (
-                        cluster_size[item[0]] + cluster_size[item[1]])
-        # for ele in record1:
-        #     uindex = index_list[ele][0]  # record1 is the location if nodes in diff in the index_list
-        #     y[ele] = update_dist[uindex]
-
-        diff1 = list(set(range(len(index_list))).difference(set(record)))
-        newindex = record1 + diff1
-        newindex.sort()
-
-        range_newindex = range(len(newindex))
-        tempy = list(range_newindex)
-        templist = list(range_newindex)
-        for i in range_newindex:
-            tempy[i] = y[newindex[i]]
-            templist[i] = index_list[newindex[i]]
-
-        index_list = templist
-        y = tempy
-        k = k + 1
-
-    temp = []
-    temp.extend(index_list[0])
-    temp.append(y[0])
-
-    cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-    temp.append(cluster_size[n - 1 + k])
-    Z.append(temp)
-    Z = np.array(Z)
-
-    return Z
+    return __agglomerate(dist_mat, cluster_size, merged_distances)
 
 
 def linkage_DMM_update(loglist, dist_mat, alpha, percent):
-    index_list = []
-    for i in range(len(dist_mat)):
-        for j in range(i + 1, len(dist_mat)):
-            index_list.append([i, j])
-
-    y = squareform(dist_mat)
-    n = len(dist_mat)  # The number of observations.
-    Z = []
-    cluster_size = dict(zip(range(n), np.ones(n)))  # record merged cluster size every step
-    k = 1
-    logsindex = list(range(len(loglist)))
-    while (k <= n - 2):
-        min_index = np.argmin(y)
+    cluster_size = dict(zip(range(len(dist_mat)), np.ones(len(dist_mat))))  # record merged cluster size every step
 
-        # update Z
-        temp = []
-        temp.extend(index_list[min_index])
-        temp.append(y[min_index])
-        cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-        temp.append(cluster_size[n - 1 + k])
-
-        Z.append(temp)
-
-        # get index of min in y
-        item = index_list[min_index][::]
-        record1 = []
-        record2 = []
-        for ele in index_list:
-            if item[0] in ele:
-                record1.append(index_list.index(ele))
-                inde = ele.index(item[0])
-                ele[inde] = n - 1 + k
-            if item[1] in ele:  # here if/elif both works
-                record2.append(index_list.index(ele))
-                inde = ele.index(item[1])
-                ele[inde] = n - 1 + k
-            ele.sort()
-
-        record = list(set(record1).union(set(record2)))
-
-        merged1 = merge_log.update_merge([loglist[item[0]], loglist[item[1]]])
-        # here the logsindex is changing
-        diff = list(set(logsindex).difference(set(item)))  # diff is the node number need to be updated
-
-        update_dist = dict()
-        for ele in diff:
+    def merged_distances(la, lb, new_label, others, dist_a, dist_b):
+        merged1 = merge_log.update_merge([loglist[la], loglist[lb]])
+        update_dist = np.zeros(len(others))
+        for i, ele in enumerate(others):
             dist_act = act_dist_calc.act_sim_percent(merged1, loglist[ele], percent, percent)
             dist_suc = suc_dist_calc.suc_sim_percent(merged1, loglist[ele], percent, percent)
-            tempdist = dist_act * alpha + dist_suc * (1 - alpha)
-            # tempdist = leven_dist_calc.leven_dist_avg(merged1, loglist[ele], percent, percent)
-            update_dist[ele] = tempdist
-
+            update_dist[i] = dist_act * alpha + dist_suc * (1 - alpha)
         loglist.append(merged1)
-        diff.append(n - 1 + k)
-        logsindex = diff
-
-        del (record1[record1.index(min_index)])
-        del (record2[record2.index(min_index)])
+        return update_dist
 
-        # for i in range(len(record1)):
-        #     y[record1[i]] = (y[record1[i]]*cluster_size[item[0]] + y[record2[i]]*cluster_size[item[1]]) / (cluster_size[item[0]]+cluster_size[item[1]])
-        for ele in record1:
-            uindex = index_list[ele][0]  # record1 is the location if nodes in diff in the index_list
-            y[ele] = update_dist[uindex]
+    return __agglomerate(dist_mat, cluster_size, merged_distances)
 
-        diff1 = list(set(range(len(index_list))).difference(set(record)))
-        newindex = record1 + diff1
-        newindex.sort()
 
-        range_newindex = range(len(newindex))
-        tempy = list(range_newindex)
-        templist = list(range_newindex)
-        for i in range_newindex:
-            tempy[i] = y[newindex[i]]
-            templist[i] = index_list[newindex[i]]
+def linkage_DMM_update_leven(loglist, dist_mat, alpha, percent, parameters=None):
+    if parameters is None:
+        parameters = {}
 
-        index_list = templist
-        y = tempy
-        k = k + 1
-
-    temp = []
-    temp.extend(index_list[0])
-    temp.append(y[0])
-
-    cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-    temp.append(cluster_size[n - 1 + k])
-    Z.append(temp)
-    Z = np.array(Z)
-
-    return Z
-
-
-def linkage_DMM_update_leven(loglist, dist_mat, alpha, percent):
-    index_list = []
-    for i in range(len(dist_mat)):
-        for j in range(i + 1, len(dist_mat)):
-            index_list.append([i, j])
-
-    y = squareform(dist_mat)
-    n = len(dist_mat)  # The number of observations.
-    Z = []
-    cluster_size = dict(zip(range(n), np.ones(n)))  # record merged cluster size every step
-    k = 1
-    logsindex = list(range(len(loglist)))
-    while (k <= n - 2):
-        min_index = np.argmin(y)
-
-        # update Z
-        temp = []
-        temp.extend(index_list[min_index])
-        temp.append(y[min_index])
-        cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-        temp.append(cluster_size[n - 1 + k])
-
-        Z.append(temp)
-
-        # get index of min in y
-        item = index_list[min_index][::]
-        record1 = []
-        record2 = []
-        for ele in index_list:
-            if item[0] in ele:
-                record1.append(index_list.index(ele))
-                inde = ele.index(item[0])
-                ele[inde] = n - 1 + k
-            if item[1] in ele:  # here if/elif both works
-                record2.append(index_list.index(ele))
-                inde = ele.index(item[1])
-                ele[inde] = n - 1 + k
-            ele.sort()
-
-        record = list(set(record1).union(set(record2)))
-
-        merged1 = merge_log.update_merge([loglist[item[0]], loglist[item[1]]])
-        # here the logsindex is changing
-        diff = list(set(logsindex).difference(set(item)))  # diff is the node number need to be updated
-
-        update_dist = dict()
-        for ele in diff:
-            tempdist = leven_dist_calc.leven_dist(merged1, loglist[ele], percent, percent)
-            # tempdist = leven_dist_calc.leven_dist_avg(merged1, loglist[ele], percent, percent)
-            update_dist[ele] = tempdist
+    cluster_size = dict(zip(range(len(dist_mat)), np.ones(len(dist_mat))))  # record merged cluster size every step
+    # the variants of the merged logs are variants of the initial logs: their distances are computed once
+    parameters = dict(parameters)
+    parameters[Parameters.VARIANT_DISTANCES] = leven_dist_calc.get_variant_distances(loglist, percent,
+                                                                                     parameters=parameters)
 
+    def merged_distances(la, lb, new_label, others, dist_a, dist_b):
+        merged1 = merge_log.update_merge([loglist[la], loglist[lb]])
+        update_dist = np.zeros(len(others))
+        for i, ele in enumerate(others):
+            update_dist[i] = leven_dist_calc.leven_dist(merged1, loglist[ele], percent, percent,
+                                                        parameters=parameters)
         loglist.append(merged1)
-        diff.append(n - 1 + k)
-        logsindex = diff
-
-        del (record1[record1.index(min_index)])
-        del (record2[record2.index(min_index)])
-
-        # for i in range(len(record1)):
-        #     y[record1[i]] = (y[record1[i]]*cluster_size[item[0]] + y[record2[i]]*cluster_size[item[1]]) / (cluster_size[item[0]]+cluster_size[item[1]])
-        for ele in record1:
-            uindex = index_list[ele][0]  # record1 is the location if nodes in diff in the index_list
-            y[ele] = update_dist[uindex]
-
-        diff1 = list(set(range(len(index_list))).difference(set(record)))
-        newindex = record1 + diff1
-        newindex.sort()
-
-        range_newindex = range(len(newindex))
-        tempy = list(range_newindex)
-        templist = list(range_newindex)
-        for i in range_newindex:
-            tempy[i] = y[newindex[i]]
-            templist[i] = index_list[newindex[i]]
-
-        index_list = templist
-        y = tempy
-        k = k + 1
-
-    temp = []
-    temp.extend(index_list[0])
-    temp.append(y[0])
-
-    cluster_size[n - 1 + k] = cluster_size[temp[0]] + cluster_size[temp[1]]
-    temp.append(cluster_size[n - 1 + k])
-    Z.append(temp)
-    Z = np.array(Z)
+        return update_dist
 
-    return Z
+    return __agglomerate(dist_mat, cluster_size, merged_distances)
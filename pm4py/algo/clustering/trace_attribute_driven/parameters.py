@@ -9,4 +9,7 @@ class Parameters(Enum):
     BINARIZE = "binarize"
     POSITIVE = "positive"
     LOWER_PERCENT = "lower_percent"
+    VARIANT_DISTANCES = "variant_distances"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
 
@@ -1,12 +1,15 @@
+from copy import copy
+
 from scipy.spatial.distance import squareform
 import numpy as np
 from pm4py.algo.clustering.trace_attribute_driven.variants import act_dist_calc
 from pm4py.algo.clustering.trace_attribute_driven.variants import suc_dist_calc
 from pm4py.algo.clustering.trace_attribute_driven.leven_dist import leven_dist_calc
 from pm4py.algo.clustering.trace_attribute_driven.dfg import dfg_dist
+from pm4py.algo.clustering.trace_attribute_driven.parameters import Parameters
 
 
-def dfg_dis(loglist, percent, alpha):
+def dfg_dis(loglist, percent, alpha, parameters=None):
     size = len(loglist)
     dist_mat = np.zeros((size, size))
 
@@ -19,7 +22,7 @@ def dfg_dis(loglist, percent, alpha):
     return y
 
 
-def eval_avg_variant(loglist, percent, alpha):
+def eval_avg_variant(loglist, percent, alpha, parameters=None):
     size = len(loglist)
     dist_mat = np.zeros((size, size))
 
@@ -34,7 +37,7 @@ def eval_avg_variant(loglist, percent, alpha):
     return y
 
 
-def eval_DMM_variant(loglist, percent, alpha):
+def eval_DMM_variant(loglist, percent, alpha, parameters=None):
     size = len(loglist)
     dist_mat = np.zeros((size, size))
 
@@ -48,25 +51,39 @@ def eval_DMM_variant(loglist, percent, alpha):
     return y
 
 
-def eval_avg_leven(loglist, percent, alpha):
+def eval_avg_leven(loglist, percent, alpha, parameters=None):
+    if parameters is None:
+        parameters = {}
     size = len(loglist)
     dist_mat = np.zeros((size, size))
 
+    # the distances between the variants of all the logs are computed at once
+    parameters = copy(parameters)
+    parameters[Parameters.VARIANT_DISTANCES] = leven_dist_calc.get_variant_distances(loglist, percent,
+                                                                                     parameters=parameters)
     for i in range(0, size - 1):
         for j in range(i + 1, size):
-            dist_mat[i][j] = leven_dist_calc.leven_dist_avg(loglist[i], loglist[j], percent, percent)
+            dist_mat[i][j] = leven_dist_calc.leven_dist_avg(loglist[i], loglist[j], percent, percent,
+                                                            parameters=parameters)
             dist_mat[j][i] = dist_mat[i][j]
     y = squareform(dist_mat)
     return y
 
 
-def eval_DMM_leven(loglist, percent, alpha):
+def eval_DMM_leven(loglist, percent, alpha, parameters=None):
+    if parameters is None:
+        parameters = {}
     size = len(loglist)
     dist_mat = np.zeros((size, size))
 
+    # the distances between the variants of all the logs are computed at once
+    parameters = copy(parameters)
+    parameters[Parameters.VARIANT_DISTANCES] = leven_dist_calc.get_variant_distances(loglist, percent,
+                                                                                     parameters=parameters)
     for i in range(0, size - 1):
         for j in range(i + 1, size):
-            dist_mat[i][j] = leven_dist_calc.leven_dist(loglist[i], loglist[j], percent, percent)
+            dist_mat[i][j] = leven_dist_calc.leven_dist(loglist[i], loglist[j], percent, percent,
+                                                        parameters=parameters)
             dist_mat[j][i] = dist_mat[i][j]
     y = squareform(dist_mat)
     return y
@@ -1,16 +1,20 @@
 from copy import copy
 
 from pm4py.algo.conformance.alignments import variants
+from pm4py.algo.conformance.alignments import cache as alignments_cache
+from pm4py.algo.conformance.alignments import session as alignments_session
 from pm4py.objects.petri import align_utils
-from pm4py.statistics.variants.log import get as variants_module
+from pm4py.objects.log.util import variants_util
 from pm4py.objects.conversion.log import converter as log_converter
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_TRACEID_KEY
 from pm4py.objects.petri import check_soundness
+from pm4py.objects.petri import utils as petri_utils
 from pm4py.objects.log.log import Trace
 import time
-from pm4py.util import exec_utils
+from pm4py.util import exec_utils, instrumentation, process_pool
 from enum import Enum
 import sys
+import importlib
 from pm4py.util.constants import PARAMETER_CONSTANT_ACTIVITY_KEY, PARAMETER_CONSTANT_CASEID_KEY
 
 
@@ -35,6 +39,10 @@ class Parameters(Enum):
     CASE_ID_KEY = PARAMETER_CONSTANT_CASEID_KEY
     ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
     VARIANTS_IDX = "variants_idx"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    ALIGNMENT_CACHE = "alignment_cache"
+    ALIGNMENT_SESSION = "alignment_session"
 
 
 DEFAULT_VARIANT = Variants.VERSION_STATE_EQUATION_LESS_MEMORY
@@ -111,7 +119,19 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
     variant
         selected variant of the algorithm, possible values: {\'Variants.VERSION_STATE_EQUATION_A_STAR, Variants.VERSION_DIJKSTRA_NO_HEURISTICS \'}
     parameters
-        :class:`dict` parameters of the algorithm,
+        :class:`dict` parameters of the algorithm, including:
+            Parameters.PARAM_MAX_ALIGN_TIME -> maximum time (in seconds) for aligning the whole log
+            Parameters.PARAM_MAX_ALIGN_TIME_TRACE -> maximum time (in seconds) for aligning a single variant
+            Parameters.CORES -> number of worker processes used to align the variants (default: 1, i.e.,
+            the variants are aligned in the current process)
+            Parameters.CHUNK_SIZE -> number of variants that are sent together to a worker process
+            (default: the variants are split in 4 chunks per worker)
+            Parameters.ALIGNMENT_CACHE -> (if provided) persistent alignment cache
+            (see pm4py.algo.conformance.alignments.cache); the variants already aligned against the same
+            accepting Petri net (with the same settings) are read from the cache instead of being aligned
+            Parameters.ALIGNMENT_SESSION -> (if provided) alignment session (see pm4py.algo.conformance.alignments.session)
+            created for the same accepting Petri net and cost functions; otherwise, a session is created, so that
+            the model part of the synchronous product net is built only once for all the variants
 
     Returns
     -----------
@@ -127,6 +147,11 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
     if not check_soundness.check_easy_soundness_net_in_fin_marking(petri_net, initial_marking, final_marking):
         raise Exception("trying to apply alignments on a Petri net that is not a easy sound net!!")
 
+    parameters = copy(parameters)
+    if exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None) is None:
+        parameters[Parameters.ALIGNMENT_SESSION] = alignments_session.apply(petri_net, initial_marking, final_marking,
+                                                                             parameters=parameters)
+
     start_time = time.time()
     max_align_time = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME, parameters,
                                                 sys.maxsize)
@@ -140,26 +165,56 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
 
     variants_idxs = exec_utils.get_param_value(Parameters.VARIANTS_IDX, parameters, None)
     if variants_idxs is None:
-        variants_idxs = variants_module.get_variants_from_log_trace_idx(log, parameters=parameters)
+        # integer-coded variants (not ambiguous when the activities contain the separator)
+        cases_per_variant = variants_util.from_log(log, parameters=parameters).get_cases_per_variant()
+    else:
+        cases_per_variant = list(variants_idxs.values())
 
     one_tr_per_var = []
-    variants_list = []
-    for index_variant, var in enumerate(variants_idxs):
-        variants_list.append(var)
-
-    for var in variants_list:
-        one_tr_per_var.append(log[variants_idxs[var][0]])
-
-    all_alignments = []
-    for trace in one_tr_per_var:
-        this_max_align_time = min(max_align_time_case, (max_align_time - (time.time() - start_time)) * 0.5)
-        parameters[Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = this_max_align_time
-        all_alignments.append(apply_trace(trace, petri_net, initial_marking, final_marking, parameters=copy(parameters),
-                                          variant=variant))
+    for cases in cases_per_variant:
+        one_tr_per_var.append(log[cases[0]])
+
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
+    alignment_cache = exec_utils.get_param_value(Parameters.ALIGNMENT_CACHE, parameters, None)
+
+    all_alignments = [None] * len(one_tr_per_var)
+    fingerprint = None
+    if alignment_cache is not None:
+        # (None if the places/transitions of the net cannot be told apart: the cache is not used)
+        fingerprint = alignments_cache.net_fingerprint(petri_net, initial_marking, final_marking,
+                                                       parameters=parameters, variant=variant)
+    if fingerprint is not None:
+        activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+        # (the events without the activity are skipped, as in the computation of the variants)
+        variants_activities = [[x[activity_key] for x in trace if activity_key in x] for trace in one_tr_per_var]
+        all_alignments = alignment_cache.get_many(fingerprint, variants_activities)
+    # indexes of the variants that are not in the cache
+    to_align = [i for i in range(len(one_tr_per_var)) if all_alignments[i] is None]
+
+    # the net is sent to the worker processes as PNML, identifying the places/transitions by name
+    if cores > 1 and len(to_align) > 1 and petri_utils.has_unique_names(petri_net):
+        aligned = __apply_variants_multiprocessing([one_tr_per_var[i] for i in to_align], petri_net,
+                                                   initial_marking, final_marking, start_time + max_align_time,
+                                                   parameters=parameters, variant=variant)
+    else:
+        aligned = []
+        with instrumentation.phase("alignments.align_variants"):
+            for i in to_align:
+                this_max_align_time = min(max_align_time_case, (max_align_time - (time.time() - start_time)) * 0.5)
+                parameters[Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = this_max_align_time
+                aligned.append(apply_trace(one_tr_per_var[i], petri_net, initial_marking, final_marking,
+                                           parameters=copy(parameters), variant=variant))
+    instrumentation.increment("alignments.aligned_variants", len(to_align))
+    for i, alignment in zip(to_align, aligned):
+        all_alignments[i] = alignment
+
+    if fingerprint is not None:
+        alignment_cache.put_many(fingerprint, [variants_activities[i] for i in to_align], aligned)
+        alignment_cache.log_statistics()
 
     al_idx = {}
-    for index_variant, variant in enumerate(variants_idxs):
-        for trace_idx in variants_idxs[variant]:
+    for index_variant, cases in enumerate(cases_per_variant):
+        for trace_idx in cases:
             al_idx[trace_idx] = all_alignments[index_variant]
 
     alignments = []
@@ -180,6 +235,110 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
     return alignments
 
 
+def __apply_variants_multiprocessing(traces, petri_net, initial_marking, final_marking, deadline, parameters=None,
+                                     variant=DEFAULT_VARIANT):
+    """
+    Aligns a list of traces (one per variant) using a pool of worker processes.
+
+    The accepting Petri net is sent (as PNML string) only once to each worker.
+    The variants are sorted by decreasing length and split in chunks, so the longest
+    (and usually most expensive) alignments are scheduled first.
+
+    Parameters
+    --------------
+    traces
+        Traces to align (one per variant)
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    deadline
+        Absolute time (as returned by time.time()) at which the alignment of the log should be completed
+    parameters
+        Parameters of the algorithm (see apply_log)
+    variant
+        Variant of the alignments to use
+
+    Returns
+    --------------
+    all_alignments
+        List of alignments (in the same order as the provided traces)
+    """
+    from pm4py.objects.petri.exporter.variants import pnml as petri_exporter
+
+    if parameters is None:
+        parameters = {}
+
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, None)
+
+    indexes = sorted(range(len(traces)), key=lambda i: len(traces[i]), reverse=True)
+    chunks = process_pool.get_chunks(indexes, cores, chunk_size=chunk_size)
+
+    petri_string = petri_exporter.export_petri_as_string(petri_net, initial_marking, final_marking)
+    worker_parameters = copy(parameters)
+    # the session is bound to the Petri net objects: each worker creates its own session
+    for key in [k for k in worker_parameters if exec_utils.unroll(k) == Parameters.ALIGNMENT_SESSION.value]:
+        del worker_parameters[key]
+    for cost_param in [Parameters.PARAM_MODEL_COST_FUNCTION, Parameters.PARAM_SYNC_COST_FUNCTION]:
+        cost_function = exec_utils.get_param_value(cost_param, worker_parameters, None)
+        if cost_function is not None:
+            # transitions do not survive the PNML serialization, hence the costs are keyed by (unique) transition name
+            for key in [k for k in worker_parameters if exec_utils.unroll(k) == cost_param.value]:
+                del worker_parameters[key]
+            worker_parameters[cost_param] = {t.name: c for t, c in cost_function.items()}
+
+    results = process_pool.apply(__apply_variants_chunk, [[traces[i] for i in chunk] for chunk in chunks], cores,
+                                 context=(petri_string, worker_parameters, exec_utils.get_variant(variant).__name__,
+                                          deadline),
+                                 initializer=__init_alignment_worker)
+    all_alignments = [None] * len(traces)
+    for chunk, alignments in zip(chunks, results):
+        for i, alignment in zip(chunk, alignments):
+            all_alignments[i] = alignment
+
+    return all_alignments
+
+
+def __init_alignment_worker(context):
+    """
+    Initializes a worker process of the multiprocessing alignments, importing the
+    accepting Petri net once
+    """
+    from pm4py.objects.petri.importer.variants import pnml as petri_importer
+
+    petri_string, parameters, variant_name, deadline = context
+    net, im, fm = petri_importer.import_petri_from_string(petri_string)
+    trans_dict = {t.name: t for t in net.transitions}
+    parameters = copy(parameters)
+    for cost_param in [Parameters.PARAM_MODEL_COST_FUNCTION, Parameters.PARAM_SYNC_COST_FUNCTION]:
+        if cost_param in parameters:
+            parameters[cost_param] = {trans_dict[n]: c for n, c in parameters[cost_param].items()}
+    parameters[Parameters.ALIGNMENT_SESSION] = alignments_session.apply(net, im, fm, parameters=parameters)
+
+    return net, im, fm, parameters, importlib.import_module(variant_name), deadline
+
+
+def __apply_variants_chunk(context, traces):
+    """
+    Aligns a chunk of traces inside a worker process, respecting the global deadline
+    and the maximum alignment time per trace
+    """
+    net, im, fm, parameters, variant, deadline = context
+    max_align_time_case = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
+                                                     sys.maxsize)
+
+    alignments = []
+    for trace in traces:
+        this_parameters = copy(parameters)
+        this_parameters[Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = min(max_align_time_case,
+                                                                     (deadline - time.time()) * 0.5)
+        alignments.append(apply_trace(trace, net, im, fm, parameters=this_parameters, variant=variant))
+    return alignments
+
+
 def get_diagnostics_dataframe(log, align_output, parameters=None):
     """
     Gets the diagnostics results of alignments (of a log_skeleton) in a dataframe
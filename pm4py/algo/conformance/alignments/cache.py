@@ -0,0 +1,296 @@
+import hashlib
+import json
+import logging
+import pickle
+import sqlite3
+import time
+
+from pm4py.objects.petri.petrinet import PetriNet
+from pm4py.util import instrumentation
+
+# parameters that do not change the result of an alignment (hence, not considered in the fingerprint)
+NOT_FINGERPRINTED_PARAMETERS = {"max_align_time", "max_align_time_trace", "variants_idx", "cores", "chunk_size",
+                                "alignment_cache", "alignment_session"}
+
+
+def __canonical_value(value):
+    """
+    Gets a representation of a parameter value that does not depend on the identity of the objects
+    """
+    if isinstance(value, dict):
+        return sorted((__canonical_value(x), __canonical_value(y)) for x, y in value.items())
+    elif isinstance(value, (list, tuple)):
+        return [__canonical_value(x) for x in value]
+    elif isinstance(value, (PetriNet.Transition, PetriNet.Place)):
+        return value.name
+    elif callable(value):
+        return getattr(value, "__module__", "") + "." + getattr(value, "__qualname__", repr(value))
+    return repr(value)
+
+
+def __refine_colors(net, initial_marking, final_marking, transition_costs):
+    """
+    Assigns to each place/transition a color that does not depend on its name (Weisfeiler-Lehman refinement):
+    the initial color of a place is given by its tokens in the initial/final marking, the initial color
+    of a transition by its label and costs; then, the colors are iteratively refined with the colors
+    of the neighbours (and the weights of the arcs)
+    """
+    nodes = list(net.places) + list(net.transitions)
+    colors = {}
+    for p in net.places:
+        colors[p] = repr(("p", initial_marking[p] if p in initial_marking else 0,
+                          final_marking[p] if p in final_marking else 0))
+    for t in net.transitions:
+        colors[t] = repr(("t", t.label, transition_costs[t] if t in transition_costs else None))
+
+    no_colors = len(set(colors.values()))
+    for i in range(len(nodes)):
+        new_colors = {}
+        for n in nodes:
+            inputs = sorted((colors[a.source], a.weight) for a in n.in_arcs)
+            outputs = sorted((colors[a.target], a.weight) for a in n.out_arcs)
+            new_colors[n] = hashlib.sha256(repr((colors[n], inputs, outputs)).encode("utf-8")).hexdigest()
+        colors = new_colors
+        new_no_colors = len(set(colors.values()))
+        if new_no_colors == no_colors:
+            break
+        no_colors = new_no_colors
+    return colors
+
+
+def __node_keys(colors):
+    """
+    Gets, for each place/transition, a key identifying it in the net: the color, if no other node has
+    the same color; otherwise, the color along with the name. The colors do not always tell apart the nodes
+    of non-isomorphic nets, hence the nodes sharing a color are told apart by their names, so that
+    the arcs between the keys describe the net exactly (up to the names of the nodes having an unique color)
+
+    Returns None if two nodes sharing a color have the same name
+    """
+    classes = {}
+    for n, c in colors.items():
+        classes[c] = classes[c] + 1 if c in classes else 1
+    keys = {}
+    for n, c in colors.items():
+        keys[n] = c if classes[c] == 1 else c + "|" + repr(n.name)
+    if len(set(keys.values())) < len(keys):
+        return None
+    return keys
+
+
+def net_fingerprint(net, initial_marking, final_marking, parameters=None, variant=None):
+    """
+    Computes a fingerprint of an accepting Petri net, along with the parameters
+    of the alignments (e.g. the cost functions) and the variant of the algorithm.
+
+    The nets having the same fingerprint are equal up to the names of the places/transitions having
+    an unique color after the Weisfeiler-Lehman refinement (which are, for example, randomly generated by some
+    discovery algorithms); the names of the places/transitions sharing a color are part of the fingerprint,
+    as well as all the names when the alignments are requested to contain the names of the transitions
+    (Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE).
+
+    Parameters
+    -------------
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the alignments
+    variant
+        Variant of the alignments
+
+    Returns
+    -------------
+    fingerprint
+        Hexadecimal digest identifying the accepting Petri net and the alignment settings
+        (None if the net cannot be identified, i.e., some places/transitions cannot be told apart)
+    """
+    if parameters is None:
+        parameters = {}
+
+    parameters = {str(getattr(k, "value", k)): v for k, v in parameters.items()}
+    # the costs associated to the transitions are part of the color of the transitions
+    transition_costs = {}
+    for cost_param in ["model_cost_function", "sync_cost_function"]:
+        if cost_param in parameters and parameters[cost_param] is not None:
+            for t, c in parameters[cost_param].items():
+                transition_costs[t] = transition_costs[t] + (c,) if t in transition_costs else (c,)
+    colors = __refine_colors(net, initial_marking, final_marking, transition_costs)
+    keys = __node_keys(colors)
+    if keys is None:
+        return None
+
+    description = {
+        "nodes": sorted(keys.values()),
+        "arcs": sorted((keys[a.source], keys[a.target], a.weight) for a in net.arcs),
+        "parameters": sorted((k, __canonical_value(v)) for k, v in parameters.items() if
+                             k not in NOT_FINGERPRINTED_PARAMETERS and k not in ["model_cost_function",
+                                                                                 "sync_cost_function"]),
+        "variant": getattr(getattr(variant, "value", variant), "__name__", str(variant))
+    }
+    if "ret_tuple_as_trans_desc" in parameters and parameters["ret_tuple_as_trans_desc"]:
+        description["names"] = sorted((keys[n], str(n.name)) for n in keys)
+
+    return hashlib.sha256(json.dumps(description, default=str).encode("utf-8")).hexdigest()
+
+
+class AlignmentCache(object):
+    """
+    Persistent (SQLite-backed) cache of the alignments, keyed by the fingerprint of the
+    accepting Petri net/alignment settings and by the activities of the variant.
+
+    The database can be shared by several processes. When the number of stored alignments
+    exceeds the maximum size, the least recently used alignments are evicted.
+    The number of hits and misses of the current object are available through get_statistics.
+    """
+
+    def __init__(self, path, max_size=1000000, timeout=60.0):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        connection = self.__connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS alignments (fingerprint TEXT NOT NULL, variant TEXT NOT NULL, "
+                "alignment BLOB NOT NULL, last_access REAL NOT NULL, PRIMARY KEY (fingerprint, variant))")
+            connection.execute("CREATE INDEX IF NOT EXISTS alignments_last_access ON alignments (last_access)")
+            connection.commit()
+        finally:
+            connection.close()
+
+    def __connect(self):
+        return sqlite3.connect(self.path, timeout=self.timeout)
+
+    @staticmethod
+    def variant_key(activities):
+        """
+        Gets the key of a variant from its list of activities
+        """
+        return json.dumps(list(activities), ensure_ascii=False)
+
+    def get_many(self, fingerprint, variants):
+        """
+        Retrieves the alignments of the given variants
+
+        Parameters
+        -------------
+        fingerprint
+            Fingerprint of the accepting Petri net/alignment settings
+        variants
+            List of variants (each one is a list of activities)
+
+        Returns
+        -------------
+        alignments
+            List containing, for each variant, the cached alignment (or None, if the alignment is not cached)
+        """
+        keys = [AlignmentCache.variant_key(v) for v in variants]
+        found = {}
+        connection = self.__connect()
+        try:
+            # the SQLite default limit of variables per query is 999
+            for i in range(0, len(keys), 900):
+                batch = keys[i:i + 900]
+                cursor = connection.execute(
+                    "SELECT variant, alignment FROM alignments WHERE fingerprint = ? AND variant IN (" + ",".join(
+                        ["?"] * len(batch)) + ")", [fingerprint] + batch)
+                for variant, alignment in cursor.fetchall():
+                    found[variant] = alignment
+            if found:
+                now = time.time()
+                connection.executemany("UPDATE alignments SET last_access = ? WHERE fingerprint = ? AND variant = ?",
+                                       [(now, fingerprint, v) for v in found])
+                connection.commit()
+        finally:
+            connection.close()
+
+        ret = [pickle.loads(found[k]) if k in found else None for k in keys]
+        hits = sum(1 for x in ret if x is not None)
+        self.hits += hits
+        self.misses += len(ret) - hits
+        instrumentation.increment("alignments.cache_hits", hits)
+        instrumentation.increment("alignments.cache_misses", len(ret) - hits)
+        return ret
+
+    def put_many(self, fingerprint, variants, alignments):
+        """
+        Stores the alignments of the given variants (the alignments that are None, i.e., not computed
+        due to the time limits, are not stored), evicting the least recently used alignments if needed
+
+        Parameters
+        -------------
+        fingerprint
+            Fingerprint of the accepting Petri net/alignment settings
+        variants
+            List of variants (each one is a list of activities)
+        alignments
+            List of alignments (one per variant)
+        """
+        now = time.time()
+        rows = [(fingerprint, AlignmentCache.variant_key(v), pickle.dumps(a, protocol=pickle.HIGHEST_PROTOCOL), now)
+                for v, a in zip(variants, alignments) if a is not None]
+        if not rows:
+            return
+        connection = self.__connect()
+        try:
+            connection.executemany("INSERT OR REPLACE INTO alignments (fingerprint, variant, alignment, last_access) "
+                                   "VALUES (?, ?, ?, ?)", rows)
+            count = connection.execute("SELECT COUNT(*) FROM alignments").fetchone()[0]
+            if count > self.max_size:
+                connection.execute("DELETE FROM alignments WHERE rowid IN (SELECT rowid FROM alignments "
+                                   "ORDER BY last_access LIMIT ?)", (count - self.max_size,))
+            connection.commit()
+        finally:
+            connection.close()
+
+    def clear(self):
+        """
+        Removes all the alignments from the cache
+        """
+        connection = self.__connect()
+        try:
+            connection.execute("DELETE FROM alignments")
+            connection.commit()
+        finally:
+            connection.close()
+
+    def __len__(self):
+        connection = self.__connect()
+        try:
+            return connection.execute("SELECT COUNT(*) FROM alignments").fetchone()[0]
+        finally:
+            connection.close()
+
+    def get_statistics(self):
+        """
+        Gets the number of hits and misses of the cache (since the creation of the object)
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def log_statistics(self):
+        logging.info("alignment cache: " + str(self.hits) + " hits, " + str(self.misses) + " misses")
+
+
+def apply(path, max_size=1000000):
+    """
+    Opens (creating it if needed) a persistent alignment cache
+
+    Parameters
+    -------------
+    path
+        Path of the SQLite database
+    max_size
+        Maximum number of alignments stored in the cache
+
+    Returns
+    -------------
+    cache
+        Alignment cache
+    """
+    return AlignmentCache(path, max_size=max_size)
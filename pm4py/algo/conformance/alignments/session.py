@@ -0,0 +1,396 @@
+from enum import Enum
+
+import numpy as np
+
+from pm4py.objects.petri import align_utils
+from pm4py.objects.petri.petrinet import PetriNet, Marking
+from pm4py.objects.petri.semantics import enabled_transitions
+from pm4py.objects.petri.utils import add_arc_from_to
+from pm4py.util import exec_utils, instrumentation
+
+
+class Parameters(Enum):
+    PARAM_MODEL_COST_FUNCTION = 'model_cost_function'
+    PARAM_SYNC_COST_FUNCTION = 'sync_cost_function'
+
+
+class SyncProductIncidenceMatrix(object):
+    """
+    Incidence matrix of a synchronous product net constructed by an alignment session.
+
+    The places/transitions of the model part come first (with the indices assigned once by the session),
+    followed by the places/transitions of the trace part. The object exposes the same interface as the
+    incidence matrix (places, transitions, a_matrix, sparse_a_matrix, encode_marking), along with the
+    places/transitions of the trace part.
+    """
+
+    def __init__(self, place_indices, transition_indices, rows, cols, values, trace_places, trace_transitions):
+        self.__place_indices = place_indices
+        self.__transition_indices = transition_indices
+        self.__rows = rows
+        self.__cols = cols
+        self.__values = values
+        self.__sparse_A = None
+        self.__trace_places = trace_places
+        self.__trace_transitions = trace_transitions
+
+    def encode_marking(self, marking):
+        x = [0 for i in range(len(self.places))]
+        for p in marking:
+            x[self.places[p]] = marking[p]
+        return x
+
+    def __get_a_matrix(self):
+        return self.sparse_a_matrix.toarray().astype(int).tolist()
+
+    def __get_sparse_a_matrix(self):
+        if self.__sparse_A is None:
+            from scipy.sparse import coo_matrix
+            self.__sparse_A = coo_matrix((self.__values, (self.__rows, self.__cols)),
+                                         shape=(len(self.__place_indices), len(self.__transition_indices)),
+                                         dtype=float).tocsr()
+        return self.__sparse_A
+
+    def __get_transition_indices(self):
+        return self.__transition_indices
+
+    def __get_place_indices(self):
+        return self.__place_indices
+
+    def __get_trace_places(self):
+        return self.__trace_places
+
+    def __get_trace_transitions(self):
+        return self.__trace_transitions
+
+    a_matrix = property(__get_a_matrix)
+    sparse_a_matrix = property(__get_sparse_a_matrix)
+    places = property(__get_place_indices)
+    transitions = property(__get_transition_indices)
+    # places/transitions (log moves and sync moves) added for the trace
+    trace_places = property(__get_trace_places)
+    trace_transitions = property(__get_trace_transitions)
+
+
+class AlignmentSession(object):
+    """
+    Model half of the synchronous product net, shared by the alignments of several traces
+    against the same accepting Petri net (and cost functions).
+
+    The places/transitions of the model moves, their pre/post sets, the incidence columns of the
+    model moves and their costs are computed once. For each trace, construct splices in only the
+    trace part (the places, the log moves and the sync moves), hence the cost of building the synchronous
+    product net depends on the length of the trace and not on the size of the model.
+
+    The places of the model part are shared by the synchronous product nets: a synchronous product net
+    is valid until the following call of construct (and the session should not be used by several threads).
+    """
+
+    def __init__(self, net, im, fm, model_cost_function=None, sync_cost_function=None, skip=align_utils.SKIP):
+        """
+        Builds the model part of the synchronous product net
+
+        Parameters
+        -------------
+        net
+            Petri net
+        im
+            Initial marking
+        fm
+            Final marking
+        model_cost_function
+            Costs of the model moves (if not provided: the standard costs, i.e., 1 for the invisible transitions
+            and STD_MODEL_LOG_MOVE_COST for the visible ones)
+        sync_cost_function
+            Costs of the sync moves, associated to the transitions of the model (if not provided: STD_SYNC_COST)
+        skip
+            Symbol to be used as skip
+        """
+        if model_cost_function is None:
+            model_cost_function = {t: align_utils.STD_MODEL_LOG_MOVE_COST if t.label is not None else
+                                   align_utils.STD_TAU_COST for t in net.transitions}
+        if sync_cost_function is None:
+            sync_cost_function = {t: align_utils.STD_SYNC_COST for t in net.transitions if t.label is not None}
+
+        self.net = net
+        self.initial_marking = im
+        self.final_marking = fm
+        self.model_cost_function = model_cost_function
+        self.sync_cost_function = sync_cost_function
+        self.skip = skip
+
+        with instrumentation.phase("alignments.session"):
+            self.__model_net = PetriNet()
+            self.__t_map = {}
+            self.__p_map = {}
+            for t in net.transitions:
+                self.__t_map[t] = PetriNet.Transition((skip, t.name), (skip, t.label))
+                self.__model_net.transitions.add(self.__t_map[t])
+            for p in net.places:
+                self.__p_map[p] = PetriNet.Place((skip, p.name))
+                self.__model_net.places.add(self.__p_map[p])
+            for t in net.transitions:
+                for a in t.in_arcs:
+                    add_arc_from_to(self.__p_map[a.source], self.__t_map[t], self.__model_net)
+                for a in t.out_arcs:
+                    add_arc_from_to(self.__t_map[t], self.__p_map[a.target], self.__model_net)
+
+            for sync_t in self.__model_net.transitions:
+                sync_t.sub_marking, sync_t.add_marking = _get_sub_add_markings(sync_t)
+            for p in self.__model_net.places:
+                p.ass_trans = set()
+            for sync_t in self.__model_net.transitions:
+                for p in sync_t.sub_marking:
+                    p.ass_trans.add(sync_t)
+
+            self.__place_indices = {self.__p_map[p]: i for i, p in enumerate(net.places)}
+            self.__transition_indices = {self.__t_map[t]: i for i, t in enumerate(net.transitions)}
+            entries = [(self.__place_indices[p], self.__transition_indices[a.source], 1) for p in
+                       self.__model_net.places for a in p.in_arcs] + [
+                          (self.__place_indices[p], self.__transition_indices[a.target], -1) for p in
+                          self.__model_net.places for a in p.out_arcs]
+            rows, cols, values = zip(*entries) if entries else ((), (), ())
+            self.__rows = np.array(rows, dtype=np.int64)
+            self.__cols = np.array(cols, dtype=np.int64)
+            self.__values = np.array(values, dtype=float)
+
+            self.__costs = {self.__t_map[t]: model_cost_function[t] for t in net.transitions}
+            self.__label_transitions = {}
+            for t in net.transitions:
+                if t.label not in self.__label_transitions:
+                    self.__label_transitions[t.label] = []
+                self.__label_transitions[t.label].append(t)
+            self.__im = Marking({self.__p_map[p]: im[p] for p in im})
+            self.__fm = Marking({self.__p_map[p]: fm[p] for p in fm})
+
+        # arcs/ass_trans entries added to the places of the model part by the last synchronous product net
+        self.__spliced_arcs = []
+        self.__spliced_ass_trans = []
+        self.__invisible_enabling_labels = None
+        self.__structures = {}
+
+    def __get_place_map(self):
+        return self.__p_map
+
+    def __get_transition_map(self):
+        return self.__t_map
+
+    # correspondence between the places/transitions of the model and the ones of the model part
+    place_map = property(__get_place_map)
+    transition_map = property(__get_transition_map)
+
+    def __release(self):
+        """
+        Detaches the trace part of the last synchronous product net from the places of the model part
+        """
+        for a in self.__spliced_arcs:
+            a.source.out_arcs.discard(a)
+            a.target.in_arcs.discard(a)
+        for p, t in self.__spliced_ass_trans:
+            p.ass_trans.discard(t)
+        self.__spliced_arcs = []
+        self.__spliced_ass_trans = []
+
+    def construct(self, trace_net, trace_im, trace_fm, trace_net_costs=None, model_cost_overrides=None):
+        """
+        Constructs the synchronous product net of a trace net and the model, splicing the trace part
+        into the model part
+
+        Parameters
+        -------------
+        trace_net
+            Trace net
+        trace_im
+            Initial marking of the trace net
+        trace_fm
+            Final marking of the trace net
+        trace_net_costs
+            (if provided) costs of the log moves, associated to the transitions of the trace net
+            (default: STD_MODEL_LOG_MOVE_COST)
+        model_cost_overrides
+            (if provided) costs of some model moves (associated to the transitions of the model)
+            replacing the ones of the session, for this trace only
+
+        Returns
+        -------------
+        sync_net
+            Synchronous product net (decorated with the pre/post sets of the transitions)
+        sync_im
+            Initial marking of the synchronous product net
+        sync_fm
+            Final marking of the synchronous product net
+        cost_function
+            Cost function
+        incidence_matrix
+            Incidence matrix of the synchronous product net
+        """
+        skip = self.skip
+        with instrumentation.phase("alignments.sync_product"):
+            self.__release()
+
+            sync_net = PetriNet('synchronous_product_net of %s and %s' % (trace_net.name, self.net.name))
+            sync_net.places.update(self.__model_net.places)
+            sync_net.transitions.update(self.__model_net.transitions)
+            sync_net.arcs.update(self.__model_net.arcs)
+            cost_function = dict(self.__costs)
+            if model_cost_overrides is not None:
+                for t, c in model_cost_overrides.items():
+                    cost_function[self.__t_map[t]] = c
+            place_indices = dict(self.__place_indices)
+            transition_indices = dict(self.__transition_indices)
+            rows, cols, values = [], [], []
+
+            p1_map = {}
+            for p in trace_net.places:
+                p1_map[p] = PetriNet.Place((p.name, skip))
+                p1_map[p].ass_trans = set()
+                sync_net.places.add(p1_map[p])
+                place_indices[p1_map[p]] = len(place_indices)
+
+            trace_transitions = []
+            for t1 in trace_net.transitions:
+                log_move = PetriNet.Transition((t1.name, skip), (t1.label, skip))
+                cost_function[log_move] = trace_net_costs[
+                    t1] if trace_net_costs is not None else align_utils.STD_MODEL_LOG_MOVE_COST
+                trace_transitions.append(log_move)
+                for a in t1.in_arcs:
+                    add_arc_from_to(p1_map[a.source], log_move, sync_net)
+                for a in t1.out_arcs:
+                    add_arc_from_to(log_move, p1_map[a.target], sync_net)
+                for t2 in self.__label_transitions.get(t1.label, ()):
+                    sync = PetriNet.Transition((t1.name, t2.name), (t1.label, t2.label))
+                    cost_function[sync] = self.sync_cost_function[t2]
+                    trace_transitions.append(sync)
+                    for a in t1.in_arcs:
+                        add_arc_from_to(p1_map[a.source], sync, sync_net)
+                    for a in t2.in_arcs:
+                        self.__spliced_arcs.append(add_arc_from_to(self.__p_map[a.source], sync, sync_net))
+                    for a in t1.out_arcs:
+                        add_arc_from_to(sync, p1_map[a.target], sync_net)
+                    for a in t2.out_arcs:
+                        self.__spliced_arcs.append(add_arc_from_to(sync, self.__p_map[a.target], sync_net))
+
+            for sync_t in trace_transitions:
+                sync_net.transitions.add(sync_t)
+                transition_indices[sync_t] = len(transition_indices)
+                sync_t.sub_marking, sync_t.add_marking = _get_sub_add_markings(sync_t)
+                for p in sync_t.sub_marking:
+                    p.ass_trans.add(sync_t)
+                    if p in self.__place_indices:
+                        self.__spliced_ass_trans.append((p, sync_t))
+                for a in sync_t.in_arcs:
+                    rows.append(place_indices[a.source])
+                    cols.append(transition_indices[sync_t])
+                    values.append(-1)
+                for a in sync_t.out_arcs:
+                    rows.append(place_indices[a.target])
+                    cols.append(transition_indices[sync_t])
+                    values.append(1)
+
+            sync_im = Marking(self.__im)
+            sync_fm = Marking(self.__fm)
+            for p in trace_im:
+                sync_im[p1_map[p]] = trace_im[p]
+            for p in trace_fm:
+                sync_fm[p1_map[p]] = trace_fm[p]
+
+            incidence_matrix = SyncProductIncidenceMatrix(place_indices, transition_indices,
+                                                          np.concatenate((self.__rows, rows)).astype(np.int64),
+                                                          np.concatenate((self.__cols, cols)).astype(np.int64),
+                                                          np.concatenate((self.__values, values)),
+                                                          list(p1_map.values()), trace_transitions)
+
+            return sync_net, sync_im, sync_fm, cost_function, incidence_matrix
+
+    def get_invisible_enabling_labels(self):
+        """
+        Gets, for each invisible transition of the model, the labels of the visible transitions
+        that are enabled in the marking containing only the preset of the invisible transition
+
+        Returns
+        -------------
+        invisible_enabling_labels
+            Dictionary associating to each invisible transition a frozenset of labels
+        """
+        if self.__invisible_enabling_labels is None:
+            self.__invisible_enabling_labels = {}
+            for t in self.net.transitions:
+                if t.label is None:
+                    preset_t = Marking()
+                    for a in t.in_arcs:
+                        preset_t[a.source] = a.weight
+                    self.__invisible_enabling_labels[t] = frozenset(
+                        x.label for x in enabled_transitions(self.net, preset_t) if x.label is not None)
+        return self.__invisible_enabling_labels
+
+    def get_structure(self, key, builder):
+        """
+        Gets a (model-side) structure of an alignment variant, building it at the first request
+
+        Parameters
+        -------------
+        key
+            Key identifying the structure
+        builder
+            Function (without arguments) building the structure
+
+        Returns
+        -------------
+        structure
+            Structure
+        """
+        if key not in self.__structures:
+            self.__structures[key] = builder()
+        return self.__structures[key]
+
+
+def _get_sub_add_markings(trans):
+    """
+    Gets the sub marking and the add marking of a transition (as in decorate_transitions_prepostset)
+    """
+    sub_marking = Marking()
+    add_marking = Marking()
+    for arc in trans.in_arcs:
+        sub_marking[arc.source] = arc.weight
+        add_marking[arc.source] = -arc.weight
+    for arc in trans.out_arcs:
+        if arc.target in add_marking:
+            add_marking[arc.target] = arc.weight + add_marking[arc.target]
+        else:
+            add_marking[arc.target] = arc.weight
+    return sub_marking, add_marking
+
+
+def apply(net, im, fm, parameters=None):
+    """
+    Creates an alignment session, sharing the model part of the synchronous product net between
+    the alignments of several traces against the given accepting Petri net
+
+    Parameters
+    -------------
+    net
+        Petri net
+    im
+        Initial marking
+    fm
+        Final marking
+    parameters
+        Parameters of the alignments, including:
+            Parameters.PARAM_MODEL_COST_FUNCTION -> costs of the model moves
+            Parameters.PARAM_SYNC_COST_FUNCTION -> costs of the sync moves (if not provided: STD_SYNC_COST, as in
+            the variants that build the synchronous product net; the std_sync_cost parameter of the less-memory
+            variants is read by the variants themselves)
+
+    Returns
+    -------------
+    session
+        Alignment session
+    """
+    if parameters is None:
+        parameters = {}
+
+    model_cost_function = exec_utils.get_param_value(Parameters.PARAM_MODEL_COST_FUNCTION, parameters, None)
+    sync_cost_function = exec_utils.get_param_value(Parameters.PARAM_SYNC_COST_FUNCTION, parameters, None)
+
+    return AlignmentSession(net, im, fm, model_cost_function=model_cost_function,
+                            sync_cost_function=sync_cost_function)
@@ -8,6 +8,7 @@ from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 from pm4py.util import exec_utils
 from pm4py.objects.petri.petrinet import Marking
 from pm4py.objects.petri.semantics import enabled_transitions
+from pm4py.algo.conformance.alignments import session as alignments_session
 from enum import Enum
 from copy import copy
 import heapq
@@ -22,6 +23,7 @@ class Parameters(Enum):
     PARAMETER_VARIANT_DELIMITER = "variant_delimiter"
     PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE = 'ret_tuple_as_trans_desc'
     ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
+    ALIGNMENT_SESSION = "alignment_session"
 
 
 PLACES_DICT = "places_dict"
@@ -36,6 +38,10 @@ TRANSF_MODEL_COST_FUNCTION = "transf_model_cost_function"
 TRANSF_TRACE = "transf_trace"
 TRACE_COST_FUNCTION = "trace_cost_function"
 INV_TRACE_LABELS_DICT = "inv_trace_labels_dict"
+# keys of the structures stored in the alignment session
+MODEL_STRUCT = "mem_efficient_model_struct"
+MODEL_TRANS_DICT = "mem_efficient_model_trans_dict"
+MODEL_COST_STRUCT = "mem_efficient_model_cost_struct"
 
 IS_SYNC_MOVE = 0
 IS_LOG_MOVE = 1
@@ -121,6 +127,11 @@ def apply_from_variants_list(var_list, petri_net, initial_marking, final_marking
                                                 sys.maxsize)
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
+    if exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None) is None:
+        # the model structure is built once for all the variants
+        parameters = copy(parameters)
+        parameters[Parameters.ALIGNMENT_SESSION] = alignments_session.apply(petri_net, initial_marking, final_marking,
+                                                                             parameters=parameters)
     dictio_alignments = {}
     for varitem in var_list:
         this_max_align_time = min(max_align_time_trace, (max_align_time - (time.time() - start_time)) * 0.5)
@@ -181,7 +192,8 @@ def __transform_model_to_mem_efficient_structure(net, im, fm, trace, parameters=
     trace
         Trace
     parameters
-        Parameters
+        Parameters (if Parameters.ALIGNMENT_SESSION is provided, the parts of the structure that
+        do not depend on the trace are built once for the session)
 
     Returns
     --------------
@@ -204,6 +216,27 @@ def __transform_model_to_mem_efficient_structure(net, im, fm, trace, parameters=
     labels = sorted(list(set(x[activity_key] for x in trace)))
 
     model_cost_function = exec_utils.get_param_value(Parameters.PARAM_MODEL_COST_FUNCTION, parameters, None)
+    session = exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None)
+
+    if session is not None:
+        if session.net is not net:
+            raise Exception("the alignment session has been created for a different Petri net!")
+        model_struct = copy(session.get_structure(MODEL_STRUCT, lambda: __build_model_structure(net, im, fm)))
+        trans_dict = session.get_structure(MODEL_TRANS_DICT,
+                                           lambda: {y: x for x, y in model_struct[INV_TRANS_DICT].items()})
+        if model_cost_function is None or model_cost_function is session.model_cost_function:
+            transf_model_cost_function = session.get_structure(MODEL_COST_STRUCT, lambda: {
+                trans_dict[t]: session.model_cost_function[t] for t in net.transitions})
+        else:
+            transf_model_cost_function = {trans_dict[t]: model_cost_function[t] for t in net.transitions}
+        if model_cost_function is None:
+            # the session has the standard costs: see the optimization 12/08/2020 below
+            transf_model_cost_function = copy(transf_model_cost_function)
+            for t, enabling_labels in session.get_invisible_enabling_labels().items():
+                if enabling_labels.isdisjoint(labels):
+                    transf_model_cost_function[trans_dict[t]] = 0
+        model_struct[TRANSF_MODEL_COST_FUNCTION] = transf_model_cost_function
+        return model_struct
 
     if model_cost_function is None:
         model_cost_function = {}
@@ -230,6 +263,18 @@ def __transform_model_to_mem_efficient_structure(net, im, fm, trace, parameters=
                 else:
                     model_cost_function[t] = align_utils.STD_TAU_COST
 
+    model_struct = __build_model_structure(net, im, fm)
+    trans_dict = {y: x for x, y in model_struct[INV_TRANS_DICT].items()}
+    model_struct[TRANSF_MODEL_COST_FUNCTION] = {trans_dict[t]: model_cost_function[t] for t in net.transitions}
+
+    return model_struct
+
+
+def __build_model_structure(net, im, fm):
+    """
+    Builds the parts of the memory efficient structure of the model that do not depend on the trace
+    (all the entries but TRANSF_MODEL_COST_FUNCTION)
+    """
     places_dict = {place: index for index, place in enumerate(net.places)}
     trans_dict = {trans: index for index, trans in enumerate(net.transitions)}
 
@@ -248,14 +293,12 @@ def __transform_model_to_mem_efficient_structure(net, im, fm, trace, parameters=
     transf_im = {places_dict[p]: im[p] for p in im}
     transf_fm = {places_dict[p]: fm[p] for p in fm}
 
-    transf_model_cost_function = {trans_dict[t]: model_cost_function[t] for t in net.transitions}
-
     inv_trans_dict = {y: x for x, y in trans_dict.items()}
 
     return {PLACES_DICT: places_dict, INV_TRANS_DICT: inv_trans_dict, LABELS_DICT: labels_dict,
             TRANS_LABELS_DICT: trans_labels_dict, TRANS_PRE_DICT: trans_pre_dict,
             TRANS_POST_DICT: trans_post_dict,
-            TRANSF_IM: transf_im, TRANSF_FM: transf_fm, TRANSF_MODEL_COST_FUNCTION: transf_model_cost_function}
+            TRANSF_IM: transf_im, TRANSF_FM: transf_fm}
 
 
 def __transform_trace_to_mem_efficient_structure(trace, model_struct, parameters=None):
@@ -318,6 +361,8 @@ def apply(trace, net, im, fm, parameters=None):
         Parameters.PARAM_MODEL_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
         model cost
         Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
+        Parameters.ALIGNMENT_SESSION: :class:`pm4py.algo.conformance.alignments.session.AlignmentSession` (parameter)
+        session (created for the same Petri net and cost functions) keeping the structures of the model
 
     Returns
     -------
@@ -587,6 +632,7 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
 
     while not len(open_set) == 0:
         if (time.time() - start_time) > max_align_time_trace:
+            align_utils.__record_search_statistics(visited, len(open_set) + visited, dummy_count, aligned=False)
             return None
         curr = heapq.heappop(open_set)
         curr_m0 = curr[POSITION_MARKING]
@@ -602,6 +648,7 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
             if -curr[POSITION_INDEX] == len(transf_trace):
                 # returns the alignment only if the final marking has been reached AND
                 # the trace is over
+                align_utils.__record_search_statistics(visited, len(open_set) + visited, dummy_count)
                 return __reconstruct_alignment(curr, model_struct, trace_struct, visited, len(open_set), len(closed),
                                                len(marking_dict),
                                                ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
@@ -663,6 +710,10 @@ def __dijkstra(model_struct, trace_struct, sync_cost=align_utils.STD_SYNC_COST,
                 # adds the log_skeleton move only if it has not been already closed before
                 open_set = __add_to_open_set(open_set, new_state)
 
+    # the final marking is not reachable
+    align_utils.__record_search_statistics(visited, len(open_set) + visited, dummy_count, aligned=False)
+    return None
+
 
 def __reconstruct_alignment(curr, model_struct, trace_struct, visited, open_set_length, closed_set_length,
                             num_visited_markings, ret_tuple_as_trans_desc=False):
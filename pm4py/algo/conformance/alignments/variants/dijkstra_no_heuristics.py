@@ -8,6 +8,7 @@ from pm4py.objects.petri.synchronous_product import construct_cost_aware, constr
 from pm4py.objects.petri.utils import construct_trace_net_cost_aware, decorate_places_preset_trans, \
     decorate_transitions_prepostset
 from pm4py.objects.petri import align_utils as utils
+from pm4py.algo.conformance.alignments import session as alignments_session
 from pm4py.util import exec_utils
 from copy import copy
 from enum import Enum
@@ -28,6 +29,7 @@ class Parameters(Enum):
     PARAMETER_VARIANT_DELIMITER = "variant_delimiter"
     ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
     VARIANTS_IDX = "variants_idx"
+    ALIGNMENT_SESSION = "alignment_session"
 
 
 def get_best_worst_cost(petri_net, initial_marking, final_marking, parameters=None):
@@ -77,6 +79,9 @@ def apply(trace, petri_net, initial_marking, final_marking, parameters=None):
         Parameters.PARAM_SYNC_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
         synchronous costs
         Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
+        Parameters.ALIGNMENT_SESSION: :class:`pm4py.algo.conformance.alignments.session.AlignmentSession` (parameter)
+        session (created for the same Petri net and cost functions) providing the model part of the synchronous
+        product net
 
     Returns
     -------
@@ -93,13 +98,14 @@ def apply(trace, petri_net, initial_marking, final_marking, parameters=None):
                                                            None)
     trace_net_cost_aware_constr_function = exec_utils.get_param_value(Parameters.TRACE_NET_COST_AWARE_CONSTR_FUNCTION,
                                                                       parameters, construct_trace_net_cost_aware)
+    session = exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None)
 
     if trace_cost_function is None:
         trace_cost_function = list(
             map(lambda e: utils.STD_MODEL_LOG_MOVE_COST, trace))
         parameters[Parameters.PARAM_TRACE_COST_FUNCTION] = trace_cost_function
 
-    if model_cost_function is None:
+    if model_cost_function is None and session is None:
         # reset variables value
         model_cost_function = dict()
         sync_cost_function = dict()
@@ -199,6 +205,11 @@ def apply_from_variants_list(var_list, petri_net, initial_marking, final_marking
                                                 sys.maxsize)
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
+    if exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None) is None:
+        # the model part of the synchronous product net is built once for all the variants
+        parameters = copy(parameters)
+        parameters[Parameters.ALIGNMENT_SESSION] = alignments_session.apply(petri_net, initial_marking, final_marking,
+                                                                             parameters=parameters)
     dictio_alignments = {}
     for varitem in var_list:
         this_max_align_time = min(max_align_time_trace, (max_align_time - (time.time() - start_time)) * 0.5)
@@ -248,6 +259,10 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
             synchronous costs
             Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
             Parameters.PARAM_TRACE_NET_COSTS: :class:`dict` (parameter) mapping between transitions and costs
+            Parameters.ALIGNMENT_SESSION: :class:`pm4py.algo.conformance.alignments.session.AlignmentSession` (parameter)
+            session providing the model part of the synchronous product net (the cost functions of the session are
+            used). The session is not used when a model cost function is provided without a sync cost function:
+            as without a session, the standard cost function is used in that case
 
         Returns
         -------
@@ -263,8 +278,19 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
     model_cost_function = exec_utils.get_param_value(Parameters.PARAM_MODEL_COST_FUNCTION, parameters, None)
     sync_cost_function = exec_utils.get_param_value(Parameters.PARAM_SYNC_COST_FUNCTION, parameters, None)
     trace_net_costs = exec_utils.get_param_value(Parameters.PARAM_TRACE_NET_COSTS, parameters, None)
-
-    if trace_cost_function is None or model_cost_function is None or sync_cost_function is None:
+    session = exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None)
+    if model_cost_function is not None and sync_cost_function is None:
+        # the cost functions are incomplete: the standard cost function is used (as without a session)
+        session = None
+    decorated = False
+
+    if session is not None:
+        if session.net is not petri_net:
+            raise Exception("the alignment session has been created for a different Petri net!")
+        sync_prod, sync_initial_marking, sync_final_marking, cost_function, incidence_matrix = session.construct(
+            trace_net, trace_im, trace_fm, trace_net_costs=trace_net_costs)
+        decorated = True
+    elif trace_cost_function is None or model_cost_function is None or sync_cost_function is None:
         sync_prod, sync_initial_marking, sync_final_marking = construct(trace_net, trace_im,
                                                                                                   trace_fm, petri_net,
                                                                                                   initial_marking,
@@ -287,21 +313,24 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
 
     return apply_sync_prod(sync_prod, sync_initial_marking, sync_final_marking, cost_function,
                            utils.SKIP, ret_tuple_as_trans_desc=ret_tuple_as_trans_desc,
-                           max_align_time_trace=max_align_time_trace)
+                           max_align_time_trace=max_align_time_trace, decorated=decorated)
 
 
 def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, skip, ret_tuple_as_trans_desc=False,
-                    max_align_time_trace=sys.maxsize):
+                    max_align_time_trace=sys.maxsize, decorated=False):
     return __search(sync_prod, initial_marking, final_marking, cost_function, skip,
-                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace)
+                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace,
+                    decorated=decorated)
 
 
 def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=False,
-             max_align_time_trace=sys.maxsize):
+             max_align_time_trace=sys.maxsize, decorated=False):
     start_time = time.time()
 
-    decorate_transitions_prepostset(sync_net)
-    decorate_places_preset_trans(sync_net)
+    if not decorated:
+        # the synchronous product nets constructed by an alignment session are already decorated
+        decorate_transitions_prepostset(sync_net)
+        decorate_places_preset_trans(sync_net)
 
     closed = set()
 
@@ -316,6 +345,7 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
 
     while not len(open_set) == 0:
         if (time.time() - start_time) > max_align_time_trace:
+            utils.__record_search_statistics(visited, queued, traversed, aligned=False)
             return None
 
         curr = heapq.heappop(open_set)
@@ -329,6 +359,7 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
             # from pympler.asizeof import asizeof
             # from pm4py.util import measurements
             # measurements.Measurements.ALIGN_TIME.append(asizeof(open_set))
+            utils.__record_search_statistics(visited, queued, traversed)
             return utils.__reconstruct_alignment(curr, visited, queued, traversed,
                                                  ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
 
@@ -357,3 +388,7 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
             tp = utils.DijkstraSearchTuple(curr.g + cost, new_marking, curr, t, curr.l + 1)
 
             heapq.heappush(open_set, tp)
+
+    # the final marking is not reachable
+    utils.__record_search_statistics(visited, queued, traversed, aligned=False)
+    return None
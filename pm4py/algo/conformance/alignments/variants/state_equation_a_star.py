@@ -17,6 +17,7 @@ from copy import copy
 import time
 
 import numpy as np
+from scipy import sparse
 
 from pm4py import util as pm4pyutil
 from pm4py.objects.log import log as log_implementation
@@ -27,6 +28,8 @@ from pm4py.objects.petri.utils import construct_trace_net_cost_aware, decorate_p
 from pm4py.util.lp import solver as lp_solver
 from pm4py.objects.petri import align_utils as utils
 from pm4py.objects.petri.incidence_matrix import construct as inc_mat_construct
+from pm4py.objects.petri import compiled_net
+from pm4py.algo.conformance.alignments import session as alignments_session
 from pm4py.util import exec_utils
 from enum import Enum
 import sys
@@ -46,6 +49,9 @@ class Parameters(Enum):
     PARAMETER_VARIANT_DELIMITER = "variant_delimiter"
     ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
     VARIANTS_IDX = "variants_idx"
+    USE_COMPILED_NET = "use_compiled_net"
+    LP_SOLVER_VARIANT = "lp_solver_variant"
+    ALIGNMENT_SESSION = "alignment_session"
 
 
 PARAM_TRACE_COST_FUNCTION = Parameters.PARAM_TRACE_COST_FUNCTION.value
@@ -100,6 +106,11 @@ def apply(trace, petri_net, initial_marking, final_marking, parameters=None):
         Parameters.PARAM_SYNC_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
         synchronous costs
         Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
+        Parameters.USE_COMPILED_NET: :class:`bool` (parameter) performs the search on the compiled (integer-indexed)
+        representation of the synchronous product net
+        Parameters.ALIGNMENT_SESSION: :class:`pm4py.algo.conformance.alignments.session.AlignmentSession` (parameter)
+        session (created for the same Petri net and cost functions) providing the model part of the synchronous
+        product net
 
     Returns
     -------
@@ -116,13 +127,14 @@ def apply(trace, petri_net, initial_marking, final_marking, parameters=None):
                                                            None)
     trace_net_cost_aware_constr_function = exec_utils.get_param_value(Parameters.TRACE_NET_COST_AWARE_CONSTR_FUNCTION,
                                                                       parameters, construct_trace_net_cost_aware)
+    session = exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None)
 
     if trace_cost_function is None:
         trace_cost_function = list(
             map(lambda e: utils.STD_MODEL_LOG_MOVE_COST, trace))
         parameters[Parameters.PARAM_TRACE_COST_FUNCTION] = trace_cost_function
 
-    if model_cost_function is None:
+    if model_cost_function is None and session is None:
         # reset variables value
         model_cost_function = dict()
         sync_cost_function = dict()
@@ -243,6 +255,11 @@ def apply_from_variants_list(var_list, petri_net, initial_marking, final_marking
                                                 sys.maxsize)
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
+    if exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None) is None:
+        # the model part of the synchronous product net is built once for all the variants
+        parameters = copy(parameters)
+        parameters[Parameters.ALIGNMENT_SESSION] = alignments_session.apply(petri_net, initial_marking, final_marking,
+                                                                             parameters=parameters)
     dictio_alignments = {}
     for varitem in var_list:
         this_max_align_time = min(max_align_time_trace, (max_align_time - (time.time() - start_time)) * 0.5)
@@ -324,6 +341,10 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
             synchronous costs
             Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
             Parameters.PARAM_TRACE_NET_COSTS: :class:`dict` (parameter) mapping between transitions and costs
+            Parameters.ALIGNMENT_SESSION: :class:`pm4py.algo.conformance.alignments.session.AlignmentSession` (parameter)
+            session providing the model part of the synchronous product net (the cost functions of the session are
+            used). The session is not used when a model cost function is provided without a sync cost function:
+            as without a session, the standard cost function is used in that case
 
         Returns
         -------
@@ -339,8 +360,18 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
     model_cost_function = exec_utils.get_param_value(Parameters.PARAM_MODEL_COST_FUNCTION, parameters, None)
     sync_cost_function = exec_utils.get_param_value(Parameters.PARAM_SYNC_COST_FUNCTION, parameters, None)
     trace_net_costs = exec_utils.get_param_value(Parameters.PARAM_TRACE_NET_COSTS, parameters, None)
-
-    if trace_cost_function is None or model_cost_function is None or sync_cost_function is None:
+    session = exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None)
+    if model_cost_function is not None and sync_cost_function is None:
+        # the cost functions are incomplete: the standard cost function is used (as without a session)
+        session = None
+    incidence_matrix = None
+
+    if session is not None:
+        if session.net is not petri_net:
+            raise Exception("the alignment session has been created for a different Petri net!")
+        sync_prod, sync_initial_marking, sync_final_marking, cost_function, incidence_matrix = session.construct(
+            trace_net, trace_im, trace_fm, trace_net_costs=trace_net_costs)
+    elif trace_cost_function is None or model_cost_function is None or sync_cost_function is None:
         sync_prod, sync_initial_marking, sync_final_marking = construct(trace_net, trace_im,
                                                                                                   trace_fm, petri_net,
                                                                                                   initial_marking,
@@ -360,14 +391,19 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
 
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
+    use_compiled_net = exec_utils.get_param_value(Parameters.USE_COMPILED_NET, parameters, False)
+    lp_solver_variant = exec_utils.get_param_value(Parameters.LP_SOLVER_VARIANT, parameters,
+                                                   lp_solver.DEFAULT_LP_SOLVER_VARIANT)
 
     return apply_sync_prod(sync_prod, sync_initial_marking, sync_final_marking, cost_function,
                            utils.SKIP, ret_tuple_as_trans_desc=ret_tuple_as_trans_desc,
-                           max_align_time_trace=max_align_time_trace)
+                           max_align_time_trace=max_align_time_trace, use_compiled_net=use_compiled_net,
+                           lp_solver_variant=lp_solver_variant, incidence_matrix=incidence_matrix)
 
 
 def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, skip, ret_tuple_as_trans_desc=False,
-                    max_align_time_trace=sys.maxsize):
+                    max_align_time_trace=sys.maxsize, use_compiled_net=False,
+                    lp_solver_variant=lp_solver.DEFAULT_LP_SOLVER_VARIANT, incidence_matrix=None):
     """
     Performs the basic alignment search on top of the synchronous product net, given a cost function and skip-symbol
 
@@ -378,50 +414,64 @@ def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, sk
     final_marking: :class:`pm4py.objects.petri.net.Marking` final marking in the synchronous product net
     cost_function: :class:`dict` cost function mapping transitions to the synchronous product net
     skip: :class:`Any` symbol to use for skips in the alignment
+    use_compiled_net: :class:`bool` performs the search on the compiled representation of the synchronous product net
+    lp_solver_variant: :class:`str` variant of the LP solver used to compute the heuristic (the variants supporting
+    persistent models, e.g. highs, build the LP model once for the synchronous product net)
+    incidence_matrix: incidence matrix of the synchronous product net (if provided, the synchronous product net is
+    assumed to be already decorated, as the ones constructed by an alignment session)
 
     Returns
     -------
     dictionary : :class:`dict` with keys **alignment**, **cost**, **visited_states**, **queued_states**
     and **traversed_arcs**
     """
+    if use_compiled_net:
+        return __search_compiled(sync_prod, initial_marking, final_marking, cost_function, skip,
+                                 ret_tuple_as_trans_desc=ret_tuple_as_trans_desc,
+                                 max_align_time_trace=max_align_time_trace, lp_solver_variant=lp_solver_variant)
     return __search(sync_prod, initial_marking, final_marking, cost_function, skip,
-                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace)
+                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace,
+                    lp_solver_variant=lp_solver_variant, incidence_matrix=incidence_matrix)
 
 
 def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=False,
-             max_align_time_trace=sys.maxsize):
+             max_align_time_trace=sys.maxsize, lp_solver_variant=lp_solver.DEFAULT_LP_SOLVER_VARIANT,
+             incidence_matrix=None):
     start_time = time.time()
 
-    decorate_transitions_prepostset(sync_net)
-    decorate_places_preset_trans(sync_net)
+    if incidence_matrix is None:
+        decorate_transitions_prepostset(sync_net)
+        decorate_places_preset_trans(sync_net)
 
-    incidence_matrix = inc_mat_construct(sync_net)
+        incidence_matrix = inc_mat_construct(sync_net)
     ini_vec, fin_vec, cost_vec = utils.__vectorize_initial_final_cost(incidence_matrix, ini, fin, cost_function)
 
     closed = set()
 
-    a_matrix = np.asmatrix(incidence_matrix.a_matrix).astype(np.float64)
-    g_matrix = -np.eye(len(sync_net.transitions))
+    a_matrix = incidence_matrix.sparse_a_matrix
+    g_matrix = -sparse.identity(len(sync_net.transitions), format="csr")
     h_cvx = np.matrix(np.zeros(len(sync_net.transitions))).transpose()
     cost_vec = [x * 1.0 for x in cost_vec]
 
     use_cvxopt = False
-    if lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN or lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN_ILP:
+    if lp_solver_variant == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN or lp_solver_variant == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN_ILP:
         use_cvxopt = True
 
     if use_cvxopt:
         # not available in the latest version of PM4Py
         from cvxopt import matrix
 
-        a_matrix = matrix(a_matrix)
-        g_matrix = matrix(g_matrix)
+        a_matrix = matrix(a_matrix.toarray())
+        g_matrix = matrix(g_matrix.toarray())
         h_cvx = matrix(h_cvx)
         cost_vec = matrix(cost_vec)
 
+    lp_model = utils.__get_heuristic_lp_model(a_matrix, h_cvx, g_matrix, cost_vec, fin_vec, lp_solver_variant)
+
     h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec, incidence_matrix,
                                                        ini,
-                                                       fin_vec, lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                       use_cvxopt=use_cvxopt)
+                                                       fin_vec, lp_solver_variant,
+                                                       use_cvxopt=use_cvxopt, lp_model=lp_model)
     ini_state = utils.SearchTuple(0 + h, 0, h, ini, None, None, x, True)
     open_set = [ini_state]
     heapq.heapify(open_set)
@@ -433,6 +483,7 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
 
     while not len(open_set) == 0:
         if (time.time() - start_time) > max_align_time_trace:
+            utils.__record_search_statistics(visited, queued, traversed, aligned=False)
             return None
 
         curr = heapq.heappop(open_set)
@@ -448,8 +499,8 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
         while not curr.trust:
             h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec,
                                                                incidence_matrix, curr.m,
-                                                               fin_vec, lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                               use_cvxopt=use_cvxopt)
+                                                               fin_vec, lp_solver_variant,
+                                                               use_cvxopt=use_cvxopt, lp_model=lp_model)
 
             # 11/10/19: shall not a state for which we compute the exact heuristics be
             # by nature a trusted solution?
@@ -472,6 +523,7 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
         # (underestimation of the remaining cost) is 0. Low-hanging fruits
         if curr.h < 0.01:
             if current_marking == fin:
+                utils.__record_search_statistics(visited, queued, traversed)
                 return utils.__reconstruct_alignment(curr, visited, queued, traversed,
                                                      ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
 
@@ -503,3 +555,104 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
 
             tp = utils.SearchTuple(new_f, g, h, new_marking, curr, t, x, trustable)
             heapq.heappush(open_set, tp)
+
+    # the final marking is not reachable
+    utils.__record_search_statistics(visited, queued, traversed, aligned=False)
+    return None
+
+
+def __search_compiled(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=False,
+                      max_align_time_trace=sys.maxsize, lp_solver_variant=lp_solver.DEFAULT_LP_SOLVER_VARIANT):
+    """
+    A* search on the compiled representation of the synchronous product net.
+
+    The search is the same as in __search, but markings are encoded as tuples of integers
+    and transitions are fired through their integer indices, avoiding the copy of marking
+    objects and the traversal of the arcs.
+    """
+    start_time = time.time()
+
+    cnet = compiled_net.construct(sync_net)
+    transitions = cnet.transition_list
+    ini_vec, fin_vec, cost_vec = utils.__vectorize_initial_final_cost(cnet, ini, fin, cost_function)
+    ini_enc = tuple(ini_vec)
+    fin_enc = tuple(fin_vec)
+
+    closed = set()
+
+    a_matrix = cnet.sparse_a_matrix
+    g_matrix = -sparse.identity(len(sync_net.transitions), format="csr")
+    h_cvx = np.matrix(np.zeros(len(sync_net.transitions))).transpose()
+    cost_vec = [x * 1.0 for x in cost_vec]
+
+    # the transitions that are log moves and model moves at the same time are never fired
+    firable = [not (utils.__is_log_move(t, skip) and utils.__is_model_move(t, skip)) for t in transitions]
+
+    lp_model = utils.__get_heuristic_lp_model(a_matrix, h_cvx, g_matrix, cost_vec, fin_vec, lp_solver_variant)
+
+    h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec, cnet,
+                                                       ini, fin_vec, lp_solver_variant, lp_model=lp_model)
+    ini_state = utils.SearchTuple(0 + h, 0, h, ini_enc, None, None, x, True)
+    open_set = [ini_state]
+    heapq.heapify(open_set)
+    visited = 0
+    queued = 0
+    traversed = 0
+
+    while not len(open_set) == 0:
+        if (time.time() - start_time) > max_align_time_trace:
+            utils.__record_search_statistics(visited, queued, traversed, aligned=False)
+            return None
+
+        curr = heapq.heappop(open_set)
+
+        current_marking = curr.m
+        if current_marking in closed:
+            continue
+
+        while not curr.trust:
+            h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec,
+                                                               cnet, cnet.decode_marking(curr.m),
+                                                               fin_vec, lp_solver_variant, lp_model=lp_model)
+            tp = utils.SearchTuple(curr.g + h, curr.g, h, curr.m, curr.p, curr.t, x, True)
+            curr = heapq.heappushpop(open_set, tp)
+            current_marking = curr.m
+
+        # max allowed heuristics value (due to the numerical instability of some of our solvers)
+        if curr.h > lp_solver.MAX_ALLOWED_HEURISTICS:
+            continue
+
+        if current_marking in closed:
+            continue
+
+        if curr.h < 0.01:
+            if current_marking == fin_enc:
+                utils.__record_search_statistics(visited, queued, traversed)
+                return utils.__reconstruct_alignment(curr, visited, queued, traversed,
+                                                     ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
+
+        closed.add(current_marking)
+        visited += 1
+
+        for t_idx in cnet.enabled_transitions(current_marking):
+            if not firable[t_idx]:
+                continue
+            traversed += 1
+            new_marking = cnet.execute(t_idx, current_marking)
+
+            if new_marking in closed:
+                continue
+            t = transitions[t_idx]
+            g = curr.g + cost_function[t]
+
+            queued += 1
+            h, x = utils.__derive_heuristic(cnet, cost_vec, curr.x, t, curr.h)
+            trustable = utils.__trust_solution(x)
+            new_f = g + h
+
+            tp = utils.SearchTuple(new_f, g, h, new_marking, curr, t, x, trustable)
+            heapq.heappush(open_set, tp)
+
+    # the final marking is not reachable
+    utils.__record_search_statistics(visited, queued, traversed, aligned=False)
+    return None
@@ -18,9 +18,11 @@ from pm4py.util.lp import solver as lp_solver
 from pm4py.objects.petri.semantics import enabled_transitions
 from pm4py.objects.petri.petrinet import Marking
 from pm4py.objects.petri.incidence_matrix import construct
+from pm4py.algo.conformance.alignments import session as alignments_session
 from enum import Enum
 import heapq
 import numpy as np
+from scipy import sparse
 from copy import copy
 
 
@@ -38,6 +40,8 @@ class Parameters(Enum):
     PARAM_SYNC_COST_FUNCTION = 'sync_cost_function'
     PARAM_TRACE_NET_COSTS = "trace_net_costs"
     RETURN_SYNC_COST_FUNCTION = "return_sync_cost_function"
+    LP_SOLVER_VARIANT = "lp_solver_variant"
+    ALIGNMENT_SESSION = "alignment_session"
 
 
 PLACES_DICT = "places_dict"
@@ -52,6 +56,10 @@ TRANSF_MODEL_COST_FUNCTION = "transf_model_cost_function"
 TRANSF_TRACE = "transf_trace"
 TRACE_COST_FUNCTION = "trace_cost_function"
 INV_TRACE_LABELS_DICT = "inv_trace_labels_dict"
+# keys of the structures stored in the alignment session
+MODEL_STRUCT = "mem_efficient_model_struct"
+MODEL_CORRESP = "mem_efficient_model_corresp"
+MODEL_TRANS_NAMES_DICT = "mem_efficient_model_trans_names_dict"
 
 IS_SYNC_MOVE = 0
 IS_LOG_MOVE = 1
@@ -112,6 +120,11 @@ def apply_from_variants_list(var_list, petri_net, initial_marking, final_marking
                                                 sys.maxsize)
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
+    if exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None) is None:
+        # the model part of the synchronous product net is built once for all the variants
+        parameters = copy(parameters)
+        parameters[Parameters.ALIGNMENT_SESSION] = alignments_session.apply(petri_net, initial_marking, final_marking,
+                                                                             parameters=parameters)
     dictio_alignments = {}
     for varitem in var_list:
         this_max_align_time = min(max_align_time_trace, (max_align_time - (time.time() - start_time)) * 0.5)
@@ -251,6 +264,88 @@ def construct_sync_prod_net(trace, net, im, fm, parameters=None):
     return sync_prod, sync_final_marking, sync_final_marking, cost_function
 
 
+def __construct_sync_prod_net_session(trace, session, parameters=None):
+    """
+    Constructs the synchronous product net, splicing the trace part into the model part
+    provided by the alignment session
+
+    Parameters
+    ---------------
+    trace
+        Trace
+    session
+        Alignment session
+    parameters
+        Parameters
+
+    Returns
+    ----------------
+    sync_prod_net
+        Synchronous product net
+    incidence_matrix
+        Incidence matrix of the synchronous product net
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+    trace_cost_function = exec_utils.get_param_value(Parameters.PARAM_TRACE_COST_FUNCTION, parameters, None)
+    model_cost_function = exec_utils.get_param_value(Parameters.PARAM_MODEL_COST_FUNCTION, parameters, None)
+    trace_net_cost_aware_constr_function = exec_utils.get_param_value(Parameters.TRACE_NET_COST_AWARE_CONSTR_FUNCTION,
+                                                                      parameters, construct_trace_net_cost_aware)
+
+    if trace_cost_function is None:
+        trace_cost_function = list(
+            map(lambda e: utils.STD_MODEL_LOG_MOVE_COST, trace))
+        parameters[Parameters.PARAM_TRACE_COST_FUNCTION] = trace_cost_function
+
+    model_cost_overrides = None
+    if model_cost_function is None:
+        # optimization 12/08/2020 (see construct_sync_prod_net)
+        labels = set(x[activity_key] for x in trace)
+        model_cost_overrides = {t: 0 for t, enabling_labels in session.get_invisible_enabling_labels().items() if
+                                enabling_labels.isdisjoint(labels)}
+
+    trace_net, trace_im, trace_fm, trace_net_costs = trace_net_cost_aware_constr_function(trace,
+                                                                                           trace_cost_function,
+                                                                                           activity_key=activity_key)
+    parameters[Parameters.PARAM_TRACE_NET_COSTS] = trace_net_costs
+
+    sync_prod, sync_initial_marking, sync_final_marking, cost_function, incidence_matrix = session.construct(
+        trace_net, trace_im, trace_fm, trace_net_costs=trace_net_costs, model_cost_overrides=model_cost_overrides)
+
+    return (sync_prod, sync_final_marking, sync_final_marking, cost_function), incidence_matrix
+
+
+def __construct_corresp_session(incidence_matrix, model_struct, session):
+    """
+    Construct the correspondency for a synchronous product net constructed by the alignment session
+    (the correspondency of the model part is built once for the session)
+    """
+    def build_model_corresp():
+        places = {y: session.place_map[x] for x, y in model_struct[PLACES_DICT].items()}
+        transitions = {(utils.SKIP, x): session.transition_map[y] for x, y in model_struct[INV_TRANS_DICT].items()}
+        return places, transitions
+
+    model_places, model_transitions = session.get_structure(MODEL_CORRESP, build_model_corresp)
+    trans_dict = session.get_structure(MODEL_TRANS_NAMES_DICT, lambda: {y.name: x for x, y in
+                                                                        model_struct[INV_TRANS_DICT].items()})
+
+    corresp = [{}, copy(model_places), copy(model_transitions)]
+
+    for pl in incidence_matrix.trace_places:
+        corresp[0][int(str(pl.name[0].split("_")[-1]))] = pl
+
+    for tr in incidence_matrix.trace_transitions:
+        zero = -int(str(tr.name[0]).split("_")[-1])
+        one = str(tr.name[1])
+        if one != ">>":
+            one = trans_dict[str(tr.name[1])]
+        corresp[2][(zero, one)] = tr
+
+    return corresp
+
+
 def construct_corresp(prod_net, model_struct):
     """
     Construct the correspondency
@@ -307,6 +402,9 @@ def apply(trace, net, im, fm, parameters=None):
         Parameters.PARAM_MODEL_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
         model cost
         Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
+        Parameters.ALIGNMENT_SESSION: :class:`pm4py.algo.conformance.alignments.session.AlignmentSession` (parameter)
+        session (created for the same Petri net and cost functions) providing the model part of the synchronous
+        product net
 
     Returns
     -------
@@ -317,12 +415,23 @@ def apply(trace, net, im, fm, parameters=None):
 
     parameters = copy(parameters)
     sync_cost = exec_utils.get_param_value(Parameters.PARAM_STD_SYNC_COST, parameters, align_utils.STD_SYNC_COST)
-    product_net = construct_sync_prod_net(trace, net, im, fm, parameters=parameters)
+    session = exec_utils.get_param_value(Parameters.ALIGNMENT_SESSION, parameters, None)
+    incidence_matrix = None
+
+    if session is not None:
+        if session.net is not net:
+            raise Exception("the alignment session has been created for a different Petri net!")
+        product_net, incidence_matrix = __construct_sync_prod_net_session(trace, session, parameters=parameters)
+    else:
+        product_net = construct_sync_prod_net(trace, net, im, fm, parameters=parameters)
 
     model_struct = __transform_model_to_mem_efficient_structure(net, im, fm, trace, parameters=parameters)
     trace_struct = __transform_trace_to_mem_efficient_structure(trace, model_struct, parameters=parameters)
 
-    corresp = construct_corresp(product_net, model_struct)
+    if session is not None:
+        corresp = __construct_corresp_session(incidence_matrix, model_struct, session)
+    else:
+        corresp = construct_corresp(product_net, model_struct)
 
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
@@ -330,9 +439,12 @@ def apply(trace, net, im, fm, parameters=None):
                                                          parameters, False)
 
     return_sync_cost = exec_utils.get_param_value(Parameters.RETURN_SYNC_COST_FUNCTION, parameters, False)
+    lp_solver_variant = exec_utils.get_param_value(Parameters.LP_SOLVER_VARIANT, parameters,
+                                                   lp_solver.DEFAULT_LP_SOLVER_VARIANT)
     alignment = __align(model_struct, trace_struct, product_net, corresp, sync_cost=sync_cost,
                         max_align_time_trace=max_align_time_trace,
-                        ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
+                        ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, lp_solver_variant=lp_solver_variant,
+                        incidence_matrix=incidence_matrix)
 
     if return_sync_cost:
         return alignment, product_net[3]
@@ -355,7 +467,7 @@ def get_corresp_marking_and_trans(m, index, corresp, t):
 
 def __calculate_heuristics(prev_h, prev_x, m0, index, corresp, t0, sync_net, incidence_matrix,
                            fin_vec, cost_vec, a_matrix, g_matrix, h_cvx, variant, use_cvxopt=False,
-                           compute_exact_heu=False):
+                           compute_exact_heu=False, lp_model=None):
     """
     Calculate the heuristics
 
@@ -372,7 +484,8 @@ def __calculate_heuristics(prev_h, prev_x, m0, index, corresp, t0, sync_net, inc
 
     if compute_exact_heu or t is None:
         h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec,
-                                                           incidence_matrix, m, fin_vec, variant, use_cvxopt=use_cvxopt)
+                                                           incidence_matrix, m, fin_vec, variant, use_cvxopt=use_cvxopt,
+                                                           lp_model=lp_model)
         trustable = True
     else:
         h, x = utils.__derive_heuristic(incidence_matrix, cost_vec, prev_x, t, prev_h)
@@ -383,7 +496,8 @@ def __calculate_heuristics(prev_h, prev_x, m0, index, corresp, t0, sync_net, inc
 
 def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_utils.STD_SYNC_COST,
             max_align_time_trace=sys.maxsize,
-            ret_tuple_as_trans_desc=False):
+            ret_tuple_as_trans_desc=False, lp_solver_variant=lp_solver.DEFAULT_LP_SOLVER_VARIANT,
+            incidence_matrix=None):
     """
     Alignments using Dijkstra
 
@@ -405,6 +519,11 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
         Says if the alignments shall be constructed including also
         the name of the transition, or only the label (default=False includes only the label)
 
+    lp_solver_variant
+        Variant of the LP solver used to compute the heuristic
+    incidence_matrix
+        (if provided) incidence matrix of the synchronous product net
+
     Returns
     --------------
     alignment
@@ -425,35 +544,38 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
     trace_cost_function = trace_struct[TRACE_COST_FUNCTION]
 
     sync_net, ini, fin, cost_function = product_net
-    incidence_matrix = construct(sync_net)
+    if incidence_matrix is None:
+        incidence_matrix = construct(sync_net)
     ini_vec, fin_vec, cost_vec = utils.__vectorize_initial_final_cost(incidence_matrix, ini, fin, cost_function)
 
-    a_matrix = np.asmatrix(incidence_matrix.a_matrix).astype(np.float64)
-    g_matrix = -np.eye(len(sync_net.transitions))
+    a_matrix = incidence_matrix.sparse_a_matrix
+    g_matrix = -sparse.identity(len(sync_net.transitions), format="csr")
     h_cvx = np.matrix(np.zeros(len(sync_net.transitions))).transpose()
     cost_vec = [x * 1.0 for x in cost_vec]
 
     use_cvxopt = False
-    if lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN or lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN_ILP:
+    if lp_solver_variant == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN or lp_solver_variant == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN_ILP:
         use_cvxopt = True
 
     if use_cvxopt:
         # not available in the latest version of PM4Py
         from cvxopt import matrix
 
-        a_matrix = matrix(a_matrix)
-        g_matrix = matrix(g_matrix)
+        a_matrix = matrix(a_matrix.toarray())
+        g_matrix = matrix(g_matrix.toarray())
         h_cvx = matrix(h_cvx)
         cost_vec = matrix(cost_vec)
 
+    lp_model = utils.__get_heuristic_lp_model(a_matrix, h_cvx, g_matrix, cost_vec, fin_vec, lp_solver_variant)
+
     marking_dict = {}
     im = __encode_marking(marking_dict, model_struct[TRANSF_IM])
     fm = __encode_marking(marking_dict, model_struct[TRANSF_FM])
 
     h, x, trustable = __calculate_heuristics(None, None, im, 0, corresp, None, sync_net, incidence_matrix,
                                              fin_vec,
-                                             cost_vec, a_matrix, g_matrix, h_cvx, lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                             use_cvxopt=use_cvxopt)
+                                             cost_vec, a_matrix, g_matrix, h_cvx, lp_solver_variant,
+                                             use_cvxopt=use_cvxopt, lp_model=lp_model)
     exact_heu_calculations = 1
 
     initial_state = (0, h, 0, 0, 0, 0, None, im, None, 0, x, trustable)
@@ -466,6 +588,7 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
 
     while not len(open_set) == 0:
         if (time.time() - start_time) > max_align_time_trace:
+            utils.__record_search_statistics(visited, len(open_set) + visited, dummy_count, aligned=False)
             return None
         curr = heapq.heappop(open_set)
         curr_m0 = curr[POSITION_MARKING]
@@ -487,8 +610,8 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
             m, t = get_corresp_marking_and_trans(curr_m, index, corresp, None)
             h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec,
                                                                incidence_matrix, m, fin_vec,
-                                                               lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                               use_cvxopt=use_cvxopt)
+                                                               lp_solver_variant,
+                                                               use_cvxopt=use_cvxopt, lp_model=lp_model)
             exact_heu_calculations = exact_heu_calculations + 1
 
             curr = list(curr)
@@ -507,6 +630,7 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
             if -curr[POSITION_INDEX] == len(transf_trace):
                 # returns the alignment only if the final marking has been reached AND
                 # the trace is over
+                utils.__record_search_statistics(visited, len(open_set) + visited, dummy_count)
                 return __reconstruct_alignment(curr, model_struct, trace_struct, visited, len(open_set), len(closed),
                                                len(marking_dict), exact_heu_calculations,
                                                ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
@@ -531,8 +655,8 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
                                                                      incidence_matrix,
                                                                      fin_vec,
                                                                      cost_vec, a_matrix, g_matrix, h_cvx,
-                                                                     lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                                     use_cvxopt=use_cvxopt)
+                                                                     lp_solver_variant,
+                                                                     use_cvxopt=use_cvxopt, lp_model=lp_model)
 
                 dummy_count = dummy_count + 1
                 new_f = curr[POSITION_COST] + sync_cost
@@ -564,8 +688,8 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
                                                                         incidence_matrix,
                                                                         fin_vec,
                                                                         cost_vec, a_matrix, g_matrix, h_cvx,
-                                                                        lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                                        use_cvxopt=use_cvxopt)
+                                                                        lp_solver_variant,
+                                                                        use_cvxopt=use_cvxopt, lp_model=lp_model)
             j = j + 1
 
         en_t.sort(key=lambda t: transf_model_cost_function[t[0]] + t[2])
@@ -602,8 +726,8 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
                                                                  incidence_matrix,
                                                                  fin_vec,
                                                                  cost_vec, a_matrix, g_matrix, h_cvx,
-                                                                 lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                                 use_cvxopt=use_cvxopt)
+                                                                 lp_solver_variant,
+                                                                 use_cvxopt=use_cvxopt, lp_model=lp_model)
 
             new_g = new_f + new_h
             new_state = (
@@ -613,6 +737,10 @@ def __align(model_struct, trace_struct, product_net, corresp, sync_cost=align_ut
                 # adds the log_skeleton move only if it has not been already closed before
                 open_set = __add_to_open_set(open_set, new_state)
 
+    # the final marking is not reachable
+    utils.__record_search_statistics(visited, len(open_set) + visited, dummy_count, aligned=False)
+    return None
+
 
 def __reconstruct_alignment(curr, model_struct, trace_struct, visited, open_set_length, closed_set_length,
                             num_visited_markings, exact_heu_calculations, ret_tuple_as_trans_desc=False):
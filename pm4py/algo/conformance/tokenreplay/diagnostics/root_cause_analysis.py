@@ -13,6 +13,7 @@ class Parameters(Enum):
     STRING_ATTRIBUTES = "string_attributes"
     NUMERIC_ATTRIBUTES = "numeric_attributes"
     ENABLE_MULTIPLIER = "enable_multiplier"
+    SPARSE = "sparse"
 
 
 def form_log_from_dictio_couple(first_cases_repr, second_cases_repr, enable_multiplier=False):
@@ -61,7 +62,7 @@ def form_log_from_dictio_couple(first_cases_repr, second_cases_repr, enable_mult
 
 
 def form_representation_from_dictio_couple(first_cases_repr, second_cases_repr, string_attributes, numeric_attributes,
-                                           enable_multiplier=False):
+                                           enable_multiplier=False, sparse=False):
     """
     Gets a log_skeleton representation, useful for training the decision tree,
     from a couple of dictionaries along with the list of string attributes
@@ -79,6 +80,8 @@ def form_representation_from_dictio_couple(first_cases_repr, second_cases_repr,
         Numeric attributes contained in the log_skeleton
     enable_multiplier
         Enable balancing of classes
+    sparse
+        Returns the data as a sparse (CSR) matrix
 
     Returns
     ------------
@@ -92,7 +95,8 @@ def form_representation_from_dictio_couple(first_cases_repr, second_cases_repr,
     log = form_log_from_dictio_couple(first_cases_repr, second_cases_repr,
                                       enable_multiplier=enable_multiplier)
 
-    data, feature_names = get_log_representation.get_representation(log, [], string_attributes, [], numeric_attributes)
+    data, feature_names = get_log_representation.get_representation(log, [], string_attributes, [], numeric_attributes,
+                                                                    sparse=sparse)
 
     return data, feature_names
 
@@ -113,6 +117,7 @@ def diagnose_from_trans_fitness(log, trans_fitness, parameters=None):
                 in building the decision tree
             numeric_attributes -> List of numeric event attributes to consider
                 in building the decision tree
+            sparse -> encodes the features in a sparse matrix (default: False)
 
     Returns
     -----------
@@ -131,6 +136,7 @@ def diagnose_from_trans_fitness(log, trans_fitness, parameters=None):
     string_attributes = exec_utils.get_param_value(Parameters.STRING_ATTRIBUTES, parameters, [])
     numeric_attributes = exec_utils.get_param_value(Parameters.NUMERIC_ATTRIBUTES, parameters, [])
     enable_multiplier = exec_utils.get_param_value(Parameters.ENABLE_MULTIPLIER, parameters, False)
+    sparse = exec_utils.get_param_value(Parameters.SPARSE, parameters, False)
 
     for trans in trans_fitness:
         if len(trans_fitness[trans]["underfed_traces"]) > 0:
@@ -146,7 +152,8 @@ def diagnose_from_trans_fitness(log, trans_fitness, parameters=None):
             if fit_cases_repr and underfed_cases_repr:
                 data, feature_names = form_representation_from_dictio_couple(fit_cases_repr, underfed_cases_repr,
                                                                              string_attributes, numeric_attributes,
-                                                                             enable_multiplier=enable_multiplier)
+                                                                             enable_multiplier=enable_multiplier,
+                                                                             sparse=sparse)
                 target = []
                 classes = []
 
@@ -194,6 +201,7 @@ def diagnose_from_notexisting_activities(log, notexisting_activities_in_model, p
                 in building the decision tree
             numeric_attributes -> List of numeric event attributes to consider
                 in building the decision tree
+            sparse -> encodes the features in a sparse matrix (default: False)
 
     Returns
     -----------
@@ -212,6 +220,7 @@ def diagnose_from_notexisting_activities(log, notexisting_activities_in_model, p
     string_attributes = exec_utils.get_param_value(Parameters.STRING_ATTRIBUTES, parameters, [])
     numeric_attributes = exec_utils.get_param_value(Parameters.NUMERIC_ATTRIBUTES, parameters, [])
     enable_multiplier = exec_utils.get_param_value(Parameters.ENABLE_MULTIPLIER, parameters, False)
+    sparse = exec_utils.get_param_value(Parameters.SPARSE, parameters, False)
 
     parameters_filtering = deepcopy(parameters)
     parameters_filtering["positive"] = False
@@ -231,7 +240,8 @@ def diagnose_from_notexisting_activities(log, notexisting_activities_in_model, p
         if fit_cases_repr and containing_cases_repr:
             data, feature_names = form_representation_from_dictio_couple(fit_cases_repr, containing_cases_repr,
                                                                          string_attributes, numeric_attributes,
-                                                                         enable_multiplier=enable_multiplier)
+                                                                         enable_multiplier=enable_multiplier,
+                                                                         sparse=sparse)
 
             target = []
             classes = []
@@ -1,13 +1,14 @@
 from pm4py.statistics.variants.log import get as variants_module
 from pm4py.util import xes_constants as xes_util
-from pm4py.objects.petri import semantics
+from pm4py.objects.petri import semantics, compiled_net
 from pm4py.objects.petri.petrinet import Marking
-from pm4py.objects.petri.utils import get_places_shortest_path_by_hidden, get_s_components_from_petri
+from pm4py.objects.petri.utils import get_places_shortest_path_by_hidden, get_s_components_from_petri, \
+    has_unique_names
 from pm4py.objects.log import log as log_implementation
 from pm4py.objects.petri import align_utils
 from copy import copy
 from enum import Enum
-from pm4py.util import exec_utils, constants
+from pm4py.util import exec_utils, constants, instrumentation, process_pool
 
 
 class Parameters(Enum):
@@ -26,6 +27,9 @@ class Parameters(Enum):
     TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN = "try_to_reach_final_marking_through_hidden"
     CONSIDER_REMAINING_IN_FITNESS = "consider_remaining_in_fitness"
     ENABLE_PLTR_FITNESS = "enable_pltr_fitness"
+    USE_COMPILED_NET = "use_compiled_net"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
 
 
 class TechnicalParameters(Enum):
@@ -350,7 +354,7 @@ def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pl
                 marking_to_activity_caching=None, is_reduction=False,
                 thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
                 enable_postfix_cache=False, enable_marktoact_cache=False, cleaning_token_flood=False,
-                s_components=None, trace_occurrences=1):
+                s_components=None, trace_occurrences=1, cnet=None):
     """
     Apply the token replaying algorithm to a trace
 
@@ -402,6 +406,11 @@ def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pl
         Decides if a cleaning of the token flood shall be operated
     s_components
         S-components of the Petri net (if workflow net)
+    trace_occurrences
+        Trace weight (number of occurrences)
+    cnet
+        (if provided) compiled representation of the Petri net, used to look up the transitions
+        corresponding to an activity without scanning all the transitions of the net
     """
     trace_activities = [event[activity_key] for event in trace]
     act_trans = []
@@ -455,7 +464,13 @@ def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pl
                     # change 14/10/2020: to better support duplicate transitions with this approach, we check
                     # whether in the current marking there is at least one transition corresponding to the activity
                     # key without looking at the transition map (that contains one entry per label)
-                    corr_en_t = [x for x in semantics.enabled_transitions(net, marking) if x.label == trace[i][activity_key]]
+                    if cnet is not None:
+                        corr_en_t = [cnet.transition_list[j] for j in
+                                     cnet.label_transitions[trace[i][activity_key]] if
+                                     semantics.is_enabled(cnet.transition_list[j], net, marking)]
+                    else:
+                        corr_en_t = [x for x in semantics.enabled_transitions(net, marking) if
+                                     x.label == trace[i][activity_key]]
                     if corr_en_t:
                         t = corr_en_t[0]
                     else:
@@ -464,13 +479,15 @@ def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pl
                                                                               marking):
                         visited_transitions = set()
                         prev_len_activated_transitions = len(act_trans)
-                        [net, new_marking, new_act_trans, new_vis_mark] = apply_hidden_trans(t, net,
-                                                                                             copy(marking),
-                                                                                             places_shortest_path_by_hidden,
-                                                                                             copy(act_trans),
-                                                                                             0,
-                                                                                             copy(visited_transitions),
-                                                                                             copy(vis_mark))
+                        instrumentation.increment("token_replay.hidden_transition_searches")
+                        with instrumentation.phase("token_replay.hidden_transition_search"):
+                            [net, new_marking, new_act_trans, new_vis_mark] = apply_hidden_trans(t, net,
+                                                                                                 copy(marking),
+                                                                                                 places_shortest_path_by_hidden,
+                                                                                                 copy(act_trans),
+                                                                                                 0,
+                                                                                                 copy(visited_transitions),
+                                                                                                 copy(vis_mark))
                         for jj5 in range(len(act_trans), len(new_act_trans)):
                             tt5 = new_act_trans[jj5]
                             c, cmap = get_consumed_tokens(tt5)
@@ -725,7 +742,7 @@ class ApplyTraceTokenReplay:
                  walk_through_hidden_trans=True, post_fix_caching=None,
                  marking_to_activity_caching=None, is_reduction=False,
                  thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
-                 cleaning_token_flood=False, s_components=None, trace_occurrences=1):
+                 cleaning_token_flood=False, s_components=None, trace_occurrences=1, cnet=None):
         """
         Constructor
 
@@ -772,6 +789,8 @@ class ApplyTraceTokenReplay:
             S-components of the Petri net
         trace_occurrences
             Trace weight (number of occurrences)
+        cnet
+            (if provided) compiled representation of the Petri net
         """
         self.thread_is_alive = True
         self.trace = trace
@@ -811,6 +830,7 @@ class ApplyTraceTokenReplay:
         self.produced = None
         self.s_components = s_components
         self.trace_occurrences = trace_occurrences
+        self.cnet = cnet
 
     def run(self):
         """
@@ -833,7 +853,8 @@ class ApplyTraceTokenReplay:
                         enable_marktoact_cache=self.enable_marktoact_cache,
                         cleaning_token_flood=self.cleaning_token_flood,
                         s_components=self.s_components,
-                        trace_occurrences=self.trace_occurrences)
+                        trace_occurrences=self.trace_occurrences,
+                        cnet=self.cnet)
         self.thread_is_alive = False
 
 
@@ -912,7 +933,7 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
               activity_key="concept:name", reach_mark_through_hidden=True, stop_immediately_unfit=False,
               walk_through_hidden_trans=True, places_shortest_path_by_hidden=None,
               variants=None, is_reduction=False, thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
-              cleaning_token_flood=False, disable_variants=False, return_object_names=False):
+              cleaning_token_flood=False, disable_variants=False, return_object_names=False, use_compiled_net=False):
     """
     Apply token-based replay to a log_skeleton
 
@@ -952,6 +973,9 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
         Disable variants grouping
     return_object_names
         Decides whether names instead of object pointers shall be returned
+    use_compiled_net
+        Uses the compiled (integer-indexed) representation of the Petri net to look up the transitions
+        corresponding to the activities of the log
     """
     post_fix_cache = PostFixCaching()
     marking_to_activity_cache = MarkingToActivityCaching()
@@ -982,6 +1006,9 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
     trans_map = {}
     for t in net.transitions:
         trans_map[t.label] = t
+
+    cnet = compiled_net.construct(net) if use_compiled_net else None
+
     if len(log) > 0:
         if len(log[0]) > 0:
             if activity_key in log[0][0]:
@@ -1009,7 +1036,8 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
                                                              is_reduction=is_reduction,
                                                              thread_maximum_ex_time=thread_maximum_ex_time,
                                                              cleaning_token_flood=cleaning_token_flood,
-                                                             s_components=s_components, trace_occurrences=vc[i][1])
+                                                             s_components=s_components, trace_occurrences=vc[i][1],
+                                                             cnet=cnet)
                     threads[variant].run()
                     t = threads[variant]
                     threads_results[variant] = {"trace_is_fit": copy(t.t_fit),
@@ -1096,6 +1124,13 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
                                                                 None)
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
     variants = exec_utils.get_param_value(Parameters.VARIANTS, parameters, None)
+    use_compiled_net = exec_utils.get_param_value(Parameters.USE_COMPILED_NET, parameters, False)
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
+
+    if cores > 1 and not enable_pltr_fitness and has_unique_names(net):
+        # the place/transition fitness is accumulated on shared objects, hence it is computed serially;
+        # the net is sent to the worker processes as PNML, identifying the places/transitions by name
+        return __apply_log_multiprocessing(log, net, initial_marking, final_marking, parameters=parameters)
 
     return apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=enable_pltr_fitness,
                      consider_remaining_in_fitness=consider_remaining_in_fitness,
@@ -1105,7 +1140,133 @@ def apply(log, net, initial_marking, final_marking, parameters=None):
                      places_shortest_path_by_hidden=places_shortest_path_by_hidden, activity_key=activity_key,
                      variants=variants, is_reduction=is_reduction, thread_maximum_ex_time=thread_maximum_ex_time,
                      cleaning_token_flood=cleaning_token_flood, disable_variants=disable_variants,
-                     return_object_names=return_names)
+                     return_object_names=return_names, use_compiled_net=use_compiled_net)
+
+
+def __apply_log_multiprocessing(log, net, initial_marking, final_marking, parameters=None):
+    """
+    Applies token-based replay to a log using a pool of worker processes.
+
+    The variants of the log are split in chunks (the longest variants are scheduled first);
+    the accepting Petri net is sent (as PNML string) only once to each worker.
+    The results (computed by the workers on the names of the places/transitions)
+    are mapped back to the objects of the provided net, and returned in the order of the traces of the log.
+
+    Parameters
+    -------------
+    log
+        Event log
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm, including:
+            - Parameters.CORES => number of worker processes
+            - Parameters.CHUNK_SIZE => number of variants sent to a worker in a single task
+
+    Returns
+    -------------
+    aligned_traces
+        Token-based replay results (one for each trace of the log)
+    """
+    from pm4py.objects.petri.exporter.variants import pnml as petri_exporter
+
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
+    disable_variants = exec_utils.get_param_value(Parameters.DISABLE_VARIANTS, parameters, False)
+    return_names = exec_utils.get_param_value(Parameters.RETURN_NAMES, parameters, False)
+    variants = exec_utils.get_param_value(Parameters.VARIANTS, parameters, None)
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, None)
+
+    if len(log) == 0 or len(log[0]) == 0:
+        return []
+    if activity_key not in log[0][0]:
+        raise NoConceptNameException("at least an event is without " + activity_key)
+
+    if variants is None:
+        variants = get_variants_from_log(log, activity_key, disable_variants=disable_variants)
+    variants_keys = list(variants)
+    variants_traces = [[x[activity_key] for x in variants[v][0]] for v in variants_keys]
+
+    indexes = sorted(range(len(variants_keys)), key=lambda i: len(variants_traces[i]), reverse=True)
+    chunks = process_pool.get_chunks(indexes, cores, chunk_size=chunk_size)
+
+    petri_string = petri_exporter.export_petri_as_string(net, initial_marking, final_marking)
+    worker_parameters = {}
+    for key, value in parameters.items():
+        if exec_utils.unroll(key) not in [Parameters.VARIANTS.value, Parameters.PLACES_SHORTEST_PATH_BY_HIDDEN.value,
+                                          Parameters.CORES.value, Parameters.CHUNK_SIZE.value,
+                                          Parameters.RETURN_NAMES.value]:
+            worker_parameters[key] = value
+    worker_parameters[Parameters.RETURN_NAMES] = True
+
+    results = process_pool.apply(__apply_variants_chunk, [[variants_traces[i] for i in chunk] for chunk in chunks],
+                                 cores, context=(petri_string, worker_parameters),
+                                 initializer=__init_token_replay_worker)
+    variants_results = {}
+    for chunk, chunk_results in zip(chunks, results):
+        for i, result in zip(chunk, chunk_results):
+            variants_results[variants_keys[i]] = result
+
+    if not return_names:
+        places = {p.name: p for p in net.places}
+        transitions = {t.name: t for t in net.transitions}
+        for result in variants_results.values():
+            del result["activated_transitions_labels"]
+            del result["enabled_transitions_in_marking_labels"]
+            result["activated_transitions"] = [transitions[x] for x in result["activated_transitions"]]
+            result["enabled_transitions_in_marking"] = set(
+                transitions[x] for x in result["enabled_transitions_in_marking"])
+            result["transitions_with_problems"] = [transitions[x] for x in result["transitions_with_problems"]]
+            result["reached_marking"] = Marking({places[x]: y for x, y in result["reached_marking"].items()})
+
+    aligned_traces = []
+    for trace in log:
+        trace_variant = get_variant_from_trace(trace, activity_key, disable_variants=disable_variants)
+        if trace_variant in variants_results:
+            aligned_traces.append(variants_results[trace_variant])
+
+    return aligned_traces
+
+
+def __init_token_replay_worker(context):
+    """
+    Initializes a worker process of the multiprocessing token-based replay, importing the
+    accepting Petri net (and computing the shortest paths between places through hidden transitions) once
+    """
+    from pm4py.objects.petri.importer.variants import pnml as petri_importer
+
+    petri_string, parameters = context
+    net, im, fm = petri_importer.import_petri_from_string(petri_string)
+    parameters = copy(parameters)
+    parameters[Parameters.PLACES_SHORTEST_PATH_BY_HIDDEN] = get_places_shortest_path_by_hidden(
+        net, TechnicalParameters.MAX_REC_DEPTH.value)
+
+    return net, im, fm, parameters
+
+
+def __apply_variants_chunk(context, variants_traces):
+    """
+    Replays a chunk of variants (each one expressed as list of activities) inside a worker process
+    """
+    net, im, fm, parameters = context
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
+
+    log = log_implementation.EventLog()
+    for activities in variants_traces:
+        log.append(log_implementation.Trace([log_implementation.Event({activity_key: x}) for x in activities]))
+
+    # each trace of the chunk is a different variant
+    parameters = copy(parameters)
+    parameters[Parameters.DISABLE_VARIANTS] = True
+
+    return apply(log, net, im, fm, parameters=parameters)
 
 
 def apply_variants_list(variants_list, net, initial_marking, final_marking, parameters=None):
@@ -18,6 +18,7 @@ from pm4py.statistics.variants.log.get import get_variants_from_log_trace_idx
 from pm4py.util.lp import solver
 from enum import Enum
 import numpy as np
+from scipy import sparse
 from copy import copy
 import sys
 import time
@@ -1260,14 +1261,13 @@ def __approximate_alignment_on_parallel(pt: ProcessTree, trace: Trace, a_sets: D
 
 
 def __ilp_solve(c, Aub, bub, Aeq, beq):
-    Aeq = np.asmatrix(Aeq).astype(np.float64)
-    beq = np.asmatrix(beq).transpose().astype(np.float64)
-    Aub = np.asmatrix(Aub).astype(np.float64)
-    bub = np.asmatrix(bub).transpose().astype(np.float64)
-
     if "cvxopt" in solver.DEFAULT_LP_SOLVER_VARIANT:
         # does this part only if cvxopt is imported
         from cvxopt import matrix
+        Aeq = np.asmatrix(Aeq).astype(np.float64)
+        beq = np.asmatrix(beq).transpose().astype(np.float64)
+        Aub = np.asmatrix(Aub).astype(np.float64)
+        bub = np.asmatrix(bub).transpose().astype(np.float64)
         c = matrix([x * 1.0 for x in c])
         Aeq = matrix(Aeq)
         beq = matrix(beq)
@@ -1295,6 +1295,11 @@ def __ilp_solve(c, Aub, bub, Aeq, beq):
         # if the ILP solver is called, these are already integer
         points = [round(x) for x in points]
     else:
+        # the constraints are mostly zeros: they are passed to the solver as sparse matrices
+        Aeq = sparse.csr_matrix(np.array(Aeq, dtype=np.float64).reshape(len(Aeq), len(c)))
+        beq = np.array(beq, dtype=np.float64)
+        Aub = sparse.csr_matrix(np.array(Aub, dtype=np.float64).reshape(len(Aub), len(c)))
+        bub = np.array(bub, dtype=np.float64)
         # calls other linear solvers (pulp, ortools) with REQUIRE_ILP set to True
         sol = solver.apply(c, Aub, bub, Aeq, beq, variant=solver.DEFAULT_LP_SOLVER_VARIANT,
                            parameters={solver.Parameters.REQUIRE_ILP: True})
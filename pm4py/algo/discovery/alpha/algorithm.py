@@ -6,7 +6,7 @@ from pm4py.algo.discovery.alpha import variants
 from pm4py.algo.discovery.dfg.adapters.pandas import df_statistics
 from pm4py.algo.discovery.parameters import Parameters
 from pm4py.objects.conversion.log import converter as log_conversion
-from pm4py.util import exec_utils
+from pm4py.util import exec_utils, instrumentation
 from pm4py.util import xes_constants as xes_util
 
 
@@ -21,6 +21,7 @@ DEFAULT_VARIANT = ALPHA_VERSION_CLASSIC
 VERSIONS = {Variants.ALPHA_VERSION_CLASSIC, Variants.ALPHA_VERSION_PLUS}
 
 
+@instrumentation.phased("discovery.alpha")
 def apply(log, parameters=None, variant=DEFAULT_VARIANT):
     """
     Apply the Alpha Miner on top of a log_skeleton
@@ -1,5 +1,6 @@
 import numpy as np
 from pm4py.util.lp import solver
+from pm4py.util import process_pool
 from statistics import mean
 
 
@@ -248,3 +249,240 @@ def calculate_time_match_rlifo(ai, aj, times1=None):
             k = k - 1
         z = z - 1
     return times1
+
+
+def get_PS_dur_matrix_from_times(end_times, start_times, cases=None, exact=False, cores=1):
+    """
+    Calculates the precede-succeed matrix and the duration matrix out of the timestamps of the events
+    of each activity, using per-activity sorted NumPy arrays (vectorized over the events through np.searchsorted).
+    The results are the same of the pairwise FIFO/reverse LIFO matching of the timestamps.
+
+    Parameters
+    --------------
+    end_times
+        List (one item per activity) of NumPy arrays containing the (end) timestamps of the events of the activity
+    start_times
+        List (one item per activity) of NumPy arrays containing the start timestamps of the events of the activity,
+        sorted increasingly (inside each case)
+    cases
+        (if provided) list (one item per activity) of NumPy arrays containing the (non-decreasing) index of the case
+        of each event. The events of different cases are never in the precede-succeed relation
+    exact
+        Performs an exact matching of the times (True/False)
+    cores
+        Number of worker processes among which the chunks of activities are distributed (default: 1)
+
+    Returns
+    --------------
+    PS_matrix
+        Precede-succeed matrix
+    duration_matrix
+        Duration matrix
+    """
+    no_act = len(end_times)
+    context = __get_context(end_times, start_times, cases)
+    context["greedy"] = not exact
+
+    if cores <= 1 or no_act < 2:
+        results = [__PS_dur_chunk(context, list(range(no_act)))]
+    else:
+        # the encoded timestamps are sent only once to each worker
+        results = process_pool.apply(__PS_dur_chunk, process_pool.get_chunks(list(range(no_act)), cores), cores,
+                                     context=context)
+
+    ps_count = np.zeros((no_act, no_act))
+    ps_total = np.zeros((no_act, no_act))
+    fifo_sum = np.zeros((no_act, no_act))
+    fifo_count = np.zeros((no_act, no_act))
+    rlifo_sum = np.zeros((no_act, no_act))
+    rlifo_count = np.zeros((no_act, no_act))
+    for indexes, count, total, f_sum, f_count, r_sum, r_count in results:
+        # the precede-succeed relations and the FIFO matching are computed per target activity (column),
+        # the reverse LIFO matching per source activity (row)
+        ps_count[:, indexes] = count
+        ps_total[:, indexes] = total
+        fifo_sum[:, indexes] = f_sum
+        fifo_count[:, indexes] = f_count
+        rlifo_sum[indexes, :] = r_sum
+        rlifo_count[indexes, :] = r_count
+
+    PS_matrix = np.divide(ps_count, ps_total, out=np.zeros((no_act, no_act)), where=ps_total > 0)
+    if exact:
+        duration_matrix = np.zeros((no_act, no_act))
+        for i in range(no_act):
+            for j in range(no_act):
+                if i != j and len(end_times[i]) > 0 and len(start_times[j]) > 0:
+                    duration_matrix[i, j] = match_return_avg_time(list(end_times[i]), list(start_times[j]), exact=True)
+    else:
+        td0 = np.divide(fifo_sum, fifo_count, out=np.zeros((no_act, no_act)), where=fifo_count > 0)
+        td1 = np.divide(rlifo_sum, rlifo_count, out=np.zeros((no_act, no_act)), where=rlifo_count > 0)
+        duration_matrix = np.minimum(td0, td1)
+    np.fill_diagonal(PS_matrix, 0)
+    np.fill_diagonal(duration_matrix, 0)
+
+    return PS_matrix, duration_matrix
+
+
+def __get_context(end_times, start_times, cases):
+    """
+    Encodes the timestamps of the events as integers (the rank of the timestamp, shifted by the case), such that
+    the integers of the events of the same case are contiguous. Also the reversed encoding
+    (used by the reverse LIFO matching) is returned
+    """
+    no_act = len(end_times)
+    end_times = [np.asarray(x, dtype=np.float64) for x in end_times]
+    start_times = [np.asarray(x, dtype=np.float64) for x in start_times]
+    single_case = cases is None
+    if single_case:
+        cases = [np.zeros(len(x), dtype=np.int64) for x in end_times]
+    else:
+        cases = [np.asarray(x, dtype=np.int64) for x in cases]
+
+    distinct_times = np.unique(np.concatenate(end_times + start_times + [np.zeros(0)]))
+    shift = max(1, len(distinct_times))
+    max_case = max([int(x[-1]) for x in cases if len(x) > 0], default=0)
+
+    end_codes = [x * shift + np.searchsorted(distinct_times, y) for x, y in zip(cases, end_times)]
+    start_codes = [x * shift + np.searchsorted(distinct_times, y) for x, y in zip(cases, start_times)]
+    # reversed order of the events, reversed order of the cases, reversed order of the timestamps
+    rev_end_codes = [((max_case - x) * shift + (shift - 1 - (y - x * shift)))[::-1] for x, y in
+                     zip(cases, end_codes)]
+    rev_start_codes = [((max_case - x) * shift + (shift - 1 - (y - x * shift)))[::-1] for x, y in
+                       zip(cases, start_codes)]
+
+    activities = np.concatenate([np.full(len(x), i, dtype=np.int64) for i, x in enumerate(end_times)] + [
+        np.zeros(0, dtype=np.int64)])
+    all_cases = np.concatenate(cases + [np.zeros(0, dtype=np.int64)])
+    all_rev_cases = np.concatenate([(max_case - x)[::-1] for x in cases] + [np.zeros(0, dtype=np.int64)])
+
+    return {"no_act": no_act, "shift": shift, "single_case": single_case, "end_times": end_times,
+            "start_times": start_times, "activities": activities,
+            # the precede-succeed relation is computed against the maximum end timestamp so far (inside the case)
+            "max_end_codes": np.concatenate([np.maximum.accumulate(x) for x in end_codes if len(x) > 0] + [
+                np.zeros(0, dtype=np.int64)]),
+            "end_codes": end_codes, "start_codes": start_codes,
+            "all_end_codes": np.concatenate(end_codes + [np.zeros(0, dtype=np.int64)]),
+            "all_end_times": np.concatenate(end_times + [np.zeros(0)]),
+            "cases": all_cases,
+            "segments": __get_segments(activities, all_cases),
+            "rev_end_codes": rev_end_codes,
+            "all_rev_start_codes": np.concatenate(rev_start_codes + [np.zeros(0, dtype=np.int64)]),
+            "all_rev_start_times": np.concatenate([x[::-1] for x in start_times] + [np.zeros(0)]),
+            "rev_cases": all_rev_cases,
+            "rev_segments": __get_segments(activities, all_rev_cases)}
+
+
+def __get_segments(activities, cases):
+    """
+    Assigns to each event the (non-decreasing) index of the couple (activity, case) to which it belongs
+    """
+    if len(activities) == 0:
+        return np.zeros(0, dtype=np.int64)
+    changes = (np.diff(activities) != 0) | (np.diff(cases) != 0)
+    return np.concatenate(([0], np.cumsum(changes)))
+
+
+def __greedy_match(driver_codes, driver_segments, scanned_codes, scanned_ends):
+    """
+    Greedy matching between the events of the driver list and a sorted list of scanned events:
+    each driver event (in order) is matched with the first following scanned event (of the same case) that
+    has a greater code, and that has not been matched before. The scanned position after the k-th driver event
+    is z(k) = max(z(k-1) + 1, s(k)), where s(k) is the first scanned event having a greater code, hence
+    z(k) = k + max_{m <= k} (s(m) - m) (inside each segment)
+
+    Returns
+    --------------
+    matched
+        Indexes of the matched driver events
+    positions
+        Positions of the corresponding scanned events
+    """
+    first_greater = np.searchsorted(scanned_codes, driver_codes, side="right")
+    indexes = np.arange(len(driver_codes), dtype=np.int64)
+    offset = driver_segments * (len(driver_codes) + len(scanned_codes) + 1)
+    positions = np.maximum.accumulate(first_greater - indexes + offset) - offset + indexes
+    matched = np.flatnonzero(positions < scanned_ends)
+    return matched, positions[matched]
+
+
+def __PS_dur_chunk(context, indexes):
+    """
+    Computes the precede-succeed relations and the FIFO matching towards the target activities of the chunk,
+    and the reverse LIFO matching from the source activities of the chunk
+    """
+    no_act = context["no_act"]
+    shift = context["shift"]
+    activities = context["activities"]
+    cases = context["cases"]
+    rev_cases = context["rev_cases"]
+
+    count = np.zeros((no_act, len(indexes)))
+    total = np.zeros((no_act, len(indexes)))
+    f_sum = np.zeros((no_act, len(indexes)))
+    f_count = np.zeros((no_act, len(indexes)))
+    r_sum = np.zeros((len(indexes), no_act))
+    r_count = np.zeros((len(indexes), no_act))
+
+    for idx, act in enumerate(indexes):
+        start_codes = context["start_codes"][act]
+        if len(start_codes) > 0 and len(activities) > 0:
+            # end and beginning of the events of the same case in the sorted start codes of the target activity
+            case_ends, case_starts = len(start_codes), 0
+            if not context["single_case"]:
+                case_ends = np.searchsorted(start_codes, (cases + 1) * shift, side="left")
+                case_starts = np.searchsorted(start_codes, cases * shift, side="left")
+            succeeding = case_ends - np.searchsorted(start_codes, context["max_end_codes"], side="right")
+            count[:, idx] = np.bincount(activities, weights=succeeding, minlength=no_act)
+            total[:, idx] = np.bincount(activities, weights=np.broadcast_to(case_ends - case_starts, activities.shape),
+                                        minlength=no_act)
+
+        if len(start_codes) > 0 and len(activities) > 0 and context["greedy"]:
+            matched, positions = __greedy_match(context["all_end_codes"], context["segments"], start_codes,
+                                                case_ends)
+            f_sum[:, idx] = np.bincount(activities[matched], weights=context["start_times"][act][positions] -
+                                                                     context["all_end_times"][matched],
+                                        minlength=no_act)
+            f_count[:, idx] = np.bincount(activities[matched], minlength=no_act)
+
+        rev_end_codes = context["rev_end_codes"][act]
+        if len(rev_end_codes) > 0 and len(activities) > 0 and context["greedy"]:
+            if np.all(np.diff(rev_end_codes) >= 0):
+                # the reverse LIFO matching is a FIFO matching between the reversed start timestamps
+                # (driver) and the reversed end timestamps (scanned)
+                case_ends = len(rev_end_codes)
+                if not context["single_case"]:
+                    case_ends = np.searchsorted(rev_end_codes, (rev_cases + 1) * shift, side="left")
+                matched, positions = __greedy_match(context["all_rev_start_codes"], context["rev_segments"],
+                                                    rev_end_codes, case_ends)
+                end_times = context["end_times"][act][::-1]
+                r_sum[idx, :] = np.bincount(activities[matched], weights=context["all_rev_start_times"][matched] -
+                                                                         end_times[positions], minlength=no_act)
+                r_count[idx, :] = np.bincount(activities[matched], minlength=no_act)
+            else:
+                # the end timestamps are not sorted as the start timestamps (overlapping executions):
+                # sequential matching
+                r_sum[idx, :], r_count[idx, :] = __rlifo_sequential(context, act)
+
+    return indexes, count, total, f_sum, f_count, r_sum, r_count
+
+
+def __rlifo_sequential(context, act):
+    """
+    Performs the reverse LIFO matching from the given activity to all the activities, case per case
+    """
+    no_act = context["no_act"]
+    shift = context["shift"]
+    r_sum = np.zeros(no_act)
+    r_count = np.zeros(no_act)
+    source_cases = context["end_codes"][act] // shift
+    source_times = context["end_times"][act]
+    for j in range(no_act):
+        target_cases = context["start_codes"][j] // shift
+        target_times = context["start_times"][j]
+        for case in np.intersect1d(source_cases, target_cases):
+            ai = list(source_times[source_cases == case])
+            aj = list(target_times[target_cases == case])
+            times = calculate_time_match_rlifo(ai, aj)
+            r_sum[j] += sum(x[1] - x[0] for x in times)
+            r_count[j] += len(times)
+    return r_sum, r_count
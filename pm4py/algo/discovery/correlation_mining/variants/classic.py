@@ -14,6 +14,7 @@ class Parameters(Enum):
     START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
     EXACT_TIME_MATCHING = "exact_time_matching"
     INDEX_KEY = "index_key"
+    CORES = "cores"
 
 
 DEFAULT_INDEX_KEY = "@@@index"
@@ -109,12 +110,40 @@ def get_PS_dur_matrix(activities_grouped, activities, parameters=None):
     start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters,
                                                      xes_constants.DEFAULT_TIMESTAMP_KEY)
     exact_time_matching = exec_utils.get_param_value(Parameters.EXACT_TIME_MATCHING, parameters, False)
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
 
-    PS_matrix = get_precede_succeed_matrix(activities, activities_grouped, timestamp_key, start_timestamp_key)
-    duration_matrix = get_duration_matrix(activities, activities_grouped, timestamp_key, start_timestamp_key,
-                                          exact=exact_time_matching)
+    end_times, start_times = get_times_arrays(activities, activities_grouped, timestamp_key, start_timestamp_key)
 
-    return PS_matrix, duration_matrix
+    return cm_util.get_PS_dur_matrix_from_times(end_times, start_times, exact=exact_time_matching, cores=cores)
+
+
+def get_times_arrays(activities, activities_grouped, timestamp_key, start_timestamp_key):
+    """
+    Gets, for each activity, the NumPy arrays of the (end) timestamps and of the start timestamps of its events
+
+    Parameters
+    ---------------
+    activities
+        Ordered list of activities of the log_skeleton
+    activities_grouped
+        Grouped list of activities
+    timestamp_key
+        Timestamp key
+    start_timestamp_key
+        Start timestamp key (events start)
+
+    Returns
+    ---------------
+    end_times
+        List of NumPy arrays (one per activity) containing the timestamps of the events
+    start_times
+        List of NumPy arrays (one per activity) containing the start timestamps of the events
+    """
+    end_times = [np.array([x[timestamp_key] for x in activities_grouped[act]], dtype=np.float64) for act in
+                 activities]
+    start_times = [np.array([x[start_timestamp_key] for x in activities_grouped[act]], dtype=np.float64) for act in
+                   activities]
+    return end_times, start_times
 
 
 def preprocess_log(log, activities=None, parameters=None):
@@ -164,7 +193,10 @@ def preprocess_log(log, activities=None, parameters=None):
     if activities is None:
         activities = sorted(list(set(x[activity_key] for x in transf_stream)))
 
-    activities_grouped = {x: [y for y in transf_stream if y[activity_key] == x] for x in activities}
+    activities_grouped = {x: [] for x in activities}
+    for ev in transf_stream:
+        if ev[activity_key] in activities_grouped:
+            activities_grouped[ev[activity_key]].append(ev)
 
     return transf_stream, activities_grouped, activities
 
@@ -189,27 +221,9 @@ def get_precede_succeed_matrix(activities, activities_grouped, timestamp_key, st
     precede_succeed_matrix
         Precede succeed matrix
     """
-    ret = np.zeros((len(activities), len(activities)))
-    for i in range(len(activities)):
-        ai = [x[timestamp_key] for x in activities_grouped[activities[i]]]
-        if ai:
-            for j in range(len(activities)):
-                if not i == j:
-                    aj = [x[start_timestamp_key] for x in activities_grouped[activities[j]]]
-                    if aj:
-                        k = 0
-                        z = 0
-                        count = 0
-                        while k < len(ai):
-                            while z < len(aj):
-                                if ai[k] < aj[z]:
-                                    break
-                                z = z + 1
-                            count = count + (len(aj) - z)
-                            k = k + 1
-                        ret[i, j] = count / float(len(ai) * len(aj))
-
-    return ret
+    end_times, start_times = get_times_arrays(activities, activities_grouped, timestamp_key, start_timestamp_key)
+
+    return cm_util.get_PS_dur_matrix_from_times(end_times, start_times)[0]
 
 
 def get_duration_matrix(activities, activities_grouped, timestamp_key, start_timestamp_key, exact=False):
@@ -234,14 +248,6 @@ def get_duration_matrix(activities, activities_grouped, timestamp_key, start_tim
     duration_matrix
         Duration matrix
     """
-    # greedy algorithm
-    ret = np.zeros((len(activities), len(activities)))
-    for i in range(len(activities)):
-        ai = [x[timestamp_key] for x in activities_grouped[activities[i]]]
-        if ai:
-            for j in range(len(activities)):
-                if not i == j:
-                    aj = [x[start_timestamp_key] for x in activities_grouped[activities[j]]]
-                    if aj:
-                        ret[i, j] = cm_util.match_return_avg_time(ai, aj, exact=exact)
-    return ret
+    end_times, start_times = get_times_arrays(activities, activities_grouped, timestamp_key, start_timestamp_key)
+
+    return cm_util.get_PS_dur_matrix_from_times(end_times, start_times, exact=exact)[1]
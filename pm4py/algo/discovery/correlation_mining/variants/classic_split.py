@@ -13,6 +13,7 @@ class Parameters(Enum):
     TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
     START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
     SAMPLE_SIZE = "sample_size"
+    CORES = "cores"
 
 
 def apply(log, parameters=None):
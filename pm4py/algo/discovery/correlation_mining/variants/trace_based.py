@@ -3,7 +3,6 @@ from enum import Enum
 from pm4py.util import constants, xes_constants
 from pm4py.objects.conversion.log import converter
 from pm4py.algo.discovery.correlation_mining import util as cm_util
-from statistics import mean
 import numpy as np
 from collections import Counter
 import pandas as pd
@@ -15,6 +14,7 @@ class Parameters(Enum):
     START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
     INDEX_KEY = "index_key"
+    CORES = "cores"
 
 
 DEFAULT_INDEX_KEY = "@@@index"
@@ -101,11 +101,49 @@ def get_PS_duration_matrix(activities, trace_grouped_list, parameters=None):
                                                xes_constants.DEFAULT_TIMESTAMP_KEY)
     start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters,
                                                      xes_constants.DEFAULT_TIMESTAMP_KEY)
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
 
-    PS_matrix = get_precede_succeed_matrix(activities, trace_grouped_list, timestamp_key, start_timestamp_key)
-    duration_matrix = get_duration_matrix(activities, trace_grouped_list, timestamp_key, start_timestamp_key)
+    end_times, start_times, cases = get_times_arrays(activities, trace_grouped_list, timestamp_key,
+                                                     start_timestamp_key)
 
-    return PS_matrix, duration_matrix
+    return cm_util.get_PS_dur_matrix_from_times(end_times, start_times, cases=cases, cores=cores)
+
+
+def get_times_arrays(activities, trace_grouped_list, timestamp_key, start_timestamp_key):
+    """
+    Gets, for each activity, the NumPy arrays of the (end) timestamps, of the start timestamps
+    and of the indexes of the traces of its events
+
+    Parameters
+    --------------
+    activities
+        Sorted list of activities of the log_skeleton
+    trace_grouped_list
+        A list of lists of lists, containing for each trace and each activity the events having such activity
+    timestamp_key
+        The key to be used as timestamp
+    start_timestamp_key
+        The key to be used as start timestamp
+
+    Returns
+    --------------
+    end_times
+        List of NumPy arrays (one per activity) containing the timestamps of the events
+    start_times
+        List of NumPy arrays (one per activity) containing the start timestamps of the events
+    cases
+        List of NumPy arrays (one per activity) containing the index of the trace of the events
+    """
+    end_times = []
+    start_times = []
+    cases = []
+    for i in range(len(activities)):
+        end_times.append(
+            np.array([x[timestamp_key] for tr in trace_grouped_list for x in tr[i]], dtype=np.float64))
+        start_times.append(
+            np.array([x[start_timestamp_key] for tr in trace_grouped_list for x in tr[i]], dtype=np.float64))
+        cases.append(np.array([idx for idx, tr in enumerate(trace_grouped_list) for x in tr[i]], dtype=np.int64))
+    return end_times, start_times, cases
 
 
 def preprocess_log(log, activities=None, activities_counter=None, parameters=None):
@@ -163,12 +201,13 @@ def preprocess_log(log, activities=None, activities_counter=None, parameters=Non
     if activities is None:
         activities = sorted(list(set(y[activity_key] for x in traces_list for y in x)))
 
+    activities_idx = {act: idx for idx, act in enumerate(activities)}
     trace_grouped_list = []
     for trace in traces_list:
-        gr = []
-        for act in activities:
-            act_gr = [x for x in trace if x[activity_key] == act]
-            gr.append(act_gr)
+        gr = [[] for _ in activities]
+        for x in trace:
+            if x[activity_key] in activities_idx:
+                gr[activities_idx[x[activity_key]]].append(x)
         trace_grouped_list.append(gr)
 
     if activities_counter is None:
@@ -197,29 +236,10 @@ def get_precede_succeed_matrix(activities, trace_grouped_list, timestamp_key, st
     mat
         The precede succeed matrix
     """
-    ret = np.zeros((len(activities), len(activities)))
-    for i in range(len(activities)):
-        for j in range(len(activities)):
-            if not i == j:
-                count = 0
-                total = 0
-                for tr in trace_grouped_list:
-                    ai = [x[timestamp_key] for x in tr[i]]
-                    aj = [x[start_timestamp_key] for x in tr[j]]
-                    if ai and aj:
-                        total += len(ai) * len(aj)
-                        k = 0
-                        z = 0
-                        while k < len(ai):
-                            while z < len(aj):
-                                if ai[k] < aj[z]:
-                                    break
-                                z = z + 1
-                            count = count + (len(aj) - z)
-                            k = k + 1
-                if total > 0:
-                    ret[i, j] = count / float(total)
-    return ret
+    end_times, start_times, cases = get_times_arrays(activities, trace_grouped_list, timestamp_key,
+                                                     start_timestamp_key)
+
+    return cm_util.get_PS_dur_matrix_from_times(end_times, start_times, cases=cases)[0]
 
 
 def get_duration_matrix(activities, trace_grouped_list, timestamp_key, start_timestamp_key):
@@ -242,19 +262,7 @@ def get_duration_matrix(activities, trace_grouped_list, timestamp_key, start_tim
     mat
         The duration matrix
     """
-    ret = np.zeros((len(activities), len(activities)))
-    for i in range(len(activities)):
-        for j in range(len(activities)):
-            if not i == j:
-                tm0 = []
-                tm1 = []
-                for tr in trace_grouped_list:
-                    ai = [x[timestamp_key] for x in tr[i]]
-                    aj = [x[start_timestamp_key] for x in tr[j]]
-                    if ai and aj:
-                        tm0 = cm_util.calculate_time_match_fifo(ai, aj, times0=tm0)
-                        tm1 = cm_util.calculate_time_match_rlifo(ai, aj, times1=tm1)
-                td0 = mean([x[1] - x[0] for x in tm0]) if tm0 else 0
-                td1 = mean([x[1] - x[0] for x in tm1]) if tm1 else 0
-                ret[i, j] = min(td0, td1)
-    return ret
+    end_times, start_times, cases = get_times_arrays(activities, trace_grouped_list, timestamp_key,
+                                                     start_timestamp_key)
+
+    return cm_util.get_PS_dur_matrix_from_times(end_times, start_times, cases=cases)[1]
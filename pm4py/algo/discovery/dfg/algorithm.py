@@ -2,7 +2,7 @@ from pm4py import util as pmutil
 from pm4py.algo.discovery.dfg.variants import native, performance, freq_triples
 from pm4py.objects.conversion.log import converter as log_conversion
 from pm4py.util import xes_constants as xes_util
-from pm4py.util import exec_utils
+from pm4py.util import exec_utils, instrumentation
 from pm4py.algo.discovery.parameters import Parameters
 from enum import Enum
 import pkgutil
@@ -29,6 +29,7 @@ DEFAULT_VARIANT = Variants.NATIVE
 VERSIONS = {DFG_NATIVE, DFG_FREQUENCY, DFG_PERFORMANCE, DFG_FREQUENCY_GREEDY, DFG_PERFORMANCE_GREEDY, FREQ_TRIPLES}
 
 
+@instrumentation.phased("discovery.dfg")
 def apply(log, parameters=None, variant=DEFAULT_VARIANT):
     """
     Calculates DFG graph (frequency or performance) starting from a log_skeleton
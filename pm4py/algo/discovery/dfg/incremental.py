@@ -0,0 +1,372 @@
+import math
+from collections import Counter
+from copy import deepcopy
+from datetime import timezone
+from enum import Enum
+
+from pm4py.util import exec_utils, constants, xes_constants, pandas_utils
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
+    TRACE_ID_KEY = "trace_id_key"
+
+
+# positions of the information stored for each open case
+FIRST_ACTIVITY = 0
+FIRST_START_TIMESTAMP = 1
+LAST_ACTIVITY = 2
+LAST_TIMESTAMP = 3
+
+# positions of the performance aggregates stored for each arc
+PERF_COUNT = 0
+PERF_SUM = 1
+PERF_SUM_SQUARES = 2
+PERF_MIN = 3
+PERF_MAX = 4
+
+
+def utc_seconds(timestamp):
+    """
+    Gets the POSIX time (in seconds) of a timestamp, reading naive timestamps as UTC
+    (as done for the datetime64 columns of the dataframes)
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+class IncrementalDfg(object):
+    """
+    Persistent state of the discovery of a directly-follows graph, which can be updated with
+    batches of events (appended to the previously received ones) without recomputing the DFG from scratch.
+
+    The state contains:
+    - the frequency of each arc of the DFG
+    - the performance aggregates of each arc (count, sum, sum of squares, min and max of the flow time in seconds),
+      from which the mean, the sum, the min, the max and the standard deviation can be obtained
+    - the count of the start activities and of the end activities (the end activity of a case is
+      the last activity seen so far for the case)
+    - for each open case, the first and the last event that have been seen (activity and timestamp)
+
+    The events of a case are expected to arrive in batches that respect the order of the case.
+    """
+
+    def __init__(self, parameters=None):
+        if parameters is None:
+            parameters = {}
+
+        self.activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters,
+                                                       xes_constants.DEFAULT_NAME_KEY)
+        self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters,
+                                                      constants.CASE_CONCEPT_NAME)
+        self.timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters,
+                                                        xes_constants.DEFAULT_TIMESTAMP_KEY)
+        self.start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters,
+                                                              None)
+        self.trace_id_key = exec_utils.get_param_value(Parameters.TRACE_ID_KEY, parameters,
+                                                       xes_constants.DEFAULT_TRACEID_KEY)
+
+        self.dfg = Counter()
+        self.performance = {}
+        self.start_activities = Counter()
+        self.end_activities = Counter()
+        self.open_cases = {}
+
+    def __add_arc(self, arc, count, perf_sum, perf_sum_squares, perf_min, perf_max):
+        self.dfg[arc] += count
+        if arc not in self.performance:
+            self.performance[arc] = [count, perf_sum, perf_sum_squares, perf_min, perf_max]
+        else:
+            perf = self.performance[arc]
+            perf[PERF_COUNT] += count
+            perf[PERF_SUM] += perf_sum
+            perf[PERF_SUM_SQUARES] += perf_sum_squares
+            perf[PERF_MIN] = min(perf[PERF_MIN], perf_min)
+            perf[PERF_MAX] = max(perf[PERF_MAX], perf_max)
+
+    def __add_flow(self, arc, flow_time):
+        flow_time = max(0.0, flow_time)
+        self.__add_arc(arc, 1, flow_time, flow_time * flow_time, flow_time, flow_time)
+
+    def __append_case(self, case, first_activity, first_start_timestamp, last_activity, last_timestamp):
+        """
+        Appends the (first and last) events of a case in the batch to the state
+        """
+        if case in self.open_cases:
+            info = self.open_cases[case]
+            self.__add_flow((info[LAST_ACTIVITY], first_activity), first_start_timestamp - info[LAST_TIMESTAMP])
+            self.end_activities[info[LAST_ACTIVITY]] -= 1
+            if self.end_activities[info[LAST_ACTIVITY]] <= 0:
+                del self.end_activities[info[LAST_ACTIVITY]]
+            info[LAST_ACTIVITY] = last_activity
+            info[LAST_TIMESTAMP] = last_timestamp
+        else:
+            self.start_activities[first_activity] += 1
+            self.open_cases[case] = [first_activity, first_start_timestamp, last_activity, last_timestamp]
+        self.end_activities[last_activity] += 1
+
+    def update(self, batch):
+        """
+        Updates the state with a batch of events
+
+        Parameters
+        --------------
+        batch
+            Batch of events (Pandas dataframe or event log)
+
+        Returns
+        --------------
+        self
+            The updated state
+        """
+        if pandas_utils.check_is_dataframe(batch):
+            self.__update_dataframe(batch)
+        else:
+            self.__update_log(batch)
+        return self
+
+    def __update_log(self, log):
+        start_timestamp_key = self.start_timestamp_key if self.start_timestamp_key is not None else \
+            self.timestamp_key
+        for trace in log:
+            events = [ev for ev in trace if self.activity_key in ev]
+            if not events:
+                continue
+            for i in range(1, len(events)):
+                self.__add_flow((events[i - 1][self.activity_key], events[i][self.activity_key]),
+                                (events[i][start_timestamp_key] - events[i - 1][self.timestamp_key]).total_seconds())
+            if self.trace_id_key not in trace.attributes:
+                # without an identifier, the trace cannot be continued by the following batches
+                self.start_activities[events[0][self.activity_key]] += 1
+                self.end_activities[events[-1][self.activity_key]] += 1
+                continue
+            case = trace.attributes[self.trace_id_key]
+            self.__append_case(case, events[0][self.activity_key], utc_seconds(events[0][start_timestamp_key]),
+                               events[-1][self.activity_key], utc_seconds(events[-1][self.timestamp_key]))
+
+    def __update_dataframe(self, df):
+        import numpy as np
+        from pm4py.objects.log.util import dataframe_utils
+
+        start_timestamp_key = self.start_timestamp_key if self.start_timestamp_key is not None else \
+            self.timestamp_key
+        timest_columns = list({self.timestamp_key, start_timestamp_key})
+        df = df[list(dict.fromkeys([self.case_id_key, self.activity_key] + timest_columns))].dropna()
+        if len(df) == 0:
+            return
+        df = dataframe_utils.convert_timestamp_columns_in_df(df, timest_columns=timest_columns)
+        df = df.sort_values([self.case_id_key, start_timestamp_key, self.timestamp_key], kind="mergesort")
+
+        cases = df[self.case_id_key].values
+        activities = df[self.activity_key].values
+        complete = df[self.timestamp_key].values.astype("datetime64[ns]").astype(np.int64) / 10 ** 9
+        start = df[start_timestamp_key].values.astype("datetime64[ns]").astype(np.int64) / 10 ** 9
+
+        # arcs inside the batch (between successive events of the same case)
+        same_case = cases[1:] == cases[:-1]
+        if np.any(same_case):
+            import pandas as pd
+            flow = np.maximum(0.0, start[1:][same_case] - complete[:-1][same_case])
+            arcs = pd.DataFrame({"s": activities[:-1][same_case], "t": activities[1:][same_case], "f": flow,
+                                 "f2": flow * flow})
+            grouped = arcs.groupby(["s", "t"])
+            agg = pd.concat([grouped["f"].agg(["size", "sum", "min", "max"]), grouped["f2"].sum()], axis=1)
+            for (s, t), row in zip(agg.index, agg.values):
+                self.__add_arc((s, t), int(row[0]), float(row[1]), float(row[4]), float(row[2]), float(row[3]))
+
+        # first and last event of each case in the batch
+        first = np.concatenate([[0], np.flatnonzero(~same_case) + 1])
+        last = np.append(first[1:] - 1, len(cases) - 1)
+        # (Python objects are kept in the state, in order to keep it serializable)
+        cases = cases.tolist()
+        activities = activities.tolist()
+        for f, l in zip(first.tolist(), last.tolist()):
+            self.__append_case(cases[f], activities[f], float(start[f]), activities[l], float(complete[l]))
+
+    def merge(self, other):
+        """
+        Merges another state into the current one.
+
+        The other state could be computed on a different set of cases (shard by case) or
+        on the events following the ones of the current state (shard by time);
+        in the second case, the last event of the open cases of the current state is connected
+        to the first event of the same case in the other state.
+
+        Parameters
+        --------------
+        other
+            Other state
+
+        Returns
+        --------------
+        self
+            The merged state
+        """
+        for arc, perf in other.performance.items():
+            self.__add_arc(arc, perf[PERF_COUNT], perf[PERF_SUM], perf[PERF_SUM_SQUARES], perf[PERF_MIN],
+                           perf[PERF_MAX])
+        self.start_activities.update(other.start_activities)
+        self.end_activities.update(other.end_activities)
+        for case, info in other.open_cases.items():
+            if case in self.open_cases:
+                # the other state started the case: it is actually a continuation of the case
+                self.start_activities[info[FIRST_ACTIVITY]] -= 1
+                if self.start_activities[info[FIRST_ACTIVITY]] <= 0:
+                    del self.start_activities[info[FIRST_ACTIVITY]]
+                self.__append_case(case, info[FIRST_ACTIVITY], info[FIRST_START_TIMESTAMP], info[LAST_ACTIVITY],
+                                   info[LAST_TIMESTAMP])
+                # the end activity of the case has been already counted by the other state
+                self.end_activities[info[LAST_ACTIVITY]] -= 1
+                if self.end_activities[info[LAST_ACTIVITY]] <= 0:
+                    del self.end_activities[info[LAST_ACTIVITY]]
+            else:
+                self.open_cases[case] = list(info)
+        return self
+
+    def close_cases(self, cases):
+        """
+        Removes the given cases from the open cases, releasing their memory.
+        The contribution of the cases to the DFG, and to the start/end activities, is kept
+
+        Parameters
+        --------------
+        cases
+            Identifiers of the cases to close
+        """
+        for case in cases:
+            if case in self.open_cases:
+                del self.open_cases[case]
+
+    def snapshot(self):
+        """
+        Gets the current DFG along with the start and end activities
+
+        Returns
+        --------------
+        dfg
+            Frequency DFG
+        start_activities
+            Start activities
+        end_activities
+            End activities
+        """
+        return dict(self.dfg), dict(self.start_activities), dict(self.end_activities)
+
+    def performance_dfg(self, aggregation_measure="mean"):
+        """
+        Gets the performance DFG from the aggregates stored in the state
+
+        Parameters
+        --------------
+        aggregation_measure
+            Aggregation measure (mean, sum, min, max, stdev); the median cannot be computed incrementally
+
+        Returns
+        --------------
+        dfg
+            Performance DFG
+        """
+        ret = {}
+        for arc, perf in self.performance.items():
+            count = perf[PERF_COUNT]
+            if aggregation_measure == "sum":
+                ret[arc] = perf[PERF_SUM]
+            elif aggregation_measure == "min":
+                ret[arc] = perf[PERF_MIN]
+            elif aggregation_measure == "max":
+                ret[arc] = perf[PERF_MAX]
+            elif aggregation_measure == "stdev":
+                if count > 1:
+                    variance = (perf[PERF_SUM_SQUARES] - perf[PERF_SUM] * perf[PERF_SUM] / count) / (count - 1)
+                    ret[arc] = math.sqrt(max(0.0, variance))
+                else:
+                    ret[arc] = 0.0
+            elif aggregation_measure == "mean":
+                ret[arc] = perf[PERF_SUM] / count
+            else:
+                raise Exception("aggregation measure not supported by the incremental DFG: " + str(aggregation_measure))
+        return ret
+
+    def to_dict(self):
+        """
+        Serializes the state into a dictionary of (JSON-serializable) lists, that can be checkpointed
+
+        Returns
+        --------------
+        dictio
+            Dictionary representing the state
+        """
+        return {"activity_key": self.activity_key, "case_id_key": self.case_id_key,
+                "timestamp_key": self.timestamp_key, "start_timestamp_key": self.start_timestamp_key,
+                "trace_id_key": self.trace_id_key,
+                "dfg": [[arc[0], arc[1], count] for arc, count in self.dfg.items()],
+                "performance": [[arc[0], arc[1]] + list(perf) for arc, perf in self.performance.items()],
+                "start_activities": [[act, count] for act, count in self.start_activities.items()],
+                "end_activities": [[act, count] for act, count in self.end_activities.items()],
+                "open_cases": [[case] + list(info) for case, info in self.open_cases.items()]}
+
+    @staticmethod
+    def from_dict(dictio):
+        """
+        Restores a state from its dictionary representation
+
+        Parameters
+        --------------
+        dictio
+            Dictionary representing the state (obtained through to_dict)
+
+        Returns
+        --------------
+        state
+            State
+        """
+        state = IncrementalDfg(parameters={Parameters.ACTIVITY_KEY: dictio["activity_key"],
+                                           Parameters.CASE_ID_KEY: dictio["case_id_key"],
+                                           Parameters.TIMESTAMP_KEY: dictio["timestamp_key"],
+                                           Parameters.START_TIMESTAMP_KEY: dictio["start_timestamp_key"],
+                                           Parameters.TRACE_ID_KEY: dictio["trace_id_key"]})
+        state.dfg = Counter({(x[0], x[1]): x[2] for x in dictio["dfg"]})
+        state.performance = {(x[0], x[1]): list(x[2:]) for x in dictio["performance"]}
+        state.start_activities = Counter({x[0]: x[1] for x in dictio["start_activities"]})
+        state.end_activities = Counter({x[0]: x[1] for x in dictio["end_activities"]})
+        # JSON deserialization transforms the tuples into lists
+        state.open_cases = {(tuple(x[0]) if type(x[0]) is list else x[0]): list(x[1:]) for x in
+                            dictio["open_cases"]}
+        return state
+
+    def __copy__(self):
+        return IncrementalDfg.from_dict(deepcopy(self.to_dict()))
+
+
+def apply(log=None, parameters=None):
+    """
+    Creates a state for the incremental discovery of the DFG (possibly initialized with a log/dataframe)
+
+    Parameters
+    --------------
+    log
+        (If provided) initial batch of events (Pandas dataframe or event log)
+    parameters
+        Parameters of the algorithm, including:
+            - Parameters.ACTIVITY_KEY => the attribute to use as activity
+            - Parameters.CASE_ID_KEY => the column to use as case identifier (dataframes)
+            - Parameters.TRACE_ID_KEY => the trace attribute to use as case identifier (event logs)
+            - Parameters.TIMESTAMP_KEY => the attribute to use as (complete) timestamp
+            - Parameters.START_TIMESTAMP_KEY => the attribute to use as start timestamp
+
+    Returns
+    --------------
+    state
+        Incremental DFG state
+    """
+    if parameters is None:
+        parameters = {}
+
+    state = IncrementalDfg(parameters=parameters)
+    if log is not None:
+        state.update(log)
+    return state
@@ -1,6 +1,6 @@
 from pm4py.algo.discovery.heuristics.variants import classic
 from pm4py.objects.conversion.log import converter as log_conversion
-from pm4py.util import exec_utils
+from pm4py.util import exec_utils, instrumentation
 from enum import Enum
 import pkgutil
 
@@ -15,6 +15,7 @@ DEFAULT_VARIANT = CLASSIC
 VERSIONS = {CLASSIC}
 
 
+@instrumentation.phased("discovery.heuristics")
 def apply(log, parameters=None, variant=CLASSIC):
     """
     Discovers a Petri net using Heuristics Miner
@@ -106,6 +107,7 @@ def apply_dfg(dfg, activities=None, activities_occurrences=None, start_activitie
                                                      parameters=parameters)
 
 
+@instrumentation.phased("discovery.heuristics")
 def apply_heu(log, parameters=None, variant=CLASSIC):
     """
     Discovers an Heuristics Net using Heuristics Miner
@@ -2,7 +2,7 @@ from pm4py.algo.discovery.inductive.variants.im_d import dfg_based
 from pm4py.algo.discovery.inductive.variants.im import algorithm as im_algo
 from pm4py.algo.discovery.inductive.variants.im_f import algorithm as im_f_algo
 from enum import Enum
-from pm4py.util import exec_utils
+from pm4py.util import exec_utils, instrumentation
 
 
 class Variants(Enum):
@@ -23,6 +23,7 @@ DEFAULT_VARIANT_VARIANTS = IM
 DEFAULT_VARIANT_DFG = IMd
 
 
+@instrumentation.phased("discovery.inductive")
 def apply(log, parameters=None, variant=DEFAULT_VARIANT_LOG):
     """
     Apply the chosen IM algorithm to a log_skeleton obtaining a Petri net along with an initial and final marking
@@ -79,6 +80,7 @@ def apply_dfg(dfg, parameters=None, variant=DEFAULT_VARIANT_DFG):
     return exec_utils.get_variant(variant).apply_dfg(dfg, parameters=parameters)
 
 
+@instrumentation.phased("discovery.inductive")
 def apply_tree(log, parameters=None, variant=DEFAULT_VARIANT_LOG):
     """
     Apply the chosen IM algorithm to a log_skeleton obtaining a process tree
@@ -1,6 +1,7 @@
 from pm4py.algo.conformance.alignments import algorithm as ali
 from pm4py.algo.conformance.alignments.variants import state_equation_a_star as star
 import sys
+import numpy as np
 from pm4py.statistics.variants.log import get as variants_module
 from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
 from copy import deepcopy, copy
@@ -13,6 +14,7 @@ from pm4py.util import exec_utils
 
 class Parameters(Enum):
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    SPARSE = "sparse"
 
 
 def get_decision_tree(log, net, initial_marking, final_marking, decision_point=None, attributes=None, parameters=None):
@@ -37,7 +39,8 @@ def get_decision_tree(log, net, initial_marking, final_marking, decision_point=N
         Attributes of the log_skeleton. If not specified, then an automatic attribute selection
         is performed.
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm, including:
+            Parameters.SPARSE -> the features are encoded in a sparse matrix (default: False)
 
     Returns
     ---------------
@@ -56,7 +59,10 @@ def get_decision_tree(log, net, initial_marking, final_marking, decision_point=N
     X, y, targets = apply(log, net, initial_marking, final_marking, decision_point=decision_point,
                           attributes=attributes, parameters=parameters)
     dt = tree.DecisionTreeClassifier()
-    dt = dt.fit(X, y)
+    if exec_utils.get_param_value(Parameters.SPARSE, parameters, False):
+        dt = dt.fit(X.sparse.to_coo().tocsr(), y)
+    else:
+        dt = dt.fit(X, y)
     return dt, list(X.columns.values.tolist()), targets
 
 
@@ -83,7 +89,8 @@ def apply(log, net, initial_marking, final_marking, decision_point=None, attribu
         Attributes of the log_skeleton. If not specified, then an automatic attribute selection
         is performed.
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm, including:
+            Parameters.SPARSE -> the features are returned as dataframe having sparse columns (default: False)
 
     Returns
     ---------------
@@ -116,14 +123,67 @@ def apply(log, net, initial_marking, final_marking, decision_point=None, attribu
     for el in I[decision_point]:
         x.append({a: v for a, v in el[0].items() if a in x_attributes})
         y.append(el[1])
-    X = pd.DataFrame(x)
-    X = pd.get_dummies(data=X, columns=x_attributes)
+    if exec_utils.get_param_value(Parameters.SPARSE, parameters, False):
+        X = get_sparse_dummies(x, x_attributes)
+    else:
+        X = pd.DataFrame(x)
+        X = pd.get_dummies(data=X, columns=x_attributes)
     Y = pd.DataFrame(y, columns=["Name"])
     Y, targets = encode_target(Y, "Name")
     y = Y['Target']
     return X, y, targets
 
 
+def get_sparse_dummies(rows, attributes):
+    """
+    One-hot encodes the values of the attributes (as pandas.get_dummies), without building the dense matrix
+
+    Parameters
+    --------------
+    rows
+        List of dictionaries (associating to some attributes a value)
+    attributes
+        Attributes to encode
+
+    Returns
+    --------------
+    X
+        Dataframe having a sparse column for each attribute value (named attribute_value)
+    """
+    import pandas as pd
+    from scipy.sparse import csr_matrix
+
+    attributes_idx = {a: i for i, a in enumerate(attributes)}
+    values = [{} for a in attributes]
+    indptr = [0]
+    indices = []
+    for row in rows:
+        for a, v in row.items():
+            if a in attributes_idx and v is not None and v == v:
+                attr_values = values[attributes_idx[a]]
+                if v not in attr_values:
+                    attr_values[v] = None
+                indices.append((attributes_idx[a], v))
+        indptr.append(len(indices))
+
+    columns = []
+    column_names = []
+    for i, attr_values in enumerate(values):
+        try:
+            attr_values = sorted(attr_values)
+        except TypeError:
+            attr_values = list(attr_values)
+        for v in attr_values:
+            columns.append((i, v))
+            column_names.append(str(attributes[i]) + "_" + str(v))
+    columns_idx = {c: j for j, c in enumerate(columns)}
+
+    matrix = csr_matrix((np.ones(len(indices), dtype=np.uint8), [columns_idx[c] for c in indices], indptr),
+                        shape=(len(rows), len(columns)))
+    matrix.sort_indices()
+    return pd.DataFrame.sparse.from_spmatrix(matrix, columns=column_names)
+
+
 def get_decisions_table(log0, net, initial_marking, final_marking, attributes=None, use_trace_attributes=False, k=1,
                         pre_decision_points=None, trace_attributes=None, parameters=None):
     """
@@ -241,9 +301,11 @@ def prepare_event_log(log):
         for attribute in attributes:
             trace.attributes["t_" + attribute] = trace.attributes.pop(attribute)
         for event in trace:
-            attributes = event._dict.copy()
+            attributes = list(event)
             for attribute in attributes:
-                event._dict["e_" + attribute] = event._dict.pop(attribute)
+                value = event[attribute]
+                del event[attribute]
+                event["e_" + attribute] = value
     return log
 
 
@@ -1,3 +1,4 @@
+import heapq
 from collections import Counter
 import numpy as np
 from pm4py.util import exec_utils
@@ -11,6 +12,10 @@ class Parameters(Enum):
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
 
 
+# maximum difference between the exact similarity and the one computed by find_role_similarity
+SIMILARITY_TOLERANCE = 1e-9
+
+
 def get_sum_from_dictio_values(dictio, parameters=None):
     """
     Get the sum of a dictionary values
@@ -209,7 +214,13 @@ def aggregate_roles_iteration(roles, parameters=None):
 
 def aggregate_roles_algorithm(roles, parameters=None):
     """
-    Algorithm to aggregate similar roles
+    Algorithm to aggregate similar roles: the two most similar roles are merged (the ties are broken by the names
+    of the activities), as long as their similarity exceeds the threshold.
+
+    The result is the same as repeatedly applying aggregate_roles_iteration, but the similarities are computed
+    in a vectorized way on the resources counts (for two roles having counts c1, c2 with totals s1, s2,
+    the similarity is sum(min(c1 * s2, c2 * s1)) / sum(max(c1 * s2, c2 * s1)), that is exact in integer arithmetic),
+    only once for each couple of roles, and the couples exceeding the threshold are kept in a heap.
 
     Parameters
     --------------
@@ -223,11 +234,86 @@ def aggregate_roles_algorithm(roles, parameters=None):
     agg_roles
         (Aggregated) roles
     """
-    found_feasible = True
-    while found_feasible:
-        roles, found_feasible = aggregate_roles_iteration(roles, parameters=parameters)
+    threshold = exec_utils.get_param_value(Parameters.ROLES_THRESHOLD_PARAMETER, parameters, 0.65)
 
-    return roles
+    if len(roles) < 2:
+        return roles
+
+    resources_idx = {}
+    for role in roles:
+        for res in role[1]:
+            if res not in resources_idx:
+                resources_idx[res] = len(resources_idx)
+
+    # each merge creates a new role
+    max_roles = 2 * len(roles) - 1
+    counts = np.zeros((max_roles, len(resources_idx)), dtype=np.int64)
+    totals = np.zeros(max_roles, dtype=np.int64)
+    alive = np.zeros(max_roles, dtype=bool)
+    activities = []
+    multisets = []
+    names = []
+    candidates = []
+
+    def add_role(role):
+        i = len(activities)
+        for res, count in role[1].items():
+            counts[i, resources_idx[res]] = count
+        totals[i] = counts[i].sum()
+        activities.append(role[0])
+        multisets.append(role[1])
+        names.append(",".join(role[0]))
+        return i
+
+    def push_candidates(i, others):
+        if len(others) == 0:
+            return
+        columns = np.flatnonzero(counts[i])
+        scaled_i = counts[i, columns][np.newaxis, :] * totals[others][:, np.newaxis]
+        scaled_others = counts[np.ix_(others, columns)] * totals[i]
+        num = np.minimum(scaled_i, scaled_others).sum(axis=1)
+        sim = num / (2 * totals[i] * totals[others] - num)
+        for k in np.flatnonzero(sim > threshold - SIMILARITY_TOLERANCE):
+            j = int(others[k])
+            if names[i] < names[j]:
+                heapq.heappush(candidates, (-float(sim[k]), names[i], names[j], i, j))
+            else:
+                heapq.heappush(candidates, (-float(sim[k]), names[j], names[i], j, i))
+
+    for role in roles:
+        add_role(role)
+    alive[:len(roles)] = True
+    for i in range(len(roles)):
+        push_candidates(i, np.arange(i + 1, len(roles)))
+
+    while candidates:
+        # the candidates having (almost) the maximum similarity are compared using the similarity
+        # provided by find_role_similarity, so the floating point ties are broken as in aggregate_roles_iteration
+        top = []
+        while candidates and (not top or candidates[0][0] <= top[0][0] + SIMILARITY_TOLERANCE):
+            candidate = heapq.heappop(candidates)
+            if alive[candidate[3]] and alive[candidate[4]]:
+                top.append(candidate)
+        if not top:
+            break
+        best = min(top, key=lambda x: (-find_role_similarity(
+            [[activities[x[3]], multisets[x[3]]], [activities[x[4]], multisets[x[4]]]], 0, 1,
+            parameters=parameters), x[1], x[2]))
+        if find_role_similarity([[activities[best[3]], multisets[best[3]]], [activities[best[4]], multisets[best[4]]]],
+                                0, 1, parameters=parameters) <= threshold:
+            break
+        for candidate in top:
+            if candidate is not best:
+                heapq.heappush(candidates, candidate)
+        i, j = best[3], best[4]
+        alive[i] = False
+        alive[j] = False
+        k = add_role([sorted(list(set(activities[i]).union(set(activities[j])))),
+                      Counter(multisets[i] + multisets[j])])
+        push_candidates(k, np.flatnonzero(alive[:k]))
+        alive[k] = True
+
+    return sorted([[activities[i], multisets[i]] for i in np.flatnonzero(alive)], key=lambda x: ",".join(x[0]))
 
 
 def get_initial_roles(res_act_couples, parameters=None):
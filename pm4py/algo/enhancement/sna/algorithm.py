@@ -7,6 +7,7 @@ from pm4py.algo.enhancement.sna.parameters import Parameters
 from pm4py.util import exec_utils
 from enum import Enum
 import numpy as np
+from scipy.sparse import issparse
 
 
 class Variants(Enum):
@@ -29,7 +30,10 @@ def apply(log, parameters=None, variant=Variants.HANDOVER_LOG):
     log
         Log
     parameters
-        Possible parameters of the algorithm
+        Possible parameters of the algorithm, including:
+            Parameters.METRIC_NORMALIZATION -> divides the metric by its maximum absolute value (default: False)
+            Parameters.SPARSE -> (handover, working together, subcontracting) returns the metric as a (CSR)
+            sparse matrix (default: False)
     variant
         Variant of the algorithm to apply. Possible values:
             - Variants.HANDOVER_LOG
@@ -55,7 +59,10 @@ def apply(log, parameters=None, variant=Variants.HANDOVER_LOG):
                    Variants.SUBCONTRACTING_LOG]:
         log = log_conversion.apply(log, parameters=parameters)
     sna = exec_utils.get_variant(variant).apply(log, parameters=parameters)
-    abs_max = np.max(np.abs(sna[0]))
+    if issparse(sna[0]):
+        abs_max = abs(sna[0]).max()
+    else:
+        abs_max = np.max(np.abs(sna[0]))
     if enable_metric_normalization and abs_max > 0:
         sna[0] = sna[0] / abs_max
     return sna
@@ -6,3 +6,4 @@ class Parameters(Enum):
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     RESOURCE_KEY = constants.PARAMETER_CONSTANT_RESOURCE_KEY
     METRIC_NORMALIZATION = "metric_normalization"
+    SPARSE = "sparse"
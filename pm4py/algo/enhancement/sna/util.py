@@ -0,0 +1,234 @@
+import numpy as np
+
+from pm4py.objects.log.util import variants_util
+from pm4py.util import instrumentation
+
+
+class EncodedResources(object):
+    """
+    Array-backed representation of the resource sequences (variants) of a log.
+
+    The resources are factorized once (codes are the indices in the sorted list of resources) and the sequences
+    are concatenated in a flat array of codes; offsets[i]:offsets[i + 1] are the positions of the i-th sequence,
+    and weights[i] its number of occurrences in the log.
+    """
+
+    def __init__(self, resources, codes, offsets, weights):
+        self.resources = resources
+        self.codes = codes
+        self.offsets = offsets
+        self.weights = weights
+        self.lengths = np.diff(offsets)
+        # sequence, and position inside the sequence, of each element of the flat array
+        self.sequences = np.repeat(np.arange(len(weights), dtype=np.int64), self.lengths)
+        self.positions = np.arange(len(codes), dtype=np.int64) - offsets[self.sequences]
+
+    def __len__(self):
+        return len(self.weights)
+
+    def get_dividend(self):
+        """
+        Gets the number of (weighted) couples of consecutive elements of the sequences
+        """
+        return float(np.sum(self.weights * (self.lengths - 1)))
+
+
+def from_encoded_variants(encoded_variants, order=None):
+    """
+    Gets the array-backed representation of the resource sequences from the integer-coded variants
+
+    Parameters
+    -------------
+    encoded_variants
+        Integer-coded variants (whose activities are the resources)
+    order
+        (If provided) order in which the variants are stored
+
+    Returns
+    -------------
+    encoded_resources
+        Encoded resources
+    """
+    if order is None:
+        order = range(len(encoded_variants.variants))
+    variants = [encoded_variants.variants[i] for i in order]
+    weights = np.array([encoded_variants.counts[i] for i in order], dtype=np.int64)
+    lengths = np.array([len(v) for v in variants], dtype=np.int64)
+    offsets = np.zeros(len(variants) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codes = np.fromiter((c for v in variants for c in v), dtype=np.int64, count=int(offsets[-1]))
+
+    # the codes are translated into the indices in the sorted list of the (occurring) resources
+    occurring = np.unique(codes)
+    names = [encoded_variants.activities[c] for c in occurring]
+    sorted_idx = sorted(range(len(names)), key=lambda i: names[i])
+    translation = np.zeros(len(encoded_variants.activities), dtype=np.int64)
+    translation[occurring[sorted_idx]] = np.arange(len(sorted_idx), dtype=np.int64)
+
+    return EncodedResources([names[i] for i in sorted_idx], translation[codes], offsets, weights)
+
+
+def apply(log, resource_key, by_frequency=False):
+    """
+    Gets the array-backed representation of the resource sequences of an event log / dataframe
+
+    Parameters
+    -------------
+    log
+        Event log / dataframe
+    resource_key
+        Attribute to be used as resource
+    by_frequency
+        Stores the variants by decreasing number of occurrences (otherwise, in order of first occurrence)
+
+    Returns
+    -------------
+    encoded_resources
+        Encoded resources
+    """
+    encoded_variants = variants_util.apply(log, parameters={variants_util.Parameters.ACTIVITY_KEY: resource_key})
+    order = None
+    if by_frequency:
+        order = sorted(range(len(encoded_variants.variants)),
+                       key=lambda x: (encoded_variants.counts[x], encoded_variants.decode(x)), reverse=True)
+    return from_encoded_variants(encoded_variants, order=order)
+
+
+def __accumulate(rows, cols, values, no_resources, sparse):
+    """
+    Sums the values in a (no_resources x no_resources) matrix at the given positions
+    """
+    if sparse:
+        from scipy.sparse import coo_matrix
+        return coo_matrix((values, (rows, cols)), shape=(no_resources, no_resources), dtype=float).tocsr()
+    matrix = np.zeros((no_resources, no_resources))
+    np.add.at(matrix, (rows, cols), values)
+    return matrix
+
+
+def handover(encoded_resources, beta=0, sparse=False):
+    """
+    Calculates the Handover of Work metric: for each couple of positions (i, j > i) of a sequence,
+    the resource at j receives work from the resource at i, weighted by beta^(j-i-1)
+    (with beta equal to 0, only the consecutive positions are considered)
+
+    Parameters
+    -------------
+    encoded_resources
+        Encoded resources
+    beta
+        Beta value as described in the Wil SNA paper
+    sparse
+        Returns a CSR matrix instead of a dense array
+
+    Returns
+    -------------
+    metric_matrix
+        Metric matrix
+    """
+    codes = encoded_resources.codes
+    weights = encoded_resources.weights[encoded_resources.sequences].astype(float)
+    # remaining positions after each element of the flat array
+    remaining = encoded_resources.lengths[encoded_resources.sequences] - encoded_resources.positions - 1
+    max_distance = int(remaining.max()) if len(remaining) > 0 else 0
+    if beta == 0:
+        max_distance = min(max_distance, 1)
+
+    rows = []
+    cols = []
+    values = []
+    with instrumentation.phase("sna.handover"):
+        for d in range(1, max_distance + 1):
+            idx = np.flatnonzero(remaining >= d)
+            rows.append(codes[idx])
+            cols.append(codes[idx + d])
+            values.append(weights[idx] * (beta ** (d - 1)) if beta != 0 else weights[idx])
+        matrix = __accumulate(np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64),
+                              np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64),
+                              np.concatenate(values) if values else np.zeros(0),
+                              len(encoded_resources.resources), sparse)
+
+    dividend = encoded_resources.get_dividend()
+    if dividend != 0:
+        matrix = matrix / dividend
+    return matrix
+
+
+def subcontracting(encoded_resources, n=2, sparse=False):
+    """
+    Calculates the Subcontracting metric: a resource subcontracts work to the resources between two
+    of its occurrences at distance n.
+    For each resource, only its first subcontracting (in order of the sequences) is considered.
+
+    Parameters
+    -------------
+    encoded_resources
+        Encoded resources
+    n
+        n of the algorithm proposed in the Wil SNA paper
+    sparse
+        Returns a CSR matrix instead of a dense array
+
+    Returns
+    -------------
+    metric_matrix
+        Metric matrix
+    """
+    codes = encoded_resources.codes
+    remaining = encoded_resources.lengths[encoded_resources.sequences] - encoded_resources.positions - 1
+
+    with instrumentation.phase("sna.subcontracting"):
+        idx = np.flatnonzero(remaining >= n)
+        idx = idx[codes[idx] == codes[idx + n]]
+        # first position (in the flat array) of each subcontracting resource
+        first = idx[np.unique(codes[idx], return_index=True)[1]]
+        between = (first[:, np.newaxis] + np.arange(1, max(n, 1), dtype=np.int64)[np.newaxis, :]).ravel()
+        origin = np.repeat(first, max(n - 1, 0))
+        matrix = __accumulate(codes[origin], codes[between],
+                              encoded_resources.weights[encoded_resources.sequences[origin]].astype(float),
+                              len(encoded_resources.resources), sparse)
+
+    dividend = encoded_resources.get_dividend()
+    if dividend != 0:
+        matrix = matrix / dividend
+    return matrix
+
+
+def working_together(encoded_resources, divisor, sparse=False):
+    """
+    Calculates the Working Together metric: two resources work together when they both occur in a sequence
+
+    Parameters
+    -------------
+    encoded_resources
+        Encoded resources
+    divisor
+        Number by which the (weighted) number of sequences shared by two resources is divided
+    sparse
+        Returns a CSR matrix instead of a dense array
+
+    Returns
+    -------------
+    metric_matrix
+        Metric matrix
+    """
+    from scipy.sparse import csr_matrix
+
+    no_resources = len(encoded_resources.resources)
+    with instrumentation.phase("sna.working_together"):
+        # incidence matrix between the sequences and the (distinct) resources occurring in them
+        couples = np.unique(encoded_resources.sequences * no_resources + encoded_resources.codes)
+        sequences = couples // no_resources if no_resources > 0 else couples
+        resources = couples % no_resources if no_resources > 0 else couples
+        incidence = csr_matrix((np.ones(len(couples)), (sequences, resources)),
+                               shape=(len(encoded_resources), no_resources))
+        weighted = csr_matrix((encoded_resources.weights[sequences].astype(float), (sequences, resources)),
+                              shape=(len(encoded_resources), no_resources))
+        matrix = (incidence.T @ weighted).tocsr()
+        matrix.setdiag(0)
+        matrix.eliminate_zeros()
+        matrix = matrix / float(divisor)
+
+    if sparse:
+        return matrix.tocsr()
+    return matrix.toarray()
@@ -1,3 +1,4 @@
+from pm4py.algo.enhancement.sna import util as sna_util
 from pm4py.util import xes_constants as xes
 from pm4py.util import exec_utils
 from pm4py.algo.enhancement.sna.parameters import Parameters
@@ -12,7 +13,8 @@ def apply(log, parameters=None):
     log
         Log
     parameters
-        Possible parameters of the algorithm
+        Possible parameters of the algorithm:
+            Parameters.SPARSE -> returns the metric as a (CSR) sparse matrix (default: False)
 
     Returns
     -----------
@@ -24,29 +26,10 @@ def apply(log, parameters=None):
     if parameters is None:
         parameters = {}
 
-    import numpy
-    from pm4py.statistics.traces.pandas import case_statistics
-
     resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, xes.DEFAULT_RESOURCE_KEY)
+    sparse = exec_utils.get_param_value(Parameters.SPARSE, parameters, False)
 
-    parameters_variants = {case_statistics.Parameters.ACTIVITY_KEY: resource_key,
-                           case_statistics.Parameters.ATTRIBUTE_KEY: resource_key}
-    variants_occ = {x["variant"]: x["case:concept:name"] for x in
-                    case_statistics.get_variant_statistics(log, parameters=parameters_variants)}
-    variants_resources = list(variants_occ.keys())
-    resources = [x.split(",") for x in variants_resources]
-    flat_list = sorted(list(set([item for sublist in resources for item in sublist])))
-
-    metric_matrix = numpy.zeros((len(flat_list), len(flat_list)))
-
-    for rv in resources:
-        ord_res_list = sorted(list(set(rv)))
-
-        for i in range(len(ord_res_list) - 1):
-            res_i = flat_list.index(ord_res_list[i])
-            for j in range(i + 1, len(ord_res_list)):
-                res_j = flat_list.index(ord_res_list[j])
-                metric_matrix[res_i, res_j] += float(variants_occ[",".join(rv)]) / float(len(log))
-                metric_matrix[res_j, res_i] += float(variants_occ[",".join(rv)]) / float(len(log))
+    encoded_resources = sna_util.apply(log, resource_key)
+    metric_matrix = sna_util.working_together(encoded_resources, len(log), sparse=sparse)
 
-    return [metric_matrix, flat_list, False]
+    return [metric_matrix, encoded_resources.resources, False]
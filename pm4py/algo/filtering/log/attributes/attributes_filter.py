@@ -1,3 +1,5 @@
+import numpy as np
+
 from pm4py.algo.filtering.common import filtering_constants
 from pm4py.statistics.attributes.common import get as attributes_common
 from pm4py.statistics.attributes.log.get import get_attribute_values, get_all_event_attributes_from_log, \
@@ -7,6 +9,7 @@ from pm4py.statistics.attributes.log.select import select_attributes_from_log_fo
 from pm4py.algo.filtering.log.variants import variants_filter
 from pm4py.objects.conversion.log import converter as log_converter
 from pm4py.objects.log.log import EventLog, Trace, EventStream
+from pm4py.objects.log.columnar import ColumnarEventLog
 from pm4py.util import xes_constants as xes
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 from pm4py.util.constants import PARAMETER_CONSTANT_ATTRIBUTE_KEY, PARAMETER_CONSTANT_ACTIVITY_KEY
@@ -135,7 +138,7 @@ def apply_events(log, values, parameters=None):
     log
         log_skeleton
     values
-        Allowed attributes
+        Allowed attributes (the values that do not occur in the log match no event)
     parameters
         Parameters of the algorithm, including:
             Parameters.ACTIVITY_KEY -> Attribute identifying the activity in the log_skeleton
@@ -144,7 +147,7 @@ def apply_events(log, values, parameters=None):
     Returns
     -----------
     filtered_log
-        Filtered log_skeleton
+        Filtered log_skeleton (an EventLog, also when a columnar log is provided)
     """
     if parameters is None:
         parameters = {}
@@ -152,6 +155,10 @@ def apply_events(log, values, parameters=None):
     attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
+    if isinstance(log, ColumnarEventLog):
+        mask = log.get_values_mask(attribute_key, values)
+        return log.filter_events(mask if positive else ~mask).to_event_log()
+
     stream = log_converter.apply(log, variant=log_converter.TO_EVENT_STREAM)
     if positive:
         stream = EventStream(list(filter(lambda x: x[attribute_key] in values, stream)))
@@ -173,7 +180,7 @@ def apply(log, values, parameters=None):
     log
         Trace log_skeleton
     values
-        Allowed attributes
+        Allowed attributes (the values that do not occur in the log match no event)
     parameters
         Parameters of the algorithm, including:
             Parameters.ACTIVITY_KEY -> Attribute identifying the activity in the log_skeleton
@@ -182,7 +189,7 @@ def apply(log, values, parameters=None):
     Returns
     -----------
     filtered_log
-        Filtered log_skeleton
+        Filtered log_skeleton (an EventLog, also when a columnar log is provided)
     """
     if parameters is None:
         parameters = {}
@@ -190,6 +197,10 @@ def apply(log, values, parameters=None):
     attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
+    if isinstance(log, ColumnarEventLog):
+        found = log.get_cases_with_events(log.get_values_mask(attribute_key, values))
+        return log.select_cases(np.flatnonzero((found == positive) & (log.get_case_lengths() > 0))).to_event_log()
+
     filtered_log = EventLog()
     for trace in log:
         new_trace = Trace()
@@ -2,6 +2,8 @@ from pm4py.statistics.variants.log.get import get_variants_from_log_trace_idx, g
     get_variants_along_with_case_durations, get_variants_sorted_by_count, convert_variants_trace_idx_to_trace_obj
 from pm4py.algo.filtering.common import filtering_constants
 from pm4py.objects.log.log import EventLog
+from pm4py.objects.log.columnar import ColumnarEventLog
+from pm4py.objects.log.util import variants_util
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 from pm4py.util.constants import PARAMETER_CONSTANT_ACTIVITY_KEY
 from enum import Enum
@@ -23,16 +25,37 @@ def apply(log, admitted_variants, parameters=None):
     log
         Log object
     admitted_variants
-        Admitted variants
+        Admitted variants (expressed as strings, or as tuples/lists of activities); a variant containing
+        an activity that does not occur in the log matches no case
     parameters
         Parameters of the algorithm, including:
             Parameters.ACTIVITY_KEY -> Attribute identifying the activity in the log_skeleton
             Parameters.POSITIVE -> Indicate if events should be kept/removed
+
+    Returns
+    -----------
+    filtered_log
+        Filtered log (an EventLog, also when a columnar log is provided: the selection of the cases is computed
+        on the columns, then the selected cases are materialized)
     """
 
     if parameters is None:
         parameters = {}
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
+    if any(not isinstance(variant, str) for variant in admitted_variants):
+        # variants expressed as sequences of activities: the integer-coded variants are used
+        encoded_variants = variants_util.from_log(log, parameters=parameters)
+        admitted_codes = set(encoded_variants.encode(tuple(variant)) for variant in admitted_variants)
+        admitted_mask = [(variant in admitted_codes) == positive for variant in encoded_variants.variants]
+        selected = [i for i, v in enumerate(encoded_variants.case_variants.tolist()) if admitted_mask[v]]
+        if isinstance(log, ColumnarEventLog):
+            return log.select_cases(selected).to_event_log()
+        return EventLog([log[i] for i in selected])
+    if isinstance(log, ColumnarEventLog):
+        variants_idx = get_variants_from_log_trace_idx(log, parameters=parameters)
+        return log.select_cases([idx for variant in variants_idx for idx in variants_idx[variant] if
+                                 (positive and variant in admitted_variants) or (
+                                         not positive and variant not in admitted_variants)]).to_event_log()
     variants = get_variants(log, parameters=parameters)
     log = EventLog()
     for variant in variants:
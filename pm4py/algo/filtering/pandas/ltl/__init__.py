@@ -1 +1 @@
-from pm4py.algo.filtering.pandas.ltl import ltl_checker
+from pm4py.algo.filtering.pandas.ltl import ltl_checker, ltl_batch
@@ -0,0 +1,303 @@
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.filtering.pandas.ltl.ltl_checker import Parameters
+from pm4py.util import exec_utils, instrumentation
+from pm4py.util.constants import CASE_CONCEPT_NAME
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_RESOURCE_KEY, DEFAULT_TIMESTAMP_KEY
+
+
+class Patterns(Enum):
+    A_EVENTUALLY_B = "A_eventually_B"
+    A_EVENTUALLY_B_EVENTUALLY_C = "A_eventually_B_eventually_C"
+    A_EVENTUALLY_B_EVENTUALLY_C_EVENTUALLY_D = "A_eventually_B_eventually_C_eventually_D"
+    A_NEXT_B_NEXT_C = "A_next_B_next_C"
+    FOUR_EYES_PRINCIPLE = "four_eyes_principle"
+    ATTR_VALUE_DIFFERENT_PERSONS = "attr_value_different_persons"
+
+
+NO_ATTRIBUTE_VALUES = {Patterns.A_EVENTUALLY_B: 2, Patterns.A_EVENTUALLY_B_EVENTUALLY_C: 3,
+                       Patterns.A_EVENTUALLY_B_EVENTUALLY_C_EVENTUALLY_D: 4, Patterns.A_NEXT_B_NEXT_C: 3,
+                       Patterns.FOUR_EYES_PRINCIPLE: 2, Patterns.ATTR_VALUE_DIFFERENT_PERSONS: 1}
+
+
+class EncodedDataframe(object):
+    """
+    Integer-coded representation of the columns of a dataframe that are needed by the rules:
+    each event is associated to the code of its case and to the code of its attribute value.
+    The last occurrence (and the last non-empty timestamp/resource) of an attribute value
+    in every case is computed once and shared by all the rules
+    """
+
+    def __init__(self, df, case_id_glue, attribute_key, timestamp_key=None, resource_key=None):
+        case_codes, self.case_ids = pd.factorize(df[case_id_glue], sort=False)
+        attribute_codes, attribute_values = pd.factorize(df[attribute_key], sort=False)
+        self.value_codes = {v: i for i, v in enumerate(attribute_values.tolist())}
+        self.no_cases = len(self.case_ids)
+
+        # the rules compare the index of the events (as in ltl_checker)
+        if pd.api.types.is_numeric_dtype(df.index):
+            index = np.asarray(df.index)
+        else:
+            index = np.arange(len(df))
+
+        valid = case_codes >= 0
+        self.case_codes = case_codes[valid]
+        self.index = index[valid]
+        self.timestamps = None
+        self.resource_codes = None
+        if timestamp_key is not None:
+            self.timestamps = df[timestamp_key].values[valid]
+        if resource_key is not None:
+            self.resource_codes = pd.factorize(df[resource_key], sort=False)[0][valid]
+
+        # events grouped by attribute value (in order of the dataframe)
+        attribute_codes = attribute_codes[valid]
+        order = np.argsort(attribute_codes, kind="mergesort")
+        offsets = np.searchsorted(attribute_codes[order], np.arange(len(attribute_values) + 1))
+        self.value_events = {i: order[offsets[i]:offsets[i + 1]] for i in range(len(attribute_values))}
+
+        self.__last = {}
+        self.__last_timestamp = {}
+        self.__last_resource = {}
+
+    def events(self, value):
+        """
+        Gets the positions of the events having the given attribute value
+        """
+        if value not in self.value_codes:
+            return np.zeros(0, dtype=np.int64)
+        return self.value_events[self.value_codes[value]]
+
+    def __last_event(self, events):
+        last = np.full(self.no_cases, -1, dtype=np.int64)
+        np.maximum.at(last, self.case_codes[events], events)
+        return last
+
+    def last(self, value):
+        """
+        Gets, for each case, the position of the last event having the given attribute value (-1 if none)
+        """
+        if value not in self.__last:
+            self.__last[value] = self.__last_event(self.events(value))
+        return self.__last[value]
+
+    def last_timestamp(self, value):
+        """
+        Gets, for each case, the last non-empty timestamp of the events having the given attribute value
+        """
+        if value not in self.__last_timestamp:
+            events = self.events(value)
+            last = self.__last_event(events[~pd.isnull(self.timestamps[events])])
+            timestamps = self.timestamps[np.maximum(last, 0)] if self.no_cases > 0 else self.timestamps[:0]
+            timestamps[last < 0] = np.datetime64("NaT")
+            self.__last_timestamp[value] = timestamps
+        return self.__last_timestamp[value]
+
+    def last_resource(self, value):
+        """
+        Gets, for each case, the code of the last non-empty resource of the events having the given
+        attribute value (-1 if none)
+        """
+        if value not in self.__last_resource:
+            events = self.events(value)
+            last = self.__last_event(events[self.resource_codes[events] >= 0])
+            resources = self.resource_codes[np.maximum(last, 0)] if self.no_cases > 0 else last
+            self.__last_resource[value] = np.where(last >= 0, resources, -1)
+        return self.__last_resource[value]
+
+
+def __seconds(timestamps_2, timestamps_1):
+    """
+    Difference (in seconds) between two series of timestamps
+    """
+    return (pd.Series(timestamps_2) - pd.Series(timestamps_1)).astype('timedelta64[s]').values
+
+
+def __within(diff, boundaries):
+    return (diff >= boundaries[0]) & (diff <= boundaries[1])
+
+
+def __check_chain(enc, values, next_only, enable_timestamp, timestamp_diff_boundaries):
+    """
+    Checks, for each case, if an event with the first value is followed by the last events
+    with the other values (in order); the differences between the indices must be 1 if next_only is True
+    """
+    a_events = enc.events(values[0])
+    cases = enc.case_codes[a_events]
+    last = [enc.last(v) for v in values[1:]]
+
+    # case-level conditions on the last occurrences of the other values
+    case_ok = last[0] >= 0
+    for j in range(1, len(last)):
+        if next_only:
+            case_ok = case_ok & (last[j] >= 0) & (enc.index[last[j]] - enc.index[last[j - 1]] == 1)
+        else:
+            case_ok = case_ok & (last[j] >= 0) & (enc.index[last[j]] - enc.index[last[j - 1]] > 0)
+
+    ok = case_ok[cases]
+    diff = enc.index[last[0][cases]] - enc.index[a_events]
+    ok = ok & (diff == 1 if next_only else diff > 0)
+
+    if enable_timestamp:
+        last_timestamps = [enc.last_timestamp(v) for v in values[1:]]
+        for j in range(len(values) - 1):
+            ok = ok & ~pd.isnull(last_timestamps[j][cases])
+        ok = ok & ~pd.isnull(enc.timestamps[a_events])
+        if timestamp_diff_boundaries:
+            ok = ok & __within(__seconds(last_timestamps[0][cases], enc.timestamps[a_events]),
+                               timestamp_diff_boundaries[0])
+            for j in range(1, len(values) - 1):
+                case_diff = __seconds(last_timestamps[j], last_timestamps[j - 1])
+                ok = ok & __within(case_diff, timestamp_diff_boundaries[j])[cases]
+
+    sat = np.zeros(enc.no_cases, dtype=bool)
+    sat[cases[ok]] = True
+    return sat
+
+
+def __check_resources(enc, value_a, value_b):
+    """
+    Checks, for each case, if an event with the first value has the same resource as the last (non-empty)
+    resource of the events with the second value, and if an event has a different resource
+    """
+    a_events = enc.events(value_a)
+    cases = enc.case_codes[a_events]
+    resources_a = enc.resource_codes[a_events]
+    resources_b = enc.last_resource(value_b)[cases]
+    ok = (enc.last(value_b)[cases] >= 0) & (resources_a >= 0) & (resources_b >= 0)
+
+    same = np.zeros(enc.no_cases, dtype=bool)
+    same[cases[ok & (resources_a == resources_b)]] = True
+    different = np.zeros(enc.no_cases, dtype=bool)
+    different[cases[ok & (resources_a != resources_b)]] = True
+    return same, different
+
+
+def __get_rules(rules):
+    """
+    Gets the names and the (pattern, attribute values, parameters) description of the rules
+    """
+    if isinstance(rules, dict):
+        items = list(rules.items())
+    else:
+        items = list(enumerate(rules))
+    ret = []
+    for name, rule in items:
+        pattern = Patterns(exec_utils.get_variant(rule[0]))
+        values = tuple(rule[1])
+        if len(values) != NO_ATTRIBUTE_VALUES[pattern]:
+            raise Exception("the rule " + str(name) + " (" + pattern.value + ") requires " + str(
+                NO_ATTRIBUTE_VALUES[pattern]) + " attribute values")
+        rule_parameters = rule[2] if len(rule) > 2 and rule[2] is not None else {}
+        ret.append((name, pattern, values, rule_parameters))
+    return ret
+
+
+def apply(df, rules, parameters=None):
+    """
+    Evaluates many LTL rules on a dataframe at once. The columns needed by the rules are encoded
+    only once (as integer codes of cases and attribute values), and each rule is evaluated
+    with vectorized operations on the encoded arrays
+
+    Parameters
+    ------------
+    df
+        Dataframe
+    rules
+        List (or dictionary name -> rule) of rules. Each rule is a tuple (pattern, attribute values)
+        or (pattern, attribute values, rule parameters), where:
+        - pattern is a member of Patterns (or the name of the corresponding function in ltl_checker)
+        - attribute values is the tuple of the attribute values (A, B, ...) of the rule
+        - rule parameters are the parameters of the corresponding function in ltl_checker
+          (Parameters.POSITIVE, Parameters.ENABLE_TIMESTAMP, Parameters.TIMESTAMP_DIFF_BOUNDARIES)
+    parameters
+        Parameters of the algorithm (shared by all the rules), including:
+            Parameters.CASE_ID_KEY -> column to be used as case identifier
+            Parameters.ATTRIBUTE_KEY -> attribute to be used in the rules
+            Parameters.TIMESTAMP_KEY -> column to be used as timestamp
+            Parameters.RESOURCE_KEY -> column to be used as resource
+
+    Returns
+    ------------
+    matrix
+        Boolean dataframe having a row for each case (indexed by the case identifier) and a column for each rule,
+        that is True if the case is kept by the corresponding function of ltl_checker
+    """
+    if parameters is None:
+        parameters = {}
+
+    case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
+    attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
+    timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters, DEFAULT_TIMESTAMP_KEY)
+    resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, DEFAULT_RESOURCE_KEY)
+
+    rules = __get_rules(rules)
+    enable_timestamp = any(exec_utils.get_param_value(Parameters.ENABLE_TIMESTAMP, r[3], False) for r in rules)
+    use_resources = any(r[1] in [Patterns.FOUR_EYES_PRINCIPLE, Patterns.ATTR_VALUE_DIFFERENT_PERSONS] for r in rules)
+
+    with instrumentation.phase("ltl_batch"):
+        enc = EncodedDataframe(df, case_id_glue, attribute_key,
+                               timestamp_key=timestamp_key if enable_timestamp else None,
+                               resource_key=resource_key if use_resources else None)
+
+        columns = {}
+        for name, pattern, values, rule_parameters in rules:
+            positive = exec_utils.get_param_value(Parameters.POSITIVE, rule_parameters, True)
+            rule_enable_timestamp = exec_utils.get_param_value(Parameters.ENABLE_TIMESTAMP, rule_parameters, False)
+            timestamp_diff_boundaries = exec_utils.get_param_value(Parameters.TIMESTAMP_DIFF_BOUNDARIES,
+                                                                   rule_parameters, [])
+
+            if pattern == Patterns.FOUR_EYES_PRINCIPLE:
+                same, different = __check_resources(enc, values[0], values[1])
+                columns[name] = different & ~same if positive else same
+                continue
+            elif pattern == Patterns.ATTR_VALUE_DIFFERENT_PERSONS:
+                sat = __check_resources(enc, values[0], values[0])[1]
+            elif pattern == Patterns.A_NEXT_B_NEXT_C:
+                sat = __check_chain(enc, values, True, False, [])
+            else:
+                sat = __check_chain(enc, values, False, rule_enable_timestamp, timestamp_diff_boundaries)
+            columns[name] = sat if positive else ~sat
+
+        matrix = pd.DataFrame(columns, index=pd.Index(enc.case_ids, name=case_id_glue),
+                              columns=[r[0] for r in rules])
+
+    return matrix
+
+
+def filter_dataframe(df, matrix, rules=None, parameters=None):
+    """
+    Filters a dataframe keeping the cases that satisfy the given rules
+
+    Parameters
+    ------------
+    df
+        Dataframe
+    matrix
+        Case-by-rule boolean matrix (returned by apply)
+    rules
+        Names of the rules (columns of the matrix) that shall be satisfied (default: all the rules)
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.CASE_ID_KEY -> column to be used as case identifier
+
+    Returns
+    ------------
+    filtered_df
+        Filtered dataframe
+    """
+    if parameters is None:
+        parameters = {}
+
+    case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
+
+    if rules is None:
+        rules = list(matrix.columns)
+    elif not isinstance(rules, list):
+        rules = [rules]
+    kept = matrix[rules].all(axis=1)
+
+    return df[df[case_id_glue].isin(matrix.index[kept.values])]
@@ -2,9 +2,11 @@ from pm4py.algo.filtering.common import filtering_constants
 from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.statistics.traces.pandas import case_statistics
 from pm4py.statistics.traces.pandas.case_statistics import get_variants_df
+from pm4py.objects.log.util import variants_util
 from pm4py.util.constants import PARAMETER_CONSTANT_CASEID_KEY, PARAMETER_CONSTANT_ACTIVITY_KEY
 from enum import Enum
 from pm4py.util import exec_utils
+import numpy as np
 
 
 class Parameters(Enum):
@@ -66,7 +68,7 @@ def apply(df, admitted_variants, parameters=None):
     df
         Dataframe
     admitted_variants
-        List of admitted variants (to include/exclude)
+        List of admitted variants (to include/exclude), expressed as strings or as tuples/lists of activities
     parameters
         Parameters of the algorithm, including:
             Parameters.CASE_ID_KEY -> Column that contains the Case ID
@@ -85,11 +87,18 @@ def apply(df, admitted_variants, parameters=None):
 
     case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
-    variants_df = parameters["variants_df"] if "variants_df" in parameters else get_variants_df(df,
-                                                                                                parameters=parameters)
-    variants_df = variants_df[variants_df["variant"].isin(admitted_variants)]
+    if any(not isinstance(variant, str) for variant in admitted_variants):
+        # variants expressed as sequences of activities: the integer-coded variants are used
+        encoded_variants = variants_util.from_dataframe(df, parameters=parameters)
+        admitted_codes = set(encoded_variants.encode(tuple(variant)) for variant in admitted_variants)
+        admitted_mask = np.array([variant in admitted_codes for variant in encoded_variants.variants], dtype=bool)
+        i2 = encoded_variants.case_ids[admitted_mask[encoded_variants.case_variants]]
+    else:
+        variants_df = parameters["variants_df"] if "variants_df" in parameters else get_variants_df(
+            df, parameters=parameters)
+        variants_df = variants_df[variants_df["variant"].isin(admitted_variants)]
+        i2 = variants_df.index
     i1 = df.set_index(case_id_glue).index
-    i2 = variants_df.index
     if positive:
         ret = df[i1.isin(i2)]
     else:
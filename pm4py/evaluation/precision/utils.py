@@ -6,11 +6,12 @@ from pm4py.objects.petri.utils import decorate_places_preset_trans, decorate_tra
 from pm4py.objects.petri import align_utils as utils
 from pm4py.objects.petri.incidence_matrix import construct
 
-def __search(sync_net, ini, fin, stop, cost_function, skip):
-    decorate_transitions_prepostset(sync_net)
-    decorate_places_preset_trans(sync_net)
+def __search(sync_net, ini, fin, stop, cost_function, skip, incidence_matrix=None):
+    if incidence_matrix is None:
+        decorate_transitions_prepostset(sync_net)
+        decorate_places_preset_trans(sync_net)
 
-    incidence_matrix = construct(sync_net)
+        incidence_matrix = construct(sync_net)
     ini_vec, fin_vec, cost_vec = utils.__vectorize_initial_final_cost(incidence_matrix, ini, fin, cost_function)
 
     closed = set()
@@ -110,6 +111,63 @@ def get_log_prefixes(log, activity_key=xes_util.DEFAULT_NAME_KEY):
     return prefixes, prefix_count
 
 
+class PrefixTrieNode(object):
+    """
+    Node of the prefix trie of a log: it represents the prefix spelled by the path from the root,
+    storing the number of traces that contain the prefix (followed by at least an event)
+    and the set of activities following the prefix in the log
+    """
+    __slots__ = ("children", "count", "next_activities")
+
+    def __init__(self):
+        self.children = {}
+        self.count = 0
+        self.next_activities = set()
+
+
+def get_log_prefix_trie(log, activity_key=xes_util.DEFAULT_NAME_KEY):
+    """
+    Get the prefix trie of the log (same prefixes, counts and next activities as get_log_prefixes,
+    but the prefixes sharing the beginning share also the path in the trie)
+
+    Parameters
+    ----------
+    log
+        Trace log_skeleton
+    activity_key
+        Activity key (must be provided if different from concept:name)
+
+    Returns
+    ----------
+    root
+        Root of the trie (empty prefix)
+    """
+    root = PrefixTrieNode()
+    for trace in log:
+        node = root
+        for i in range(1, len(trace)):
+            activity = trace[i - 1][activity_key]
+            if activity not in node.children:
+                node.children[activity] = PrefixTrieNode()
+            node = node.children[activity]
+            node.count += 1
+            node.next_activities.add(trace[i][activity_key])
+    return root
+
+
+def get_prefix_trie_count(node):
+    """
+    Get the sum of the counts of the prefixes in the subtree of the given node (included)
+    """
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += node.count
+        stack.extend(node.children.values())
+    return count
+
+
 def form_fake_log(prefixes_keys, activity_key=xes_util.DEFAULT_NAME_KEY):
     """
     Form fake log_skeleton for replay (putting each prefix as separate trace to align)
@@ -1,14 +1,17 @@
+import heapq
+
 from pm4py.objects import log as log_lib
 from pm4py.evaluation.precision import utils as precision_utils
 from pm4py.objects.petri import align_utils as utils
-from pm4py.objects.petri import check_soundness
+from pm4py.objects.petri import check_soundness, compiled_net
 from pm4py.objects.petri.petrinet import Marking
 from pm4py.objects.petri.utils import construct_trace_net
 from pm4py.objects.petri.synchronous_product import construct
+from pm4py.algo.conformance.alignments import session as alignments_session
 from pm4py.statistics.start_activities.log.get import get_start_activities
 from pm4py.objects.petri.align_utils import get_visible_transitions_eventually_enabled_by_marking
 from pm4py.evaluation.precision.parameters import Parameters
-from pm4py.util import exec_utils
+from pm4py.util import exec_utils, instrumentation
 from pm4py.util import xes_constants
 
 
@@ -47,38 +50,51 @@ def apply(log, net, marking, final_marking, parameters=None):
     if not check_soundness.check_easy_soundness_net_in_fin_marking(net, marking, final_marking):
         raise Exception("trying to apply Align-ETConformance on a Petri net that is not a easy sound net!!")
 
-    prefixes, prefix_count = precision_utils.get_log_prefixes(log, activity_key=activity_key)
-    prefixes_keys = list(prefixes.keys())
-    fake_log = precision_utils.form_fake_log(prefixes_keys, activity_key=activity_key)
-
-    align_stop_marking = align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameters=parameters)
-    all_markings = transform_markings_from_sync_to_original_net(align_stop_marking, net, parameters=parameters)
-
-    for i in range(len(prefixes)):
-        markings = all_markings[i]
-
-        if markings is not None:
-            log_transitions = set(prefixes[prefixes_keys[i]])
+    cnet = compiled_net.construct(net)
+    hidden_transitions = cnet.label_transitions.get(None, ())
+    activated_labels_cache = {}
+
+    # the prefixes of the log are visited depth-first on a prefix trie: the replay of a prefix
+    # starts from the markings (with their cost) reached by the replay of its parent prefix,
+    # instead of aligning every prefix from scratch
+    root = precision_utils.get_log_prefix_trie(log, activity_key=activity_key)
+    stack = [(root, (), {cnet.encode_marking(marking): 0})]
+    while stack:
+        node, prefix, frontier = stack.pop()
+        for activity, child in node.children.items():
+            child_prefix = prefix + (activity,)
+            reached = __replay_activity(cnet, frontier, cnet.label_transitions.get(activity, ()),
+                                        hidden_transitions)
+            if not reached:
+                # no path from the initial marking replaying the prefix (and its extensions)
+                unfit += precision_utils.get_prefix_trie_count(child)
+                continue
+
+            min_cost = min(reached.values())
             activated_transitions_labels = set()
-            for m in markings:
-                # add to the set of activated transitions in the model the activated transitions
-                # for each prefix
-                activated_transitions_labels = activated_transitions_labels.union(
-                    x.label for x in utils.get_visible_transitions_eventually_enabled_by_marking(net, m) if
-                    x.label is not None)
-            escaping_edges = activated_transitions_labels.difference(log_transitions)
-
-            sum_at += len(activated_transitions_labels) * prefix_count[prefixes_keys[i]]
-            sum_ee += len(escaping_edges) * prefix_count[prefixes_keys[i]]
+            for m, cost in reached.items():
+                if cost == min_cost:
+                    # add to the set of activated transitions in the model the activated transitions
+                    # for each marking reached by an optimal replay of the prefix
+                    if m not in activated_labels_cache:
+                        activated_labels_cache[m] = set(
+                            x.label for x in utils.get_visible_transitions_eventually_enabled_by_marking(
+                                net, cnet.decode_marking(m)) if x.label is not None)
+                    activated_transitions_labels.update(activated_labels_cache[m])
+            escaping_edges = activated_transitions_labels.difference(child.next_activities)
+
+            sum_at += len(activated_transitions_labels) * child.count
+            sum_ee += len(escaping_edges) * child.count
 
             if debug_level > 1:
                 print("")
-                print("prefix=", prefixes_keys[i])
-                print("log_transitions=", log_transitions)
+                print("prefix=", ",".join(child_prefix))
+                print("log_transitions=", child.next_activities)
                 print("activated_transitions=", activated_transitions_labels)
                 print("escaping_edges=", escaping_edges)
-        else:
-            unfit += prefix_count[prefixes_keys[i]]
+
+            if child.children:
+                stack.append((child, child_prefix, reached))
 
     if debug_level > 0:
         print("\n")
@@ -100,6 +116,57 @@ def apply(log, net, marking, final_marking, parameters=None):
     return precision
 
 
+def __replay_activity(cnet, frontier, visible_transitions, hidden_transitions):
+    """
+    Extends the replay of a prefix with an activity: starting from the markings reached by the prefix
+    (with their costs), the hidden transitions (cost STD_TAU_COST) and the transitions labeled with the
+    activity (cost STD_SYNC_COST) are fired. Log moves and visible model moves are not allowed.
+
+    Parameters
+    -------------
+    cnet
+        Compiled Petri net
+    frontier
+        Dictionary associating to each (encoded) marking reached by the prefix its minimum cost
+    visible_transitions
+        Indices of the transitions labeled with the activity
+    hidden_transitions
+        Indices of the hidden transitions
+
+    Returns
+    -------------
+    reached
+        Dictionary associating to each (encoded) marking reached by firing a transition labeled with the
+        activity its minimum cost (empty if the activity cannot be replayed)
+    """
+    open_set = [(cost, m) for m, cost in frontier.items()]
+    heapq.heapify(open_set)
+    closed = set()
+    reached = {}
+
+    while open_set:
+        cost, m = heapq.heappop(open_set)
+        if m in closed:
+            continue
+        closed.add(m)
+
+        for t in visible_transitions:
+            new_m = cnet.execute(t, m)
+            if new_m is not None:
+                new_cost = cost + utils.STD_SYNC_COST
+                if new_m not in reached or new_cost < reached[new_m]:
+                    reached[new_m] = new_cost
+
+        for t in hidden_transitions:
+            new_m = cnet.execute(t, m)
+            if new_m is not None and new_m not in closed:
+                heapq.heappush(open_set, (cost + utils.STD_TAU_COST, new_m))
+
+    instrumentation.increment("precision.visited_markings", len(closed))
+
+    return reached
+
+
 def transform_markings_from_sync_to_original_net(markings0, net, parameters=None):
     """
     Transform the markings of the sync net (in which alignment stops) into markings of the original net
@@ -176,20 +243,25 @@ def align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameter
     """
     if parameters is None:
         parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    # the model part of the synchronous product nets (with the standard costs) is built once for all the prefixes
+    session = alignments_session.apply(net, marking, final_marking)
+
     align_result = []
     for i in range(len(fake_log)):
         trace = fake_log[i]
-        sync_net, sync_initial_marking, sync_final_marking = build_sync_net(trace, net, marking, final_marking,
-                                                                            parameters=parameters)
+        trace_net, trace_im, trace_fm = construct_trace_net(trace, activity_key=activity_key)
+        sync_net, sync_initial_marking, sync_final_marking, cost_function, incidence_matrix = session.construct(
+            trace_net, trace_im, trace_fm)
         stop_marking = Marking()
         for pl, count in sync_final_marking.items():
             if pl.name[1] == utils.SKIP:
                 stop_marking[pl] = count
-        cost_function = utils.construct_standard_cost_function(sync_net, utils.SKIP)
 
         # perform the alignment of the prefix
         res = precision_utils.__search(sync_net, sync_initial_marking, sync_final_marking, stop_marking, cost_function,
-                                       utils.SKIP)
+                                       utils.SKIP, incidence_matrix=incidence_matrix)
 
         if res is not None:
             align_result.append([])
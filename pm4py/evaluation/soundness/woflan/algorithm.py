@@ -38,6 +38,10 @@ class Parameters(Enum):
     RETURN_ASAP_WHEN_NOT_SOUND = "return_asap_when_not_sound"
     PRINT_DIAGNOSTICS = "print_diagnostics"
     RETURN_DIAGNOSTICS = "return_diagnostics"
+    # limits of the exploration of the reachability graphs (see pm4py.objects.petri.state_space)
+    MAX_STATES = "max_states"
+    MAX_MEMORY = "max_memory"
+    MAX_ELAB_TIME = "max_elab_time"
 
 
 class Outputs(Enum):
@@ -60,11 +64,12 @@ class Outputs(Enum):
 
 
 class woflan:
-    def __init__(self, net, initial_marking, final_marking, print_diagnostics=False):
+    def __init__(self, net, initial_marking, final_marking, print_diagnostics=False, parameters=None):
         self.net = net
         self.initial_marking = initial_marking
         self.final_marking = final_marking
         self.print_diagnostics = print_diagnostics
+        self.parameters = parameters if parameters is not None else {}
         self.s_c_net = None
         self.place_invariants = None
         self.uniform_place_invariants = None
@@ -475,7 +480,8 @@ def step_10(woflan_object, return_asap_when_unsound=False):
 
 def step_11(woflan_object, return_asap_when_unsound=False):
     woflan_object.set_r_g_s_c(
-        reachability_graph(woflan_object.get_s_c_net(), woflan_object.get_initial_marking(), woflan_object.get_net()))
+        reachability_graph(woflan_object.get_s_c_net(), woflan_object.get_initial_marking(), woflan_object.get_net(),
+                           parameters=woflan_object.parameters))
     if nx.is_strongly_connected(woflan_object.get_r_g_s_c()):
         if woflan_object.print_diagnostics:
             print('All tasks are live.')
@@ -488,7 +494,8 @@ def step_11(woflan_object, return_asap_when_unsound=False):
 
 def step_12(woflan_object, return_asap_when_unsound=False):
     woflan_object.set_r_g_s_c(
-        reachability_graph(woflan_object.get_s_c_net(), woflan_object.get_initial_marking(), woflan_object.get_net()))
+        reachability_graph(woflan_object.get_s_c_net(), woflan_object.get_initial_marking(), woflan_object.get_net(),
+                           parameters=woflan_object.parameters))
     if woflan_object.print_diagnostics:
         print('There are non-live tasks.')
     if return_asap_when_unsound:
@@ -509,6 +516,9 @@ def apply(net, i_m, f_m, parameters=None):
     :param net: Petri Net representation of PM4Py
     :param i_m: initial marking of given Net. Marking object of PM4Py
     :param f_m: final marking of given Net. Marking object of PM4Py
+    :param parameters: Parameters of the algorithm, including MAX_STATES, MAX_MEMORY and MAX_ELAB_TIME (limits of
+    the exploration of the reachability graphs; if a limit is reached, the soundness cannot be decided
+    and an exception is raised)
     :return: True, if net is sound; False otherwise.
     """
     if parameters is None:
@@ -517,7 +527,7 @@ def apply(net, i_m, f_m, parameters=None):
     print_diagnostics = exec_utils.get_param_value(Parameters.PRINT_DIAGNOSTICS, parameters, True)
     return_diagnostics = exec_utils.get_param_value(Parameters.RETURN_DIAGNOSTICS, parameters, False)
 
-    woflan_object = woflan(net, i_m, f_m, print_diagnostics=print_diagnostics)
+    woflan_object = woflan(net, i_m, f_m, print_diagnostics=print_diagnostics, parameters=parameters)
     step_1_res = step_1(woflan_object, return_asap_when_unsound=return_asap_when_unsound)
 
     if return_diagnostics:
@@ -536,7 +546,8 @@ def compute_non_live_sequences(woflan_object):
     :param woflan_object: Object that contains the necessary information
     :return: List of sequence of transitions, each sequence is a list
     """
-    woflan_object.set_r_g(reachability_graph(woflan_object.get_net(), woflan_object.get_initial_marking()))
+    woflan_object.set_r_g(reachability_graph(woflan_object.get_net(), woflan_object.get_initial_marking(),
+                                             parameters=woflan_object.parameters))
     f_m = convert_marking(woflan_object.get_net(), woflan_object.get_final_marking())
     sucessfull_terminate_state = None
     for node in woflan_object.get_r_g().nodes:
@@ -1,40 +1,39 @@
 import networkx as nx
 import numpy as np
 from pm4py.evaluation.soundness.woflan.graphs import utility as helper
+from pm4py.objects.petri import state_space
+from pm4py.objects.petri.petrinet import Marking
 
 
-def apply(net, initial_marking, original_net=None):
+def apply(net, initial_marking, original_net=None, parameters=None):
     """
     Method that computes a reachability graph as networkx object
     :param net: Petri Net
     :param initial_marking: Initial Marking of the Petri Net
     :param original_net: Petri Net without short-circuited transition
+    :param parameters: Parameters of the exploration of the state space (see state_space.explore)
     :return: Networkx Graph that represents the reachability graph of the Petri Net
+    (an exception is raised if a limit of the exploration is reached, as the graph would be incomplete)
     """
+    place_list = list(net.places)
     initial_marking = helper.convert_marking(net, initial_marking, original_net)
-    firing_dict = helper.split_incidence_matrix(helper.compute_incidence_matrix(net), net)
-    req_dict = helper.compute_firing_requirement(net)
-    look_up_indices = {}
-    j = 0
-    reachability_graph = nx.MultiDiGraph()
-    reachability_graph.add_node(j, marking=initial_marking)
-
-    working_set = set()
-    working_set.add(j)
+    marking = Marking()
+    for index, value in enumerate(initial_marking):
+        if value > 0:
+            marking[place_list[index]] = int(value)
 
-    look_up_indices[np.array2string(initial_marking)] = j
+    # the states are numbered in order of discovery (0 is the initial marking)
+    space = state_space.explore(net, marking, parameters=parameters)
+    if not space.is_complete():
+        raise Exception("the reachability graph is incomplete (the exploration reached the limit " +
+                        space.interrupted + "): the analysis is inconclusive")
+    place_indices = [space.cnet.places[p] for p in place_list]
+    transitions = space.cnet.transition_list
 
-    j += 1
-    while len(working_set) > 0:
-        m = working_set.pop()
-        possible_markings = helper.enabled_markings(firing_dict, req_dict, reachability_graph.nodes[m]['marking'])
-        for marking in possible_markings:
-            if np.array2string(marking[0]) not in look_up_indices:
-                look_up_indices[np.array2string(marking[0])] = j
-                reachability_graph.add_node(j, marking=marking[0])
-                working_set.add(j)
-                reachability_graph.add_edge(m, j, transition=marking[1])
-                j += 1
-            else:
-                reachability_graph.add_edge(m, look_up_indices[np.array2string(marking[0])], transition=marking[1])
+    reachability_graph = nx.MultiDiGraph()
+    for j, m in enumerate(space.markings):
+        reachability_graph.add_node(j, marking=np.array([m[i] for i in place_indices], dtype=float))
+    for j in space.expanded_states():
+        for t, j2 in space.arcs[j]:
+            reachability_graph.add_edge(j, j2, transition=transitions[t])
     return reachability_graph
@@ -32,8 +32,6 @@ def apply(df, parameters=None):
         variant = vd['variant'].split(",")
         trace = Trace()
         for activity in variant:
-            event = Event()
-            event[activity_key] = activity
-            trace.append(event)
+            trace.append(Event({activity_key: activity}))
         log.append(trace)
     return log
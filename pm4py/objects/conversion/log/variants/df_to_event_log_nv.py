@@ -43,9 +43,7 @@ def apply(df, parameters=None):
         variant_count = vd[case_glue]
         trace = Trace()
         for activity in variant:
-            event = Event()
-            event[activity_key] = activity
-            trace.append(event)
+            trace.append(Event({activity_key: activity}))
         all_variants_log[vd['variant']] = []
         for i in range(variant_count):
             log.append(trace)
@@ -15,6 +15,10 @@ class Parameters(Enum):
     STREAM_POST_PROCESSING = constants.STREAM_POSTPROCESSING
     CASE_ATTRIBUTE_PREFIX = "case_attribute_prefix"
     CASE_ID_KEY = pmconstants.PARAMETER_CONSTANT_CASEID_KEY
+    CHUNK_SIZE = "chunk_size"
+
+
+DEFAULT_CHUNK_SIZE = 100000
 
 
 def apply(log, parameters=None):
@@ -28,13 +32,122 @@ def apply(log, parameters=None):
     if pkgutil.find_loader("pandas"):
         import pandas
         if isinstance(log, pandas.core.frame.DataFrame):
-            log = to_event_stream.apply(log, parameters=parameters)
+            return __transform_dataframe_to_event_log(log, parameters=parameters)
     if isinstance(log, log_instance.EventStream) and (not isinstance(log, log_instance.EventLog)):
         return __transform_event_stream_to_event_log(log, case_glue=glue, include_case_attributes=True,
                                                      case_attribute_prefix=case_pref, enable_deepcopy=enable_deepcopy)
     return log
 
 
+def iterate(df, parameters=None):
+    """
+    Lazily converts a dataframe to traces, without materializing the intermediate event stream.
+
+    The row indices are grouped by case (stable argsort on the factorized case column; the cases are returned
+    in the order of their first occurrence, the events of a case in the order of the dataframe) and the traces are
+    built directly from slices of the columns, processing a chunk of rows at a time.
+    Rows without a case identifier are discarded.
+
+    Parameters
+    -------------
+    df
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.CASE_ID_KEY -> column containing the case identifier (default: case:concept:name)
+            Parameters.CASE_ATTRIBUTE_PREFIX -> prefix of the columns containing the case attributes (default: case:)
+            Parameters.STREAM_POST_PROCESSING -> removes the NaN/NaT/empty values from the events (default: False)
+            Parameters.CHUNK_SIZE -> (approximate) number of rows converted at once (default: 100000)
+
+    Returns
+    -------------
+    traces
+        Generator of traces
+    """
+    if parameters is None:
+        parameters = {}
+
+    import numpy as np
+    import pandas as pd
+
+    glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, pmconstants.CASE_CONCEPT_NAME)
+    case_pref = exec_utils.get_param_value(Parameters.CASE_ATTRIBUTE_PREFIX, parameters, "case:")
+    stream_post_processing = exec_utils.get_param_value(Parameters.STREAM_POST_PROCESSING, parameters, False)
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, DEFAULT_CHUNK_SIZE)
+
+    columns = list(df.columns)
+    event_columns = [c for c in columns if not c.startswith(case_pref)]
+    trace_columns = [c for c in columns if c.startswith(case_pref)]
+    trace_keys = [c.replace(case_pref, '') for c in trace_columns]
+
+    codes, uniques = pd.factorize(df[glue], sort=False)
+    # codes are assigned in order of first occurrence, hence a stable sort keeps both the order of the cases
+    # and the order of the events inside each case
+    order = np.argsort(codes, kind="mergesort")
+    order = order[np.count_nonzero(codes < 0):]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(codes[order], minlength=len(uniques)))))
+    case_ids = uniques.tolist() if hasattr(uniques, "tolist") else list(uniques)
+
+    case_start = 0
+    while case_start < len(case_ids):
+        # takes whole cases until the chunk contains at least chunk_size rows
+        case_end = int(np.searchsorted(offsets, offsets[case_start] + max(chunk_size, 1), side="left"))
+        case_end = min(max(case_end, case_start + 1), len(case_ids))
+        rows = order[offsets[case_start]:offsets[case_end]]
+        values = {}
+        dropped = {}
+        for c in columns:
+            series = df[c].take(rows)
+            values[c] = series.tolist()
+            if stream_post_processing:
+                mask = series.isna().to_numpy()
+                if series.dtype == object or str(series.dtype) in ["category", "string"]:
+                    mask = mask | series.astype(str).str.lower().isin(["none", "null", ""]).to_numpy()
+                dropped[c] = mask.tolist() if mask.any() else None
+        for case in range(case_start, case_end):
+            start = int(offsets[case] - offsets[case_start])
+            end = int(offsets[case + 1] - offsets[case_start])
+            trace_attr = {}
+            for c, k in zip(trace_columns, trace_keys):
+                if not stream_post_processing or dropped[c] is None or not dropped[c][start]:
+                    trace_attr[k] = values[c][start]
+            if xes.DEFAULT_TRACEID_KEY not in trace_attr:
+                trace_attr[xes.DEFAULT_TRACEID_KEY] = case_ids[case]
+            trace = log_instance.Trace(attributes=trace_attr)
+            for i in range(start, end):
+                if stream_post_processing:
+                    trace.append(log_instance.Event(
+                        {c: values[c][i] for c in event_columns if dropped[c] is None or not dropped[c][i]}))
+                else:
+                    trace.append(log_instance.Event({c: values[c][i] for c in event_columns}))
+            yield trace
+        case_start = case_end
+
+
+def __transform_dataframe_to_event_log(df, parameters=None):
+    """
+    Converts a dataframe to an event log, building the traces directly from the columns of the dataframe
+
+    Parameters
+    -------------
+    df
+        Dataframe
+    parameters
+        Parameters of the algorithm (see iterate)
+
+    Returns
+    -------------
+    log
+        Event log
+    """
+    log = log_instance.EventLog(iterate(df, parameters=parameters), attributes={'origin': 'csv'})
+    for ex in to_event_stream.__detect_extensions(df):
+        log.extensions[ex.name] = {
+            xes.KEY_PREFIX: ex.prefix,
+            xes.KEY_URI: ex.uri}
+    return log
+
+
 def __transform_event_stream_to_event_log(log, case_glue=Parameters.CASE_ID_KEY.value,
                                           include_case_attributes=True,
                                           case_attribute_prefix=Parameters.CASE_ATTRIBUTE_PREFIX.value,
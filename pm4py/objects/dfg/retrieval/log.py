@@ -2,6 +2,9 @@ from collections import Counter
 from enum import Enum
 from statistics import mean, median, stdev
 
+import numpy as np
+
+from pm4py.objects.log.columnar import ColumnarEventLog
 from pm4py.util import constants, exec_utils
 from pm4py.util import xes_constants as xes_util
 
@@ -64,6 +67,8 @@ def native(log, parameters=None):
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
     window = exec_utils.get_param_value(Parameters.WINDOW, parameters, 1)
     keep_once_per_case = exec_utils.get_param_value(Parameters.KEEP_ONCE_PER_CASE, parameters, False)
+    if isinstance(log, ColumnarEventLog) and log.has_categorical_attribute(activity_key):
+        return __native_columnar(log, activity_key, window, keep_once_per_case)
     if keep_once_per_case:
         dfgs = map((lambda t: set((t[i - window][activity_key], t[i][activity_key]) for i in range(window, len(t)))),
                    log)
@@ -72,6 +77,31 @@ def native(log, parameters=None):
     return Counter([dfg for lista in dfgs for dfg in lista])
 
 
+def __native_columnar(log, activity_key, window, keep_once_per_case):
+    """
+    Counts the directly follows occurrences on a columnar event log, working on the integer codes of the activities
+    """
+    column = log.event_columns[activity_key]
+    codes = column.values.astype(np.int64)
+    case_idx = log.get_case_index_per_event()
+    if len(codes) <= window:
+        return Counter()
+    # couples of events at distance window that belong to the same case
+    same_case = case_idx[window:] == case_idx[:-window]
+    source = codes[:-window][same_case]
+    target = codes[window:][same_case]
+    pair_case = case_idx[window:][same_case]
+    valid = (source >= 0) & (target >= 0)
+    source, target, pair_case = source[valid], target[valid], pair_case[valid]
+    no_act = len(column.categories)
+    pairs = source * no_act + target
+    if keep_once_per_case:
+        pairs = np.unique(pair_case * (no_act * no_act) + pairs) % (no_act * no_act)
+    values, counts = np.unique(pairs, return_counts=True)
+    categories = column.categories
+    return Counter({(categories[v // no_act], categories[v % no_act]): int(c) for v, c in zip(values, counts)})
+
+
 def performance(log, parameters=None):
     """
     Measure performance between couples of attributes in the DFG graph
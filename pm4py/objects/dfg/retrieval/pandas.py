@@ -1,5 +1,10 @@
+from collections import Counter
+
 from pm4py.util import xes_constants, pandas_utils, constants
 
+# number of couples of events that are computed in a single chunk
+DEFAULT_CHUNK_SIZE = 1000000
+
 
 def get_dfg_graph(df, measure="frequency", activity_key="concept:name", case_id_glue="case:concept:name",
                   start_timestamp_key=None, timestamp_key="time:timestamp", perf_aggregation_key="mean",
@@ -163,9 +168,154 @@ def get_freq_triples(df, activity_key="concept:name", case_id_glue="case:concept
     return freq_triples
 
 
+def __prepare_dataframe(df, start_timestamp_key, timestamp_key, case_id_glue, activity_key, sort_caseid_required,
+                        sort_timestamp_along_case_id, reduce_dataframe):
+    """
+    Prepares the dataframe for the computation of the relations between the events of the same case
+    (events sorted by case, essential columns, original index inserted in the @@index column,
+    rows with missing values removed)
+    """
+    # to get rows belonging to same case ID together, we need to sort on case ID
+    if sort_caseid_required:
+        if sort_timestamp_along_case_id:
+            df = df.sort_values([case_id_glue, start_timestamp_key, timestamp_key])
+        else:
+            df = df.sort_values(case_id_glue)
+
+    # to increase the speed of the approaches reduce dataframe to case, activity (and possibly complete timestamp)
+    # columns
+    if reduce_dataframe:
+        df = df[list(dict.fromkeys([case_id_glue, activity_key, start_timestamp_key, timestamp_key]))]
+
+    df = pandas_utils.insert_index(df)
+    df = df.dropna()
+
+    return df.reset_index(drop=True)
+
+
+def __timestamp_to_int(series):
+    """
+    Transforms a timestamp column into a NumPy array of integers (nanoseconds from the epoch)
+    """
+    import numpy as np
+
+    return series.values.astype("datetime64[ns]").astype(np.int64)
+
+
+def __iterate_event_pairs(case_values, condition, window=None, chunk_size=DEFAULT_CHUNK_SIZE, first_only=False):
+    """
+    Iterates (in chunks) over the couples of events (i, j) of the same case, with i preceding j in the order
+    of the events, that satisfy the provided condition.
+
+    The events are expected to be grouped by case. Instead of performing a self-join of the cases
+    (whose memory grows quadratically with the length of the cases), the couples are built offset by offset:
+    for the offset k, the couples (i, i+k) are computed on the events having at least k following events in the case.
+    Hence, the peak memory is linear in the number of events (plus the size of a chunk).
+
+    Parameters
+    --------------
+    case_values
+        Array containing the case of each event
+    condition
+        Function that, given the arrays of the indexes of the source and target events, returns a boolean mask
+    window
+        (If specified) maximum distance between the events of the couple
+    chunk_size
+        Number of couples (approximately) returned in each chunk
+    first_only
+        Keep, for each source event, only the first target event that satisfies the condition
+
+    Returns
+    --------------
+    chunks
+        Generator of couples (source indexes, target indexes)
+    """
+    import numpy as np
+    import pandas as pd
+
+    no_events = len(case_values)
+    if no_events == 0:
+        return
+    case_codes = pd.factorize(case_values)[0]
+    case_starts = np.concatenate([[0], np.flatnonzero(case_codes[1:] != case_codes[:-1]) + 1])
+    case_ends = np.append(case_starts[1:], no_events)
+    case_lengths = case_ends - case_starts
+    # number of events that follow each event in its case
+    remaining = np.repeat(case_ends, case_lengths) - 1 - np.arange(no_events)
+    order = np.argsort(-remaining, kind="stable")
+    neg_sorted_remaining = -remaining[order]
+    max_offset = int(-neg_sorted_remaining[0])
+    if window is not None:
+        max_offset = min(max_offset, window)
+
+    found = np.zeros(no_events, dtype=bool) if first_only else None
+    buffer_source = []
+    buffer_target = []
+    buffered = 0
+    for k in range(1, max_offset + 1):
+        source = order[:np.searchsorted(neg_sorted_remaining, -k, side="right")]
+        if first_only:
+            source = source[~found[source]]
+        target = source + k
+        mask = condition(source, target)
+        source = source[mask]
+        target = target[mask]
+        if first_only:
+            found[source] = True
+        if len(source) > 0:
+            buffer_source.append(source)
+            buffer_target.append(target)
+            buffered += len(source)
+        if buffered >= chunk_size:
+            yield np.concatenate(buffer_source), np.concatenate(buffer_target)
+            buffer_source = []
+            buffer_target = []
+            buffered = 0
+    if buffered > 0:
+        yield np.concatenate(buffer_source), np.concatenate(buffer_target)
+
+
+def __partial_order_condition(start_timestamps, complete_timestamps):
+    return lambda source, target: complete_timestamps[source] <= start_timestamps[target]
+
+
+def __concurrency_condition(start_timestamps, complete_timestamps):
+    import numpy as np
+
+    return lambda source, target: np.maximum(start_timestamps[source], start_timestamps[target]) <= np.minimum(
+        complete_timestamps[source], complete_timestamps[target])
+
+
+def __join_event_pairs(df, chunks, case_id_glue):
+    """
+    Builds a dataframe containing, for each couple of events, the columns of the source event
+    and the columns of the target event (with the _2 suffix)
+    """
+    import numpy as np
+    import pandas as pd
+
+    source = []
+    target = []
+    for chunk_source, chunk_target in chunks:
+        source.append(chunk_source)
+        target.append(chunk_target)
+    source = np.concatenate(source) if source else np.zeros(0, dtype=np.int64)
+    target = np.concatenate(target) if target else np.zeros(0, dtype=np.int64)
+    order = np.lexsort((target, source))
+    source = source[order]
+    target = target[order]
+
+    other_columns = [x for x in df.columns if x != case_id_glue]
+    left = df.iloc[source].reset_index(drop=True)
+    right = df[other_columns].iloc[target].reset_index(drop=True)
+    right.columns = [x + "_2" for x in other_columns]
+    return pd.concat([left, right], axis=1)
+
+
 def get_partial_order_dataframe(df, start_timestamp_key=None, timestamp_key="time:timestamp",
                                 case_id_glue="case:concept:name", activity_key="concept:name", sort_caseid_required=True,
-                                sort_timestamp_along_case_id=True, reduce_dataframe=True, keep_first_following=True):
+                                sort_timestamp_along_case_id=True, reduce_dataframe=True, keep_first_following=True,
+                                window=None, chunk_size=DEFAULT_CHUNK_SIZE):
     """
     Gets the partial order between events (of the same case) in a Pandas dataframe
 
@@ -189,6 +339,10 @@ def get_partial_order_dataframe(df, start_timestamp_key=None, timestamp_key="tim
         To fasten operation, keep only essential columns in the dataframe
     keep_first_following
         Keep only the first event following the given event
+    window
+        (If specified) consider only the couples of events whose distance in the case is at most the window
+    chunk_size
+        Number of couples of events that are computed in a single chunk
     Returns
     ---------------
     part_ord_dataframe
@@ -200,40 +354,99 @@ def get_partial_order_dataframe(df, start_timestamp_key=None, timestamp_key="tim
         start_timestamp_key = xes_constants.DEFAULT_START_TIMESTAMP_KEY
         df[start_timestamp_key] = df[timestamp_key]
 
-    # to get rows belonging to same case ID together, we need to sort on case ID
-    if sort_caseid_required:
-        if sort_timestamp_along_case_id:
-            df = df.sort_values([case_id_glue, start_timestamp_key, timestamp_key])
-        else:
-            df = df.sort_values(case_id_glue)
-
-    # to increase the speed of the approaches reduce dataframe to case, activity (and possibly complete timestamp)
-    # columns
-    if reduce_dataframe:
-        df = df[[case_id_glue, activity_key, start_timestamp_key, timestamp_key]]
-
-    df = pandas_utils.insert_index(df)
-    df = df.set_index(case_id_glue)
-    df_copy = df.copy()
+    df = __prepare_dataframe(df, start_timestamp_key, timestamp_key, case_id_glue, activity_key, sort_caseid_required,
+                             sort_timestamp_along_case_id, reduce_dataframe)
 
-    df = df.join(df_copy, rsuffix="_2").dropna()
-    df = df[df[constants.DEFAULT_INDEX_KEY] < df[constants.DEFAULT_INDEX_KEY + "_2"]]
-    df = df[df[timestamp_key] <= df[start_timestamp_key + "_2"]]
-    df = df.reset_index()
+    condition = __partial_order_condition(__timestamp_to_int(df[start_timestamp_key]),
+                                          __timestamp_to_int(df[timestamp_key]))
+    chunks = __iterate_event_pairs(df[case_id_glue].values, condition, window=window, chunk_size=chunk_size,
+                                   first_only=keep_first_following)
+    df = __join_event_pairs(df, chunks, case_id_glue)
 
     df[constants.DEFAULT_FLOW_TIME] = (df[start_timestamp_key + "_2"] - df[timestamp_key]).astype('timedelta64[s]')
 
     if keep_first_following:
-        df = df.groupby(constants.DEFAULT_INDEX_KEY).first().reset_index()
+        df = df.sort_values(constants.DEFAULT_INDEX_KEY, kind="mergesort")
+        df = df[[constants.DEFAULT_INDEX_KEY] + [x for x in df.columns if x != constants.DEFAULT_INDEX_KEY]]
+        df = df.reset_index(drop=True)
 
     return df
 
 
+def get_partial_order_counts(df, start_timestamp_key=None, timestamp_key="time:timestamp",
+                             case_id_glue="case:concept:name", activity_key="concept:name", sort_caseid_required=True,
+                             sort_timestamp_along_case_id=True, keep_first_following=True, window=None,
+                             chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Counts the number of times a couple of activities is in the partial order (of the same case)
+    in a Pandas dataframe, without materializing the partial order dataframe
+
+    Parameters
+    --------------
+    df
+        Dataframe
+    start_timestamp_key
+        Start timestamp key (if not provided, defaulted to the timestamp_key)
+    timestamp_key
+        Complete timestamp
+    case_id_glue
+        Column of the dataframe to use as case ID
+    activity_key
+        Activity key
+    sort_caseid_required
+        Tells if a sort by case ID is required (default: True)
+    sort_timestamp_along_case_id
+        Tells if a sort by timestamp is required along the case ID (default: True)
+    keep_first_following
+        Keep only the first event following the given event
+    window
+        (If specified) consider only the couples of events whose distance in the case is at most the window
+    chunk_size
+        Number of couples of events that are computed in a single chunk
+
+    Returns
+    ---------------
+    ret_dict
+        Dictionary associating to each couple of activities the number of occurrences
+    """
+    if start_timestamp_key is None:
+        start_timestamp_key = timestamp_key
+
+    df = __prepare_dataframe(df, start_timestamp_key, timestamp_key, case_id_glue, activity_key, sort_caseid_required,
+                             sort_timestamp_along_case_id, True)
+
+    condition = __partial_order_condition(__timestamp_to_int(df[start_timestamp_key]),
+                                          __timestamp_to_int(df[timestamp_key]))
+    chunks = __iterate_event_pairs(df[case_id_glue].values, condition, window=window, chunk_size=chunk_size,
+                                   first_only=keep_first_following)
+
+    return __count_activity_pairs(df[activity_key], chunks)
+
+
+def __count_activity_pairs(activities, chunks):
+    """
+    Counts the couples of activities in the chunks of couples of events
+    """
+    import numpy as np
+    import pandas as pd
+
+    activity_codes, activity_values = pd.factorize(activities)
+    activity_codes = activity_codes.astype(np.int64)
+    no_activities = len(activity_values)
+    counts = Counter()
+    for source, target in chunks:
+        pairs, pairs_count = np.unique(activity_codes[source] * no_activities + activity_codes[target],
+                                       return_counts=True)
+        for pair, count in zip(pairs, pairs_count):
+            counts[int(pair)] += int(count)
+    return {(activity_values[x // no_activities], activity_values[x % no_activities]): y for x, y in counts.items()}
+
+
 def get_concurrent_events_dataframe(df, start_timestamp_key=None, timestamp_key="time:timestamp",
                                     case_id_glue="case:concept:name", activity_key="concept:name", sort_caseid_required=True,
                                     sort_timestamp_along_case_id=True, reduce_dataframe=True,
                                     max_start_column="@@max_start_column", min_complete_column="@@min_complete_column",
-                                    diff_maxs_minc="@@diff_maxs_minc"):
+                                    diff_maxs_minc="@@diff_maxs_minc", window=None, chunk_size=DEFAULT_CHUNK_SIZE):
     """
     Gets the concurrent events (of the same case) in a Pandas dataframe
 
@@ -255,6 +468,10 @@ def get_concurrent_events_dataframe(df, start_timestamp_key=None, timestamp_key=
         Tells if a sort by timestamp is required along the case ID (default: True)
     reduce_dataframe
         To fasten operation, keep only essential columns in the dataframe
+    window
+        (If specified) consider only the couples of events whose distance in the case is at most the window
+    chunk_size
+        Number of couples of events that are computed in a single chunk
     Returns
     ---------------
     conc_ev_dataframe
@@ -266,29 +483,68 @@ def get_concurrent_events_dataframe(df, start_timestamp_key=None, timestamp_key=
         start_timestamp_key = xes_constants.DEFAULT_START_TIMESTAMP_KEY
         df[start_timestamp_key] = df[timestamp_key]
 
-    # to get rows belonging to same case ID together, we need to sort on case ID
-    if sort_caseid_required:
-        if sort_timestamp_along_case_id:
-            df = df.sort_values([case_id_glue, start_timestamp_key, timestamp_key])
-        else:
-            df = df.sort_values(case_id_glue)
-
-    # to increase the speed of the approaches reduce dataframe to case, activity (and possibly complete timestamp)
-    # columns
-    if reduce_dataframe:
-        df = df[[case_id_glue, activity_key, start_timestamp_key, timestamp_key]]
+    df = __prepare_dataframe(df, start_timestamp_key, timestamp_key, case_id_glue, activity_key, sort_caseid_required,
+                             sort_timestamp_along_case_id, reduce_dataframe)
 
-    df = pandas_utils.insert_index(df)
-    df = df.set_index(case_id_glue)
-    df_copy = df.copy()
+    start_timestamps = __timestamp_to_int(df[start_timestamp_key])
+    complete_timestamps = __timestamp_to_int(df[timestamp_key])
+    condition = __concurrency_condition(start_timestamps, complete_timestamps)
+    chunks = __iterate_event_pairs(df[case_id_glue].values, condition, window=window, chunk_size=chunk_size)
+    df = __join_event_pairs(df, chunks, case_id_glue)
 
-    df = df.join(df_copy, rsuffix="_2").dropna()
-    df = df[df[constants.DEFAULT_INDEX_KEY] < df[constants.DEFAULT_INDEX_KEY + "_2"]]
     df[max_start_column] = df[[start_timestamp_key, start_timestamp_key + '_2']].max(axis=1)
     df[min_complete_column] = df[[timestamp_key, timestamp_key + '_2']].min(axis=1)
-    df[max_start_column] = df[max_start_column].apply(lambda x: x.timestamp())
-    df[min_complete_column] = df[min_complete_column].apply(lambda x: x.timestamp())
+    df[max_start_column] = __timestamp_to_int(df[max_start_column]) / 10 ** 9
+    df[min_complete_column] = __timestamp_to_int(df[min_complete_column]) / 10 ** 9
     df[diff_maxs_minc] = df[min_complete_column] - df[max_start_column]
-    df = df[df[diff_maxs_minc] >= 0]
+    df = df.set_index(case_id_glue)
 
     return df
+
+
+def get_concurrent_events_counts(df, start_timestamp_key=None, timestamp_key="time:timestamp",
+                                 case_id_glue="case:concept:name", activity_key="concept:name",
+                                 sort_caseid_required=True, sort_timestamp_along_case_id=True, window=None,
+                                 chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Counts the number of times a couple of activities has been executed concurrently (in the same case)
+    in a Pandas dataframe, without materializing the concurrent events dataframe
+
+    Parameters
+    --------------
+    df
+        Dataframe
+    start_timestamp_key
+        Start timestamp key (if not provided, defaulted to the timestamp_key)
+    timestamp_key
+        Complete timestamp
+    case_id_glue
+        Column of the dataframe to use as case ID
+    activity_key
+        Activity key
+    sort_caseid_required
+        Tells if a sort by case ID is required (default: True)
+    sort_timestamp_along_case_id
+        Tells if a sort by timestamp is required along the case ID (default: True)
+    window
+        (If specified) consider only the couples of events whose distance in the case is at most the window
+    chunk_size
+        Number of couples of events that are computed in a single chunk
+
+    Returns
+    ---------------
+    ret_dict
+        Dictionary associating to each couple of activities the number of times they have been executed
+        concurrently
+    """
+    if start_timestamp_key is None:
+        start_timestamp_key = timestamp_key
+
+    df = __prepare_dataframe(df, start_timestamp_key, timestamp_key, case_id_glue, activity_key, sort_caseid_required,
+                             sort_timestamp_along_case_id, True)
+
+    condition = __concurrency_condition(__timestamp_to_int(df[start_timestamp_key]),
+                                        __timestamp_to_int(df[timestamp_key]))
+    chunks = __iterate_event_pairs(df[case_id_glue].values, condition, window=window, chunk_size=chunk_size)
+
+    return __count_activity_pairs(df[activity_key], chunks)
@@ -0,0 +1,591 @@
+import datetime
+from collections.abc import Mapping, Sequence
+from copy import copy
+
+import numpy as np
+
+from pm4py.objects.log.log import EventLog, Trace, Event
+from pm4py.util import xes_constants, constants
+from pm4py.util.constants import DEFAULT_VARIANT_SEP
+
+# encoding of the columns
+CATEGORICAL = "categorical"
+NUMERIC = "numeric"
+TIMESTAMP = "timestamp"
+OBJECT = "object"
+
+_NS_PER_SECOND = 10 ** 9
+
+
+def _to_ns(value):
+    """
+    Transforms a datetime into the number of nanoseconds from the epoch (UTC)
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    delta = value - datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * _NS_PER_SECOND + delta.microseconds * 1000
+
+
+def _from_ns(value, tz):
+    """
+    Transforms a number of nanoseconds from the epoch (UTC) into a datetime
+    """
+    value = int(value)
+    dt = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(
+        microseconds=value // 1000)
+    if tz is None:
+        return dt.replace(tzinfo=None)
+    return dt.astimezone(tz)
+
+
+class Column(object):
+    """
+    Column of an attribute in the columnar event log.
+
+    Depending on the encoding, the values are stored as:
+    - CATEGORICAL: integer codes (-1 if missing) pointing to the list of categories
+    - NUMERIC: NumPy numeric array, along with a mask of the present values
+    - TIMESTAMP: int64 array of nanoseconds from the epoch (UTC), along with a mask of the present values
+      and the timezone in which the values are returned
+    - OBJECT: NumPy object array, along with a mask of the present values
+    """
+
+    def __init__(self, encoding, values, categories=None, present=None, tz=None):
+        self.encoding = encoding
+        self.values = values
+        self.categories = categories
+        self.present = present
+        self.tz = tz
+
+    def is_present(self, i):
+        if self.encoding == CATEGORICAL:
+            return self.values[i] >= 0
+        return self.present is None or bool(self.present[i])
+
+    def get(self, i):
+        """
+        Gets the value of the column at the given position (KeyError if not present)
+        """
+        if not self.is_present(i):
+            raise KeyError(i)
+        if self.encoding == CATEGORICAL:
+            return self.categories[self.values[i]]
+        elif self.encoding == TIMESTAMP:
+            return _from_ns(self.values[i], self.tz)
+        elif self.encoding == NUMERIC:
+            return self.values[i].item()
+        return self.values[i]
+
+    def take(self, indices):
+        """
+        Gets a new column containing only the values at the given positions
+        """
+        return Column(self.encoding, self.values[indices], categories=self.categories,
+                      present=self.present[indices] if self.present is not None else None, tz=self.tz)
+
+    @staticmethod
+    def from_values(values):
+        """
+        Builds a column from a list of Python values (None if missing), choosing the encoding
+        """
+        present = np.array([v is not None for v in values], dtype=bool)
+        non_null = [v for v in values if v is not None]
+        all_present = None if bool(present.all()) else present
+
+        if non_null and all(isinstance(v, str) for v in non_null):
+            categories_dict = {}
+            codes = np.empty(len(values), dtype=np.int32)
+            for i, v in enumerate(values):
+                if v is None:
+                    codes[i] = -1
+                else:
+                    if v not in categories_dict:
+                        categories_dict[v] = len(categories_dict)
+                    codes[i] = categories_dict[v]
+            return Column(CATEGORICAL, codes, categories=list(categories_dict))
+        elif non_null and all(isinstance(v, datetime.datetime) for v in non_null):
+            tz = non_null[0].tzinfo
+            ns = np.array([_to_ns(v) if v is not None else 0 for v in values], dtype=np.int64)
+            return Column(TIMESTAMP, ns, present=all_present, tz=tz)
+        elif non_null and all(type(v) in (int, float) for v in non_null):
+            dtype = np.int64 if all(type(v) is int for v in non_null) else np.float64
+            arr = np.array([v if v is not None else 0 for v in values], dtype=dtype)
+            return Column(NUMERIC, arr, present=all_present)
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = values
+        return Column(OBJECT, arr, present=all_present)
+
+
+class ColumnarEvent(Event):
+    """
+    Read-only view over an event of a columnar event log
+    """
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._columns[key].get(self._index)
+
+    get = Mapping.get
+    __contains__ = Mapping.__contains__
+
+    def __setitem__(self, key, value):
+        raise TypeError("events of a columnar event log are read-only (materialize them through to_event_log)")
+
+    def __delitem__(self, key):
+        raise TypeError("events of a columnar event log are read-only (materialize them through to_event_log)")
+
+    def __iter__(self):
+        return iter([k for k, c in self._columns.items() if c.is_present(self._index)])
+
+    def __len__(self):
+        return len([k for k, c in self._columns.items() if c.is_present(self._index)])
+
+    def __hash__(self):
+        return hash(frozenset(dict(self)))
+
+    def _get_items_hash(self):
+        return hash(tuple(self.items()))
+
+    def __copy__(self):
+        return Event(dict(self))
+
+
+class ColumnarTrace(Trace):
+    """
+    Read-only view over a case of a columnar event log.
+    Events are materialized (as views) only when accessed
+    """
+
+    def __init__(self, log, case_index):
+        self._log = log
+        self._case_index = case_index
+        self._start = int(log.case_offsets[case_index])
+        self._end = int(log.case_offsets[case_index + 1])
+        self._attributes = None
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [ColumnarEvent(self._log.event_columns, i) for i in range(self._start, self._end)[key]]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return ColumnarEvent(self._log.event_columns, self._start + key)
+
+    def __iter__(self):
+        columns = self._log.event_columns
+        return (ColumnarEvent(columns, i) for i in range(self._start, self._end))
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __contains__(self, item):
+        return Sequence.__contains__(self, item)
+
+    def __reversed__(self):
+        columns = self._log.event_columns
+        return (ColumnarEvent(columns, i) for i in range(self._end - 1, self._start - 1, -1))
+
+    def __setitem__(self, key, value):
+        raise TypeError("traces of a columnar event log are read-only (materialize them through to_event_log)")
+
+    def insert(self, i, x):
+        raise TypeError("traces of a columnar event log are read-only (materialize them through to_event_log)")
+
+    def append(self, x):
+        raise TypeError("traces of a columnar event log are read-only (materialize them through to_event_log)")
+
+    def index(self, x, start=0, end=None):
+        return Sequence.index(self, x, start, end)
+
+    def count(self, x):
+        return Sequence.count(self, x)
+
+    def __hash__(self):
+        return hash(tuple(tuple(((x, y) for x, y in event.items())) for event in self))
+
+    def _get_attributes(self):
+        if self._attributes is None:
+            self._attributes = {k: c.get(self._case_index) for k, c in self._log.trace_columns.items() if
+                                c.is_present(self._case_index)}
+        return self._attributes
+
+    attributes = property(_get_attributes)
+
+    def __repr__(self, ret_list=False):
+        if len(self) == 0:
+            events = []
+        elif len(self) == 1:
+            events = [self[0]]
+        else:
+            events = [self[0], "..", self[-1]]
+        ret = {"attributes": self.attributes, "events": events}
+        if ret_list:
+            return ret
+        return str(ret)
+
+    def __copy__(self):
+        return Trace([Event(dict(ev)) for ev in self], attributes=dict(self.attributes))
+
+
+class ColumnarEventLog(EventLog):
+    """
+    Event log backed by contiguous columns instead of per-event dictionaries.
+
+    Events are stored ordered by case; the events of the i-th case are located in the positions
+    case_offsets[i]:case_offsets[i+1] of each event column. The activity is a categorical column
+    (integer codes + list of activities) and the timestamp is an int64 column (nanoseconds from the epoch).
+
+    The log exposes the same Sequence protocol of the event log, through lazily created
+    (read-only) trace and event views; hence, the existing algorithms can consume it
+    without modifications. Use to_event_log to obtain a classic (mutable) event log.
+    """
+
+    def __init__(self, case_offsets, event_columns, trace_columns=None, activity_key=xes_constants.DEFAULT_NAME_KEY,
+                 timestamp_key=xes_constants.DEFAULT_TIMESTAMP_KEY, **kwargs):
+        super(ColumnarEventLog, self).__init__(**kwargs)
+        self._case_offsets = np.asarray(case_offsets, dtype=np.int64)
+        self._event_columns = event_columns
+        self._trace_columns = trace_columns if trace_columns is not None else {}
+        self._activity_key = activity_key
+        self._timestamp_key = timestamp_key
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.select_cases(np.arange(len(self))[key])
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return ColumnarTrace(self, key)
+
+    def __iter__(self):
+        return (ColumnarTrace(self, i) for i in range(len(self)))
+
+    def __len__(self):
+        return len(self._case_offsets) - 1
+
+    def __contains__(self, item):
+        return Sequence.__contains__(self, item)
+
+    def __reversed__(self):
+        return (ColumnarTrace(self, i) for i in range(len(self) - 1, -1, -1))
+
+    def __setitem__(self, key, value):
+        raise TypeError("a columnar event log is read-only (materialize it through to_event_log)")
+
+    def append(self, x):
+        raise TypeError("a columnar event log is read-only (materialize it through to_event_log)")
+
+    def index(self, x, start=0, end=None):
+        return Sequence.index(self, x, start, end)
+
+    def count(self, x):
+        return Sequence.count(self, x)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        if len(self) == 0:
+            ret = []
+        elif len(self) == 1:
+            ret = [self[0].__repr__(ret_list=True)]
+        else:
+            ret = [self[0].__repr__(ret_list=True), "....", self[-1].__repr__(ret_list=True)]
+        return str(ret)
+
+    def __copy__(self):
+        # the columns are never modified in-place, hence they can be shared
+        return self.__new_log(self._case_offsets, self._event_columns, self._trace_columns)
+
+    def __new_log(self, case_offsets, event_columns, trace_columns):
+        return ColumnarEventLog(case_offsets, event_columns, trace_columns=trace_columns,
+                                activity_key=self._activity_key, timestamp_key=self._timestamp_key,
+                                attributes=copy(self._attributes), extensions=copy(self._extensions),
+                                omni_present=copy(self._omni), classifiers=copy(self._classifiers))
+
+    def _get_case_offsets(self):
+        return self._case_offsets
+
+    def _get_event_columns(self):
+        return self._event_columns
+
+    def _get_trace_columns(self):
+        return self._trace_columns
+
+    def _get_activity_key(self):
+        return self._activity_key
+
+    def _get_timestamp_key(self):
+        return self._timestamp_key
+
+    def _get_activity_codes(self):
+        return self._event_columns[self._activity_key].values
+
+    def _get_activities(self):
+        return self._event_columns[self._activity_key].categories
+
+    def _get_timestamps(self):
+        if self._timestamp_key in self._event_columns:
+            return self._event_columns[self._timestamp_key].values
+        return None
+
+    def get_case_lengths(self):
+        return np.diff(self._case_offsets)
+
+    def get_case_index_per_event(self):
+        """
+        Gets, for each event, the index of the case to which it belongs
+        """
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.get_case_lengths())
+
+    def has_categorical_attribute(self, key):
+        return key in self._event_columns and self._event_columns[key].encoding == CATEGORICAL
+
+    def get_values_mask(self, key, values):
+        """
+        Gets a boolean mask (one entry per event) which is True when the event
+        has the given attribute with a value contained in the provided values
+        """
+        column = self._event_columns[key] if key in self._event_columns else None
+        if column is None:
+            return np.zeros(self._case_offsets[-1], dtype=bool)
+        if column.encoding == CATEGORICAL:
+            values = set(values)
+            admitted = np.array([i for i, c in enumerate(column.categories) if c in values], dtype=column.values.dtype)
+            return np.isin(column.values, admitted)
+        values = set(values)
+        return np.array([column.is_present(i) and column.get(i) in values for i in range(len(column.values))],
+                        dtype=bool)
+
+    def get_cases_with_events(self, mask):
+        """
+        Gets a boolean array (one entry per case) which is True when at least an event of the case
+        satisfies the provided (event) mask
+        """
+        cumulative = np.zeros(len(mask) + 1, dtype=np.int64)
+        np.cumsum(mask, out=cumulative[1:])
+        return np.diff(cumulative[self._case_offsets]) > 0
+
+    def select_cases(self, indices):
+        """
+        Gets a new columnar log containing only the cases at the given indices (in the given order)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        lengths = self.get_case_lengths()[indices]
+        new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=new_offsets[1:])
+        event_idx = np.repeat(self._case_offsets[:-1][indices] - new_offsets[:-1], lengths) + np.arange(
+            new_offsets[-1], dtype=np.int64)
+        return self.__new_log(new_offsets, {k: c.take(event_idx) for k, c in self._event_columns.items()},
+                              {k: c.take(indices) for k, c in self._trace_columns.items()})
+
+    def filter_events(self, mask):
+        """
+        Gets a new columnar log containing only the events for which the mask is True
+        (the cases that remain without events are removed)
+        """
+        mask = np.asarray(mask, dtype=bool)
+        kept = np.zeros(len(mask) + 1, dtype=np.int64)
+        np.cumsum(mask, out=kept[1:])
+        new_offsets = kept[self._case_offsets]
+        non_empty = np.flatnonzero(np.diff(new_offsets) > 0)
+        new_offsets = np.concatenate([[0], new_offsets[1:][non_empty]])
+        event_idx = np.flatnonzero(mask)
+        return self.__new_log(new_offsets, {k: c.take(event_idx) for k, c in self._event_columns.items()},
+                              {k: c.take(non_empty) for k, c in self._trace_columns.items()})
+
+    def get_variants_trace_idx(self, activity_key=None):
+        """
+        Gets the variants of the log (along with the indices of the cases) reading the activity codes
+
+        Returns
+        -------------
+        variants
+            Dictionary associating to each variant (activities separated by the default variant separator)
+            the list of indices of the cases
+        """
+        activity_key = self._activity_key if activity_key is None else activity_key
+        column = self._event_columns[activity_key]
+        codes = column.values
+        offsets = self._case_offsets
+        variants_codes = {}
+        for i in range(len(offsets) - 1):
+            key = codes[offsets[i]:offsets[i + 1]].tobytes()
+            if key not in variants_codes:
+                variants_codes[key] = []
+            variants_codes[key].append(i)
+        variants = {}
+        for key, idxs in variants_codes.items():
+            trace_codes = codes[offsets[idxs[0]]:offsets[idxs[0] + 1]]
+            variant = DEFAULT_VARIANT_SEP.join(column.categories[c] for c in trace_codes if c >= 0)
+            if variant not in variants:
+                variants[variant] = idxs
+            else:
+                variants[variant] = sorted(variants[variant] + idxs)
+        return variants
+
+    def to_event_log(self):
+        """
+        Materializes the columnar log into a classic event log
+        """
+        log = EventLog(attributes=copy(self._attributes), extensions=copy(self._extensions),
+                       omni_present=copy(self._omni), classifiers=copy(self._classifiers))
+        for trace in self:
+            log.append(copy(trace))
+        return log
+
+    case_offsets = property(_get_case_offsets)
+    event_columns = property(_get_event_columns)
+    trace_columns = property(_get_trace_columns)
+    activity_key = property(_get_activity_key)
+    timestamp_key = property(_get_timestamp_key)
+    activity_codes = property(_get_activity_codes)
+    activities = property(_get_activities)
+    timestamps = property(_get_timestamps)
+
+
+def from_event_log(log, parameters=None):
+    """
+    Builds a columnar event log from an event log
+
+    Parameters
+    -------------
+    log
+        Event log
+    parameters
+        Parameters, including:
+            - constants.PARAMETER_CONSTANT_ACTIVITY_KEY => the activity key
+            - constants.PARAMETER_CONSTANT_TIMESTAMP_KEY => the timestamp key
+
+    Returns
+    -------------
+    columnar_log
+        Columnar event log
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = parameters[
+        constants.PARAMETER_CONSTANT_ACTIVITY_KEY] if constants.PARAMETER_CONSTANT_ACTIVITY_KEY in parameters else \
+        xes_constants.DEFAULT_NAME_KEY
+    timestamp_key = parameters[
+        constants.PARAMETER_CONSTANT_TIMESTAMP_KEY] if constants.PARAMETER_CONSTANT_TIMESTAMP_KEY in parameters else \
+        xes_constants.DEFAULT_TIMESTAMP_KEY
+
+    no_events = sum(len(trace) for trace in log)
+    case_offsets = np.zeros(len(log) + 1, dtype=np.int64)
+    event_values = {}
+    trace_values = {}
+    event_pos = 0
+    for case_idx, trace in enumerate(log):
+        for key, value in trace.attributes.items():
+            if key not in trace_values:
+                trace_values[key] = [None] * len(log)
+            trace_values[key][case_idx] = value
+        for event in trace:
+            for key, value in event.items():
+                if key not in event_values:
+                    event_values[key] = [None] * no_events
+                event_values[key][event_pos] = value
+            event_pos += 1
+        case_offsets[case_idx + 1] = event_pos
+
+    event_columns = {k: Column.from_values(v) for k, v in event_values.items()}
+    trace_columns = {k: Column.from_values(v) for k, v in trace_values.items()}
+    if activity_key not in event_columns:
+        event_columns[activity_key] = Column(CATEGORICAL, np.full(no_events, -1, dtype=np.int32), categories=[])
+
+    return ColumnarEventLog(case_offsets, event_columns, trace_columns=trace_columns, activity_key=activity_key,
+                            timestamp_key=timestamp_key, attributes=copy(log.attributes),
+                            extensions=copy(log.extensions), omni_present=copy(log.omni_present),
+                            classifiers=copy(log.classifiers))
+
+
+def from_dataframe(df, parameters=None):
+    """
+    Builds a columnar event log from a dataframe (the order of the events inside each case is kept)
+
+    Parameters
+    -------------
+    df
+        Dataframe
+    parameters
+        Parameters, including:
+            - constants.PARAMETER_CONSTANT_CASEID_KEY => the case identifier column (default: case:concept:name)
+            - constants.PARAMETER_CONSTANT_ACTIVITY_KEY => the activity key
+            - constants.PARAMETER_CONSTANT_TIMESTAMP_KEY => the timestamp key
+            - "case_attribute_prefix" => the prefix of the case attributes (default: case:)
+
+    Returns
+    -------------
+    columnar_log
+        Columnar event log
+    """
+    import pandas as pd
+
+    if parameters is None:
+        parameters = {}
+
+    case_id_key = parameters[
+        constants.PARAMETER_CONSTANT_CASEID_KEY] if constants.PARAMETER_CONSTANT_CASEID_KEY in parameters else \
+        constants.CASE_CONCEPT_NAME
+    activity_key = parameters[
+        constants.PARAMETER_CONSTANT_ACTIVITY_KEY] if constants.PARAMETER_CONSTANT_ACTIVITY_KEY in parameters else \
+        xes_constants.DEFAULT_NAME_KEY
+    timestamp_key = parameters[
+        constants.PARAMETER_CONSTANT_TIMESTAMP_KEY] if constants.PARAMETER_CONSTANT_TIMESTAMP_KEY in parameters else \
+        xes_constants.DEFAULT_TIMESTAMP_KEY
+    case_prefix = parameters["case_attribute_prefix"] if "case_attribute_prefix" in parameters else "case:"
+
+    case_codes, case_uniques = pd.factorize(df[case_id_key], sort=False)
+    order = np.argsort(case_codes, kind="stable")
+    case_codes = case_codes[order]
+    case_offsets = np.zeros(len(case_uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(case_codes, minlength=len(case_uniques)), out=case_offsets[1:])
+    first_event = case_offsets[:-1]
+
+    event_columns = {}
+    trace_columns = {}
+    for col in df.columns:
+        series = df[col].iloc[order]
+        column = __column_from_series(series)
+        if col.startswith(case_prefix):
+            trace_columns[col[len(case_prefix):]] = column.take(first_event)
+        else:
+            event_columns[col] = column
+    if xes_constants.DEFAULT_TRACEID_KEY not in trace_columns:
+        trace_columns[xes_constants.DEFAULT_TRACEID_KEY] = Column.from_values(list(case_uniques))
+
+    return ColumnarEventLog(case_offsets, event_columns, trace_columns=trace_columns, activity_key=activity_key,
+                            timestamp_key=timestamp_key)
+
+
+def __column_from_series(series):
+    """
+    Builds a column from a Pandas series
+    """
+    import pandas as pd
+
+    present = series.notna().values
+    all_present = None if bool(present.all()) else present
+    if pd.api.types.is_datetime64_any_dtype(series):
+        tz = series.dt.tz
+        if tz is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        values = series.values.astype("datetime64[ns]").astype(np.int64)
+        return Column(TIMESTAMP, values, present=all_present, tz=tz)
+    elif pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        if all_present is None and series.map(type).eq(str).all():
+            codes, uniques = pd.factorize(series, sort=False)
+            return Column(CATEGORICAL, codes.astype(np.int32), categories=list(uniques))
+        values = np.empty(len(series), dtype=object)
+        values[:] = series.values
+        return Column(OBJECT, values, present=all_present)
+    return Column(NUMERIC, series.values, present=all_present)
@@ -1,12 +1,13 @@
 from enum import Enum
 
 from pm4py.objects.conversion.log import converter as log_conversion
-from pm4py.objects.log.exporter.xes.variants import etree_xes_exp
+from pm4py.objects.log.exporter.xes.variants import etree_xes_exp, line_by_line
 from pm4py.util import exec_utils
 
 
 class Variants(Enum):
     ETREE = etree_xes_exp
+    LINE_BY_LINE = line_by_line
 
 
 def __export_log_as_string(log, variant=Variants.ETREE, parameters=None):
@@ -49,8 +50,10 @@ def __export_log(log, output_file_path, variant=Variants.ETREE, parameters=None)
             Parameters.COMPRESS -> Indicates that the XES file must be compressed
     """
     parameters = dict() if parameters is None else parameters
-    return exec_utils.get_variant(variant).apply(log_conversion.apply(log, parameters=parameters), output_file_path,
-                                                 parameters=parameters)
+    if variant != Variants.LINE_BY_LINE:
+        # the line-by-line exporter accepts also dataframes and iterables of traces (converted lazily)
+        log = log_conversion.apply(log, parameters=parameters)
+    return exec_utils.get_variant(variant).apply(log, output_file_path, parameters=parameters)
 
 
 def apply(log, output_file_path, variant=Variants.ETREE, parameters=None):
@@ -0,0 +1,179 @@
+import gzip
+import io
+import pkgutil
+from enum import Enum
+
+from lxml import etree
+
+from pm4py.objects.conversion.log import converter as log_converter
+from pm4py.objects.conversion.log.variants import to_event_log
+from pm4py.objects.log import log as log_instance
+from pm4py.objects.log.exporter.xes.variants import etree_xes_exp
+from pm4py.objects.log.util import xes as xes_util
+from pm4py.util import exec_utils
+
+
+class Parameters(Enum):
+    COMPRESS = "compress"
+
+
+def __get_traces(log, parameters=None):
+    """
+    Gets an iterable of traces from the provided log object (the dataframes are converted lazily, one chunk
+    of cases at a time)
+
+    Parameters
+    -----------
+    log
+        Event log, event stream, dataframe, or iterable of traces
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------
+    traces
+        Iterable of traces
+    """
+    if pkgutil.find_loader("pandas"):
+        import pandas as pd
+
+        if isinstance(log, pd.DataFrame):
+            return to_event_log.iterate(log, parameters=parameters)
+    if type(log) is log_instance.EventStream:
+        return log_converter.apply(log, parameters=parameters)
+    return log
+
+
+def __export_header(log):
+    """
+    Gets the XML elements describing the log-level attributes, extensions, globals and classifiers
+    (available only if the log is an EventLog object)
+
+    Parameters
+    -----------
+    log
+        Log object
+
+    Returns
+    -----------
+    header
+        XML element containing the log-level elements as children
+    """
+    header = etree.Element(xes_util.TAG_LOG)
+    if isinstance(log, log_instance.EventLog):
+        etree_xes_exp.__export_attributes(log, header)
+        etree_xes_exp.__export_extensions(log, header)
+        etree_xes_exp.__export_globals(log, header)
+        etree_xes_exp.__export_classifiers(log, header)
+    return header
+
+
+def __export_trace(tr):
+    """
+    Gets the XML element of a single trace (with its events)
+
+    Parameters
+    -----------
+    tr
+        Trace
+
+    Returns
+    -----------
+    trace
+        XML element
+    """
+    trace = etree.Element(xes_util.TAG_TRACE)
+    etree_xes_exp.__export_attributes_element(tr, trace)
+    etree_xes_exp.__export_traces_events(tr, trace)
+    return trace
+
+
+def __write_element(xf, element):
+    """
+    Writes an element (child of the root element) with the same indentation of the pretty-printed XES
+    """
+    etree.indent(element, space="  ", level=1)
+    xf.write("  ")
+    xf.write(element)
+    xf.write("\n")
+
+
+def __export_to_file(log, f, parameters=None):
+    """
+    Writes the XES to a (binary) file object using the incremental serialization of lxml:
+    only the XML element of the current trace is kept in memory
+
+    Parameters
+    -----------
+    log
+        Event log, event stream, dataframe, or iterable of traces
+    f
+        Binary file object
+    parameters
+        Parameters of the algorithm
+    """
+    with etree.xmlfile(f, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element(xes_util.TAG_LOG, {xes_util.TAG_VERSION: xes_util.VALUE_XES_VERSION}):
+            xf.write("\n")
+            for child in __export_header(log):
+                __write_element(xf, child)
+            for tr in __get_traces(log, parameters=parameters):
+                __write_element(xf, __export_trace(tr))
+    f.write(b"\n")
+
+
+def export_log_as_string(log, parameters=None):
+    """
+    Export a log into a string
+
+    Parameters
+    -----------
+    log
+        Event log, event stream, dataframe, or iterable of traces
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------
+    logString
+        Log as a (bytes) string
+    """
+    if parameters is None:
+        parameters = {}
+
+    b = io.BytesIO()
+    __export_to_file(log, b, parameters=parameters)
+    return b.getvalue()
+
+
+def apply(log, output_file_path, parameters=None):
+    """
+    Exports a log to a XES file, writing one trace at a time: the memory usage does not depend on the
+    number of traces, and the log can also be a generator of traces or a dataframe (converted lazily)
+
+    Parameters
+    -----------
+    log
+        Event log, event stream, dataframe, or iterable of traces
+    output_file_path
+        Output file path
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.COMPRESS -> the file is directly written in the gzip format (default: True if
+            the path ends with .gz); the .gz suffix is added to the path if it is missing
+    """
+    if parameters is None:
+        parameters = {}
+
+    compress = exec_utils.get_param_value(Parameters.COMPRESS, parameters,
+                                          output_file_path.lower().endswith(".gz"))
+
+    if compress:
+        if not output_file_path.lower().endswith(".gz"):
+            output_file_path = output_file_path + ".gz"
+        with gzip.open(output_file_path, "wb") as f:
+            __export_to_file(log, f, parameters=parameters)
+    else:
+        with open(output_file_path, "wb") as f:
+            __export_to_file(log, f, parameters=parameters)
@@ -1,7 +1,7 @@
 import pkgutil
 from enum import Enum
 
-from pm4py.objects.log.importer.xes.variants import iterparse, line_by_line
+from pm4py.objects.log.importer.xes.variants import iterparse, line_by_line, iterparse_1pass
 from pm4py.objects.log.util import compression
 from pm4py.objects.log.util import string_to_file
 from pm4py.util import exec_utils
@@ -10,6 +10,7 @@ from pm4py.util import exec_utils
 class Variants(Enum):
     ITERPARSE = iterparse
     LINE_BY_LINE = line_by_line
+    ITERPARSE_1PASS = iterparse_1pass
 
 
 if pkgutil.find_loader("lxml"):
@@ -37,6 +38,7 @@ def __import_log_from_string(log_string, parameters=None, variant=DEFAULT_VARIAN
         Variant of the algorithm to use, including:
             - Variants.ITERPARSE
             - Variants.LINE_BY_LINE
+            - Variants.ITERPARSE_1PASS
 
     Returns
     -----------
@@ -55,7 +57,7 @@ def apply(path, parameters=None, variant=DEFAULT_VARIANT):
     Parameters
     -----------
     path
-        Log path
+        Log path (for the ITERPARSE_1PASS variant, also a file-like object opened in binary mode)
     parameters
         Parameters of the algorithm, including
             Parameters.TIMESTAMP_SORT -> Specify if we should sort log_skeleton by timestamp
@@ -67,20 +69,22 @@ def apply(path, parameters=None, variant=DEFAULT_VARIANT):
         Variant of the algorithm to use, including:
             - Variants.ITERPARSE
             - Variants.LINE_BY_LINE
+            - Variants.ITERPARSE_1PASS
 
     Returns
     -----------
     log_skeleton
         Trace log_skeleton object
     """
-    # supporting .xes.gz file types
-    if path.endswith("gz"):
-        path = compression.decompress(path)
-
     # backward compatibility
     if variant == 'nonstandard':
         variant = Variants.LINE_BY_LINE
     elif variant == 'iterparse':
         variant = Variants.ITERPARSE
 
+    # supporting .xes.gz file types
+    # (the single-pass variant decompresses them while parsing)
+    if variant != Variants.ITERPARSE_1PASS and path.endswith("gz"):
+        path = compression.decompress(path)
+
     return variant.value.apply(path, parameters=parameters)
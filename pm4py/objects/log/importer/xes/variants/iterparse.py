@@ -3,7 +3,7 @@ import pkgutil
 import sys
 from enum import Enum
 
-from pm4py.objects.log.log import EventLog, Trace, Event
+from pm4py.objects.log.log import EventLog, Trace, Event, SymbolTable
 from pm4py.objects.log.util import sorting
 from pm4py.util import exec_utils, constants
 from pm4py.util import xes_constants
@@ -79,6 +79,36 @@ def import_log(filename, parameters=None):
     """
     from lxml import etree
 
+    if parameters is None:
+        parameters = {}
+
+    # count number of traces and setup progress bar
+    num_traces = count_traces(filename)
+
+    context = etree.iterparse(filename, events=[_EVENT_START, _EVENT_END])
+
+    return import_from_context(context, num_traces, parameters=parameters)
+
+
+def import_from_context(context, num_traces, parameters=None):
+    """
+    Imports a XES log from an iterparse context
+
+    Parameters
+    --------------
+    context
+        Iterparse context
+    num_traces
+        Number of traces of the XES log (used to setup the progress bar).
+        If None, no per-trace progress bar is shown
+    parameters
+        Parameters of the algorithm (see import_log)
+
+    Returns
+    --------------
+    log
+        Event log
+    """
     if parameters is None:
         parameters = {}
 
@@ -90,20 +120,17 @@ def import_log(filename, parameters=None):
 
     date_parser = dt_parser.get()
 
-    # count number of traces and setup progress bar
-    no_trace = count_traces(filename)
-
-    context = etree.iterparse(filename, events=[_EVENT_START, _EVENT_END])
-
     # make tqdm facultative
     progress = None
-    if pkgutil.find_loader("tqdm"):
+    if pkgutil.find_loader("tqdm") and num_traces is not None:
         from tqdm.auto import tqdm
-        progress = tqdm(total=no_trace, desc="parsing log_skeleton, completed traces :: ")
+        progress = tqdm(total=num_traces, desc="parsing log_skeleton, completed traces :: ")
 
     log = None
     trace = None
     event = None
+    # the attribute keys and the string values are interned against the symbol table of the log
+    symbols = SymbolTable()
 
     tree = {}
     for tree_event, elem in context:
@@ -113,13 +140,13 @@ def import_log(filename, parameters=None):
             if elem.tag.endswith(xes_constants.TAG_STRING):
                 if parent is not None:
                     tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY),
-                                             elem.get(xes_constants.KEY_VALUE), tree)
+                                             elem.get(xes_constants.KEY_VALUE), tree, symbols)
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_DATE):
                 try:
-                    dt = date_parser.apply(elem.get(xes_constants.KEY_VALUE))
-                    tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), dt, tree)
+                    dt = symbols.intern_date(date_parser.apply(elem.get(xes_constants.KEY_VALUE)))
+                    tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), dt, tree, symbols)
                 except TypeError:
                     logging.info("failed to parse date: " + str(elem.get(xes_constants.KEY_VALUE)))
                 except ValueError:
@@ -129,7 +156,8 @@ def import_log(filename, parameters=None):
             elif elem.tag.endswith(xes_constants.TAG_EVENT):
                 if event is not None:
                     raise SyntaxError('file contains <event> in another <event> tag')
-                event = Event()
+                # the attributes are collected in a dictionary, and the (compact) event is built at the end
+                event = {}
                 tree[elem] = event
                 continue
 
@@ -146,7 +174,8 @@ def import_log(filename, parameters=None):
                 if parent is not None:
                     try:
                         val = float(elem.get(xes_constants.KEY_VALUE))
-                        tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), val, tree)
+                        tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), val, tree,
+                                                 symbols)
                     except ValueError:
                         logging.info("failed to parse float: " + str(elem.get(xes_constants.KEY_VALUE)))
                 continue
@@ -155,7 +184,8 @@ def import_log(filename, parameters=None):
                 if parent is not None:
                     try:
                         val = int(elem.get(xes_constants.KEY_VALUE))
-                        tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), val, tree)
+                        tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), val, tree,
+                                                 symbols)
                     except ValueError:
                         logging.info("failed to parse int: " + str(elem.get(xes_constants.KEY_VALUE)))
                 continue
@@ -167,7 +197,8 @@ def import_log(filename, parameters=None):
                         val = False
                         if str(val0).lower() == "true":
                             val = True
-                        tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), val, tree)
+                        tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), val, tree,
+                                                 symbols)
                     except ValueError:
                         logging.info("failed to parse boolean: " + str(elem.get(xes_constants.KEY_VALUE)))
                 continue
@@ -175,13 +206,13 @@ def import_log(filename, parameters=None):
             elif elem.tag.endswith(xes_constants.TAG_LIST):
                 if parent is not None:
                     # lists have no value, hence we put None as a value
-                    tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), None, tree)
+                    tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY), None, tree, symbols)
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_ID):
                 if parent is not None:
                     tree = __parse_attribute(elem, parent, elem.get(xes_constants.KEY_KEY),
-                                             elem.get(xes_constants.KEY_VALUE), tree)
+                                             elem.get(xes_constants.KEY_VALUE), tree, symbols)
                 continue
 
             elif elem.tag.endswith(xes_constants.TAG_EXTENSION):
@@ -233,7 +264,7 @@ def import_log(filename, parameters=None):
 
             if elem.tag.endswith(xes_constants.TAG_EVENT):
                 if trace is not None:
-                    trace.append(event)
+                    trace.append(Event(event))
                     event = None
                 continue
 
@@ -261,7 +292,10 @@ def import_log(filename, parameters=None):
     return log
 
 
-def __parse_attribute(elem, store, key, value, tree):
+def __parse_attribute(elem, store, key, value, tree, symbols):
+    key = symbols[key]
+    if type(value) is str:
+        value = symbols[value]
     if len(elem.getchildren()) == 0:
         if type(store) is list:
             # changes to the store of lists: not dictionaries anymore
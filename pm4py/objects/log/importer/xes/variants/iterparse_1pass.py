@@ -0,0 +1,126 @@
+import gzip
+import os
+import pkgutil
+from enum import Enum
+
+from pm4py.objects.log.importer.xes.variants import iterparse
+from pm4py.util import constants
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+class Parameters(Enum):
+    TIMESTAMP_SORT = "timestamp_sort"
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    REVERSE_SORT = "reverse_sort"
+    MAX_TRACES = "max_traces"
+
+
+class ProgressReader(object):
+    """
+    File-like wrapper that updates a progress bar with the number of bytes
+    that are read from the underlying file handle
+    """
+
+    def __init__(self, fileobj, progress=None):
+        self.fileobj = fileobj
+        self.progress = progress
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        if self.progress is not None:
+            self.progress.update(len(data))
+        return data
+
+
+def apply(filename, parameters=None):
+    return import_log(filename, parameters)
+
+
+def __get_remaining_size(fileobj):
+    try:
+        return os.fstat(fileobj.fileno()).st_size - fileobj.tell()
+    except Exception:
+        pass
+    try:
+        position = fileobj.tell()
+        size = fileobj.seek(0, os.SEEK_END) - position
+        fileobj.seek(position)
+        return size
+    except Exception:
+        return None
+
+
+def __is_gzipped(fileobj):
+    try:
+        position = fileobj.tell()
+        magic = fileobj.read(2)
+        fileobj.seek(position)
+        return magic == _GZIP_MAGIC
+    except Exception:
+        return False
+
+
+def import_log(filename, parameters=None):
+    """
+    Imports a XES file into a log object, reading the file only once.
+
+    Differently from the iterparse variant, the number of traces is not counted in advance;
+    the progress bar is driven by the bytes read from the (possibly compressed) file handle.
+    Gzipped files (.xes.gz) are decompressed on-the-fly while parsing, without
+    creating a temporary file.
+
+    Parameters
+    ----------
+    filename:
+        Path to the XES (or XES.GZ) file, or a file-like object opened in binary mode
+    parameters
+        Parameters of the algorithm, including
+            Parameters.TIMESTAMP_SORT -> Specify if we should sort log by timestamp
+            Parameters.TIMESTAMP_KEY -> If sort is enabled, then sort the log by using this key
+            Parameters.REVERSE_SORT -> Specify in which direction the log should be sorted
+            Parameters.MAX_TRACES -> Specify the maximum number of traces to import from the log (read in order in the XML file)
+
+    Returns
+    -------
+    log : :class:`pm4py.log.log.EventLog`
+        A log
+    """
+    from lxml import etree
+
+    if parameters is None:
+        parameters = {}
+
+    if isinstance(filename, str):
+        raw_file = open(filename, "rb")
+        is_compressed = filename.lower().endswith(".gz")
+        close_file = True
+    else:
+        raw_file = filename
+        is_compressed = __is_gzipped(raw_file)
+        close_file = False
+
+    # make tqdm facultative
+    progress = None
+    if pkgutil.find_loader("tqdm"):
+        from tqdm.auto import tqdm
+        progress = tqdm(total=__get_remaining_size(raw_file), unit="B", unit_scale=True,
+                        desc="parsing log, read bytes :: ")
+
+    source = ProgressReader(raw_file, progress)
+    if is_compressed:
+        source = gzip.GzipFile(fileobj=source, mode="rb")
+
+    try:
+        context = etree.iterparse(source, events=[iterparse._EVENT_START, iterparse._EVENT_END])
+        log = iterparse.import_from_context(context, None, parameters=parameters)
+    finally:
+        # gracefully close progress bar
+        if progress is not None:
+            progress.close()
+        if is_compressed:
+            source.close()
+        if close_file:
+            raw_file.close()
+
+    return log
@@ -2,7 +2,7 @@ import os
 import sys
 from enum import Enum
 
-from pm4py.objects.log.log import EventLog, Trace, Event
+from pm4py.objects.log.log import EventLog, Trace, Event, SymbolTable
 from pm4py.objects.log.util import sorting
 from pm4py.util import constants, xes_constants, exec_utils
 from pm4py.util.dt_parsing import parser as dt_parser
@@ -69,6 +69,8 @@ def import_log(filename, parameters=None):
         skip_bytes = file_size - max_bytes_to_read
 
     log = EventLog()
+    # the attribute keys and the string values are interned against the symbol table of the log
+    symbols = SymbolTable()
     tracecount = 0
     trace = None
     event = None
@@ -84,31 +86,33 @@ def import_log(filename, parameters=None):
                 if event is not None:
                     if len(content) == 5:
                         if tag.startswith("string"):
-                            event[content[1]] = content[3]
+                            event[symbols[content[1]]] = symbols[content[3]]
                         elif tag.startswith("date"):
-                            event[content[1]] = date_parser.apply(content[3])
+                            event[symbols[content[1]]] = symbols.intern_date(date_parser.apply(content[3]))
                         elif tag.startswith("int"):
-                            event[content[1]] = int(content[3])
+                            event[symbols[content[1]]] = int(content[3])
                         elif tag.startswith("float"):
-                            event[content[1]] = float(content[3])
+                            event[symbols[content[1]]] = float(content[3])
                         else:
-                            event[content[1]] = content[3]
+                            event[symbols[content[1]]] = symbols[content[3]]
                     elif tag.startswith("/event"):
-                        trace.append(event)
+                        trace.append(Event(event))
                         event = None
                 elif tag.startswith("event"):
-                    event = Event()
+                    # the attributes are collected in a dictionary, and the (compact) event is built at the end
+                    event = {}
                 elif len(content) == 5:
                     if tag.startswith("string"):
-                        trace.attributes[content[1]] = content[3]
+                        trace.attributes[symbols[content[1]]] = symbols[content[3]]
                     elif tag.startswith("date"):
-                        trace.attributes[content[1]] = date_parser.apply(content[3])
+                        trace.attributes[symbols[content[1]]] = symbols.intern_date(
+                            date_parser.apply(content[3]))
                     elif tag.startswith("int"):
-                        trace.attributes[content[1]] = int(content[3])
+                        trace.attributes[symbols[content[1]]] = int(content[3])
                     elif tag.startswith("float"):
-                        trace.attributes[content[1]] = float(content[3])
+                        trace.attributes[symbols[content[1]]] = float(content[3])
                     else:
-                        trace.attributes[content[1]] = content[3]
+                        trace.attributes[symbols[content[1]]] = symbols[content[3]]
                 elif tag.startswith("/trace"):
                     log.append(trace)
                     tracecount += 1
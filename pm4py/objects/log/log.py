@@ -1,4 +1,6 @@
 import copy
+import datetime
+import weakref
 from collections.abc import Mapping, Sequence
 from enum import Enum
 
@@ -36,24 +38,127 @@ class XESExtension(Enum):
         return self._uri
 
 
+class SymbolTable(dict):
+    """
+    Symbol table of a log: equal attribute keys and (string) values are replaced by a single instance,
+    obtained as symbols[value] (the missing values are added to the table)
+    """
+
+    def __missing__(self, symbol):
+        self[symbol] = symbol
+        return symbol
+
+    def intern_date(self, dt):
+        """
+        Replaces the (fixed offset) timezone of a date with a single instance, as the parsers create
+        a timezone object for each date
+        """
+        tz = dt.tzinfo
+        if type(tz) is datetime.timezone:
+            shared = self.setdefault(tz, tz)
+            if shared is not tz:
+                dt = dt.replace(tzinfo=shared)
+        return dt
+
+
+class _EventKeys(object):
+    """
+    Attribute keys (in order) shared by all the events having the same keys.
+    The instances are interned (one for each tuple of keys), and the keys obtained adding/removing a key
+    are cached, so that an event changes its keys without hashing the whole tuple.
+    The registry holds weak references, while the keys objects obtained adding a key reference each other
+    (in both directions): the keys objects of an event built key by key are kept while the event exists,
+    and are released (with the ones reachable from them) when no event uses them anymore
+    """
+    __slots__ = ("keys", "index", "additions", "removals", "__weakref__")
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+        self.additions = {}
+        self.removals = {}
+
+    def add(self, key):
+        event_keys = self.additions.get(key)
+        if event_keys is None:
+            event_keys = get_event_keys(self.keys + (key,))
+            self.additions[key] = event_keys
+            event_keys.removals[key] = self
+        return event_keys
+
+    def remove(self, key):
+        event_keys = self.removals.get(key)
+        if event_keys is None:
+            event_keys = get_event_keys(tuple(k for k in self.keys if k != key))
+            self.removals[key] = event_keys
+        return event_keys
+
+
+_EVENT_KEYS = weakref.WeakValueDictionary()
+
+
+def get_event_keys(keys):
+    """
+    Gets the (interned) keys object for the given tuple of attribute keys
+    """
+    event_keys = _EVENT_KEYS.get(keys)
+    if event_keys is None:
+        event_keys = _EventKeys(keys)
+        _EVENT_KEYS[keys] = event_keys
+    return event_keys
+
+
 class Event(Mapping):
+    """
+    Event of a log (mapping from the attribute keys to their values).
+
+    To save memory, the event does not store a dictionary: the events having the same attribute keys
+    share a single keys object, and each event stores only the tuple of its values.
+    The hash of the items, used by the hash of the trace, is cached until the event is modified.
+    """
+    __slots__ = ("_keys", "_values", "_hash")
+
     def __init__(self, *args, **kw):
-        self._dict = dict(*args, **kw)
+        if len(args) == 1 and not kw and type(args[0]) is dict:
+            d = args[0]
+        else:
+            d = dict(*args, **kw)
+        self._keys = get_event_keys(tuple(d))
+        self._values = tuple(d.values())
+        self._hash = None
 
     def __getitem__(self, key):
-        return self._dict[key]
+        return self._values[self._keys.index[key]]
+
+    def get(self, key, default=None):
+        i = self._keys.index.get(key)
+        if i is None:
+            return default
+        return self._values[i]
+
+    def __contains__(self, key):
+        return key in self._keys.index
 
     def __setitem__(self, key, value):
-        self._dict[key] = value
+        i = self._keys.index.get(key)
+        if i is None:
+            self._keys = self._keys.add(key)
+            self._values = self._values + (value,)
+        else:
+            self._values = self._values[:i] + (value,) + self._values[i + 1:]
+        self._hash = None
 
     def __iter__(self):
-        return iter(self._dict)
+        return iter(self._keys.keys)
 
     def __len__(self):
-        return len(self._dict)
+        return len(self._values)
 
     def __delitem__(self, key):
-        del self._dict[key]
+        i = self._keys.index[key]
+        self._keys = self._keys.remove(key)
+        self._values = self._values[:i] + self._values[i + 1:]
+        self._hash = None
 
     def __repr__(self):
         return str(dict(self))
@@ -61,11 +166,20 @@ class Event(Mapping):
     def __hash__(self):
         return hash(frozenset(dict(self)))
 
+    def _get_items_hash(self):
+        if self._hash is None:
+            self._hash = hash(tuple(zip(self._keys.keys, self._values)))
+        return self._hash
+
     def __copy__(self):
         event = Event()
-        event._dict = copy.copy(self._dict)
+        event._keys = self._keys
+        event._values = self._values
         return event
 
+    def __reduce__(self):
+        return Event, (dict(self),)
+
 
 class EventStream(Sequence):
 
@@ -144,9 +258,9 @@ class Trace(Sequence):
         self._list = list(*args)
 
     def __hash__(self):
-        tup = tuple(tuple(((x, y) for x, y in event.items())) for event in self._list)
-        ret = hash(tup)
-        return ret
+        # the hash of the items of each event is cached in the event
+        return hash(tuple(event._get_items_hash() if isinstance(event, Event) else hash(tuple(event.items()))
+                          for event in self._list))
 
     def __getitem__(self, key):
         return self._list[key]
@@ -1,6 +1,6 @@
 from pm4py.objects.log.util import compression, insert_classifier, string_to_file, log, sampling, \
     sorting, index_attribute, get_class_representation, get_log_representation, get_prefixes, \
-    get_log_encoded, interval_lifecycle, log_regex, basic_filter, func
+    get_log_encoded, interval_lifecycle, log_regex, basic_filter, func, variants_util
 import pkgutil
 
 if pkgutil.find_loader("pandas"):
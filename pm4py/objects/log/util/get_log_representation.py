@@ -5,6 +5,7 @@ from pm4py.util import constants
 
 ENABLE_ACTIVITY_DEF_REPRESENTATION = "enable_activity_def_representation"
 ENABLE_SUCC_DEF_REPRESENTATION = "enable_succ_def_representation"
+SPARSE_REPRESENTATION = "sparse_representation"
 
 
 def get_string_trace_attribute_rep(trace, trace_attribute):
@@ -293,7 +294,8 @@ def get_default_representation_with_attribute_names(log, parameters=None, featur
     log
         Trace log_skeleton
     parameters
-        Possible parameters of the algorithm
+        Possible parameters of the algorithm, including:
+            sparse_representation -> returns the data as a sparse (CSR) matrix (default: False)
     feature_names
         (If provided) Feature to use in the representation of the log_skeleton
 
@@ -316,6 +318,7 @@ def get_default_representation_with_attribute_names(log, parameters=None, featur
     activity_key = parameters[
         constants.PARAMETER_CONSTANT_ACTIVITY_KEY] if constants.PARAMETER_CONSTANT_ACTIVITY_KEY in parameters else xes.DEFAULT_NAME_KEY
     blacklist = parameters["blacklist"] if "blacklist" in parameters else []
+    sparse = parameters[SPARSE_REPRESENTATION] if SPARSE_REPRESENTATION in parameters else False
 
     str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr = select_attributes_from_log_for_tree(log)
     str_evsucc_attr = None
@@ -334,7 +337,7 @@ def get_default_representation_with_attribute_names(log, parameters=None, featur
 
     data, feature_names = get_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr,
                                              str_evsucc_attr=str_evsucc_attr,
-                                             feature_names=feature_names)
+                                             feature_names=feature_names, sparse=sparse)
 
     return data, feature_names, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr
 
@@ -348,7 +351,8 @@ def get_default_representation(log, parameters=None, feature_names=None):
     log
         Trace log_skeleton
     parameters
-        Possible parameters of the algorithm
+        Possible parameters of the algorithm, including:
+            sparse_representation -> returns the data as a sparse (CSR) matrix (default: False)
     feature_names
         (If provided) Feature to use in the representation of the log_skeleton
 
@@ -371,6 +375,7 @@ def get_default_representation(log, parameters=None, feature_names=None):
     activity_key = parameters[
         constants.PARAMETER_CONSTANT_ACTIVITY_KEY] if constants.PARAMETER_CONSTANT_ACTIVITY_KEY in parameters else xes.DEFAULT_NAME_KEY
     blacklist = parameters["blacklist"] if "blacklist" in parameters else []
+    sparse = parameters[SPARSE_REPRESENTATION] if SPARSE_REPRESENTATION in parameters else False
 
     str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr = select_attributes_from_log_for_tree(log)
     str_evsucc_attr = None
@@ -388,11 +393,11 @@ def get_default_representation(log, parameters=None, feature_names=None):
         str_evsucc_attr = [x for x in str_evsucc_attr if x not in blacklist]
 
     return get_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr, str_evsucc_attr=str_evsucc_attr,
-                              feature_names=feature_names)
+                              feature_names=feature_names, sparse=sparse)
 
 
 def get_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr, str_evsucc_attr=None,
-                       feature_names=None):
+                       feature_names=None, sparse=False):
     """
     Get a representation of the event log_skeleton that is suited for the data part of the decision tree learning
 
@@ -414,6 +419,8 @@ def get_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr,
         List of attributes succession of values to consider in data vector creation
     feature_names
         (If provided) Feature to use in the representation of the log_skeleton
+    sparse
+        (boolean) returns the data as a sparse (CSR) matrix, see get_sparse_representation
 
     Returns
     -------------
@@ -422,6 +429,9 @@ def get_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr,
     feature_names
         Names of the features, in order
     """
+    if sparse:
+        return get_sparse_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr,
+                                         str_evsucc_attr=str_evsucc_attr, feature_names=feature_names)
     data = []
     dictionary = {}
     count = 0
@@ -488,3 +498,106 @@ def get_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr,
         data.append(trace_rep)
     data = np.asarray(data)
     return data, feature_names
+
+
+def get_sparse_representation(log, str_tr_attr, str_ev_attr, num_tr_attr, num_ev_attr, str_evsucc_attr=None,
+                              feature_names=None):
+    """
+    Get a representation of the event log as a sparse (CSR) matrix, having the same features (in the same order)
+    as the dense representation provided by get_representation.
+
+    The log is read in a single pass: the index of a feature is assigned when the feature is found for the first time,
+    and the columns are sorted at the end. Hence, the memory usage is proportional to the non-zero entries of the
+    matrix and not to the number of traces times the number of features (which can be huge for attributes
+    having many different values, e.g. the resources).
+
+    NOTE: this function only encodes the last value seen for each attribute
+
+    Parameters
+    -------------
+    log
+        Trace log
+    str_tr_attr
+        List of string trace attributes to consider in data vector creation
+    str_ev_attr
+        List of string event attributes to consider in data vector creation
+    num_tr_attr
+        List of numeric trace attributes to consider in data vector creation
+    num_ev_attr
+        List of numeric event attributes to consider in data vector creation
+    str_evsucc_attr
+        List of attributes succession of values to consider in data vector creation
+    feature_names
+        (If provided) Feature to use in the representation of the log
+
+    Returns
+    -------------
+    data
+        Sparse (CSR) matrix to provide for decision tree learning
+    feature_names
+        Names of the features, in order
+    """
+    from scipy.sparse import csr_matrix
+
+    if str_evsucc_attr is None:
+        str_evsucc_attr = []
+
+    if feature_names is not None:
+        dictionary = {value: index for index, value in enumerate(feature_names)}
+        feature_keys = None
+    else:
+        dictionary = {}
+        # for each feature, the key used to sort the features as in the dense representation
+        feature_keys = []
+        for index, trace_attribute in enumerate(num_tr_attr):
+            dictionary[get_numeric_trace_attribute_rep(trace_attribute)] = len(feature_keys)
+            feature_keys.append((2, index, get_numeric_trace_attribute_rep(trace_attribute)))
+        for index, event_attribute in enumerate(num_ev_attr):
+            dictionary[get_numeric_event_attribute_rep(event_attribute)] = len(feature_keys)
+            feature_keys.append((3, index, get_numeric_event_attribute_rep(event_attribute)))
+
+    def add_string_features(row, values, group, index):
+        for value in values:
+            if value not in dictionary:
+                if feature_keys is None:
+                    continue
+                dictionary[value] = len(feature_keys)
+                feature_keys.append((group, index, value))
+            row[dictionary[value]] = 1
+
+    indptr = [0]
+    indices = []
+    data = []
+    for trace in log:
+        row = {}
+        for index, trace_attribute in enumerate(str_tr_attr):
+            add_string_features(row, [get_string_trace_attribute_rep(trace, trace_attribute)], 0, index)
+        for index, event_attribute in enumerate(str_ev_attr):
+            add_string_features(row, get_values_event_attribute_for_trace(trace, event_attribute), 1, index)
+        for trace_attribute in num_tr_attr:
+            this_value = get_numeric_trace_attribute_rep(trace_attribute)
+            if this_value in dictionary:
+                row[dictionary[this_value]] = get_numeric_trace_attribute_value(trace, trace_attribute)
+        for event_attribute in num_ev_attr:
+            this_value = get_numeric_event_attribute_rep(event_attribute)
+            if this_value in dictionary:
+                row[dictionary[this_value]] = get_numeric_event_attribute_value_trace(trace, event_attribute)
+        for index, event_attribute in enumerate(str_evsucc_attr):
+            add_string_features(row, get_values_event_attribute_succession_for_trace(trace, event_attribute), 4,
+                                index)
+        indices.extend(row.keys())
+        data.extend(row.values())
+        indptr.append(len(indices))
+
+    indices = np.asarray(indices, dtype=np.int64)
+    if feature_keys is not None:
+        order = sorted(range(len(feature_keys)), key=lambda i: feature_keys[i])
+        position = np.zeros(len(feature_keys), dtype=np.int64)
+        position[order] = np.arange(len(feature_keys))
+        indices = position[indices]
+        feature_names = [feature_keys[i][2] for i in order]
+
+    data = csr_matrix((np.asarray(data) if data else np.zeros(0, dtype=np.int64), indices, indptr),
+                      shape=(len(indptr) - 1, len(feature_names)))
+    data.sort_indices()
+    return data, feature_names
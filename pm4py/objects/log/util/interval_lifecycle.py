@@ -65,7 +65,8 @@ def to_interval(log, parameters=None):
                     start_timestamp = event[timestamp_key]
                     if activity in activities_start and len(activities_start[activity]) > 0:
                         start_timestamp = activities_start[activity].pop(0)
-                    new_event = Event()
+                    # the attributes are collected in a dictionary, and the (compact) event is built at the end
+                    new_event = {}
                     for attr in event:
                         if not attr == timestamp_key and not attr == transition_key:
                             new_event[attr] = event[attr]
@@ -79,7 +80,7 @@ def to_interval(log, parameters=None):
                                            weekends=weekends)
                         new_event["@@approx_bh_duration"] = bh.getseconds()
 
-                    new_trace.append(new_event)
+                    new_trace.append(Event(new_event))
             new_trace = sorting.sort_timestamp_trace(new_trace, start_timestamp_key)
             new_log.append(new_trace)
         return new_log
@@ -131,8 +132,9 @@ def to_lifecycle(log, parameters=None):
                 new_trace.attributes[attr] = trace.attributes[attr]
             list_events = []
             for index, event in enumerate(trace):
-                new_event_start = Event()
-                new_event_complete = Event()
+                # the attributes are collected in dictionaries, and the (compact) events are built at the end
+                new_event_start = {}
+                new_event_complete = {}
                 for attr in event:
                     if not attr == timestamp_key and not attr == start_timestamp_key:
                         new_event_start[attr] = event[attr]
@@ -150,7 +152,7 @@ def to_lifecycle(log, parameters=None):
             list_events = sorted(list_events,
                                  key=lambda x: (x[timestamp_key], x["@@origin_ev_idx"], x["@@custom_lif_id"]))
             for ev in list_events:
-                new_trace.append(ev)
+                new_trace.append(Event(ev))
             new_log.append(new_trace)
         return new_log
     return log
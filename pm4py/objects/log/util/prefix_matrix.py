@@ -5,11 +5,45 @@ import pandas as pd
 
 from pm4py.objects.conversion.log import converter as log_conversion
 from pm4py.objects.log.log import EventStream
+from pm4py.objects.log.util import variants_util
 from pm4py.util import xes_constants as xes
 from pm4py.util import constants
+from pm4py.util.constants import DEFAULT_VARIANT_SEP
 
 KEEP_UNIQUE = "keep_unique"
 SKIP_LAST = "skip_last"
+SPARSE = "sparse"
+
+
+def __sparse_row(counts, multiplier=1):
+    """
+    Gets the sparse representation of a row (sorted tuple of (column, value) couples)
+    from a dictionary associating to some columns a (non-zero) value
+    """
+    return tuple(sorted((i, v * multiplier) for i, v in counts.items()))
+
+
+def __unique_sparse_rows(rows):
+    """
+    Gets the distinct rows (expressed as sorted tuples of (column, value) couples, with positive values),
+    in the same order as numpy.unique on the corresponding dense matrix.
+    Comparing the dense rows lexicographically, the first row having a non-zero entry in the first column in which
+    they differ is the greatest; hence, the columns are compared in decreasing order
+    """
+    return sorted(set(rows), key=lambda row: tuple((-i, v) for i, v in row))
+
+
+def __to_csr(rows, no_columns):
+    """
+    Builds a CSR matrix from a list of rows (expressed as sorted tuples of (column, value) couples)
+    """
+    from scipy.sparse import csr_matrix
+
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    indices = np.array([i for row in rows for i, v in row], dtype=np.int64)
+    data = np.array([v for row in rows for i, v in row], dtype=np.int64)
+    return csr_matrix((data, indices, indptr), shape=(len(rows), no_columns))
 
 
 def get_variants_matrix_from_variants_list(variants_list, activities, parameters=None):
@@ -21,11 +55,11 @@ def get_variants_matrix_from_variants_list(variants_list, activities, parameters
     Parameters
     -------------
     variants_list
-        List of variants contained in the log_skeleton, along with their count
+        List of variants contained in the log_skeleton (as tuples of activities, or as strings), along with their count
     activities
         List of activities in the log_skeleton
     parameters
-        Parameters of the algorithm: keep_unique (default: True)
+        Parameters of the algorithm: keep_unique (default: True), sparse (default: False; returns a CSR matrix)
 
     Returns
     -------------
@@ -35,13 +69,26 @@ def get_variants_matrix_from_variants_list(variants_list, activities, parameters
     if parameters is None:
         parameters = {}
     keep_unique = parameters[KEEP_UNIQUE] if KEEP_UNIQUE in parameters else True
+    sparse = parameters[SPARSE] if SPARSE in parameters else False
+    activities_idx = {act: i for i, act in enumerate(activities)}
+    if sparse:
+        rows = []
+        for var in variants_list:
+            counts = {}
+            for act in variants_util.get_activities_from_variant(var[0]):
+                i = activities_idx[act]
+                counts[i] = counts.get(i, 0) + 1
+            rows.append(__sparse_row(counts, var[1]))
+        if keep_unique:
+            rows = __unique_sparse_rows(rows)
+        return __to_csr(rows, len(activities)), activities
     variants_mat = []
     for var in variants_list:
-        variant = var[0].split(",")
+        variant = variants_util.get_activities_from_variant(var[0])
         count = var[1]
         this_var_repr = [0] * len(activities)
         for act in variant:
-            i = activities.index(act)
+            i = activities_idx[act]
             this_var_repr[i] = this_var_repr[i] + count
         variants_mat.append(this_var_repr)
     variants_mat = np.asmatrix(variants_mat)
@@ -50,7 +97,7 @@ def get_variants_matrix_from_variants_list(variants_list, activities, parameters
     return variants_mat, activities
 
 
-def get_prefix_repr(prefix, activities):
+def get_prefix_repr(prefix, activities, activities_idx=None):
     """
     Gets the numeric representation (as vector) of a prefix
 
@@ -60,15 +107,19 @@ def get_prefix_repr(prefix, activities):
         Prefix
     activities
         Activities
+    activities_idx
+        (if provided) dictionary associating to each activity its index in the list of activities
 
     Returns
     -------------
     prefix_repr
         Representation of a prefix
     """
+    if activities_idx is None:
+        activities_idx = {act: i for i, act in enumerate(activities)}
     this_pref_repr = [0] * len(activities)
     for act in prefix:
-        i = activities.index(act)
+        i = activities_idx[act]
         this_pref_repr[i] = this_pref_repr[i] + 1
     return tuple(this_pref_repr)
 
@@ -81,11 +132,11 @@ def get_prefix_matrix_from_variants_list(variants_list, activities, parameters=N
     Parameters
     -------------
     variants_list
-        List of variants contained in the log_skeleton, along with their count
+        List of variants contained in the log_skeleton (as tuples of activities, or as strings), along with their count
     activities
         List of activities in the log_skeleton
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm: skip_last (default: False), sparse (default: False; returns a CSR matrix)
 
     Returns
     -------------
@@ -95,17 +146,34 @@ def get_prefix_matrix_from_variants_list(variants_list, activities, parameters=N
     if parameters is None:
         parameters = {}
     skip_last = parameters[SKIP_LAST] if SKIP_LAST in parameters else False
+    sparse = parameters[SPARSE] if SPARSE in parameters else False
+    activities_idx = {act: i for i, act in enumerate(activities)}
+
+    if sparse:
+        prefixes = {}
+        for var in variants_list:
+            variant = variants_util.get_activities_from_variant(var[0])
+            counts = {}
+            for index, act in enumerate(variant):
+                if skip_last and index == len(variant) - 1:
+                    break
+                i = activities_idx[act]
+                counts[i] = counts.get(i, 0) + 1
+                prefix_repr = __sparse_row(counts)
+                prefixes[prefix_repr] = prefixes.get(prefix_repr, 0) + var[1]
+        rows = __unique_sparse_rows(tuple((i, v * count) for i, v in pref) for pref, count in prefixes.items())
+        return __to_csr(rows, len(activities)), activities
 
     prefixes = {}
     for var in variants_list:
-        variant = var[0].split(",")
+        variant = variants_util.get_activities_from_variant(var[0])
         count = var[1]
         prefix = []
         for index, act in enumerate(variant):
             if skip_last and index == len(variant) - 1:
                 break
             prefix.append(act)
-            prefix_repr = get_prefix_repr(prefix, activities)
+            prefix_repr = get_prefix_repr(prefix, activities, activities_idx=activities_idx)
             if prefix_repr not in prefixes:
                 prefixes[prefix_repr] = 0
             prefixes[prefix_repr] = prefixes[prefix_repr] + count
@@ -144,6 +212,18 @@ def get_prefix_matrix_from_trace(trace, activities, parameters=None):
     activity_key = parameters[
         constants.PARAMETER_CONSTANT_ACTIVITY_KEY] if constants.PARAMETER_CONSTANT_ACTIVITY_KEY in parameters else xes.DEFAULT_NAME_KEY
     skip_last = parameters[SKIP_LAST] if SKIP_LAST in parameters else False
+    sparse = parameters[SPARSE] if SPARSE in parameters else False
+    if sparse:
+        activities_idx = {act: i for i, act in enumerate(activities)}
+        rows = []
+        counts = {}
+        for index, event in enumerate(trace):
+            if skip_last and index == len(trace) - 1:
+                break
+            i = activities_idx[event[activity_key]]
+            counts[i] = counts.get(i, 0) + 1
+            rows.append(__sparse_row(counts))
+        return __to_csr(rows, len(activities))
     prefix_mat = []
     this_prefix_repr = [0] * len(activities)
     for index, event in enumerate(trace):
@@ -165,7 +245,7 @@ def get_prefix_matrix_from_var_str(var_str, activities, parameters=None):
     Parameters
     --------------
     var_str
-        String representation of a variant
+        Variant (tuple of activities, or string representation)
     activities
         Activities
     parameters
@@ -179,9 +259,21 @@ def get_prefix_matrix_from_var_str(var_str, activities, parameters=None):
     if parameters is None:
         parameters = {}
     skip_last = parameters[SKIP_LAST] if SKIP_LAST in parameters else False
+    sparse = parameters[SPARSE] if SPARSE in parameters else False
+    variant = variants_util.get_activities_from_variant(var_str)
+    if sparse:
+        activities_idx = {act: i for i, act in enumerate(activities)}
+        rows = []
+        counts = {}
+        for index, act in enumerate(variant):
+            if skip_last and index == len(variant) - 1:
+                break
+            i = activities_idx[act]
+            counts[i] = counts.get(i, 0) + 1
+            rows.append(__sparse_row(counts))
+        return __to_csr(rows, len(activities))
     prefix_mat = []
     this_prefix_repr = [0] * len(activities)
-    variant = var_str.split(",")
     for index, act in enumerate(variant):
         if skip_last and index == len(variant) - 1:
             break
@@ -216,6 +308,19 @@ def get_prefix_matrix_from_event_log_not_unique(event_log, activities, parameter
     activity_key = parameters[
         constants.PARAMETER_CONSTANT_ACTIVITY_KEY] if constants.PARAMETER_CONSTANT_ACTIVITY_KEY in parameters else xes.DEFAULT_NAME_KEY
     skip_last = parameters[SKIP_LAST] if SKIP_LAST in parameters else False
+    sparse = parameters[SPARSE] if SPARSE in parameters else False
+    activities_idx = {act: i for i, act in enumerate(activities)}
+    if sparse:
+        rows = []
+        for trace in event_log:
+            counts = {}
+            for index, event in enumerate(trace):
+                if skip_last and index == len(trace) - 1:
+                    break
+                i = activities_idx[event[activity_key]]
+                counts[i] = counts.get(i, 0) + 1
+                rows.append(__sparse_row(counts))
+        return __to_csr(rows, len(activities)), activities
     prefix_mat = []
     for trace in event_log:
         this_prefix_repr = [0] * len(activities)
@@ -223,7 +328,7 @@ def get_prefix_matrix_from_event_log_not_unique(event_log, activities, parameter
             if skip_last and index == len(trace) - 1:
                 break
             eve_act = event[activity_key]
-            eve_act_idx = activities.index(eve_act)
+            eve_act_idx = activities_idx[eve_act]
             this_prefix_repr[eve_act_idx] = this_prefix_repr[eve_act_idx] + 1
             prefix_mat.append(copy(this_prefix_repr))
     prefix_mat = np.asmatrix(prefix_mat)
@@ -244,25 +349,18 @@ def get_variants_list(log, parameters=None):
     Returns
     -------------
     variants_list
-        List of variants of the log_skeleton (along with their count)
+        List of variants of the log_skeleton (activities separated by the variant separator, along with their count)
     """
-    from pm4py.statistics.traces.pandas import case_statistics as pd_case_statistics
-    from pm4py.statistics.traces.log import case_statistics as log_case_statistics
+    return [(DEFAULT_VARIANT_SEP.join(variant), count) for variant, count in
+            __get_encoded_variants_list(log, parameters=parameters)]
 
-    variants_list = []
-    if type(log) is pd.DataFrame:
-        pd_variants = pd_case_statistics.get_variant_statistics(log, parameters=parameters)
-        for var in pd_variants:
-            varkeys = list(var.keys())
-            del varkeys[varkeys.index("variant")]
-            variants_list.append((var["variant"], var[varkeys[0]]))
-    else:
-        log_variants = log_case_statistics.get_variant_statistics(log, parameters=parameters)
-        for var in log_variants:
-            varkeys = list(var.keys())
-            del varkeys[varkeys.index("variant")]
-            variants_list.append((var["variant"], var[varkeys[0]]))
-    return variants_list
+
+def __get_encoded_variants_list(log, parameters=None):
+    """
+    Gets the list of variants (as tuples of activities, not ambiguous when the activities contain the separator)
+    along with their count
+    """
+    return variants_util.apply(log, parameters=parameters).get_variants_list()
 
 
 def get_activities_list(log, parameters=None):
@@ -304,7 +402,8 @@ def get_prefix_matrix(log, parameters=None):
     log
         Log
     parameters
-        Parameters of the algorithm: activity_key
+        Parameters of the algorithm: activity_key, keep_unique (default: False), sparse (default: False;
+        returns a CSR matrix)
 
     Returns
     --------------
@@ -324,7 +423,7 @@ def get_prefix_matrix(log, parameters=None):
 
     if type(log) is EventStream:
         log = log_conversion.apply(log, parameters=parameters)
-    variants_list = get_variants_list(log, parameters=parameters)
+    variants_list = __get_encoded_variants_list(log, parameters=parameters)
     activities = get_activities_list(log, parameters=parameters)
 
     if keep_unique:
@@ -364,7 +463,7 @@ def get_variants_matrix(log, parameters=None):
 
     if type(log) is EventStream:
         log = log_conversion.apply(log, parameters=parameters)
-    variants_list = get_variants_list(log, parameters=parameters)
+    variants_list = __get_encoded_variants_list(log, parameters=parameters)
     activities = get_activities_list(log, parameters=parameters)
 
     return get_variants_matrix_from_variants_list(variants_list, activities, parameters=parameters)
@@ -399,7 +498,7 @@ def get_prefix_variants_matrix(log, parameters=None):
 
     if type(log) is EventStream:
         log = log_conversion.apply(log, parameters=parameters)
-    variants_list = get_variants_list(log, parameters=parameters)
+    variants_list = __get_encoded_variants_list(log, parameters=parameters)
     activities = get_activities_list(log, parameters=parameters)
 
     prefix_matrix, activities = get_prefix_matrix_from_variants_list(variants_list, activities, parameters=parameters)
@@ -0,0 +1,242 @@
+from enum import Enum
+
+import numpy as np
+
+from pm4py.objects.log.columnar import ColumnarEventLog
+from pm4py.util import constants, exec_utils, instrumentation, pandas_utils, xes_constants
+from pm4py.util.constants import DEFAULT_VARIANT_SEP
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+
+
+class EncodedVariants(object):
+    """
+    Integer-coded representation of the variants of a log.
+
+    Each activity is associated to an integer code (the index in the activities list), and each variant is
+    represented as a tuple of activity codes (in order of first occurrence in the log). For each case, the index
+    of its variant is stored; hence, the variants are hashed only once during the construction.
+    Unlike the string representation (activities separated by commas), the representation is not
+    ambiguous when the activities contain the separator.
+    """
+
+    def __init__(self, activities, variants, case_variants, case_ids=None):
+        self.activities = activities
+        self.variants = variants
+        self.case_variants = case_variants
+        self.case_ids = case_ids
+        self.counts = np.bincount(case_variants, minlength=len(variants)).tolist() if len(variants) > 0 else []
+        self.__activity_codes = None
+
+    def __len__(self):
+        return len(self.variants)
+
+    def __iter__(self):
+        return iter(self.variants)
+
+    def _get_activity_codes(self):
+        if self.__activity_codes is None:
+            self.__activity_codes = {a: i for i, a in enumerate(self.activities)}
+        return self.__activity_codes
+
+    def decode(self, index):
+        """
+        Gets the activities of the variant at the given index (as tuple)
+        """
+        return tuple(self.activities[c] for c in self.variants[index])
+
+    def to_string(self, index, sep=DEFAULT_VARIANT_SEP):
+        """
+        Gets the string representation of the variant at the given index
+        (activities separated by the separator)
+        """
+        return sep.join(self.activities[c] for c in self.variants[index])
+
+    def encode(self, activities):
+        """
+        Gets the activity codes of the given sequence of activities
+        (None if an activity does not occur in the log)
+        """
+        activity_codes = self.activity_codes
+        if any(a not in activity_codes for a in activities):
+            return None
+        return tuple(activity_codes[a] for a in activities)
+
+    def get_cases_per_variant(self):
+        """
+        Gets, for each variant, the list of the indices of its cases (in increasing order)
+        """
+        order = np.argsort(self.case_variants, kind="mergesort")
+        offsets = np.zeros(len(self.variants) + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=offsets[1:])
+        order = order.tolist()
+        return [order[offsets[i]:offsets[i + 1]] for i in range(len(self.variants))]
+
+    def get_variants_trace_idx(self):
+        """
+        Gets a dictionary associating to each variant (tuple of activities) the list of indices of its cases
+        """
+        return {self.decode(i): cases for i, cases in enumerate(self.get_cases_per_variant())}
+
+    def get_variants_list(self):
+        """
+        Gets the list of variants (tuples of activities) along with their count, sorted by decreasing count
+        """
+        return sorted([(self.decode(i), self.counts[i]) for i in range(len(self.variants))],
+                      key=lambda x: (x[1], x[0]), reverse=True)
+
+    def get_sorted_encoding(self):
+        """
+        Gets the variants encoded with the indices of the activities sorted by name
+        (only the activities that occur in at least a variant are considered)
+
+        Returns
+        -------------
+        activities
+            Sorted list of activities
+        variants
+            List of variants (each one is a list of indices in the sorted list of activities)
+        """
+        occurring = sorted(set(c for variant in self.variants for c in variant), key=lambda c: self.activities[c])
+        new_codes = {c: i for i, c in enumerate(occurring)}
+        return [self.activities[c] for c in occurring], [[new_codes[c] for c in variant] for variant in
+                                                          self.variants]
+
+    activity_codes = property(_get_activity_codes)
+
+
+def __build(activities, case_codes, case_offsets, case_ids=None):
+    """
+    Builds the encoded variants from the (flat) list of activity codes and the offsets of the cases
+    """
+    variants_index = {}
+    case_variants = []
+    for i in range(len(case_offsets) - 1):
+        variant = tuple(case_codes[case_offsets[i]:case_offsets[i + 1]])
+        if variant not in variants_index:
+            variants_index[variant] = len(variants_index)
+        case_variants.append(variants_index[variant])
+    return EncodedVariants(list(activities), list(variants_index), np.array(case_variants, dtype=np.int64),
+                           case_ids=case_ids)
+
+
+def from_log(log, parameters=None):
+    """
+    Gets the integer-coded variants of an event log (one case per trace, in the order of the log)
+
+    Parameters
+    -------------
+    log
+        Event log
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.ACTIVITY_KEY -> attribute to be used as activity
+
+    Returns
+    -------------
+    encoded_variants
+        Encoded variants
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+
+    with instrumentation.phase("variants"):
+        if isinstance(log, ColumnarEventLog) and log.has_categorical_attribute(activity_key):
+            column = log.event_columns[activity_key]
+            codes = column.values
+            present = codes >= 0
+            # offsets of the cases after removing the events without activity
+            present_cumsum = np.zeros(len(codes) + 1, dtype=np.int64)
+            np.cumsum(present, out=present_cumsum[1:])
+            return __build(column.categories, codes[present].tolist(), present_cumsum[log.case_offsets].tolist())
+
+        activity_codes = {}
+        case_codes = []
+        case_offsets = [0]
+        for trace in log:
+            for event in trace:
+                if activity_key in event:
+                    activity = event[activity_key]
+                    if activity not in activity_codes:
+                        activity_codes[activity] = len(activity_codes)
+                    case_codes.append(activity_codes[activity])
+            case_offsets.append(len(case_codes))
+        return __build(activity_codes, case_codes, case_offsets)
+
+
+def from_dataframe(df, parameters=None):
+    """
+    Gets the integer-coded variants of a dataframe (the cases are sorted by their identifier;
+    the events without activity are ignored)
+
+    Parameters
+    -------------
+    df
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.ACTIVITY_KEY -> column to be used as activity
+            Parameters.CASE_ID_KEY -> column to be used as case identifier
+
+    Returns
+    -------------
+    encoded_variants
+        Encoded variants (the identifiers of the cases are stored in the case_ids attribute)
+    """
+    if parameters is None:
+        parameters = {}
+
+    import pandas as pd
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+
+    with instrumentation.phase("variants"):
+        case_codes, case_ids = pd.factorize(df[case_id_key], sort=True)
+        activity_codes, activities = pd.factorize(df[activity_key], sort=False)
+        valid = (case_codes >= 0) & (activity_codes >= 0)
+        case_codes = case_codes[valid]
+        activity_codes = activity_codes[valid]
+        # stable sort: the events of each case keep the order of the dataframe
+        order = np.argsort(case_codes, kind="mergesort")
+        offsets = np.zeros(len(case_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(case_codes, minlength=len(case_ids)), out=offsets[1:])
+        return __build(activities.tolist(), activity_codes[order].tolist(), offsets.tolist(), case_ids=case_ids)
+
+
+def apply(log, parameters=None):
+    """
+    Gets the integer-coded variants of an event log or of a dataframe
+
+    Parameters
+    -------------
+    log
+        Event log / dataframe
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.ACTIVITY_KEY -> attribute to be used as activity
+            Parameters.CASE_ID_KEY -> (dataframe) column to be used as case identifier
+
+    Returns
+    -------------
+    encoded_variants
+        Encoded variants
+    """
+    if pandas_utils.check_is_dataframe(log):
+        return from_dataframe(log, parameters=parameters)
+    return from_log(log, parameters=parameters)
+
+
+def get_activities_from_variant(variant, sep=DEFAULT_VARIANT_SEP):
+    """
+    Gets the activities of a variant, that can be expressed as tuple/list of activities or
+    as string (activities separated by the separator)
+    """
+    if isinstance(variant, str):
+        return tuple(variant.split(sep)) if variant else ()
+    return tuple(variant)
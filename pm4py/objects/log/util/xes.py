@@ -9,7 +9,7 @@ TAG_GLOBAL = 'global'
 TAG_ID = 'id'
 TAG_INT = 'int'
 TAG_LIST = 'list'
-TAG_LOG = 'log_skeleton'
+TAG_LOG = 'log'
 TAG_STRING = 'string'
 TAG_TRACE = 'trace'
 TAG_VALUES = 'values'
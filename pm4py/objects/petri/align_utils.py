@@ -2,6 +2,7 @@ import numpy as np
 from pm4py.util.lp import solver as lp_solver
 from pm4py.objects.petri.petrinet import Marking
 from pm4py.objects.petri import semantics
+from pm4py.util import instrumentation
 from copy import copy
 import sys
 
@@ -108,6 +109,20 @@ def __get_alt(open_set, new_marking):
             return item
 
 
+def __record_search_statistics(visited, queued, traversed, aligned=True):
+    """
+    Records the visited/queued states and the traversed arcs of an alignment search in the active profilers
+    (also for the searches that do not find an alignment, because of the time limit or because the final marking
+    is not reachable; these are counted as alignments.failed_searches)
+    """
+    if instrumentation.is_enabled():
+        instrumentation.increment("alignments.visited_states", visited)
+        instrumentation.increment("alignments.queued_states", queued)
+        instrumentation.increment("alignments.traversed_arcs", traversed)
+        if not aligned:
+            instrumentation.increment("alignments.failed_searches")
+
+
 def __reconstruct_alignment(state, visited, queued, traversed, ret_tuple_as_trans_desc=False):
     parent = state.p
     if ret_tuple_as_trans_desc:
@@ -145,8 +160,39 @@ def __trust_solution(x):
     return True
 
 
+def __get_heuristic_lp_model(a_matrix, h_cvx, g_matrix, cost_vec, fin_vec, variant):
+    """
+    Builds (once for each synchronous product) the LP model of the heuristic, if the variant of the LP solver
+    supports persistent models: the following computations of the heuristic change only the right-hand side
+    (the marking vector) of the model.
+
+    Parameters
+    -------------
+    a_matrix
+        Incidence matrix (dense or sparse)
+    h_cvx
+        Right-hand side of the non-negativity constraints
+    g_matrix
+        Matrix of the non-negativity constraints (dense or sparse)
+    cost_vec
+        Cost vector
+    fin_vec
+        Vector of the final marking
+    variant
+        Variant of the LP solver
+
+    Returns
+    -------------
+    lp_model
+        Persistent LP model (None if not supported by the variant)
+    """
+    if variant not in lp_solver.VERSIONS_PERSISTENT_MODEL:
+        return None
+    return lp_solver.get_persistent_model(cost_vec, g_matrix, h_cvx, a_matrix, fin_vec, variant=variant)
+
+
 def __compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec, incidence_matrix,
-                                          marking, fin_vec, variant, use_cvxopt=False):
+                                          marking, fin_vec, variant, use_cvxopt=False, lp_model=None):
     m_vec = incidence_matrix.encode_marking(marking)
     b_term = [i - j for i, j in zip(fin_vec, m_vec)]
     b_term = np.matrix([x * 1.0 for x in b_term]).transpose()
@@ -159,7 +205,12 @@ def __compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, c
 
     parameters_solving = {"solver": "glpk"}
 
-    sol = lp_solver.apply(cost_vec, g_matrix, h_cvx, a_matrix, b_term, parameters=parameters_solving,
+    with instrumentation.phase("alignments.lp_solve"):
+        if lp_model is not None:
+            # the persistent model is re-solved from the previous basis, after changing the marking vector
+            sol = lp_model.solve(beq=b_term)
+        else:
+            sol = lp_solver.apply(cost_vec, g_matrix, h_cvx, a_matrix, b_term, parameters=parameters_solving,
                                   variant=variant)
     prim_obj = lp_solver.get_prim_obj_from_sol(sol, variant=variant)
     points = lp_solver.get_points_from_sol(sol, variant=variant)
@@ -0,0 +1,176 @@
+import numpy as np
+
+from pm4py.objects.petri.petrinet import Marking
+
+
+class CompiledPetriNet(object):
+    """
+    Immutable, integer-indexed representation of a Petri net.
+
+    Places and transitions are assigned an integer index; the pre/post sets are stored as
+    NumPy arrays (pre and post matrices) and as tuples of (place index, weight) pairs,
+    which are the fastest structure to iterate in the firing rule.
+    Markings are represented as tuples of integers (one entry per place), which are hashable
+    and cheap to compare, so they can be used directly as dictionary keys or set members.
+
+    The object exposes the same interface as the incidence matrix
+    (places, transitions, a_matrix, sparse_a_matrix, encode_marking), hence it can replace it in the
+    computations based on the state equation.
+    """
+
+    def __init__(self, net):
+        self.__place_list = tuple(sorted(net.places, key=lambda x: str(x.name)))
+        self.__transition_list = tuple(sorted(net.transitions, key=lambda x: str(x.name)))
+        self.__place_indices = {p: i for i, p in enumerate(self.__place_list)}
+        self.__transition_indices = {t: i for i, t in enumerate(self.__transition_list)}
+
+        no_places = len(self.__place_list)
+        no_transitions = len(self.__transition_list)
+
+        self.__pre = np.zeros((no_transitions, no_places), dtype=np.int64)
+        self.__post = np.zeros((no_transitions, no_places), dtype=np.int64)
+        for t, i in self.__transition_indices.items():
+            for a in t.in_arcs:
+                self.__pre[i, self.__place_indices[a.source]] += a.weight
+            for a in t.out_arcs:
+                self.__post[i, self.__place_indices[a.target]] += a.weight
+        self.__pre.setflags(write=False)
+        self.__post.setflags(write=False)
+
+        delta = self.__post - self.__pre
+        self.__pre_sets = tuple(tuple((int(j), int(self.__pre[i, j])) for j in np.flatnonzero(self.__pre[i])) for i in
+                                range(no_transitions))
+        self.__post_sets = tuple(tuple((int(j), int(self.__post[i, j])) for j in np.flatnonzero(self.__post[i])) for i in
+                                 range(no_transitions))
+        self.__changes = tuple(tuple((int(j), int(delta[i, j])) for j in np.flatnonzero(delta[i])) for i in
+                               range(no_transitions))
+        self.__consumers = tuple(tuple(int(i) for i in np.flatnonzero(self.__pre[:, j])) for j in range(no_places))
+        self.__empty_preset = tuple(i for i in range(no_transitions) if not self.__pre_sets[i])
+
+        label_transitions = {}
+        for i, t in enumerate(self.__transition_list):
+            if t.label not in label_transitions:
+                label_transitions[t.label] = []
+            label_transitions[t.label].append(i)
+        self.__label_transitions = {x: tuple(y) for x, y in label_transitions.items()}
+
+    def __get_place_list(self):
+        return self.__place_list
+
+    def __get_transition_list(self):
+        return self.__transition_list
+
+    def __get_place_indices(self):
+        return self.__place_indices
+
+    def __get_transition_indices(self):
+        return self.__transition_indices
+
+    def __get_pre(self):
+        return self.__pre
+
+    def __get_post(self):
+        return self.__post
+
+    def __get_a_matrix(self):
+        return (self.__post - self.__pre).transpose()
+
+    def __get_sparse_a_matrix(self):
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.__post - self.__pre).transpose(), dtype=float)
+
+    def __get_pre_sets(self):
+        return self.__pre_sets
+
+    def __get_post_sets(self):
+        return self.__post_sets
+
+    def __get_consumers(self):
+        return self.__consumers
+
+    def __get_empty_preset(self):
+        return self.__empty_preset
+
+    def __get_label_transitions(self):
+        return self.__label_transitions
+
+    def encode_marking(self, marking):
+        """
+        Encodes a marking as tuple of integers (one entry per place)
+        """
+        m = [0] * len(self.__place_list)
+        for p, n in marking.items():
+            m[self.__place_indices[p]] = n
+        return tuple(m)
+
+    def decode_marking(self, m):
+        """
+        Decodes a tuple of integers into a marking object
+        """
+        marking = Marking()
+        for i, n in enumerate(m):
+            if n > 0:
+                marking[self.__place_list[i]] = n
+        return marking
+
+    def is_enabled(self, t, m):
+        """
+        Checks if the transition with index t is enabled in the (encoded) marking m
+        """
+        for p, w in self.__pre_sets[t]:
+            if m[p] < w:
+                return False
+        return True
+
+    def execute(self, t, m):
+        """
+        Fires the transition with index t in the (encoded) marking m.
+        Returns None if the transition is not enabled
+        """
+        if not self.is_enabled(t, m):
+            return None
+        m_out = list(m)
+        for p, d in self.__changes[t]:
+            m_out[p] += d
+        return tuple(m_out)
+
+    def weak_execute(self, t, m):
+        """
+        Fires the transition with index t in the (encoded) marking m, even if it is not enabled
+        (the tokens of the places in the preset cannot go below zero)
+        """
+        m_out = list(m)
+        for p, w in self.__pre_sets[t]:
+            m_out[p] = max(0, m_out[p] - w)
+        for p, w in self.__post_sets[t]:
+            m_out[p] += w
+        return tuple(m_out)
+
+    def enabled_transitions(self, m):
+        """
+        Gets the indices of the transitions that are enabled in the (encoded) marking m.
+        Only the transitions consuming from a marked place (or having an empty preset) are checked
+        """
+        candidates = set(self.__empty_preset)
+        for p, n in enumerate(m):
+            if n > 0:
+                candidates.update(self.__consumers[p])
+        return sorted(t for t in candidates if self.is_enabled(t, m))
+
+    place_list = property(__get_place_list)
+    transition_list = property(__get_transition_list)
+    places = property(__get_place_indices)
+    transitions = property(__get_transition_indices)
+    pre = property(__get_pre)
+    post = property(__get_post)
+    a_matrix = property(__get_a_matrix)
+    sparse_a_matrix = property(__get_sparse_a_matrix)
+    pre_sets = property(__get_pre_sets)
+    post_sets = property(__get_post_sets)
+    consumers = property(__get_consumers)
+    empty_preset = property(__get_empty_preset)
+    label_transitions = property(__get_label_transitions)
+
+
+def construct(net):
+    return CompiledPetriNet(net)
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy import sparse
 from pm4py.util.lp import solver as lp_solver
 from pm4py.objects.petri import align_utils as utils
 from pm4py.objects.petri.incidence_matrix import construct
@@ -18,8 +19,8 @@ def __search(net, ini, fin):
 
     closed = set()
 
-    a_matrix = np.asmatrix(incidence_matrix.a_matrix).astype(np.float64)
-    g_matrix = -np.eye(len(net.transitions))
+    a_matrix = incidence_matrix.sparse_a_matrix
+    g_matrix = -sparse.identity(len(net.transitions), format="csr")
     h_cvx = np.matrix(np.zeros(len(net.transitions))).transpose()
     cost_vec = [x * 1.0 for x in cost_vec]
 
@@ -31,8 +32,8 @@ def __search(net, ini, fin):
         # not available in the latest version of PM4Py
         from cvxopt import matrix
 
-        a_matrix = matrix(a_matrix)
-        g_matrix = matrix(g_matrix)
+        a_matrix = matrix(a_matrix.toarray())
+        g_matrix = matrix(g_matrix.toarray())
         h_cvx = matrix(h_cvx)
         cost_vec = matrix(cost_vec)
 
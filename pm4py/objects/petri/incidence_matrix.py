@@ -1,6 +1,8 @@
 class IncidenceMatrix(object):
 
     def __init__(self, net):
+        self.__entries = []
+        self.__sparse_A = None
         self.__A, self.__place_indices, self.__transition_indices = self.__construct_matrix(net)
 
     def encode_marking(self, marking):
@@ -12,6 +14,15 @@ class IncidenceMatrix(object):
     def __get_a_matrix(self):
         return self.__A
 
+    def __get_sparse_a_matrix(self):
+        if self.__sparse_A is None:
+            from scipy.sparse import coo_matrix
+            rows, cols, values = zip(*self.__entries) if self.__entries else ((), (), ())
+            self.__sparse_A = coo_matrix((values, (rows, cols)), shape=(len(self.__place_indices),
+                                                                        len(self.__transition_indices)),
+                                         dtype=float).tocsr()
+        return self.__sparse_A
+
     def __get_transition_indices(self):
         return self.__transition_indices
 
@@ -29,11 +40,15 @@ class IncidenceMatrix(object):
         for p in net.places:
             for a in p.in_arcs:
                 a_matrix[p_index[p]][t_index[a.source]] += 1
+                self.__entries.append((p_index[p], t_index[a.source], 1))
             for a in p.out_arcs:
                 a_matrix[p_index[p]][t_index[a.target]] -= 1
+                self.__entries.append((p_index[p], t_index[a.target], -1))
         return a_matrix, p_index, t_index
 
     a_matrix = property(__get_a_matrix)
+    # the same matrix, as CSR matrix built from the arcs (the duplicate entries are summed)
+    sparse_a_matrix = property(__get_sparse_a_matrix)
     places = property(__get_place_indices)
     transitions = property(__get_transition_indices)
 
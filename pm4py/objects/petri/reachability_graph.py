@@ -1,15 +1,19 @@
 import re
 
-from pm4py.objects.petri import semantics, align_utils
+from pm4py.objects.petri import align_utils, state_space
 from pm4py.objects.transition_system import transition_system as ts
 from pm4py.objects.transition_system import utils
-from pm4py.util import exec_utils
 from enum import Enum
-import time
 
 
 class Parameters(Enum):
     MAX_ELAB_TIME = "max_elab_time"
+    USE_COMPILED_NET = "use_compiled_net"
+    MAX_STATES = "max_states"
+    MAX_MEMORY = "max_memory"
+    STRATEGY = "strategy"
+    SPILL_THRESHOLD = "spill_threshold"
+    SPILL_DIRECTORY = "spill_directory"
 
 
 def staterep(name):
@@ -41,37 +45,47 @@ def marking_flow_petri(net, im, return_eventually_enabled=False, parameters=None
         Initial marking
     return_eventually_enabled
         Return the eventually enabled (visible) transitions
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.MAX_ELAB_TIME -> maximum time (in seconds) for the exploration
+            Parameters.MAX_STATES -> maximum number of markings
+            Parameters.MAX_MEMORY -> maximum (estimated) memory occupation of the exploration, in bytes
+            Parameters.STRATEGY -> state_space.BFS (breadth-first) or state_space.DFS (depth-first, default)
+            Parameters.SPILL_THRESHOLD -> number of markings of the frontier kept in memory (the rest is
+            written to temporary files)
+            Parameters.SPILL_DIRECTORY -> directory of the temporary files
+            Parameters.USE_COMPILED_NET -> kept for compatibility (the markings are always explored on the
+            compiled representation of the Petri net, see state_space)
+
+    Returns
+    -----------------
+    incoming_transitions
+        Dictionary associating to each reached marking the set of transitions leading to it
+    outgoing_transitions
+        Dictionary associating to each explored marking the transitions enabled in it, along with the reached
+        marking (when a limit is reached, the markings discovered but not explored are only in incoming_transitions)
+    eventually_enabled
+        Visible transitions eventually enabled in each explored marking (if requested)
     """
     if parameters is None:
         parameters = {}
 
-    # set a maximum execution time of 1 day (it can be changed by providing the parameter)
-    max_exec_time = exec_utils.get_param_value(Parameters.MAX_ELAB_TIME, parameters, 86400)
+    # the parameters of the exploration (limits, strategy, spill) have the same names in state_space
+    space = state_space.explore(net, im, parameters=parameters)
 
-    start_time = time.time()
-
-    incoming_transitions = {im: set()}
+    transitions = space.cnet.transition_list
+    decoded = space.decode_markings()
+    incoming_transitions = {m: set() for m in decoded}
     outgoing_transitions = {}
     eventually_enabled = {}
-
-    active = [im]
-    while active:
-        if (time.time() - start_time) >= max_exec_time:
-            # interrupt the execution
-            return incoming_transitions, outgoing_transitions, eventually_enabled
-        m = active.pop()
-        enabled_transitions = semantics.enabled_transitions(net, m)
+    for s in space.expanded_states():
+        m = decoded[s]
+        outgoing_transitions[m] = {}
+        for t, s2 in space.arcs[s]:
+            outgoing_transitions[m][transitions[t]] = decoded[s2]
+            incoming_transitions[decoded[s2]].add(transitions[t])
         if return_eventually_enabled:
             eventually_enabled[m] = align_utils.get_visible_transitions_eventually_enabled_by_marking(net, m)
-        outgoing_transitions[m] = {}
-        for t in enabled_transitions:
-            nm = semantics.weak_execute(t, m)
-            outgoing_transitions[m][t] = nm
-            if nm not in incoming_transitions:
-                incoming_transitions[nm] = set()
-                if nm not in active:
-                    active.append(nm)
-            incoming_transitions[nm].add(t)
 
     return incoming_transitions, outgoing_transitions, eventually_enabled
 
@@ -125,6 +139,8 @@ def construct_reachability_graph(net, initial_marking, use_trans_name=False, par
     ----------
     net: Petri net
     initial_marking: initial marking of the Petri net.
+    parameters: parameters of the exploration (limits on the number of states, memory and time;
+    see marking_flow_petri).
 
     Returns
     -------
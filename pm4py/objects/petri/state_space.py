@@ -0,0 +1,249 @@
+import os
+import pickle
+import sys
+import tempfile
+import time
+from collections import deque
+from enum import Enum
+
+from pm4py.objects.petri import compiled_net
+from pm4py.util import exec_utils, instrumentation
+
+BFS = "bfs"
+DFS = "dfs"
+
+# approximate memory (in bytes) used by the bookkeeping of a state (index entry, list of outgoing arcs)
+# and by an arc, besides the size of the encoded marking
+STATE_OVERHEAD = 160
+ARC_OVERHEAD = 72
+
+MAX_STATES_REASON = "max_states"
+MAX_MEMORY_REASON = "max_memory"
+MAX_ELAB_TIME_REASON = "max_elab_time"
+
+
+class Parameters(Enum):
+    MAX_STATES = "max_states"
+    MAX_MEMORY = "max_memory"
+    MAX_ELAB_TIME = "max_elab_time"
+    STRATEGY = "strategy"
+    SPILL_THRESHOLD = "spill_threshold"
+    SPILL_DIRECTORY = "spill_directory"
+
+
+class StateSpace(object):
+    """
+    State space of a Petri net, explored on its compiled representation.
+
+    The states are identified by integers (0 is the initial marking); markings[i] is the encoded marking
+    (tuple of integers, see CompiledPetriNet) of the state i, and arcs[i] is the list of the outgoing arcs
+    of the state i, expressed as (transition index, target state) couples. The states that have been
+    discovered, but not expanded because a limit was reached, have arcs[i] equal to None.
+    """
+
+    def __init__(self, cnet):
+        self.cnet = cnet
+        self.markings = []
+        self.index = {}
+        self.arcs = []
+        self.interrupted = None
+
+    def __len__(self):
+        return len(self.markings)
+
+    def add_state(self, m):
+        """
+        Adds a state with the given encoded marking, returning its identifier
+        """
+        self.index[m] = len(self.markings)
+        self.markings.append(m)
+        self.arcs.append(None)
+        return len(self.markings) - 1
+
+    def is_complete(self):
+        """
+        Checks if the state space has been fully explored (no limit was reached)
+        """
+        return self.interrupted is None
+
+    def expanded_states(self):
+        """
+        Gets the identifiers of the states whose outgoing arcs have been computed
+        """
+        return [i for i in range(len(self.markings)) if self.arcs[i] is not None]
+
+    def decode_markings(self):
+        """
+        Gets the list of the markings (as Marking objects) of the states
+        """
+        return [self.cnet.decode_marking(m) for m in self.markings]
+
+
+class _Frontier(object):
+    """
+    Frontier of the exploration (FIFO for breadth-first, LIFO for depth-first search).
+    When the number of states kept in memory exceeds the spill threshold, part of the frontier is
+    written to temporary files, which are read back when the in-memory frontier runs out of states
+    (the exploration order is the same as without spilling)
+    """
+
+    def __init__(self, strategy, spill_threshold=None, spill_directory=None):
+        self.strategy = strategy
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+        self.head = deque()
+        self.tail = []
+        self.spilled = deque()
+        self.no_spilled = 0
+
+    def __len__(self):
+        return len(self.head) + len(self.tail) + self.no_spilled
+
+    def push(self, s):
+        if self.strategy == BFS:
+            self.tail.append(s)
+            if self.spill_threshold is not None and len(self.tail) >= self.spill_threshold:
+                self.__spill(self.tail)
+                self.tail = []
+        else:
+            self.head.append(s)
+            if self.spill_threshold is not None and len(self.head) >= self.spill_threshold:
+                # the bottom half of the stack is visited last
+                half = len(self.head) // 2
+                bottom = [self.head.popleft() for i in range(half)]
+                self.__spill(bottom)
+
+    def pop(self):
+        if self.strategy == BFS:
+            if not self.head:
+                if self.spilled:
+                    self.head = deque(self.__load(self.spilled.popleft()))
+                else:
+                    self.head = deque(self.tail)
+                    self.tail = []
+            return self.head.popleft()
+        if not self.head:
+            self.head = deque(self.__load(self.spilled.pop()))
+        return self.head.pop()
+
+    def close(self):
+        """
+        Removes the spill files that have not been read
+        """
+        while self.spilled:
+            os.remove(self.spilled.pop()[0])
+        self.no_spilled = 0
+
+    def __spill(self, states):
+        fd, path = tempfile.mkstemp(prefix="pm4py_frontier_", suffix=".pkl", dir=self.spill_directory)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(states, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.spilled.append((path, len(states)))
+        self.no_spilled += len(states)
+        instrumentation.increment("state_space.spilled_states", len(states))
+
+    def __load(self, spill_file):
+        path, count = spill_file
+        with open(path, "rb") as f:
+            states = pickle.load(f)
+        os.remove(path)
+        self.no_spilled -= count
+        return states
+
+
+def explore(net, im, parameters=None):
+    """
+    Explores the state space (reachable markings) of a Petri net.
+
+    The markings are encoded as tuples of integers on the compiled representation of the net,
+    and the visited markings are kept in a hash table; the exploration can be bounded in the number of states,
+    in the (estimated) memory and in the time. If a limit is reached, the exploration is interrupted and the
+    reason is stored in the interrupted attribute of the state space.
+
+    Parameters
+    -------------
+    net
+        Petri net
+    im
+        Initial marking
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.MAX_STATES -> maximum number of states (default: no limit)
+            Parameters.MAX_MEMORY -> maximum (estimated) memory occupation of the state space, in bytes
+            (default: no limit)
+            Parameters.MAX_ELAB_TIME -> maximum time (in seconds) for the exploration (default: 1 day)
+            Parameters.STRATEGY -> BFS (breadth-first search) or DFS (depth-first search, default)
+            Parameters.SPILL_THRESHOLD -> number of states of the frontier that are kept in memory;
+            the rest is written to temporary files (default: no spill)
+            Parameters.SPILL_DIRECTORY -> directory of the temporary files (default: system temporary directory)
+
+    Returns
+    -------------
+    state_space
+        State space
+    """
+    if parameters is None:
+        parameters = {}
+
+    max_states = exec_utils.get_param_value(Parameters.MAX_STATES, parameters, None)
+    max_memory = exec_utils.get_param_value(Parameters.MAX_MEMORY, parameters, None)
+    max_exec_time = exec_utils.get_param_value(Parameters.MAX_ELAB_TIME, parameters, 86400)
+    strategy = exec_utils.get_param_value(Parameters.STRATEGY, parameters, DFS)
+    spill_threshold = exec_utils.get_param_value(Parameters.SPILL_THRESHOLD, parameters, None)
+    spill_directory = exec_utils.get_param_value(Parameters.SPILL_DIRECTORY, parameters, None)
+
+    if strategy not in [BFS, DFS]:
+        raise Exception("unsupported exploration strategy: " + str(strategy))
+
+    cnet = compiled_net.construct(net)
+    state_space = StateSpace(cnet)
+    index = state_space.index
+    markings = state_space.markings
+    arcs = state_space.arcs
+
+    start_time = time.time()
+
+    ini = cnet.encode_marking(im)
+    state_space.add_state(ini)
+    memory = sys.getsizeof(ini) + STATE_OVERHEAD
+
+    frontier = _Frontier(strategy, spill_threshold=spill_threshold, spill_directory=spill_directory)
+    frontier.push(0)
+    try:
+        with instrumentation.phase("state_space"):
+            while frontier:
+                if (time.time() - start_time) >= max_exec_time:
+                    state_space.interrupted = MAX_ELAB_TIME_REASON
+                    break
+                s = frontier.pop()
+                m = markings[s]
+                out = []
+                for t in cnet.enabled_transitions(m):
+                    nm = cnet.weak_execute(t, m)
+                    if nm not in index:
+                        if max_states is not None and len(markings) >= max_states:
+                            state_space.interrupted = MAX_STATES_REASON
+                            break
+                        frontier.push(state_space.add_state(nm))
+                        memory += sys.getsizeof(nm) + STATE_OVERHEAD
+                    out.append((t, index[nm]))
+                    memory += ARC_OVERHEAD
+                if state_space.interrupted is not None:
+                    break
+                arcs[s] = out
+                if max_memory is not None and memory >= max_memory:
+                    state_space.interrupted = MAX_MEMORY_REASON
+                    break
+    finally:
+        frontier.close()
+
+    instrumentation.increment("state_space.states", len(markings))
+
+    return state_space
+
+
+def apply(net, im, parameters=None):
+    """
+    Explores the state space (reachable markings) of a Petri net (see explore)
+    """
+    return explore(net, im, parameters=parameters)
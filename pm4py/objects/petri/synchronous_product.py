@@ -1,7 +1,9 @@
 from pm4py.objects.petri.petrinet import PetriNet, Marking
 from pm4py.objects.petri.utils import add_arc_from_to
+from pm4py.util import instrumentation
 
 
+@instrumentation.phased("alignments.sync_product")
 def construct(pn1, im1, fm1, pn2, im2, fm2, skip):
     """
     Constructs the synchronous product net of two given Petri nets.
@@ -51,6 +53,7 @@ def construct(pn1, im1, fm1, pn2, im2, fm2, skip):
     return sync_net, sync_im, sync_fm
 
 
+@instrumentation.phased("alignments.sync_product")
 def construct_cost_aware(pn1, im1, fm1, pn2, im2, fm2, skip, pn1_costs, pn2_costs, sync_costs):
     """
     Constructs the synchronous product net of two given Petri nets.
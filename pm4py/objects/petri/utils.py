@@ -269,6 +269,25 @@ def get_transition_by_name(net, transition_name):
     return None
 
 
+def has_unique_names(net):
+    """
+    Checks if the places and the transitions of a Petri net have distinct names
+    (the names are used as identifiers when the net is exported to PNML)
+
+    Parameters
+    ------------
+    net
+        Petri net
+
+    Returns
+    ------------
+    boolean
+        True if no name is shared by two places/transitions
+    """
+    names = set(p.name for p in net.places) | set(t.name for t in net.transitions)
+    return len(names) == len(net.places) + len(net.transitions)
+
+
 def get_cycles_petri_net_places(net):
     """
     Get the cycles of a Petri net (returning only list of places belonging to the cycle)
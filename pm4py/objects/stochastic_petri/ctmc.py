@@ -116,7 +116,7 @@ def get_tangible_reachability_and_q_matrix_from_dfg_performance(dfg_performance,
             exp.scale = scale
             rv.random_variable = exp
             stochastic_map[tr] = rv
-    tang_reach_graph = construct_reachability_graph(net, im, use_trans_name=True)
+    tang_reach_graph = construct_reachability_graph(net, im, use_trans_name=True, parameters=parameters)
     q_matrix = get_q_matrix_from_tangible_exponential(tang_reach_graph, stochastic_map)
     return tang_reach_graph, tang_reach_graph, stochastic_map, q_matrix
 
@@ -177,7 +177,7 @@ def transient_analysis_from_petri_net_and_smap(net, im, s_map, delay, parameters
     if parameters is None:
         parameters = {}
     # gets the reachability graph from the Petri net
-    reachab_graph = construct_reachability_graph(net, im)
+    reachab_graph = construct_reachability_graph(net, im, parameters=parameters)
     states_reachable_from_start = set()
     for trans in reachab_graph.transitions:
         if str(trans.from_state) == "start1":
@@ -1,6 +1,7 @@
 from copy import copy
 
 import numpy as np
+from scipy import sparse
 
 from pm4py.objects.petri.petrinet import PetriNet, Marking
 from pm4py.objects.petri.utils import remove_place, remove_transition, add_arc_from_to
@@ -14,7 +15,8 @@ DEFAULT_LP_SOLVER_VARIANT = lp_solver.ORTOOLS_SOLVER
 
 
 class LpPerfBounds(object):
-    def __init__(self, net, initial_marking, final_marking, smap, avg_time_starts):
+    def __init__(self, net, initial_marking, final_marking, smap, avg_time_starts,
+                 variant=DEFAULT_LP_SOLVER_VARIANT):
         """
         Construct the LpPerfBounds object
 
@@ -30,7 +32,12 @@ class LpPerfBounds(object):
             Stochastic map of transitions distribution
         avg_time_starts
             Average time interlapsed between case starts (may be real or provided)
+        variant
+            Variant of the LP solver (with the variants supporting persistent models, e.g. highs,
+            the constraints are passed to the solver only once, and each problem changes only the objective)
         """
+        self.variant = variant
+        self.lp_model = None
         self.Aub = None
         self.bub = None
         self.Aeq = None
@@ -110,11 +117,17 @@ class LpPerfBounds(object):
             c[target_column] = -1.0
         else:
             c[target_column] = 1.0
-        sol = lp_solver.apply(c, self.Aub, self.bub, self.Aeq, self.beq, variant=DEFAULT_LP_SOLVER_VARIANT)
+        if self.lp_model is None:
+            self.lp_model = lp_solver.get_persistent_model(c, self.Aub, self.bub, self.Aeq, self.beq,
+                                                           variant=self.variant)
+        if self.lp_model is not None:
+            sol = self.lp_model.solve(c=c)
+        else:
+            sol = lp_solver.apply(c, self.Aub, self.bub, self.Aeq, self.beq, variant=self.variant)
         parameters_points = {"maximize": maximize, "return_when_none": True, "var_corr": self.var_corr}
 
         return lp_solver.get_points_from_sol(sol, parameters=parameters_points,
-                                                     variant=DEFAULT_LP_SOLVER_VARIANT)
+                                                     variant=self.variant)
 
     def build_problem(self):
         """
@@ -151,11 +164,15 @@ class LpPerfBounds(object):
 
         self.Aeq, self.beq = aeq_redundant_fix.remove_redundant_rows(self.Aeq, self.beq)
 
-        if DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT:
+        if self.variant == lp_solver.CVXOPT:
             self.Aeq = np.transpose(self.Aeq.astype(np.float64)).tolist()
             self.beq = np.transpose(self.beq.astype(np.float64)).tolist()
             self.Aub = np.transpose(self.Aub.astype(np.float64)).tolist()
             self.bub = np.transpose(self.bub.astype(np.float64)).tolist()
+        else:
+            # the constraints are mostly zeros: they are passed to the solver as sparse matrices
+            self.Aeq = sparse.csr_matrix(self.Aeq, dtype=np.float64)
+            self.Aub = sparse.csr_matrix(self.Aub, dtype=np.float64)
 
     def build_1_throughput(self):
         """
@@ -1,4 +1,4 @@
-from pm4py.simulation.montecarlo.variants import petri_semaph_fifo
+from pm4py.simulation.montecarlo.variants import petri_semaph_fifo, petri_discrete_event
 from pm4py.simulation.montecarlo.outputs import Outputs
 from pm4py.util import exec_utils
 from enum import Enum
@@ -6,11 +6,12 @@ from enum import Enum
 
 class Variants(Enum):
     PETRI_SEMAPH_FIFO = petri_semaph_fifo
+    PETRI_DISCRETE_EVENT = petri_discrete_event
 
 
 DEFAULT_VARIANT = Variants.PETRI_SEMAPH_FIFO
 
-VERSIONS = {Variants.PETRI_SEMAPH_FIFO}
+VERSIONS = {Variants.PETRI_SEMAPH_FIFO, Variants.PETRI_DISCRETE_EVENT}
 
 
 def apply(log, net, im, fm, variant=DEFAULT_VARIANT, parameters=None):
@@ -31,6 +32,8 @@ def apply(log, net, im, fm, variant=DEFAULT_VARIANT, parameters=None):
     variant
         Variant of the algorithm to use:
         - Variants.PETRI_SEMAPH_FIFO
+        - Variants.PETRI_DISCRETE_EVENT (discrete-event scheduler on the simulated time; reproducible with
+        Parameters.PARAM_SEED; the parameters related to the real execution time are not used)
     parameters
         Parameters of the algorithm:
             Parameters.PARAM_NUM_SIMULATIONS => (default: 100)
@@ -47,6 +50,7 @@ def apply(log, net, im, fm, variant=DEFAULT_VARIANT, parameters=None):
             Parameters.PARAM_SMALL_SCALE_FACTOR => Scale factor for the sleeping time of the actual simulation
             (default: 864000.0, 10gg)
             Parameters.PARAM_MAX_THREAD_EXECUTION_TIME => Maximum execution time per thread (default: 60.0, 1 minute)
+            Parameters.PARAM_SEED => (Variants.PETRI_DISCRETE_EVENT) seed of the random number generator
 
     Returns
     ------------
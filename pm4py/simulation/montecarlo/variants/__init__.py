@@ -1 +1,2 @@
 from pm4py.simulation.montecarlo.variants import petri_semaph_fifo
+from pm4py.simulation.montecarlo.variants import petri_discrete_event
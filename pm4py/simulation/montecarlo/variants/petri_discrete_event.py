@@ -0,0 +1,530 @@
+import datetime
+import heapq
+import logging
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Mapping
+from statistics import median
+from time import time
+
+import numpy as np
+
+from pm4py.objects.log.log import EventLog, Trace, Event
+from pm4py.objects.petri import compiled_net
+from pm4py.objects.random_variables.constant0.random_variable import Constant0
+from pm4py.objects.random_variables.exponential.random_variable import Exponential
+from pm4py.objects.random_variables.normal.random_variable import Normal
+from pm4py.objects.random_variables.uniform.random_variable import Uniform
+from pm4py.simulation.montecarlo.outputs import Outputs
+from pm4py.simulation.montecarlo.parameters import Parameters
+from pm4py.simulation.montecarlo.utils import replay
+from pm4py.statistics.traces.log import case_arrival
+from pm4py.util import exec_utils, xes_constants
+
+# kinds of the events of the scheduler
+ARRIVAL = 0
+STEP = 1
+COMPLETION = 2
+
+# maximum number of samples drawn to get a non-negative duration
+MAX_RESAMPLING = 100
+
+
+class RandomSource(object):
+    """
+    Seeded source of random numbers; the numbers are generated by NumPy in blocks and consumed one at a time
+    """
+
+    def __init__(self, seed=None, block_size=65536):
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        self.__uniform = []
+        self.__normal = []
+        self.__exponential = []
+
+    def uniform(self):
+        if not self.__uniform:
+            self.__uniform = self.rng.random(self.block_size).tolist()
+        return self.__uniform.pop()
+
+    def normal(self):
+        if not self.__normal:
+            self.__normal = self.rng.standard_normal(self.block_size).tolist()
+        return self.__normal.pop()
+
+    def exponential(self):
+        if not self.__exponential:
+            self.__exponential = self.rng.standard_exponential(self.block_size).tolist()
+        return self.__exponential.pop()
+
+
+def get_sampler(rv, source):
+    """
+    Gets a function sampling the duration of a transition from the random source
+
+    Parameters
+    -------------
+    rv
+        Random variable associated to the transition in the stochastic map (None if the transition is not in the map)
+    source
+        Random source
+
+    Returns
+    -------------
+    sampler
+        Function returning a (non-negative) duration
+    """
+    if rv is None:
+        return lambda: 0.0
+    distr = getattr(rv, "random_variable", rv)
+    if isinstance(distr, Normal):
+        mu, sigma = float(distr.mu), float(distr.sigma)
+        sample = lambda: mu + sigma * source.normal()
+    elif isinstance(distr, Uniform):
+        loc, scale = float(distr.loc), float(distr.scale)
+        sample = lambda: loc + scale * source.uniform()
+    elif isinstance(distr, Exponential):
+        loc, scale = float(distr.loc), float(distr.scale)
+        sample = lambda: loc + scale * source.exponential()
+    elif isinstance(distr, Constant0):
+        return lambda: 0.0
+    else:
+        # unknown distributions are sampled through their own generator (not controlled by the seed)
+        sample = rv.get_value
+
+    def sampler():
+        for i in range(MAX_RESAMPLING):
+            value = sample()
+            if value >= 0:
+                return value
+        return 0.0
+
+    return sampler
+
+
+class _Case(object):
+    __slots__ = ("id", "marking", "events", "held", "token_times", "transition", "duration", "start",
+                 "to_acquire", "acquired", "waiting", "finished")
+
+    def __init__(self, id, marking):
+        self.id = id
+        self.marking = marking
+        # (label, numeric timestamp) of the visible transitions fired by the case
+        self.events = []
+        self.held = {}
+        self.token_times = {}
+        self.transition = None
+        self.duration = 0.0
+        self.start = 0.0
+        self.to_acquire = ()
+        self.acquired = 0
+        # place in whose queue the case is waiting (None if the case is not waiting)
+        self.waiting = None
+        self.finished = False
+
+
+class IntervalTrees(Mapping):
+    """
+    Interval trees of the places/transitions of the simulation; the tree of an element is built (in bulk)
+    when it is first accessed, as building the trees of all the elements takes longer than the simulation
+    """
+
+    def __init__(self, intervals):
+        self.__intervals = intervals
+        self.__trees = {}
+
+    def __getitem__(self, key):
+        if key not in self.__trees:
+            from intervaltree import IntervalTree
+            self.__trees[key] = IntervalTree.from_tuples(self.__intervals[key])
+        return self.__trees[key]
+
+    def __iter__(self):
+        return iter(self.__intervals)
+
+    def __len__(self):
+        return len(self.__intervals)
+
+
+class DiscreteEventSimulation(object):
+    """
+    Discrete-event simulation of the cases of an accepting Petri net.
+
+    The events of the simulation (arrival of a case, choice of the next transition, completion of a transition)
+    are stored in a priority queue ordered by the simulated time; hence, the time advances from one event to the next
+    and no real waiting is needed. Each place has a number of resources: a case needs a resource of each output place
+    before firing a transition, and waits (FIFO) when all the resources of the place are busy.
+    The resources of the input places are released when the transition completes.
+
+    When a case starts waiting, the cases waiting for each other's resources are detected: if no resource
+    of the place can become free (all the holders are waiting, directly or indirectly, for resources held
+    by waiting cases), a case on a wait-for cycle is aborted and its resources are released.
+    """
+
+    def __init__(self, net, im, fm, smap, capacities, source):
+        self.cnet = compiled_net.construct(net)
+        self.im = self.cnet.encode_marking(im)
+        self.fm = tuple((p, n) for p, n in enumerate(self.cnet.encode_marking(fm)) if n > 0)
+        self.free = [capacities[p] for p in self.cnet.place_list]
+        self.queues = [deque() for p in self.cnet.place_list]
+        # cases holding at least a resource of each place
+        self.holders = [set() for p in self.cnet.place_list]
+        # identifiers of the aborted cases
+        self.aborted = []
+        self.source = source
+        self.weights = [float(smap[t].get_weight()) if t in smap else 1.0 for t in self.cnet.transition_list]
+        self.samplers = [get_sampler(smap[t] if t in smap else None, source) for t in self.cnet.transition_list]
+        self.labels = [t.label for t in self.cnet.transition_list]
+        self.post_places = [tuple(p for p, w in post for i in range(w)) for post in self.cnet.post_sets]
+        self.enabled = {}
+        self.firings = {}
+        self.choices = {}
+        self.heap = []
+        self.counter = 0
+        self.places_intervals = [[] for p in self.cnet.place_list]
+        self.transitions_intervals = [[] for t in self.cnet.transition_list]
+
+    def schedule(self, timestamp, kind, case):
+        heapq.heappush(self.heap, (timestamp, self.counter, kind, case))
+        self.counter += 1
+
+    def pick_transition(self, enabled):
+        """
+        Picks one of the enabled transitions according to the weights
+        """
+        if len(enabled) == 1:
+            return enabled[0]
+        if enabled not in self.choices:
+            weights = [self.weights[t] for t in enabled]
+            if sum(weights) == 0:
+                weights = [1.0] * len(enabled)
+            self.choices[enabled] = (np.cumsum(weights) / sum(weights)).tolist()
+        cumulative = self.choices[enabled]
+        return enabled[min(bisect_right(cumulative, self.source.uniform()), len(enabled) - 1)]
+
+    def acquire(self, case, timestamp):
+        """
+        Acquires (in order) the resources requested by the case; if a place has no free resources,
+        the case is put in the queue of the place
+        """
+        to_acquire = case.to_acquire
+        while case.acquired < len(to_acquire):
+            p = to_acquire[case.acquired]
+            if self.free[p] > 0 and not self.queues[p]:
+                self.free[p] -= 1
+                case.held[p] = case.held.get(p, 0) + 1
+                self.holders[p].add(case)
+                case.acquired += 1
+            else:
+                self.queues[p].append(case)
+                case.waiting = p
+                self.resolve_deadlocks(p, timestamp)
+                return
+        if case.transition is None:
+            self.schedule(timestamp, STEP, case)
+        else:
+            waiting_time = timestamp - case.start
+            if waiting_time > 0:
+                self.transitions_intervals[case.transition].append((case.start, timestamp))
+            self.schedule(case.start + max(case.duration, waiting_time), COMPLETION, case)
+
+    def release(self, p, count, timestamp):
+        """
+        Releases resources of a place, assigning them to the cases waiting in the queue of the place
+        """
+        self.free[p] += count
+        queue = self.queues[p]
+        while self.free[p] > 0 and queue:
+            case = queue.popleft()
+            case.waiting = None
+            self.free[p] -= 1
+            case.held[p] = case.held.get(p, 0) + 1
+            self.holders[p].add(case)
+            case.acquired += 1
+            self.acquire(case, timestamp)
+
+    def release_all(self, case, timestamp):
+        held = case.held
+        case.held = {}
+        for p in held:
+            self.holders[p].discard(case)
+        for p, count in held.items():
+            if count > 0:
+                self.release(p, count, timestamp)
+
+    def find_deadlock(self, p):
+        """
+        Checks if a resource of the place p can become free. The places whose resources are needed are
+        visited: a resource can become free if one of them has free resources, or is held by a case that is not
+        waiting (which releases it, or starts waiting, in which case the check is repeated).
+        Otherwise, the waiting cases form a deadlock, and a case holding a resource on a wait-for cycle
+        (place -> holder -> place the holder waits for) is returned.
+
+        Returns
+        -------------
+        victim
+            Case to abort (None if there is no deadlock)
+        """
+        visited = {p}
+        to_visit = [p]
+        while to_visit:
+            q = to_visit.pop()
+            if self.free[q] > 0:
+                return None
+            for holder in self.holders[q]:
+                if holder.waiting is None:
+                    return None
+                if holder.waiting not in visited:
+                    visited.add(holder.waiting)
+                    to_visit.append(holder.waiting)
+
+        # depth-first search of a cycle in the wait-for graph between the places
+        on_path = {}
+        path = []
+        done = set()
+        stack = [(p, iter(sorted(self.holders[p], key=lambda c: c.id)))]
+        on_path[p] = 0
+        while stack:
+            q, holders = stack[-1]
+            holder = next(holders, None)
+            if holder is None:
+                stack.pop()
+                del on_path[q]
+                done.add(q)
+                if path:
+                    path.pop()
+                continue
+            q2 = holder.waiting
+            if q2 in on_path:
+                # the cycle goes from q2 back to q2; the most recently arrived case of the cycle is aborted
+                return max(path[on_path[q2]:] + [holder], key=lambda c: c.id)
+            if q2 not in done:
+                path.append(holder)
+                on_path[q2] = len(path)
+                stack.append((q2, iter(sorted(self.holders[q2], key=lambda c: c.id))))
+        # the place has no resources at all: the cases are waiting forever, but not for each other
+        return None
+
+    def resolve_deadlocks(self, p, timestamp):
+        """
+        Aborts cases on wait-for cycles until a resource of the place p can become free
+        """
+        while True:
+            victim = self.find_deadlock(p)
+            if victim is None:
+                return
+            self.abort(victim, timestamp)
+
+    def step(self, case, timestamp):
+        """
+        Chooses the next transition of the case (or terminates the case if the final marking is reached)
+        """
+        marking = case.marking
+        if marking not in self.enabled:
+            # the reachable markings are few compared to the simulated steps
+            if all(marking[p] >= n for p, n in self.fm):
+                self.enabled[marking] = None
+            else:
+                self.enabled[marking] = tuple(self.cnet.enabled_transitions(marking))
+        enabled = self.enabled[marking]
+        if enabled is None:
+            case.finished = True
+            self.release_all(case, timestamp)
+            return
+        if not enabled:
+            # deadlock: the case is not completed
+            self.release_all(case, timestamp)
+            return
+        t = self.pick_transition(enabled)
+        case.transition = t
+        case.duration = self.samplers[t]()
+        case.start = timestamp
+        case.to_acquire = self.post_places[t]
+        case.acquired = 0
+        self.acquire(case, timestamp)
+
+    def complete(self, case, timestamp):
+        """
+        Completes the firing of the current transition of the case
+        """
+        t = case.transition
+        key = (case.marking, t)
+        if key not in self.firings:
+            self.firings[key] = self.cnet.weak_execute(t, case.marking)
+        case.marking = self.firings[key]
+        if self.labels[t] is not None:
+            case.events.append((self.labels[t], timestamp))
+        for p, w in self.cnet.pre_sets[t]:
+            entry_time = case.token_times.get(p, timestamp)
+            if timestamp - entry_time > 0:
+                self.places_intervals[p].append((entry_time, timestamp))
+            held = min(w, case.held.get(p, 0))
+            if held > 0:
+                case.held[p] -= held
+                if case.held[p] == 0:
+                    self.holders[p].discard(case)
+                self.release(p, held, timestamp)
+        for p, w in self.cnet.post_sets[t]:
+            case.token_times[p] = timestamp
+        case.transition = None
+        self.step(case, timestamp)
+
+    def run(self, arrival_times):
+        """
+        Runs the simulation
+
+        Parameters
+        -------------
+        arrival_times
+            Arrival time of each case
+
+        Returns
+        -------------
+        cases
+            List of the simulated cases
+        """
+        cases = []
+        for i, timestamp in enumerate(arrival_times):
+            case = _Case(i, self.im)
+            cases.append(case)
+            self.schedule(timestamp, ARRIVAL, case)
+        heap = self.heap
+        while heap:
+            timestamp, counter, kind, case = heapq.heappop(heap)
+            if kind == ARRIVAL:
+                for p, n in enumerate(case.marking):
+                    if n > 0:
+                        case.token_times[p] = timestamp
+                case.start = timestamp
+                case.to_acquire = tuple(p for p, n in enumerate(case.marking) for i in range(n))
+                case.acquired = 0
+                self.acquire(case, timestamp)
+            elif kind == STEP:
+                self.step(case, timestamp)
+            else:
+                self.complete(case, timestamp)
+        return cases
+
+    def abort(self, case, timestamp):
+        """
+        Aborts a waiting case (the case is not completed), releasing its resources
+        """
+        self.queues[case.waiting].remove(case)
+        case.waiting = None
+        self.aborted.append(case.id)
+        self.release_all(case, timestamp)
+
+
+def apply(log, net, im, fm, parameters=None):
+    """
+    Performs a Monte Carlo simulation of an accepting Petri net through a discrete-event scheduler
+    (the simulated time advances from one event to the next, hence no real waiting is needed
+    and large numbers of cases can be simulated). The resources of the places have the same semantics
+    as the PETRI_SEMAPH_FIFO variant. The simulation is reproducible when a seed is provided.
+
+    Parameters
+    -------------
+    log
+        Event log
+    net
+        Accepting Petri net
+    im
+        Initial marking
+    fm
+        Final marking
+    parameters
+        Parameters of the algorithm:
+            PARAM_NUM_SIMULATIONS => (default: 100)
+            PARAM_FORCE_DISTRIBUTION => Force a particular stochastic distribution (e.g. normal) when the stochastic map
+            is discovered from the log (default: None; no distribution is forced)
+            PARAM_ENABLE_DIAGNOSTICS => Enable the logging of the phases of the simulation (default: True)
+            PARAM_CASE_ARRIVAL_RATIO => Case arrival of new cases (default: None; inferred from the log)
+            PARAM_PROVIDED_SMAP => Stochastic map that is used in the simulation (default: None; inferred from the log)
+            PARAM_MAP_RESOURCES_PER_PLACE => Specification of the number of resources available per place
+            (default: None; each place gets the default number of resources)
+            PARAM_DEFAULT_NUM_RESOURCES_PER_PLACE => Default number of resources per place when not specified
+            (default: 1; each place gets 1 resource and has to wait for the resource to finish)
+            PARAM_SEED => Seed of the random number generator (default: None; not reproducible)
+
+    Returns
+    ------------
+    simulated_log
+        Simulated event log
+    simulation_result
+        Result of the simulation (see the PETRI_SEMAPH_FIFO variant); the cases that cannot reach
+        the final marking, or that are aborted because they are waiting for each other's resources
+        (the most recently arrived case of the wait-for cycle is aborted), are not included
+    """
+    if parameters is None:
+        parameters = {}
+
+    no_simulations = exec_utils.get_param_value(Parameters.PARAM_NUM_SIMULATIONS, parameters,
+                                                100)
+    force_distribution = exec_utils.get_param_value(Parameters.PARAM_FORCE_DISTRIBUTION, parameters,
+                                                    None)
+    enable_diagnostics = exec_utils.get_param_value(Parameters.PARAM_ENABLE_DIAGNOSTICS, parameters,
+                                                    True)
+    case_arrival_ratio = exec_utils.get_param_value(Parameters.PARAM_CASE_ARRIVAL_RATIO, parameters,
+                                                    None)
+    smap = exec_utils.get_param_value(Parameters.PARAM_PROVIDED_SMAP, parameters,
+                                      None)
+    resources_per_places = exec_utils.get_param_value(Parameters.PARAM_MAP_RESOURCES_PER_PLACE, parameters,
+                                                      None)
+    default_num_resources_per_places = exec_utils.get_param_value(Parameters.PARAM_DEFAULT_NUM_RESOURCES_PER_PLACE,
+                                                                  parameters, 1)
+    seed = exec_utils.get_param_value(Parameters.PARAM_SEED, parameters, None)
+
+    if case_arrival_ratio is None:
+        case_arrival_ratio = case_arrival.get_case_arrival_avg(log, parameters=parameters)
+    if resources_per_places is None:
+        resources_per_places = {}
+
+    logging.basicConfig()
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.DEBUG)
+
+    # when the user does not specify any map from transitions to random variables,
+    # a replay operation is performed
+    if smap is None:
+        if enable_diagnostics:
+            logger.info(str(time()) + " started the replay operation.")
+        if force_distribution is not None:
+            smap = replay.get_map_from_log_and_net(log, net, im, fm, force_distribution=force_distribution,
+                                                   parameters=parameters)
+        else:
+            smap = replay.get_map_from_log_and_net(log, net, im, fm, parameters=parameters)
+        if enable_diagnostics:
+            logger.info(str(time()) + " ended the replay operation.")
+
+    capacities = {p: resources_per_places[p] if p in resources_per_places else default_num_resources_per_places for p
+                  in net.places}
+    simulation = DiscreteEventSimulation(net, im, fm, smap, capacities, RandomSource(seed))
+
+    # the start timestamp is set to 1000000 instead of 0 to avoid problems with 32 bit machines
+    start_time = 1000000
+    cases = simulation.run([start_time + i * case_arrival_ratio for i in range(no_simulations)])
+    cases = [case for case in cases if case.finished]
+
+    if enable_diagnostics:
+        logger.info(str(time()) + " ended the Monte carlo simulation (" + str(
+            len(simulation.aborted)) + " deadlocked cases aborted).")
+
+    # the timestamps are numeric during the simulation, and are converted only when the log is built
+    fromtimestamp = datetime.datetime.fromtimestamp
+    log = EventLog([Trace([Event({xes_constants.DEFAULT_NAME_KEY: label,
+                                  xes_constants.DEFAULT_TIMESTAMP_KEY: fromtimestamp(timestamp)})
+                           for label, timestamp in case.events]) for case in cases])
+    cases_ex_time = [case.events[-1][1] - case.events[0][1] if case.events else 0 for case in cases]
+    timestamps = [timestamp for case in cases for label, timestamp in case.events]
+
+    places_interval_trees = IntervalTrees({p: simulation.places_intervals[i] for i, p in
+                                           enumerate(simulation.cnet.place_list)})
+    transitions_interval_trees = IntervalTrees({t.name: simulation.transitions_intervals[i]
+                                                for i, t in enumerate(simulation.cnet.transition_list)})
+
+    return log, {Outputs.OUTPUT_PLACES_INTERVAL_TREES.value: places_interval_trees,
+                 Outputs.OUTPUT_TRANSITIONS_INTERVAL_TREES.value: transitions_interval_trees,
+                 Outputs.OUTPUT_CASES_EX_TIME.value: cases_ex_time,
+                 Outputs.OUTPUT_MEDIAN_CASES_EX_TIME.value: median(cases_ex_time) if cases_ex_time else 0,
+                 Outputs.OUTPUT_CASE_ARRIVAL_RATIO.value: case_arrival_ratio,
+                 Outputs.OUTPUT_TOTAL_CASES_TIME.value: max(timestamps) - min(timestamps) if timestamps else 0}
@@ -3,7 +3,7 @@ from copy import copy
 from random import choice
 
 from pm4py.objects.log import log as log_instance
-from pm4py.objects.petri import semantics
+from pm4py.objects.petri import semantics, compiled_net
 from pm4py.util import exec_utils
 from pm4py.util import xes_constants
 from enum import Enum
@@ -16,12 +16,13 @@ class Parameters(Enum):
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
     NO_TRACES = "noTraces"
     MAX_TRACE_LENGTH = "maxTraceLength"
+    USE_COMPILED_NET = "use_compiled_net"
 
 
 def apply_playout(net, initial_marking, no_traces=100, max_trace_length=100,
                   case_id_key=xes_constants.DEFAULT_TRACEID_KEY,
                   activity_key=xes_constants.DEFAULT_NAME_KEY, timestamp_key=xes_constants.DEFAULT_TIMESTAMP_KEY,
-                  final_marking=None):
+                  final_marking=None, use_compiled_net=False):
     """
     Do the playout of a Petrinet generating a log_skeleton
 
@@ -43,7 +44,14 @@ def apply_playout(net, initial_marking, no_traces=100, max_trace_length=100,
         Event attribute that corresponds to the timestamp
     final_marking
         If provided, the final marking of the Petri net
+    use_compiled_net
+        If True, the playout is done on the integer-indexed compiled representation of the Petri net
     """
+    if use_compiled_net:
+        return __apply_playout_compiled(net, initial_marking, no_traces=no_traces, max_trace_length=max_trace_length,
+                                        case_id_key=case_id_key, activity_key=activity_key,
+                                        timestamp_key=timestamp_key, final_marking=final_marking)
+
     # assigns to each event an increased timestamp from 1970
     curr_timestamp = 10000000
     log = log_instance.EventLog()
@@ -73,6 +81,48 @@ def apply_playout(net, initial_marking, no_traces=100, max_trace_length=100,
     return log
 
 
+def __apply_playout_compiled(net, initial_marking, no_traces=100, max_trace_length=100,
+                             case_id_key=xes_constants.DEFAULT_TRACEID_KEY,
+                             activity_key=xes_constants.DEFAULT_NAME_KEY,
+                             timestamp_key=xes_constants.DEFAULT_TIMESTAMP_KEY, final_marking=None):
+    """
+    Do the playout of a Petri net on its compiled representation
+    (same semantics and parameters as apply_playout)
+    """
+    cnet = compiled_net.construct(net)
+    transitions = cnet.transition_list
+    im = cnet.encode_marking(initial_marking)
+    fm = cnet.encode_marking(final_marking) if final_marking is not None else None
+
+    # assigns to each event an increased timestamp from 1970
+    curr_timestamp = 10000000
+    log = log_instance.EventLog()
+    for i in range(no_traces):
+        trace = log_instance.Trace()
+        trace.attributes[case_id_key] = str(i)
+        marking = im
+        while len(trace) < max_trace_length:
+            all_enabled_trans = cnet.enabled_transitions(marking)
+            if not all_enabled_trans:  # supports nets with possible deadlocks
+                break
+            if fm is not None and marking == fm:
+                trans = choice(all_enabled_trans + [None])
+            else:
+                trans = choice(all_enabled_trans)
+            if trans is None:
+                break
+            if transitions[trans].label is not None:
+                event = log_instance.Event()
+                event[activity_key] = transitions[trans].label
+                event[timestamp_key] = datetime.datetime.fromtimestamp(curr_timestamp)
+                trace.append(event)
+                # increases by 1 second
+                curr_timestamp += 1
+            marking = cnet.execute(trans, marking)
+        log.append(trace)
+    return log
+
+
 def apply(net, initial_marking, final_marking=None, parameters=None):
     """
     Do the playout of a Petrinet generating a log_skeleton
@@ -89,6 +139,7 @@ def apply(net, initial_marking, final_marking=None, parameters=None):
         Parameters of the algorithm:
             Parameters.NO_TRACES -> Number of traces of the log_skeleton to generate
             Parameters.MAX_TRACE_LENGTH -> Maximum trace length
+            Parameters.USE_COMPILED_NET -> Do the playout on the compiled (integer-indexed) representation of the net
     """
     if parameters is None:
         parameters = {}
@@ -98,7 +149,8 @@ def apply(net, initial_marking, final_marking=None, parameters=None):
                                                xes_constants.DEFAULT_TIMESTAMP_KEY)
     no_traces = exec_utils.get_param_value(Parameters.NO_TRACES, parameters, 1000)
     max_trace_length = exec_utils.get_param_value(Parameters.MAX_TRACE_LENGTH, parameters, 1000)
+    use_compiled_net = exec_utils.get_param_value(Parameters.USE_COMPILED_NET, parameters, False)
 
     return apply_playout(net, initial_marking, max_trace_length=max_trace_length, no_traces=no_traces,
                          case_id_key=case_id_key, activity_key=activity_key, timestamp_key=timestamp_key,
-                         final_marking=final_marking)
+                         final_marking=final_marking, use_compiled_net=use_compiled_net)
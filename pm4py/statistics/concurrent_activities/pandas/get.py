@@ -1,6 +1,6 @@
 from enum import Enum
 
-from pm4py.objects.dfg.retrieval.pandas import get_concurrent_events_dataframe
+from pm4py.objects.dfg.retrieval.pandas import get_concurrent_events_counts, DEFAULT_CHUNK_SIZE
 from pm4py.util import exec_utils, constants, xes_constants
 
 
@@ -9,6 +9,8 @@ class Parameters(Enum):
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
     TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
     START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
+    WINDOW = "window"
+    CHUNK_SIZE = "chunk_size"
 
 
 def apply(dataframe, parameters=None):
@@ -25,6 +27,8 @@ def apply(dataframe, parameters=None):
         - Parameters.CASE_ID_KEY => case id
         - Parameters.START_TIMESTAMP_KEY => start timestamp
         - Parameters.TIMESTAMP_KEY => complete timestamp
+        - Parameters.WINDOW => (if specified) maximum distance between the events of the same case
+        - Parameters.CHUNK_SIZE => number of couples of events that are computed in a single chunk
 
     Returns
     --------------
@@ -40,16 +44,12 @@ def apply(dataframe, parameters=None):
     timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters,
                                                xes_constants.DEFAULT_TIMESTAMP_KEY)
     start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters, None)
+    window = exec_utils.get_param_value(Parameters.WINDOW, parameters, None)
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, DEFAULT_CHUNK_SIZE)
 
-    concurrent_dataframe = get_concurrent_events_dataframe(dataframe, start_timestamp_key=start_timestamp_key,
-                                                           timestamp_key=timestamp_key, case_id_glue=case_id_glue,
-                                                           activity_key=activity_key)
-
-    ret_dict = concurrent_dataframe.groupby([activity_key, activity_key + '_2']).size().to_dict()
-
-    # assure to avoid problems with np.float64, by using the Python float type
-    for el in ret_dict:
-        ret_dict[el] = int(ret_dict[el])
+    ret_dict = get_concurrent_events_counts(dataframe, start_timestamp_key=start_timestamp_key,
+                                            timestamp_key=timestamp_key, case_id_glue=case_id_glue,
+                                            activity_key=activity_key, window=window, chunk_size=chunk_size)
 
     return ret_dict
 
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from pm4py.objects.dfg.retrieval.pandas import get_partial_order_dataframe
+from pm4py.objects.dfg.retrieval.pandas import get_partial_order_counts, DEFAULT_CHUNK_SIZE
 from pm4py.util import exec_utils, constants, xes_constants
 
 
@@ -10,6 +10,8 @@ class Parameters(Enum):
     TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
     START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
     KEEP_FIRST_FOLLOWING = "keep_first_following"
+    WINDOW = "window"
+    CHUNK_SIZE = "chunk_size"
 
 
 def apply(dataframe, parameters=None):
@@ -25,16 +27,12 @@ def apply(dataframe, parameters=None):
                                                xes_constants.DEFAULT_TIMESTAMP_KEY)
     start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters, None)
     keep_first_following = exec_utils.get_param_value(Parameters.KEEP_FIRST_FOLLOWING, parameters, False)
+    window = exec_utils.get_param_value(Parameters.WINDOW, parameters, None)
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, DEFAULT_CHUNK_SIZE)
 
-    partial_order_dataframe = get_partial_order_dataframe(dataframe, start_timestamp_key=start_timestamp_key,
-                                                          timestamp_key=timestamp_key, case_id_glue=case_id_glue,
-                                                          activity_key=activity_key,
-                                                          keep_first_following=keep_first_following)
-
-    ret_dict = partial_order_dataframe.groupby([activity_key, activity_key + '_2']).size().to_dict()
-
-    # assure to avoid problems with np.float64, by using the Python float type
-    for el in ret_dict:
-        ret_dict[el] = int(ret_dict[el])
+    ret_dict = get_partial_order_counts(dataframe, start_timestamp_key=start_timestamp_key,
+                                        timestamp_key=timestamp_key, case_id_glue=case_id_glue,
+                                        activity_key=activity_key, keep_first_following=keep_first_following,
+                                        window=window, chunk_size=chunk_size)
 
     return ret_dict
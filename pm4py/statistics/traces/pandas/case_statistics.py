@@ -3,7 +3,9 @@ from pm4py.util.xes_constants import DEFAULT_TIMESTAMP_KEY
 from pm4py.statistics.traces.common import case_duration as case_duration_commons
 from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.util import exec_utils, constants, pandas_utils
+from pm4py.objects.log.util import variants_util
 from enum import Enum
+import numpy as np
 import pandas as pd
 
 
@@ -176,9 +178,12 @@ def get_variants_df(df, parameters=None):
     case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes.DEFAULT_NAME_KEY)
 
-    new_df = df.groupby(case_id_glue)[activity_key].agg(lambda col: ",".join(pd.Series.to_list(col))).to_frame()
-    new_cols = list(new_df.columns)
-    new_df = new_df.rename(columns={new_cols[0]: "variant"})
+    encoded_variants = variants_util.from_dataframe(df, parameters={
+        variants_util.Parameters.CASE_ID_KEY: case_id_glue, variants_util.Parameters.ACTIVITY_KEY: activity_key})
+    # the string representation is computed once per variant
+    variants_str = np.array([encoded_variants.to_string(i) for i in range(len(encoded_variants))], dtype=object)
+    new_df = pd.DataFrame({"variant": variants_str[encoded_variants.case_variants]},
+                          index=pd.Index(encoded_variants.case_ids, name=case_id_glue))
 
     return new_df
 
@@ -211,9 +216,7 @@ def get_variants_df_with_case_duration(df, parameters=None):
 
     grouped_df = df[[case_id_glue, timestamp_key, activity_key]].groupby(df[case_id_glue])
 
-    df1 = grouped_df[activity_key].agg(lambda col: ",".join(pd.Series.to_list(col))).to_frame()
-    new_cols = list(df1.columns)
-    df1 = df1.rename(columns={new_cols[0]: "variant"})
+    df1 = get_variants_df(df, parameters=parameters)
 
     first_eve_df = grouped_df.first()
     last_eve_df = grouped_df.last()
@@ -1,7 +1,8 @@
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY
 from pm4py.statistics.parameters import Parameters
-from pm4py.util import exec_utils
+from pm4py.util import exec_utils, instrumentation
 from pm4py.util.constants import DEFAULT_VARIANT_SEP
+from pm4py.objects.log.columnar import ColumnarEventLog
 
 import numpy as np
 
@@ -97,6 +98,7 @@ def get_variants_along_with_case_durations(log, parameters=None):
     return all_var, all_durations
 
 
+@instrumentation.phased("variants")
 def get_variants_from_log_trace_idx(log, parameters=None):
     """
     Gets a dictionary whose key is the variant and as value there
@@ -120,6 +122,10 @@ def get_variants_from_log_trace_idx(log, parameters=None):
 
     attribute_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
 
+    if isinstance(log, ColumnarEventLog) and log.has_categorical_attribute(attribute_key):
+        # the variants are computed directly on the integer codes of the activities
+        return log.get_variants_trace_idx(activity_key=attribute_key)
+
     variants = {}
     for trace_idx, trace in enumerate(log):
         variant = DEFAULT_VARIANT_SEP.join([x[attribute_key] for x in trace if attribute_key in x])
@@ -113,7 +113,8 @@ class StreamingEventXesReader:
                 parent = tree[elem.getparent()] if elem.getparent() in tree else None
 
                 if elem.tag.endswith(xes_constants.TAG_EVENT):
-                    self.event = Event()
+                    # the attributes are collected in a dictionary, and the (compact) event is built at the end
+                    self.event = {}
                     tree[elem] = self.event
                     self.reading_event = True
                     continue
@@ -189,6 +190,7 @@ class StreamingEventXesReader:
 
                 if elem.tag.endswith(xes_constants.TAG_EVENT):
                     self.reading_event = False
+                    self.event = Event(self.event)
                     if self.acceptance_condition(self.event):
                         return self.event
                     continue
@@ -137,7 +137,8 @@ class StreamingTraceXesReader:
                         continue
 
                     elif elem.tag.endswith(xes_constants.TAG_EVENT):
-                        self.event = Event()
+                        # the attributes are collected in a dictionary, and the (compact) event is built at the end
+                        self.event = {}
                         tree[elem] = self.event
                         continue
 
@@ -195,7 +196,7 @@ class StreamingTraceXesReader:
 
                 if elem.tag.endswith(xes_constants.TAG_EVENT):
                     if self.trace is not None:
-                        self.trace.append(self.event)
+                        self.trace.append(Event(self.event))
                         self.event = None
                     continue
 
@@ -0,0 +1,179 @@
+import functools
+import threading
+import time
+
+_LOCAL = threading.local()
+
+
+class Profiler(object):
+    """
+    Collects the timings of the phases and the counters recorded (in the current thread)
+    while the profiler is active.
+
+    The data is recorded only inside a `with` block. Profilers can be nested: all the active profilers
+    receive the data. When the block is left, the callback (if provided) is called with the report.
+    The work performed in other processes (e.g., when the CORES parameter of the alignments/token-based replay
+    is set) is not recorded.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.timings = {}
+        self.counters = {}
+
+    def __enter__(self):
+        if not hasattr(_LOCAL, "profilers"):
+            _LOCAL.profilers = []
+        _LOCAL.profilers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _LOCAL.profilers.remove(self)
+        if self.callback is not None:
+            self.callback(self.get_report())
+        return False
+
+    def add_timing(self, name, duration):
+        if name in self.timings:
+            timing = self.timings[name]
+            timing[0] += 1
+            timing[1] += duration
+            timing[2] = min(timing[2], duration)
+            timing[3] = max(timing[3], duration)
+        else:
+            self.timings[name] = [1, duration, duration, duration]
+
+    def increment(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def get_report(self):
+        """
+        Gets the report of the profiler
+
+        Returns
+        -------------
+        report
+            Dictionary containing:
+            - timings: for each phase, the number of executions and the total/minimum/maximum time (in seconds)
+            - counters: the value of each counter
+        """
+        return {"timings": {name: {"count": t[0], "total": t[1], "min": t[2], "max": t[3]} for name, t in
+                            self.timings.items()},
+                "counters": dict(self.counters)}
+
+
+class _Phase(object):
+    __slots__ = ("name", "profilers", "start")
+
+    def __init__(self, name, profilers):
+        self.name = name
+        self.profilers = profilers
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = time.perf_counter() - self.start
+        for profiler in self.profilers:
+            profiler.add_timing(self.name, duration)
+        return False
+
+
+class _NullPhase(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def is_enabled():
+    """
+    Checks if at least one profiler is active in the current thread
+    """
+    return bool(getattr(_LOCAL, "profilers", None))
+
+
+def phase(name):
+    """
+    Gets a context manager that records the time spent in the given phase
+    (a shared no-op context manager is returned when no profiler is active)
+
+    Parameters
+    -------------
+    name
+        Name of the phase
+    """
+    profilers = getattr(_LOCAL, "profilers", None)
+    if not profilers:
+        return _NULL_PHASE
+    return _Phase(name, tuple(profilers))
+
+
+def phased(name):
+    """
+    Gets a decorator that records the time spent in the decorated function as the given phase
+    (the function is called directly when no profiler is active)
+
+    Parameters
+    -------------
+    name
+        Name of the phase
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profilers = getattr(_LOCAL, "profilers", None)
+            if not profilers:
+                return function(*args, **kwargs)
+            with _Phase(name, tuple(profilers)):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def increment(name, value=1):
+    """
+    Increments the given counter in the active profilers
+
+    Parameters
+    -------------
+    name
+        Name of the counter
+    value
+        Increment
+    """
+    profilers = getattr(_LOCAL, "profilers", None)
+    if profilers:
+        for profiler in profilers:
+            profiler.increment(name, value)
+
+
+def profile(callback=None):
+    """
+    Gets a profiler, to be used as context manager, recording the timings of the phases
+    (e.g. variants, discovery.inductive, alignments.sync_product, alignments.lp_solve) and the counters
+    (e.g. alignments.visited_states, alignments.queued_states) of the algorithms executed inside the block
+
+    Example:
+        with instrumentation.profile() as profiler:
+            aligned_traces = alignments.apply(log, net, im, fm)
+        report = profiler.get_report()
+
+    Parameters
+    -------------
+    callback
+        (if provided) function that is called with the report when the block is left
+
+    Returns
+    -------------
+    profiler
+        Profiler
+    """
+    return Profiler(callback=callback)
@@ -9,6 +9,7 @@ PULP = "pulp"
 CVXOPT_SOLVER_CUSTOM_ALIGN = "cvxopt_solver_custom_align"
 CVXOPT_SOLVER_CUSTOM_ALIGN_ILP = "cvxopt_solver_custom_align_ilp"
 ORTOOLS_SOLVER = "ortools_solver"
+HIGHS = "highs"
 
 # max allowed heuristics value (27/10/2019, due to the numerical instability of some of our solvers)
 MAX_ALLOWED_HEURISTICS = 10**15
@@ -16,6 +17,7 @@ MAX_ALLOWED_HEURISTICS = 10**15
 VERSIONS_APPLY = {}
 VERSIONS_GET_PRIM_OBJ = {}
 VERSIONS_GET_POINTS_FROM_SOL = {}
+VERSIONS_PERSISTENT_MODEL = {}
 DEFAULT_LP_SOLVER_VARIANT = None
 
 if pkgutil.find_loader("pulp"):
@@ -28,6 +30,18 @@ if pkgutil.find_loader("pulp"):
 
     DEFAULT_LP_SOLVER_VARIANT = PULP
 
+if pkgutil.find_loader("scipy"):
+    # the HiGHS solver is shipped with SciPy
+    from pm4py.util.lp.variants import highs_solver
+
+    VERSIONS_APPLY[HIGHS] = highs_solver.apply
+    VERSIONS_GET_PRIM_OBJ[HIGHS] = highs_solver.get_prim_obj_from_sol
+    VERSIONS_GET_POINTS_FROM_SOL[HIGHS] = highs_solver.get_points_from_sol
+
+    if pkgutil.find_loader("highspy"):
+        # the persistent (warm-started) models require the Python interface of HiGHS
+        VERSIONS_PERSISTENT_MODEL[HIGHS] = highs_solver.PersistentModel
+
 if pkgutil.find_loader("ortools"):
     # in the case ortools is installed, it works
     from pm4py.util.lp.variants import ortools_solver
@@ -48,17 +62,17 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None, variant=DEFAULT_LP_SOLVER_VARI
     c
         c parameter of the algorithm
     Aub
-        A_ub parameter of the algorithm
+        A_ub parameter of the algorithm (dense or scipy.sparse matrix)
     bub
         b_ub parameter of the algorithm
     Aeq
-        A_eq parameter of the algorithm
+        A_eq parameter of the algorithm (dense or scipy.sparse matrix)
     beq
         b_eq parameter of the algorithm
     parameters
         Possible parameters of the algorithm
     variant
-        Variant of the algorithm, possible values: pulp, ortools
+        Variant of the algorithm, possible values: pulp, ortools, highs
 
     Returns
     -------------
@@ -68,6 +82,39 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None, variant=DEFAULT_LP_SOLVER_VARI
     return VERSIONS_APPLY[variant](c, Aub, bub, Aeq, beq, parameters=parameters)
 
 
+def get_persistent_model(c, Aub, bub, Aeq, beq, parameters=None, variant=DEFAULT_LP_SOLVER_VARIANT):
+    """
+    Gets a model of the problem that is kept in memory by the solver, so that problems differing only in the
+    objective and/or the right-hand sides are solved through model.solve(c=..., bub=..., beq=...)
+    (returning a solution that is read by get_prim_obj_from_sol and get_points_from_sol)
+
+    Parameters
+    ------------
+    c
+        c parameter of the algorithm
+    Aub
+        A_ub parameter of the algorithm (dense or scipy.sparse matrix)
+    bub
+        b_ub parameter of the algorithm
+    Aeq
+        A_eq parameter of the algorithm (dense or scipy.sparse matrix)
+    beq
+        b_eq parameter of the algorithm
+    parameters
+        Possible parameters of the algorithm
+    variant
+        Variant of the algorithm, possible values: highs
+
+    Returns
+    -------------
+    model
+        Persistent model (None if the variant does not support persistent models)
+    """
+    if variant not in VERSIONS_PERSISTENT_MODEL:
+        return None
+    return VERSIONS_PERSISTENT_MODEL[variant](c, Aub, bub, Aeq, beq, parameters=parameters)
+
+
 def get_prim_obj_from_sol(sol, parameters=None, variant=DEFAULT_LP_SOLVER_VARIANT):
     """
     Gets the primal objective from the solution of the LP problem
@@ -79,7 +126,7 @@ def get_prim_obj_from_sol(sol, parameters=None, variant=DEFAULT_LP_SOLVER_VARIAN
     parameters
         Possible parameters of the algorithm
     variant
-        Variant of the algorithm, possible values: pulp, ortools
+        Variant of the algorithm, possible values: pulp, ortools, highs
 
     Returns
     -------------
@@ -100,7 +147,7 @@ def get_points_from_sol(sol, parameters=None, variant=DEFAULT_LP_SOLVER_VARIANT)
     parameters
         Possible parameters of the algorithm
     variant
-        Variant of the algorithm, possible values: pulp, ortools
+        Variant of the algorithm, possible values: pulp, ortools, highs
 
     Returns
     -------------
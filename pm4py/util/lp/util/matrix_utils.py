@@ -0,0 +1,79 @@
+import numpy as np
+from scipy import sparse
+
+
+def to_vector(v, length=0):
+    """
+    Transforms a vector of the LP problem (list, column matrix, array, possibly None) into a flat NumPy array
+
+    Parameters
+    -------------
+    v
+        Vector
+    length
+        Length of the (zero) vector returned if v is None
+
+    Returns
+    -------------
+    vector
+        Flat NumPy array of floats
+    """
+    if v is None:
+        return np.zeros(length)
+    if type(v) is list and len(v) == 1:
+        v = v[0]
+    return np.asarray(v, dtype=np.float64).ravel()
+
+
+def to_csr(A, no_cols, threshold=0.0):
+    """
+    Transforms a matrix of the LP problem (dense, or scipy.sparse in any format, possibly None)
+    into a CSR matrix, dropping the entries that are not greater than the threshold in absolute value
+
+    Parameters
+    -------------
+    A
+        Matrix
+    no_cols
+        Number of columns of the (empty) matrix returned if A is None
+    threshold
+        Threshold
+
+    Returns
+    -------------
+    csr_matrix
+        CSR matrix of floats (with sorted indices and no duplicate entries)
+    """
+    if A is None:
+        return sparse.csr_matrix((0, no_cols))
+    if sparse.issparse(A):
+        A = sparse.csr_matrix(A, dtype=np.float64, copy=True)
+        A.sum_duplicates()
+    else:
+        A = sparse.csr_matrix(np.asarray(A, dtype=np.float64))
+    A.data[np.abs(A.data) <= threshold] = 0.0
+    A.eliminate_zeros()
+    A.sort_indices()
+    return A
+
+
+def get_rows(A):
+    """
+    Iterates over the rows of a CSR matrix, returning for each row the indices of the columns
+    and the values of its non-zero entries
+
+    Parameters
+    -------------
+    A
+        CSR matrix
+
+    Returns
+    -------------
+    rows
+        Generator of (row index, column indices, values)
+    """
+    indptr = A.indptr
+    indices = A.indices.tolist()
+    data = A.data.tolist()
+    for i in range(A.shape[0]):
+        yield i, indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]]
@@ -5,3 +5,6 @@ if pkgutil.find_loader("pulp"):
 
 if pkgutil.find_loader("ortools"):
     from pm4py.util.lp.variants import ortools_solver
+
+if pkgutil.find_loader("scipy"):
+    from pm4py.util.lp.variants import highs_solver
@@ -0,0 +1,228 @@
+import sys
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog, OptimizeResult
+
+from pm4py.util.lp.parameters import Parameters
+from pm4py.util.lp.util import matrix_utils
+from pm4py.util import exec_utils
+
+try:
+    # the Python interface of HiGHS (optional, required only by the persistent models)
+    from highspy import Highs, HighsLp, HighsModelStatus, MatrixFormat
+except ImportError:
+    Highs = None
+
+# status of the solutions (as in scipy.optimize.linprog)
+STATUS_OPTIMAL = 0
+STATUS_INFEASIBLE = 2
+
+
+class PersistentModel(object):
+    """
+    LP problem (min c x s.t. Aub x <= bub, Aeq x = beq) kept in memory by the HiGHS solver.
+
+    The model is built once (from the sparse constraint matrices); the following calls of solve change only
+    the objective and/or the right-hand sides, and the simplex method restarts from the basis of the previous
+    solution. Requires the Python interface of HiGHS (the highspy package).
+    """
+
+    def __init__(self, c, Aub, bub, Aeq, beq, parameters=None):
+        """
+        Builds the model
+
+        Parameters
+        ------------
+        c
+            c parameter of the algorithm
+        Aub
+            A_ub parameter of the algorithm (dense or sparse)
+        bub
+            b_ub parameter of the algorithm
+        Aeq
+            A_eq parameter of the algorithm (dense or sparse)
+        beq
+            b_eq parameter of the algorithm
+        parameters
+            Possible parameters of the algorithm
+        """
+        if Highs is None:
+            raise Exception("the persistent HiGHS model requires the highspy package (pip install highspy)")
+        if parameters is None:
+            parameters = {}
+
+        self.require_ilp = exec_utils.get_param_value(Parameters.REQUIRE_ILP, parameters, False)
+        self.c = matrix_utils.to_vector(c)
+        no_cols = len(self.c)
+        self.Aub = matrix_utils.to_csr(Aub, no_cols)
+        self.Aeq = matrix_utils.to_csr(Aeq, no_cols)
+        self.bub = matrix_utils.to_vector(bub, self.Aub.shape[0])
+        self.beq = matrix_utils.to_vector(beq, self.Aeq.shape[0])
+
+        matrix = sparse.vstack([self.Aub, self.Aeq]).tocsc()
+        lp = HighsLp()
+        lp.num_col_ = no_cols
+        lp.num_row_ = matrix.shape[0]
+        lp.col_cost_ = self.c
+        lp.col_lower_ = np.zeros(no_cols) if self.require_ilp else np.full(no_cols, -np.inf)
+        lp.col_upper_ = np.ones(no_cols) if self.require_ilp else np.full(no_cols, np.inf)
+        lp.row_lower_ = np.concatenate((np.full(len(self.bub), -np.inf), self.beq))
+        lp.row_upper_ = np.concatenate((self.bub, self.beq))
+        lp.a_matrix_.format_ = MatrixFormat.kColwise
+        lp.a_matrix_.start_ = matrix.indptr.astype(np.int32)
+        lp.a_matrix_.index_ = matrix.indices.astype(np.int32)
+        lp.a_matrix_.value_ = matrix.data
+        self.highs = Highs()
+        self.highs.setOptionValue("output_flag", False)
+        # the presolve would discard the basis of the previous solution
+        self.highs.setOptionValue("presolve", "off")
+        self.highs.passModel(lp)
+        if self.require_ilp:
+            self.highs.changeColsIntegrality(no_cols, np.arange(no_cols, dtype=np.int32),
+                                             np.ones(no_cols, dtype=np.uint8))
+
+    def solve(self, c=None, bub=None, beq=None):
+        """
+        Solves the problem, after changing (if provided) the objective and the right-hand sides
+
+        Parameters
+        ------------
+        c
+            New c parameter of the algorithm
+        bub
+            New b_ub parameter of the algorithm
+        beq
+            New b_eq parameter of the algorithm
+
+        Returns
+        -------------
+        sol
+            Solution of the LP problem
+        """
+        no_ub = len(self.bub)
+        if c is not None:
+            c = matrix_utils.to_vector(c, len(self.c))
+            for j in np.flatnonzero(c != self.c):
+                self.highs.changeColCost(int(j), float(c[j]))
+            self.c = c
+        if bub is not None:
+            bub = matrix_utils.to_vector(bub, no_ub)
+            for i in np.flatnonzero(bub != self.bub):
+                self.highs.changeRowBounds(int(i), -np.inf, float(bub[i]))
+            self.bub = bub
+        if beq is not None:
+            beq = matrix_utils.to_vector(beq, len(self.beq))
+            for i in np.flatnonzero(beq != self.beq):
+                self.highs.changeRowBounds(no_ub + int(i), float(beq[i]), float(beq[i]))
+            self.beq = beq
+
+        self.highs.run()
+        if self.highs.getModelStatus() != HighsModelStatus.kOptimal:
+            return OptimizeResult(status=STATUS_INFEASIBLE, fun=None, x=None)
+        return OptimizeResult(status=STATUS_OPTIMAL, fun=self.highs.getInfo().objective_function_value,
+                              x=np.array(self.highs.getSolution().col_value))
+
+
+def _linprog(c, Aub, bub, Aeq, beq, require_ilp):
+    """
+    Solves the problem from scratch through scipy.optimize.linprog
+    """
+    return linprog(c, A_ub=Aub if Aub.shape[0] > 0 else None, b_ub=bub if Aub.shape[0] > 0 else None,
+                   A_eq=Aeq if Aeq.shape[0] > 0 else None, b_eq=beq if Aeq.shape[0] > 0 else None,
+                   bounds=(0, 1) if require_ilp else (None, None), method="highs",
+                   integrality=np.ones(len(c)) if require_ilp else None)
+
+
+def apply(c, Aub, bub, Aeq, beq, parameters=None):
+    """
+    Gets the overall solution of the problem
+
+    Parameters
+    ------------
+    c
+        c parameter of the algorithm
+    Aub
+        A_ub parameter of the algorithm (dense or scipy.sparse matrix)
+    bub
+        b_ub parameter of the algorithm
+    Aeq
+        A_eq parameter of the algorithm (dense or scipy.sparse matrix)
+    beq
+        b_eq parameter of the algorithm
+    parameters
+        Possible parameters of the algorithm
+
+    Returns
+    -------------
+    sol
+        Solution of the LP problem by the given algorithm
+    """
+    if parameters is None:
+        parameters = {}
+
+    require_ilp = exec_utils.get_param_value(Parameters.REQUIRE_ILP, parameters, False)
+
+    c = matrix_utils.to_vector(c)
+    Aub = matrix_utils.to_csr(Aub, len(c))
+    Aeq = matrix_utils.to_csr(Aeq, len(c))
+    bub = matrix_utils.to_vector(bub, Aub.shape[0])
+    beq = matrix_utils.to_vector(beq, Aeq.shape[0])
+
+    return _linprog(c, Aub, bub, Aeq, beq, require_ilp)
+
+
+def get_prim_obj_from_sol(sol, parameters=None):
+    """
+    Gets the primal objective from the solution of the LP problem
+
+    Parameters
+    -------------
+    sol
+        Solution of the ILP problem by the given algorithm
+    parameters
+        Possible parameters of the algorithm
+
+    Returns
+    -------------
+    prim_obj
+        Primal objective
+    """
+    if parameters is None:
+        parameters = {}
+
+    if sol.status == STATUS_OPTIMAL:
+        return sol.fun
+    return None
+
+
+def get_points_from_sol(sol, parameters=None):
+    """
+    Gets the points from the solution
+
+    Parameters
+    -------------
+    sol
+        Solution of the LP problem by the given algorithm
+    parameters
+        Possible parameters of the algorithm
+
+    Returns
+    -------------
+    points
+        Point of the solution
+    """
+    if parameters is None:
+        parameters = {}
+
+    maximize = parameters["maximize"] if "maximize" in parameters else False
+    return_when_none = parameters["return_when_none"] if "return_when_none" in parameters else False
+    var_corr = parameters["var_corr"] if "var_corr" in parameters else {}
+
+    if sol.status == STATUS_OPTIMAL:
+        return [float(x) for x in sol.x]
+    else:
+        if return_when_none:
+            if maximize:
+                return [sys.float_info.max] * len(list(var_corr.keys()))
+            return [sys.float_info.min] * len(list(var_corr.keys()))
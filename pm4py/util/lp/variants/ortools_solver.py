@@ -1,9 +1,8 @@
 import sys
-import tempfile
-import numpy as np
 
 from ortools.linear_solver import pywraplp
 from pm4py.util.lp.parameters import Parameters
+from pm4py.util.lp.util import matrix_utils
 from pm4py.util import exec_utils
 
 
@@ -19,11 +18,11 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None):
     c
         c parameter of the algorithm
     Aub
-        A_ub parameter of the algorithm
+        A_ub parameter of the algorithm (dense or scipy.sparse matrix)
     bub
         b_ub parameter of the algorithm
     Aeq
-        A_eq parameter of the algorithm
+        A_eq parameter of the algorithm (dense or scipy.sparse matrix)
     beq
         b_eq parameter of the algorithm
     parameters
@@ -39,13 +38,13 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None):
 
     require_ilp = exec_utils.get_param_value(Parameters.REQUIRE_ILP, parameters, False)
 
-    Aub = np.asmatrix(Aub)
-    if type(bub) is list and len(bub) == 1:
-        bub = bub[0]
-    if Aeq is not None:
-        Aeq = np.asmatrix(Aeq)
-    if beq is not None and type(beq) is list and len(beq) == 1:
-        beq = beq[0]
+    c = matrix_utils.to_vector(c)
+    # the constraints are built from the non-zero entries of the (sparse) matrices
+    Aub = matrix_utils.to_csr(Aub, len(c), threshold=MIN_THRESHOLD)
+    bub = matrix_utils.to_vector(bub, Aub.shape[0])
+    if Aeq is not None and beq is not None:
+        Aeq = matrix_utils.to_csr(Aeq, Aub.shape[1], threshold=MIN_THRESHOLD)
+        beq = matrix_utils.to_vector(beq, Aeq.shape[0])
 
     solver = pywraplp.Solver('LinearProgrammingExample',
                              pywraplp.Solver.GLOP_LINEAR_PROGRAMMING)
@@ -65,30 +64,18 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None):
         if abs(c[j]) > MIN_THRESHOLD:
             objective.SetCoefficient(x_list[j], c[j])
 
-    for i in range(Aub.shape[0]):
-        ok = False
-        for j in range(Aub.shape[1]):
-            if abs(Aub[i, j]) > MIN_THRESHOLD:
-                ok = True
-                break
-        if ok:
-            constraint = solver.Constraint(-solver.infinity(), bub[i].reshape(-1, ).tolist()[0][0])
-            for j in range(Aub.shape[1]):
-                if abs(Aub[i, j]) > MIN_THRESHOLD:
-                    constraint.SetCoefficient(x_list[j], Aub[i, j])
+    for i, cols, values in matrix_utils.get_rows(Aub):
+        if cols:
+            constraint = solver.Constraint(-solver.infinity(), float(bub[i]))
+            for j, v in zip(cols, values):
+                constraint.SetCoefficient(x_list[j], v)
 
     if Aeq is not None and beq is not None:
-        for i in range(Aeq.shape[0]):
-            ok = False
-            for j in range(Aeq.shape[1]):
-                if abs(Aeq[i, j]) > MIN_THRESHOLD:
-                    ok = True
-                    break
-            if ok:
-                constraint = solver.Constraint(beq[i].reshape(-1,).tolist()[0][0], beq[i].reshape(-1,).tolist()[0][0])
-                for j in range(Aeq.shape[1]):
-                    if abs(Aeq[i, j]) > MIN_THRESHOLD:
-                        constraint.SetCoefficient(x_list[j], Aeq[i, j])
+        for i, cols, values in matrix_utils.get_rows(Aeq):
+            if cols:
+                constraint = solver.Constraint(float(beq[i]), float(beq[i]))
+                for j, v in zip(cols, values):
+                    constraint.SetCoefficient(x_list[j], v)
 
     objective.SetMinimization()
 
@@ -1,9 +1,9 @@
 import sys
-import tempfile
 import numpy as np
 
-from pulp import LpProblem, LpMinimize, LpVariable, LpStatus, value, PULP_CBC_CMD
+from pulp import LpProblem, LpMinimize, LpVariable, LpAffineExpression, LpStatus, value, PULP_CBC_CMD
 from pm4py.util.lp.parameters import Parameters
+from pm4py.util.lp.util import matrix_utils
 from pm4py.util import exec_utils
 
 MIN_THRESHOLD = 10 ** -12
@@ -40,11 +40,11 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None):
     c
         c parameter of the algorithm
     Aub
-        A_ub parameter of the algorithm
+        A_ub parameter of the algorithm (dense or scipy.sparse matrix)
     bub
         b_ub parameter of the algorithm
     Aeq
-        A_eq parameter of the algorithm
+        A_eq parameter of the algorithm (dense or scipy.sparse matrix)
     beq
         b_eq parameter of the algorithm
     parameters
@@ -60,13 +60,13 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None):
 
     require_ilp = exec_utils.get_param_value(Parameters.REQUIRE_ILP, parameters, False)
 
-    Aub = np.asmatrix(Aub)
-    if type(bub) is list and len(bub) == 1:
-        bub = bub[0]
-    if Aeq is not None:
-        Aeq = np.asmatrix(Aeq)
-    if beq is not None and type(beq) is list and len(beq) == 1:
-        beq = beq[0]
+    c = matrix_utils.to_vector(c)
+    # the constraints are built from the non-zero entries of the (sparse) matrices
+    Aub = matrix_utils.to_csr(Aub, len(c), threshold=MIN_THRESHOLD)
+    bub = matrix_utils.to_vector(bub, Aub.shape[0])
+    if Aeq is not None and beq is not None:
+        Aeq = matrix_utils.to_csr(Aeq, Aub.shape[1], threshold=MIN_THRESHOLD)
+        beq = matrix_utils.to_vector(beq, Aeq.shape[0])
 
     prob = LpProblem("", LpMinimize)
 
@@ -77,51 +77,20 @@ def apply(c, Aub, bub, Aeq, beq, parameters=None):
         else:
             x_list.append(LpVariable("x_" + get_terminal_part_name_num(i)))
 
-    eval_str = ""
-    expr_count = 0
-    for j in range(len(c)):
-        if abs(c[j]) > MIN_THRESHOLD:
-            if expr_count > 0:
-                eval_str = eval_str + " + "
-            eval_str = eval_str + str(c[j]) + "*x_list[" + str(j) + "]"
-            expr_count = expr_count + 1
-    eval_str = eval_str + ", \"objective\""
-    prob += eval(eval_str)
-
-    for i in range(Aub.shape[0]):
-        expr_count = 0
-        eval_str = 0
-        eval_str = ""
-        for j in range(Aub.shape[1]):
-            if abs(Aub[i, j]) > MIN_THRESHOLD:
-                if expr_count > 0:
-                    eval_str = eval_str + " + "
-                eval_str = eval_str + str(Aub[i, j]) + "*x_list[" + str(j) + "]"
-                expr_count = expr_count + 1
-        eval_str = eval_str + "<=" + str(
-            bub[i].reshape(-1, ).tolist()[0][0]) + ", \"vinc_" + get_terminal_part_name_num(i) + "\""
-
-        prob += eval(eval_str)
+    prob += LpAffineExpression([(x_list[j], float(c[j])) for j in np.flatnonzero(np.abs(c) > MIN_THRESHOLD)]), \
+            "objective"
+
+    for i, cols, values in matrix_utils.get_rows(Aub):
+        if cols:
+            prob += LpAffineExpression([(x_list[j], v) for j, v in zip(cols, values)]) <= float(bub[i]), \
+                    "vinc_" + get_terminal_part_name_num(i)
 
     if Aeq is not None and beq is not None:
-        for i in range(Aeq.shape[0]):
-            expr_count = 0
-            eval_str = 0
-            eval_str = ""
-            for j in range(Aeq.shape[1]):
-                if abs(Aeq[i, j]) > MIN_THRESHOLD:
-                    if expr_count > 0:
-                        eval_str = eval_str + " + "
-                    eval_str = eval_str + str(Aeq[i, j]) + "*x_list[" + str(j) + "]"
-                    expr_count = expr_count + 1
-            if eval_str:
-                eval_str = eval_str + "==" + str(beq[i].reshape(-1, ).tolist()[0][0]) + ", \"vinceq_" + get_terminal_part_name_num(
-                    i + 1 + Aub.shape[0]) + "\""
-
-                prob += eval(eval_str)
-
-    filename = tempfile.NamedTemporaryFile(suffix='.lp').name
-    prob.writeLP(filename)
+        for i, cols, values in matrix_utils.get_rows(Aeq):
+            if cols:
+                prob += LpAffineExpression([(x_list[j], v) for j, v in zip(cols, values)]) == float(beq[i]), \
+                        "vinceq_" + get_terminal_part_name_num(i + 1 + Aub.shape[0])
+
     PULP_CBC_CMD(msg=0).solve(prob)
 
     return prob
@@ -0,0 +1,69 @@
+import math
+
+# state of the worker process, set once by the initializer of the pool
+_WORKER_CONTEXT = {}
+
+
+def get_chunks(items, cores, chunk_size=None):
+    """
+    Splits a list of items in chunks
+
+    Parameters
+    -------------
+    items
+        List of items
+    cores
+        Number of worker processes
+    chunk_size
+        Number of items of a chunk (default: None; the items are split in 4 chunks per worker)
+
+    Returns
+    -------------
+    chunks
+        List of chunks (each one is a list of items)
+    """
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(items) / (4 * cores)))
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def apply(function, chunks, cores, context=None, initializer=None):
+    """
+    Applies a function to chunks of work in a pool of worker processes.
+
+    The context (data shared by all the chunks) is sent only once to each worker; if an initializer is provided,
+    it is called once in each worker on the context, and its result is used as context.
+    The function and the initializer must be defined at module level (to be sent to the workers).
+
+    Parameters
+    -------------
+    function
+        Function called in a worker as function(context, chunk)
+    chunks
+        List of chunks
+    cores
+        Number of worker processes
+    context
+        Data shared by all the chunks
+    initializer
+        (if provided) function called once in each worker as initializer(context)
+
+    Returns
+    -------------
+    results
+        List of the results of the function (in the same order as the chunks)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=cores, initializer=__init_worker,
+                             initargs=(context, initializer)) as executor:
+        futures = [executor.submit(__apply_chunk, function, chunk) for chunk in chunks]
+        return [future.result() for future in futures]
+
+
+def __init_worker(context, initializer):
+    _WORKER_CONTEXT["context"] = initializer(context) if initializer is not None else context
+
+
+def __apply_chunk(function, chunk):
+    return function(_WORKER_CONTEXT["context"], chunk)
@@ -1,5 +1,21 @@
+from enum import Enum
+
+import numpy as np
 import stringdist
 
+from pm4py.util import exec_utils, instrumentation, process_pool
+
+
+class Parameters(Enum):
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+
+
+# number of bits of a machine word (patterns up to this length are processed with NumPy)
+WORD_SIZE = 64
+# maximum number of (pattern, text) couples whose state is kept in memory at once
+BLOCK_SIZE = 1 << 20
+
 
 def levenshtein(stru1, stru2):
     """
@@ -18,3 +34,182 @@ def levenshtein(stru1, stru2):
         Levenshtein distance
     """
     return stringdist.levenshtein(stru1, stru2)
+
+
+def levenshtein_bit_parallel(seq1, seq2):
+    """
+    Measures the Levenshtein distance between two sequences (of any hashable symbol, e.g. the
+    activity codes of two variants) with the bit-parallel algorithm of Myers/Hyyro
+    (bit vectors of arbitrary length are represented by Python integers)
+
+    Parameters
+    ---------------
+    seq1
+        First sequence
+    seq2
+        Second sequence
+
+    Returns
+    ---------------
+    levens_dist
+        Levenshtein distance
+    """
+    m = len(seq1)
+    if m == 0:
+        return len(seq2)
+    peq = {}
+    for k, c in enumerate(seq1):
+        peq[c] = peq.get(c, 0) | (1 << k)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv = mask
+    mv = 0
+    score = m
+    for c in seq2:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def __bit_parallel_block(patterns, texts):
+    """
+    Computes the Levenshtein distances between the patterns (non-empty, at most WORD_SIZE symbols)
+    and the texts, running the bit-parallel algorithm on all the patterns and a block of texts at once
+    (one 64-bit word per couple)
+    """
+    ret = np.zeros((len(patterns), len(texts)), dtype=np.int64)
+    if len(patterns) == 0 or len(texts) == 0:
+        return ret
+
+    symbols = {}
+    masks = []
+    for p in patterns:
+        pattern_masks = {}
+        for k, c in enumerate(p):
+            if c not in symbols:
+                symbols[c] = len(symbols)
+            pattern_masks[symbols[c]] = pattern_masks.get(symbols[c], 0) | (1 << k)
+        masks.append(pattern_masks)
+    # the symbols of the texts that do not occur in the patterns have an empty equality mask
+    no_symbols = len(symbols)
+    peq = np.zeros((no_symbols + 1, len(patterns)), dtype=np.uint64)
+    for i, pattern_masks in enumerate(masks):
+        for c, mask in pattern_masks.items():
+            peq[c, i] = mask
+
+    one = np.uint64(1)
+    lengths = np.array([len(p) for p in patterns], dtype=np.int64)
+    last = one << (lengths.astype(np.uint64) - one)
+    text_lengths = np.array([len(t) for t in texts], dtype=np.int64)
+    codes = np.full((len(texts), max(1, int(text_lengths.max()))), no_symbols, dtype=np.int64)
+    for j, t in enumerate(texts):
+        codes[j, :len(t)] = [symbols.get(c, no_symbols) for c in t]
+
+    # the texts are processed in order of length, so that the texts of a block end at about the same step
+    order = np.argsort(text_lengths, kind="mergesort")
+    block = max(1, BLOCK_SIZE // len(patterns))
+    for start in range(0, len(texts), block):
+        block_texts = order[start:start + block]
+        block_codes = codes[block_texts]
+        block_lengths = text_lengths[block_texts]
+        pv = np.full((len(block_codes), len(patterns)), np.iinfo(np.uint64).max, dtype=np.uint64)
+        mv = np.zeros((len(block_codes), len(patterns)), dtype=np.uint64)
+        score = np.tile(lengths, (len(block_codes), 1))
+        for k in range(int(block_lengths.max())):
+            eq = peq[block_codes[:, k]]
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | ~(xh | pv)
+            mh = pv & xh
+            # the texts that are already ended do not change their score
+            active = (block_lengths > k)[:, np.newaxis]
+            score += ((ph & last) != 0) & active
+            score -= ((mh & last) != 0) & active
+            ph = (ph << one) | one
+            mh = mh << one
+            pv = mh | ~(xv | ph)
+            mv = ph & xv
+        ret[:, block_texts] = score.T
+    return ret
+
+
+def __levenshtein_block(sequences1, sequences2):
+    """
+    Computes the Levenshtein distances between two lists of sequences
+    """
+    ret = np.zeros((len(sequences1), len(sequences2)), dtype=np.int64)
+    lengths1 = np.array([len(s) for s in sequences1], dtype=np.int64)
+    lengths2 = np.array([len(s) for s in sequences2], dtype=np.int64)
+    short1 = np.flatnonzero((lengths1 > 0) & (lengths1 <= WORD_SIZE))
+    long1 = np.flatnonzero(lengths1 > WORD_SIZE)
+    short2 = np.flatnonzero((lengths2 > 0) & (lengths2 <= WORD_SIZE))
+    long2 = np.flatnonzero(lengths2 > WORD_SIZE)
+
+    # the empty sequences are at distance equal to the length of the other sequence
+    ret[lengths1 == 0, :] = lengths2
+    ret[:, lengths2 == 0] = lengths1[:, np.newaxis]
+
+    # the short sequences of the first list are the patterns
+    ret[np.ix_(short1, np.flatnonzero(lengths2 > 0))] = __bit_parallel_block(
+        [sequences1[i] for i in short1], [sequences2[j] for j in np.flatnonzero(lengths2 > 0)])
+    # the distance is symmetric: the short sequences of the second list are the patterns for the long sequences
+    ret[np.ix_(long1, short2)] = __bit_parallel_block([sequences2[j] for j in short2],
+                                                      [sequences1[i] for i in long1]).T
+    for i in long1:
+        for j in long2:
+            ret[i, j] = levenshtein_bit_parallel(sequences1[i], sequences2[j])
+    return ret
+
+
+def levenshtein_matrix(sequences1, sequences2=None, parameters=None):
+    """
+    Computes the matrix of the Levenshtein distances between two lists of sequences (for example, the
+    integer-coded variants of a log), using a bit-parallel algorithm vectorized over the couples of sequences
+
+    Parameters
+    ---------------
+    sequences1
+        First list of sequences (tuples/lists of hashable symbols)
+    sequences2
+        Second list of sequences (if not provided, the distances between the sequences of the first list are computed)
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.CORES -> number of worker processes (default: 1, i.e., no multiprocessing)
+            Parameters.CHUNK_SIZE -> number of sequences of the second list assigned to a worker at once
+
+    Returns
+    ---------------
+    matrix
+        Matrix (len(sequences1) x len(sequences2)) of the Levenshtein distances
+    """
+    if parameters is None:
+        parameters = {}
+
+    if sequences2 is None:
+        sequences2 = sequences1
+    sequences1 = [tuple(s) for s in sequences1]
+    sequences2 = [tuple(s) for s in sequences2]
+
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
+
+    with instrumentation.phase("levenshtein_matrix"):
+        if cores <= 1 or len(sequences2) < 2:
+            return __levenshtein_block(sequences1, sequences2)
+
+        chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, None)
+        chunks = process_pool.get_chunks(sequences2, cores, chunk_size=chunk_size)
+
+        # the first list of sequences is sent only once to each worker
+        blocks = process_pool.apply(__levenshtein_block, chunks, cores, context=sequences1)
+        return np.hstack(blocks)
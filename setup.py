@@ -172,6 +172,10 @@ setup(
         'sympy',
         'tqdm'
     ],
+    extras_require={
+        # persistent (warm-started) HiGHS models for the LP-based heuristics
+        'highs': ["highspy; python_version >= '3.8'"]
+    },
     project_urls={
         'Documentation': 'http://www.pm4py.org',
         'Source': 'https://github.com/pm4py/pm4py-source',
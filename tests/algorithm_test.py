@@ -65,6 +65,31 @@ class AlgorithmTest(unittest.TestCase):
         generalization = generalization_evaluation.apply(log, net, im, fm,
                                                          variant=generalization_evaluation.Variants.GENERALIZATION_TOKEN)
 
+    def test_tokenreplay_multiprocessing(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        from pm4py.algo.discovery.alpha import algorithm as alpha_miner
+        net, im, fm = alpha_miner.apply(log)
+        from pm4py.algo.conformance.tokenreplay.variants import token_replay
+        replayed_traces = token_replay.apply(log, net, im, fm)
+        replayed_traces_mp = token_replay.apply(log, net, im, fm, parameters={token_replay.Parameters.CORES: 2,
+                                                                              token_replay.Parameters.CHUNK_SIZE: 1})
+        self.assertEqual([x["trace_fitness"] for x in replayed_traces], [x["trace_fitness"] for x in replayed_traces_mp])
+        self.assertEqual([x["activated_transitions"] for x in replayed_traces],
+                         [x["activated_transitions"] for x in replayed_traces_mp])
+
+    def test_tokenreplay_multiprocessing_duplicate_names(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        from pm4py.algo.discovery.alpha import algorithm as alpha_miner
+        net, im, fm = alpha_miner.apply(log)
+        # the names of the places cannot identify them: the replay is done in-process
+        for p in net.places:
+            p.name = "p"
+        from pm4py.algo.conformance.tokenreplay.variants import token_replay
+        replayed_traces = token_replay.apply(log, net, im, fm)
+        replayed_traces_mp = token_replay.apply(log, net, im, fm, parameters={token_replay.Parameters.CORES: 2})
+        self.assertEqual([x["reached_marking"] for x in replayed_traces],
+                         [x["reached_marking"] for x in replayed_traces_mp])
+
     def test_evaluation(self):
         log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
         from pm4py.algo.discovery.alpha import algorithm as alpha_miner
@@ -1,4 +1,5 @@
 import os
+import pkgutil
 import unittest
 
 from pm4py.algo.conformance.alignments import algorithm as align_alg
@@ -48,6 +49,175 @@ class AlignmentTest(unittest.TestCase):
             if not is_fit:
                 raise Exception("should be fit")
 
+    def test_alignment_log_multiprocessing(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = alpha_alg.apply(log)
+        aligned_traces = align_alg.apply_log(log, net, marking, final_marking)
+        aligned_traces_mp = align_alg.apply_log(log, net, marking, final_marking,
+                                                parameters={align_alg.Parameters.CORES: 2,
+                                                            align_alg.Parameters.CHUNK_SIZE: 1})
+        self.assertEqual([x["cost"] for x in aligned_traces], [x["cost"] for x in aligned_traces_mp])
+        self.assertEqual([x["fitness"] for x in aligned_traces], [x["fitness"] for x in aligned_traces_mp])
+
+    def test_alignment_log_multiprocessing_duplicate_names(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = alpha_alg.apply(log)
+        # the names of the transitions cannot identify them: the alignments are computed in-process
+        for t in net.transitions:
+            t.name = "t"
+        model_cost_function = {t: 1 + i for i, t in enumerate(sorted(net.transitions, key=lambda x: x.label))}
+        parameters = {align_alg.Parameters.PARAM_MODEL_COST_FUNCTION: model_cost_function,
+                      align_alg.Parameters.PARAM_SYNC_COST_FUNCTION: {t: 0 for t in net.transitions}}
+        aligned_traces = align_alg.apply_log(log, net, marking, final_marking, parameters=parameters)
+        parameters[align_alg.Parameters.CORES] = 2
+        aligned_traces_mp = align_alg.apply_log(log, net, marking, final_marking, parameters=parameters)
+        self.assertEqual([x["cost"] for x in aligned_traces], [x["cost"] for x in aligned_traces_mp])
+
+    def test_alignment_log_cache(self):
+        import tempfile
+        from pm4py.algo.conformance.alignments import cache as alignments_cache
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = alignments_cache.apply(os.path.join(directory, "alignments.db"))
+            parameters = {align_alg.Parameters.ALIGNMENT_CACHE: cache}
+            aligned_traces = align_alg.apply_log(log, net, marking, final_marking, parameters=parameters)
+            self.assertEqual(cache.get_statistics(), {"hits": 0, "misses": len(log)})
+            # the fingerprint does not depend on the names of the places/transitions
+            net, marking, final_marking = inductive_miner.apply(log)
+            aligned_traces_cache = align_alg.apply_log(log, net, marking, final_marking, parameters=parameters)
+            self.assertEqual(cache.get_statistics(), {"hits": len(log), "misses": len(log)})
+            self.assertEqual([x["cost"] for x in aligned_traces], [x["cost"] for x in aligned_traces_cache])
+            self.assertEqual([x["fitness"] for x in aligned_traces], [x["fitness"] for x in aligned_traces_cache])
+            # the events without the activity are skipped in the keys, as in the variants
+            from pm4py.objects.log.log import Event
+            log[0].append(Event({"time:timestamp": log[0][-1]["time:timestamp"]}))
+            aligned_traces_cache = align_alg.apply_log(log, net, marking, final_marking, parameters=parameters)
+            self.assertEqual([x["cost"] for x in aligned_traces], [x["cost"] for x in aligned_traces_cache])
+
+    def test_alignment_cache_wl_indistinguishable_nets(self):
+        import tempfile
+        from pm4py.algo.conformance.alignments import cache as alignments_cache
+        from pm4py.objects.log.log import EventLog, Trace, Event
+        from pm4py.objects.petri.petrinet import PetriNet, Marking
+        from pm4py.objects.petri.utils import add_arc_from_to
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+
+        def cycles_net(cycle_length):
+            # 6 places/transitions (with the same names and labels) forming cycles of the given length;
+            # the colour refinement does not tell apart two 3-cycles from one 6-cycle
+            net = PetriNet("cycles")
+            places = [PetriNet.Place("p" + str(i)) for i in range(6)]
+            transitions = [PetriNet.Transition("t" + str(i), "a") for i in range(6)]
+            for i in range(6):
+                net.places.add(places[i])
+                net.transitions.add(transitions[i])
+                add_arc_from_to(places[i], transitions[i], net)
+                add_arc_from_to(transitions[i], places[(i + 1) % cycle_length + (i // cycle_length) * cycle_length],
+                                net)
+            return net, Marking({places[0]: 1, places[3]: 1}), Marking({places[1]: 1, places[4]: 1})
+
+        # perfectly fitting the two 3-cycles, not the 6-cycle
+        log = EventLog([Trace([Event({"concept:name": "a"}) for i in range(5)])])
+        net1, im1, fm1 = cycles_net(3)
+        net2, im2, fm2 = cycles_net(6)
+        self.assertNotEqual(alignments_cache.net_fingerprint(net1, im1, fm1),
+                            alignments_cache.net_fingerprint(net2, im2, fm2))
+        with tempfile.TemporaryDirectory() as directory:
+            cache = alignments_cache.apply(os.path.join(directory, "alignments.db"))
+            parameters = {align_alg.Parameters.ALIGNMENT_CACHE: cache}
+            align_alg.apply_log(log, net1, im1, fm1, parameters=parameters)
+            aligned_traces_cache = align_alg.apply_log(log, net2, im2, fm2, parameters=parameters)
+            self.assertEqual(cache.get_statistics(), {"hits": 0, "misses": 2})
+            self.assertEqual([x["cost"] for x in align_alg.apply_log(log, net2, im2, fm2)],
+                             [x["cost"] for x in aligned_traces_cache])
+
+    @unittest.skipIf(not pkgutil.find_loader("highspy"), "the persistent HiGHS model requires highspy")
+    def test_alignment_highs_persistent_model(self):
+        import numpy as np
+        from pm4py.util.lp import solver as lp_solver
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        self.assertIn(lp_solver.HIGHS, lp_solver.VERSIONS_PERSISTENT_MODEL)
+        # min x0 + 2 x1 s.t. x0 + x1 = b, x >= 0
+        model = lp_solver.get_persistent_model([1.0, 2.0], -np.eye(2), np.zeros((2, 1)), np.ones((1, 2)), [1.0],
+                                               variant=lp_solver.HIGHS)
+        sol = model.solve(beq=[3.0])
+        self.assertAlmostEqual(lp_solver.get_prim_obj_from_sol(sol, variant=lp_solver.HIGHS), 3.0)
+        sol = model.solve(c=[3.0, 2.0])
+        self.assertAlmostEqual(lp_solver.get_prim_obj_from_sol(sol, variant=lp_solver.HIGHS), 6.0)
+        self.assertEqual(lp_solver.get_points_from_sol(sol, variant=lp_solver.HIGHS), [0.0, 3.0])
+        sol = model.solve(beq=[-1.0])
+        self.assertIsNone(lp_solver.get_prim_obj_from_sol(sol, variant=lp_solver.HIGHS))
+
+    def test_alignment_highs(self):
+        from pm4py.algo.conformance.alignments.variants import state_equation_a_star
+        from pm4py.util.lp import solver as lp_solver
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = alpha_alg.apply(log)
+        aligned_traces = align_alg.apply_log(log, net, marking, final_marking)
+        for use_compiled_net in [False, True]:
+            aligned_traces_highs = align_alg.apply_log(log, net, marking, final_marking, parameters={
+                state_equation_a_star.Parameters.LP_SOLVER_VARIANT: lp_solver.HIGHS,
+                state_equation_a_star.Parameters.USE_COMPILED_NET: use_compiled_net})
+            self.assertEqual([x["cost"] for x in aligned_traces], [x["cost"] for x in aligned_traces_highs])
+
+    def test_alignment_session(self):
+        from pm4py.algo.conformance.alignments import session as alignments_session
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        for variant in align_alg.Variants:
+            session = alignments_session.apply(net, marking, final_marking)
+            for trace in log:
+                self.assertEqual(align_alg.apply_trace(trace, net, marking, final_marking, variant=variant)["cost"],
+                                 align_alg.apply_trace(trace, net, marking, final_marking, variant=variant, parameters={
+                                     align_alg.Parameters.ALIGNMENT_SESSION: session})["cost"])
+        # the synchronous product nets share the model part, but not the arcs of the previous traces
+        trace_net, trace_im, trace_fm = petri.utils.construct_trace_net(log[0])
+        sync_net, sync_im, sync_fm, cost_function, incidence_matrix = session.construct(trace_net, trace_im, trace_fm)
+        self.assertEqual(len(sync_net.arcs), len(set(a for p in sync_net.places for a in p.in_arcs | p.out_arcs)))
+        self.assertEqual(incidence_matrix.sparse_a_matrix.shape, (len(sync_net.places), len(sync_net.transitions)))
+        other_net, other_marking, other_final_marking = alpha_alg.apply(log)
+        with self.assertRaises(Exception):
+            align_alg.apply_trace(log[0], other_net, other_marking, other_final_marking,
+                                  variant=align_alg.VERSION_STATE_EQUATION_A_STAR,
+                                  parameters={align_alg.Parameters.ALIGNMENT_SESSION: session})
+        # apply_log (sharing a session between the variants) and apply_trace agree with a custom model cost function
+        model_cost_function = {t: 5 if t.label is not None else 1 for t in net.transitions}
+        parameters = {align_alg.Parameters.PARAM_MODEL_COST_FUNCTION: model_cost_function}
+        for variant in align_alg.Variants:
+            aligned_traces = align_alg.apply_log(log, net, marking, final_marking, variant=variant,
+                                                 parameters=parameters)
+            self.assertEqual([x["cost"] for x in aligned_traces],
+                             [align_alg.apply_trace(trace, net, marking, final_marking, variant=variant,
+                                                    parameters=parameters)["cost"] for trace in log])
+        # ... and with a standard sync cost (read only by the less-memory variants)
+        parameters = {"std_sync_cost": 2}
+        for variant in align_alg.Variants:
+            aligned_traces = align_alg.apply_log(log, net, marking, final_marking, variant=variant,
+                                                 parameters=parameters)
+            self.assertEqual([x["cost"] for x in aligned_traces],
+                             [align_alg.apply_trace(trace, net, marking, final_marking, variant=variant,
+                                                    parameters=parameters)["cost"] for trace in log])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -38,6 +38,26 @@ class DecisionTreeTest(unittest.TestCase):
                             parameters={dt_vis.Variants.CLASSIC.value.Parameters.FORMAT: "svg"})
         del gviz
 
+    def test_decisiontree_sparse_representation(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log_path = os.path.join("input_data", "roadtraffic50traces.xes")
+        log = xes_importer.apply(log_path)
+        data, feature_names = get_log_representation.get_representation(log, [], ["concept:name", "org:resource"],
+                                                                         [], ["amount"],
+                                                                         str_evsucc_attr=["concept:name"])
+        sparse_data, sparse_feature_names = get_log_representation.get_representation(
+            log, [], ["concept:name", "org:resource"], [], ["amount"], str_evsucc_attr=["concept:name"], sparse=True)
+        self.assertEqual(feature_names, sparse_feature_names)
+        self.assertTrue((sparse_data.toarray() == data).all())
+        target, classes = get_class_representation.get_class_representation_by_trace_duration(log, 2 * 8640000)
+        clf = tree.DecisionTreeClassifier(max_depth=7)
+        clf.fit(sparse_data, target)
+        gviz = dt_vis.apply(clf, sparse_feature_names, classes,
+                            parameters={dt_vis.Variants.CLASSIC.value.Parameters.FORMAT: "svg"})
+        del gviz
+
 
 if __name__ == "__main__":
     unittest.main()
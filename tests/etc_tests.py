@@ -17,6 +17,35 @@ class ETCTest(unittest.TestCase):
         precision = etc_alg.apply(log, net, marking, final_marking, variant=etc_alg.ETCONFORMANCE_TOKEN)
         del precision
 
+    def test_align_etc_prefix_trie(self):
+        # the replay of the prefixes on the prefix trie must reach the same markings
+        # as the alignment of each prefix
+        from pm4py.evaluation.precision import utils as precision_utils
+        from pm4py.evaluation.precision.variants import align_etconformance
+        from pm4py.objects.petri.align_utils import get_visible_transitions_eventually_enabled_by_marking
+        from pm4py.statistics.start_activities.log.get import get_start_activities
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        net, marking, final_marking = inductive_miner.apply(log)
+        prefixes, prefix_count = precision_utils.get_log_prefixes(log)
+        prefixes_keys = list(prefixes.keys())
+        fake_log = precision_utils.form_fake_log(prefixes_keys)
+        all_markings = align_etconformance.transform_markings_from_sync_to_original_net(
+            align_etconformance.align_fake_log_stop_marking(fake_log, net, marking, final_marking), net)
+        sum_at = 0
+        sum_ee = 0
+        for i, prefix in enumerate(prefixes_keys):
+            activated = set()
+            for m in all_markings[i]:
+                activated.update(x.label for x in get_visible_transitions_eventually_enabled_by_marking(net, m) if
+                                 x.label is not None)
+            sum_at += len(activated) * prefix_count[prefix]
+            sum_ee += len(activated.difference(prefixes[prefix])) * prefix_count[prefix]
+        enabled_ini = set(x.label for x in get_visible_transitions_eventually_enabled_by_marking(net, marking))
+        sum_at += len(log) * len(enabled_ini)
+        sum_ee += len(log) * len(enabled_ini.difference(get_start_activities(log)))
+        precision = etc_alg.apply(log, net, marking, final_marking, variant=etc_alg.ALIGN_ETCONFORMANCE)
+        self.assertEqual(precision, 1 - float(sum_ee) / float(sum_at))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -160,6 +160,28 @@ class DataframePrefilteringTest(unittest.TestCase):
                                                                                     parameters={
                                                                                         ltl_checker.Parameters.POSITIVE: False})
 
+    def test_ltl_batch(self):
+        from pm4py.algo.filtering.pandas.ltl import ltl_batch
+        df = pd.read_csv(os.path.join("input_data", "running-example.csv"))
+        df = dataframe_utils.convert_timestamp_columns_in_df(df)
+        rules = {"ev": (ltl_batch.Patterns.A_EVENTUALLY_B, ("check ticket", "pay compensation")),
+                 "ev_neg": (ltl_batch.Patterns.A_EVENTUALLY_B_EVENTUALLY_C, ("check ticket", "decide", "reject request"),
+                            {ltl_checker.Parameters.POSITIVE: False}),
+                 "ev_time": (ltl_batch.Patterns.A_EVENTUALLY_B, ("register request", "decide"),
+                             {ltl_checker.Parameters.ENABLE_TIMESTAMP: True,
+                              ltl_checker.Parameters.TIMESTAMP_DIFF_BOUNDARIES: [(0, 86400 * 7)]}),
+                 "next": (ltl_batch.Patterns.A_NEXT_B_NEXT_C, ("check ticket", "decide", "pay compensation")),
+                 "four_eyes": (ltl_batch.Patterns.FOUR_EYES_PRINCIPLE, ("check ticket", "pay compensation")),
+                 "diff_persons": (ltl_batch.Patterns.ATTR_VALUE_DIFFERENT_PERSONS, ("check ticket",))}
+        matrix = ltl_batch.apply(df, rules)
+        for name, rule in rules.items():
+            rule_parameters = rule[2] if len(rule) > 2 else {}
+            filtered_df = getattr(ltl_checker, rule[0].value)(df, *rule[1], parameters=rule_parameters)
+            self.assertEqual(set(matrix.index[matrix[name].values]), set(filtered_df["case:concept:name"]))
+        filtered_df = ltl_batch.filter_dataframe(df, matrix, ["ev", "four_eyes"])
+        self.assertEqual(set(filtered_df["case:concept:name"]),
+                         set(matrix.index[(matrix["ev"] & matrix["four_eyes"]).values]))
+
 
 if __name__ == "__main__":
     unittest.main()
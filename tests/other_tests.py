@@ -198,6 +198,329 @@ class OtherPartsTests(unittest.TestCase):
         from pm4py.statistics.eventually_follows.pandas import get
         efg = get.apply(dataframe, parameters={get.Parameters.START_TIMESTAMP_KEY: "start_timestamp"})
 
+    def test_efg_pandas_window_chunks(self):
+        import pandas as pd
+        dataframe = pd.read_csv(os.path.join("input_data", "interval_event_log.csv"))
+        from pm4py.objects.log.util import dataframe_utils
+        dataframe = dataframe_utils.convert_timestamp_columns_in_df(dataframe)
+        from pm4py.statistics.eventually_follows.pandas import get
+        efg = get.apply(dataframe, parameters={get.Parameters.START_TIMESTAMP_KEY: "start_timestamp"})
+        efg_chunks = get.apply(dataframe, parameters={get.Parameters.START_TIMESTAMP_KEY: "start_timestamp",
+                                                      get.Parameters.CHUNK_SIZE: 100})
+        self.assertEqual(efg, efg_chunks)
+        efg_window = get.apply(dataframe, parameters={get.Parameters.WINDOW: 1})
+        self.assertLessEqual(sum(efg_window.values()), len(dataframe))
+
+    def test_incremental_dfg(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        from pm4py.algo.discovery.dfg import incremental, algorithm as dfg_discovery
+        from pm4py.objects.conversion.log import converter as log_converter
+        from pm4py.objects.log.util import dataframe_utils
+        dataframe = log_converter.apply(log, variant=log_converter.Variants.TO_DATA_FRAME)
+        dataframe = dataframe_utils.convert_timestamp_columns_in_df(dataframe)
+        dataframe = dataframe.sort_values("time:timestamp", kind="mergesort")
+        state = incremental.apply(log)
+        self.assertEqual(state.snapshot()[0], dict(dfg_discovery.apply(log)))
+        batches_state = incremental.apply()
+        for i in range(0, len(dataframe), 7):
+            batches_state.update(dataframe.iloc[i:i + 7])
+        self.assertEqual(batches_state.snapshot(), state.snapshot())
+        first = incremental.apply(dataframe.iloc[:20])
+        second = incremental.apply(dataframe.iloc[20:])
+        first = incremental.IncrementalDfg.from_dict(first.to_dict())
+        self.assertEqual(first.merge(second).snapshot(), state.snapshot())
+        # naive timestamps are read as UTC both in the event logs and in the dataframes
+        from datetime import datetime
+        from pm4py.objects.log.log import EventLog, Trace, Event
+        mixed = incremental.apply(EventLog([Trace([Event({"concept:name": "A", "time:timestamp": datetime(2020, 1, 1, 10)})],
+                                                  attributes={"concept:name": "c1"})]))
+        mixed.update(pd.DataFrame({"case:concept:name": ["c1"], "concept:name": ["B"],
+                                   "time:timestamp": [datetime(2020, 1, 1, 11)]}))
+        self.assertEqual(mixed.performance_dfg()[("A", "B")], 3600.0)
+
+    def test_compiled_net_semantics(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = inductive_miner.apply(log)
+        from pm4py.objects.petri import compiled_net, semantics
+        cnet = compiled_net.construct(net)
+        m = cnet.encode_marking(im)
+        self.assertEqual(cnet.decode_marking(m), im)
+        self.assertEqual(set(cnet.transition_list[t] for t in cnet.enabled_transitions(m)),
+                         semantics.enabled_transitions(net, im))
+        for t in cnet.enabled_transitions(m):
+            self.assertEqual(cnet.decode_marking(cnet.execute(t, m)),
+                             semantics.execute(cnet.transition_list[t], net, im))
+
+    def test_compiled_net_algorithms(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = inductive_miner.apply(log)
+        from pm4py.objects.petri import reachability_graph
+        from pm4py.algo.conformance.alignments.variants import state_equation_a_star
+        from pm4py.algo.conformance.tokenreplay.variants import token_replay
+        from pm4py.simulation.playout.variants import basic_playout
+        incoming, outgoing, eventually_enabled = reachability_graph.marking_flow_petri(net, im)
+        incoming_c, outgoing_c, eventually_enabled_c = reachability_graph.marking_flow_petri(
+            net, im, parameters={reachability_graph.Parameters.USE_COMPILED_NET: True})
+        self.assertEqual(set(incoming), set(incoming_c))
+        for trace in log:
+            self.assertEqual(state_equation_a_star.apply(trace, net, im, fm)["cost"], state_equation_a_star.apply(
+                trace, net, im, fm, parameters={state_equation_a_star.Parameters.USE_COMPILED_NET: True})["cost"])
+        replayed = token_replay.apply(log, net, im, fm)
+        replayed_c = token_replay.apply(log, net, im, fm, parameters={token_replay.Parameters.USE_COMPILED_NET: True})
+        self.assertEqual([x["trace_fitness"] for x in replayed], [x["trace_fitness"] for x in replayed_c])
+        playout = basic_playout.apply(net, im, fm, parameters={basic_playout.Parameters.USE_COMPILED_NET: True,
+                                                               basic_playout.Parameters.NO_TRACES: 10})
+        self.assertEqual(len(playout), 10)
+
+    def test_state_space_limits_spill(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = inductive_miner.apply(log)
+        from pm4py.objects.petri import state_space
+        full = state_space.explore(net, im)
+        self.assertTrue(full.is_complete())
+        for strategy in [state_space.BFS, state_space.DFS]:
+            spilled = state_space.explore(net, im, parameters={state_space.Parameters.STRATEGY: strategy,
+                                                               state_space.Parameters.SPILL_THRESHOLD: 2})
+            self.assertEqual(set(spilled.markings), set(full.markings))
+        limited = state_space.explore(net, im, parameters={state_space.Parameters.MAX_STATES: 3})
+        self.assertEqual(len(limited), 3)
+        self.assertEqual(limited.interrupted, state_space.MAX_STATES_REASON)
+
+    def test_columnar_log(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        from pm4py.objects.log import columnar
+        clog = columnar.from_event_log(log)
+        self.assertEqual(len(clog), len(log))
+        materialized = clog.to_event_log()
+        for trace, ctrace in zip(log, materialized):
+            self.assertEqual(trace.attributes, ctrace.attributes)
+            self.assertEqual([dict(x) for x in trace], [dict(x) for x in ctrace])
+        with self.assertRaises(TypeError):
+            clog[0][0]["concept:name"] = "A"
+
+    def test_columnar_log_algorithms(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        from pm4py.objects.log import columnar
+        from pm4py.objects.dfg.retrieval import log as dfg_retrieval
+        from pm4py.statistics.variants.log import get as variants_get
+        from pm4py.algo.filtering.log.attributes import attributes_filter
+        clog = columnar.from_event_log(log)
+        self.assertEqual(dfg_retrieval.native(log), dfg_retrieval.native(clog))
+        self.assertEqual(dfg_retrieval.native(log, parameters={dfg_retrieval.Parameters.WINDOW: 2}),
+                         dfg_retrieval.native(clog, parameters={dfg_retrieval.Parameters.WINDOW: 2}))
+        self.assertEqual(variants_get.get_variants_from_log_trace_idx(log),
+                         variants_get.get_variants_from_log_trace_idx(clog))
+        filtered = attributes_filter.apply_events(log, ["decide"])
+        filtered_c = attributes_filter.apply_events(clog, ["decide"])
+        self.assertEqual([len(x) for x in filtered], [len(x) for x in filtered_c])
+        # the filters return mutable event logs; unknown values match nothing
+        self.assertNotIsInstance(filtered_c, columnar.ColumnarEventLog)
+        filtered_c[0][0]["concept:name"] = "A"
+        self.assertEqual(len(attributes_filter.apply(clog, ["unknown"])), 0)
+        self.assertEqual(len(attributes_filter.apply(clog, ["unknown"], parameters={
+            attributes_filter.Parameters.POSITIVE: False})), len(log))
+        net, im, fm = inductive_miner.apply(clog)
+        self.assertEqual(len(net.transitions), len(inductive_miner.apply(log)[0].transitions))
+
+    def test_dataframe_to_event_log_chunks(self):
+        df = pd.read_csv(os.path.join("input_data", "running-example.csv"))
+        df = dataframe_utils.convert_timestamp_columns_in_df(df)
+        from pm4py.objects.conversion.log.variants import to_event_log
+        log = converter.apply(df, variant=converter.Variants.TO_EVENT_LOG)
+        self.assertEqual(len(log), df["case:concept:name"].nunique())
+        self.assertEqual(sum(len(x) for x in log), len(df))
+        self.assertTrue(all("case:concept:name" not in e for x in log for e in x))
+        traces = list(to_event_log.iterate(df, parameters={to_event_log.Parameters.CHUNK_SIZE: 1}))
+        self.assertEqual([x.attributes for x in log], [x.attributes for x in traces])
+        self.assertEqual([[dict(e) for e in x] for x in log], [[dict(e) for e in x] for x in traces])
+
+    def test_instrumentation(self):
+        from pm4py.util import instrumentation
+        from pm4py.algo.conformance.alignments import algorithm as alignments
+        from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = inductive_miner.apply(log)
+        reports = []
+        self.assertFalse(instrumentation.is_enabled())
+        with instrumentation.profile(callback=reports.append) as profiler:
+            self.assertTrue(instrumentation.is_enabled())
+            alignments.apply(log, net, im, fm, variant=alignments.Variants.VERSION_STATE_EQUATION_A_STAR)
+            token_replay.apply(log, net, im, fm)
+            inductive_miner.apply(log)
+        self.assertFalse(instrumentation.is_enabled())
+        report = profiler.get_report()
+        self.assertEqual(reports, [report])
+        for phase in ["variants", "alignments.sync_product", "alignments.lp_solve", "alignments.align_variants"]:
+            self.assertGreater(report["timings"][phase]["count"], 0)
+        self.assertEqual(report["timings"]["discovery.inductive"]["count"], 1)
+        self.assertEqual(report["counters"]["alignments.aligned_variants"], 6)
+        self.assertGreater(report["counters"]["alignments.visited_states"], 0)
+        self.assertGreater(report["counters"]["alignments.queued_states"], 0)
+        self.assertIn("token_replay.hidden_transition_searches", report["counters"])
+        # the counters record the alignment searches of every variant (also the ones not finding an alignment)
+        for variant in alignments.Variants:
+            with instrumentation.profile() as profiler:
+                alignment = alignments.apply_trace(log[0], net, im, fm, variant=variant)
+            self.assertEqual(profiler.get_report()["counters"]["alignments.visited_states"],
+                             alignment["visited_states"])
+            with instrumentation.profile() as profiler:
+                alignments.apply_trace(log[0], net, im, fm, variant=variant,
+                                       parameters={alignments.Parameters.PARAM_MAX_ALIGN_TIME_TRACE: -1})
+            self.assertEqual(profiler.get_report()["counters"]["alignments.failed_searches"], 1)
+
+    def test_encoded_variants(self):
+        from pm4py.objects.log.util import variants_util
+        from pm4py.algo.filtering.log.variants import variants_filter as log_variants_filter
+        from pm4py.algo.filtering.pandas.variants import variants_filter as pd_variants_filter
+        from pm4py.statistics.traces.pandas import case_statistics
+        df = pd.DataFrame({"case:concept:name": ["1", "1", "2", "3", "3"],
+                           "concept:name": ["A,B", "C", "A", "B,C", "C"]})
+        log = converter.apply(df, variant=converter.Variants.TO_EVENT_LOG)
+        for encoded in [variants_util.from_log(log), variants_util.from_dataframe(df)]:
+            self.assertEqual(len(encoded), 3)
+            self.assertEqual(encoded.counts, [1, 1, 1])
+            self.assertEqual(encoded.decode(0), ("A,B", "C"))
+            self.assertEqual(encoded.to_string(0), "A,B,C")
+        self.assertEqual(list(case_statistics.get_variants_df(df)["variant"]), ["A,B,C", "A", "B,C,C"])
+        filtered = log_variants_filter.apply(log, [("A,B", "C"), ("A",)])
+        self.assertEqual([x.attributes["concept:name"] for x in filtered], ["1", "2"])
+        filtered = log_variants_filter.apply(log, [("A,B", "C")], parameters={
+            log_variants_filter.Parameters.POSITIVE: False})
+        self.assertEqual([x.attributes["concept:name"] for x in filtered], ["2", "3"])
+        filtered_df = pd_variants_filter.apply(df, [("B,C", "C")])
+        self.assertEqual(list(filtered_df["case:concept:name"]), ["3", "3"])
+        # the public variants lists are still keyed by the variant strings
+        from pm4py.objects.log.util import prefix_matrix
+        self.assertEqual(sorted(prefix_matrix.get_variants_list(log)), [("A", 1), ("A,B,C", 1), ("B,C,C", 1)])
+        variants_matrix, activities = prefix_matrix.get_variants_matrix(log)
+        self.assertEqual(activities, ["A", "A,B", "B,C", "C"])
+        self.assertEqual(variants_matrix.sum(), 5)
+
+    def test_sparse_prefix_matrix(self):
+        from pm4py.objects.log.util import prefix_matrix
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        for parameters in [{}, {prefix_matrix.KEEP_UNIQUE: True}, {prefix_matrix.SKIP_LAST: True}]:
+            dense, activities = prefix_matrix.get_prefix_matrix(log, parameters=dict(parameters))
+            parameters[prefix_matrix.SPARSE] = True
+            sparse, sparse_activities = prefix_matrix.get_prefix_matrix(log, parameters=parameters)
+            self.assertEqual(activities, sparse_activities)
+            self.assertTrue((sparse.toarray() == dense).all())
+        dense, activities = prefix_matrix.get_variants_matrix(log)
+        sparse, activities = prefix_matrix.get_variants_matrix(log, parameters={prefix_matrix.SPARSE: True})
+        self.assertTrue((sparse.toarray() == dense).all())
+
+    def test_montecarlo_discrete_event(self):
+        from pm4py.simulation.montecarlo import simulator
+        from pm4py.simulation.montecarlo.parameters import Parameters
+        from pm4py.simulation.montecarlo.outputs import Outputs
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = inductive_miner.apply(log)
+        parameters = {Parameters.PARAM_NUM_SIMULATIONS: 50, Parameters.PARAM_SEED: 7,
+                      Parameters.PARAM_DEFAULT_NUM_RESOURCES_PER_PLACE: 10,
+                      Parameters.PARAM_ENABLE_DIAGNOSTICS: False}
+        log1, res1 = simulator.apply(log, net, im, fm, variant=simulator.Variants.PETRI_DISCRETE_EVENT,
+                                     parameters=parameters)
+        log2, res2 = simulator.apply(log, net, im, fm, variant=simulator.Variants.PETRI_DISCRETE_EVENT,
+                                     parameters=parameters)
+        self.assertEqual(len(log1), 50)
+        self.assertEqual([[dict(e) for e in x] for x in log1], [[dict(e) for e in x] for x in log2])
+        for output in Outputs:
+            self.assertIn(output.value, res1)
+        self.assertEqual(res1[Outputs.OUTPUT_CASES_EX_TIME.value], res2[Outputs.OUTPUT_CASES_EX_TIME.value])
+        # the interval trees are built when accessed
+        places_trees = res1[Outputs.OUTPUT_PLACES_INTERVAL_TREES.value]
+        self.assertEqual(set(places_trees), set(net.places))
+        self.assertTrue(any(len(places_trees[p]) > 0 for p in net.places))
+        # with a single resource per place, the cases waiting for each other's resources are aborted
+        parameters[Parameters.PARAM_DEFAULT_NUM_RESOURCES_PER_PLACE] = 1
+        log3, res3 = simulator.apply(log, net, im, fm, variant=simulator.Variants.PETRI_DISCRETE_EVENT,
+                                     parameters=parameters)
+        self.assertEqual(len(log3), len(res3[Outputs.OUTPUT_CASES_EX_TIME.value]))
+        # the number of completed cases grows with the number of simulated cases
+        parameters[Parameters.PARAM_NUM_SIMULATIONS] = 200
+        log4, res4 = simulator.apply(log, net, im, fm, variant=simulator.Variants.PETRI_DISCRETE_EVENT,
+                                     parameters=parameters)
+        self.assertGreater(len(log4), 3 * len(log3))
+        # only the cases on a wait-for cycle, holding a resource, are aborted
+        from pm4py.simulation.montecarlo.variants import petri_discrete_event
+        from pm4py.simulation.montecarlo.utils import replay
+        test = self
+
+        class CheckedSimulation(petri_discrete_event.DiscreteEventSimulation):
+            def abort(self, case, timestamp):
+                test.assertIsNotNone(case.waiting)
+                test.assertTrue(any(case.held.values()))
+                test.assertIs(self.find_deadlock(case.waiting), case)
+                super().abort(case, timestamp)
+
+        smap = replay.get_map_from_log_and_net(log, net, im, fm)
+        for num_resources in [1, 100]:
+            simulation = CheckedSimulation(net, im, fm, smap, {p: num_resources for p in net.places},
+                                           petri_discrete_event.RandomSource(7))
+            cases = simulation.run([1000000 + 10 * i for i in range(200)])
+            self.assertEqual(len([c for c in cases if c.finished]) + len(simulation.aborted), 200)
+            if num_resources > 1:
+                self.assertEqual(simulation.aborted, [])
+
+    def test_levenshtein_matrix_linkage(self):
+        import random
+        from pm4py.util import string_distance
+        from pm4py.algo.clustering.trace_attribute_driven.linkage_method import linkage_avg
+        random.seed(5)
+        sequences = [[random.randint(0, 4) for j in range(random.randint(0, 80))] for i in range(30)]
+        matrix = string_distance.levenshtein_matrix(sequences)
+        for i, s1 in enumerate(sequences):
+            for j, s2 in enumerate(sequences):
+                self.assertEqual(matrix[i, j], string_distance.levenshtein(
+                    "".join(chr(65 + x) for x in s1), "".join(chr(65 + x) for x in s2)))
+        matrix_mp = string_distance.levenshtein_matrix(sequences, parameters={
+            string_distance.Parameters.CORES: 2, string_distance.Parameters.CHUNK_SIZE: 7})
+        self.assertTrue((matrix == matrix_mp).all())
+        Z = linkage_avg.linkage_avg([[None]] * len(sequences), matrix, 0.5, 1)
+        self.assertEqual(len(Z), len(sequences) - 1)
+        self.assertEqual(Z[-1][3], len(sequences))
+        self.assertTrue((Z[1:, 2] >= Z[:-1, 2] - 1e-9).all())
+
+    def test_lp_sparse_inputs(self):
+        import numpy as np
+        from scipy import sparse
+        from pm4py.util.lp import solver
+        # min x0 + 2 x1 + 3 x2 s.t. x0 + x1 >= 1, x1 + x2 >= 1, x0 - x2 = 0, x >= 0
+        c = [1.0, 2.0, 3.0]
+        Aub = np.array([[-1.0, -1.0, 0.0], [0.0, -1.0, -1.0], [-1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, 0.0, -1.0]])
+        bub = np.matrix([-1.0, -1.0, 0.0, 0.0, 0.0]).transpose()
+        Aeq = np.array([[1.0, 0.0, -1.0]])
+        beq = np.matrix([0.0]).transpose()
+        for variant in solver.VERSIONS_APPLY:
+            for matrix_type in [np.asmatrix, sparse.csr_matrix, sparse.coo_matrix]:
+                sol = solver.apply(c, matrix_type(Aub), bub, matrix_type(Aeq), beq, variant=variant)
+                self.assertAlmostEqual(solver.get_prim_obj_from_sol(sol, variant=variant), 2.0)
+                points = solver.get_points_from_sol(sol, variant=variant)
+                self.assertEqual([round(x, 6) for x in points], [0.0, 1.0, 0.0])
+
+    def test_correlation_miner_matrices(self):
+        import random
+        import numpy as np
+        from pm4py.algo.discovery.correlation_mining import util as cm_util
+        from pm4py.algo.discovery.correlation_mining.variants import classic
+        random.seed(7)
+        # overlapping executions: the end timestamps are not sorted as the start timestamps
+        start_times = [np.array(sorted(random.randint(0, 50) for j in range(random.randint(0, 15)))) for i in
+                       range(5)]
+        end_times = [x + np.array([random.randint(0, 10) for j in range(len(x))]) for x in start_times]
+        for times in [start_times, end_times]:
+            PS_matrix, duration_matrix = cm_util.get_PS_dur_matrix_from_times(times, start_times)
+            for i in range(5):
+                for j in range(5):
+                    ai = [float(x) for x in times[i]]
+                    aj = [float(x) for x in start_times[j]]
+                    if i != j and ai and aj:
+                        count = sum(1 for x in np.maximum.accumulate(ai) for y in aj if x < y)
+                        self.assertAlmostEqual(PS_matrix[i, j], count / (len(ai) * len(aj)))
+                        self.assertAlmostEqual(duration_matrix[i, j], cm_util.greedy_match_return_avg_time(ai, aj))
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        self.assertEqual(classic.apply(log), classic.apply(log, parameters={classic.Parameters.CORES: 2}))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -26,6 +26,21 @@ class RoleDetectionTest(unittest.TestCase):
         log = xes_importer.apply(os.path.join("..", "tests", "input_data", "receipt.xes"))
         roles = role_mining.apply(log)
 
+    def test_role_aggregation_same_as_iterations(self):
+        from collections import Counter
+        from pm4py.algo.enhancement.roles.common import algorithm as roles_common
+        df = pd.read_csv(os.path.join("input_data", "receipt.csv"))
+        res_act_couples = Counter(zip(df["org:resource"], df["concept:name"]))
+        for threshold in [0.65, 0.3]:
+            parameters = {roles_common.Parameters.ROLES_THRESHOLD_PARAMETER: threshold}
+            roles = roles_common.get_initial_roles(res_act_couples, parameters=parameters)
+            expected = sorted([[[act], Counter({res: c for (res, a), c in res_act_couples.items() if a == act})] for
+                               act in set(df["concept:name"])], key=lambda x: x[0])
+            found_feasible = True
+            while found_feasible:
+                expected, found_feasible = roles_common.aggregate_roles_iteration(expected, parameters=parameters)
+            self.assertEqual(roles, expected)
+
 
 if __name__ == "__main__":
     unittest.main()
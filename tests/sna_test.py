@@ -32,6 +32,25 @@ class SnaTests(unittest.TestCase):
         wt_values = sna_alg.apply(log, variant=sna_alg.Variants.WORKING_TOGETHER_PANDAS)
         sub_values = sna_alg.apply(log, variant=sna_alg.Variants.SUBCONTRACTING_PANDAS)
 
+    def test_sparse(self):
+        from pm4py.objects.conversion.log import converter as log_converter
+        df = pd.read_csv(os.path.join("..", "tests", "input_data", "running-example.csv"))
+        df = dataframe_utils.convert_timestamp_columns_in_df(df)
+        log = log_converter.apply(df)
+        for variant, obj in [(sna_alg.Variants.HANDOVER_LOG, log), (sna_alg.Variants.HANDOVER_PANDAS, df),
+                             (sna_alg.Variants.WORKING_TOGETHER_LOG, log),
+                             (sna_alg.Variants.WORKING_TOGETHER_PANDAS, df),
+                             (sna_alg.Variants.SUBCONTRACTING_LOG, log), (sna_alg.Variants.SUBCONTRACTING_PANDAS, df)]:
+            for parameters in [{}, {"beta": 0.5}, {"n": 3}]:
+                dense = sna_alg.apply(obj, parameters=dict(parameters), variant=variant)
+                parameters[sna_alg.Parameters.SPARSE] = True
+                parameters[sna_alg.Parameters.METRIC_NORMALIZATION] = True
+                sparse = sna_alg.apply(obj, parameters=parameters, variant=variant)
+                self.assertEqual(dense[1], sparse[1])
+                abs_max = abs(dense[0]).max()
+                if abs_max > 0:
+                    self.assertTrue(abs(sparse[0].toarray() - dense[0] / abs_max).max() < 1e-12)
+
 
 if __name__ == "__main__":
     unittest.main()
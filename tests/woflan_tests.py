@@ -22,6 +22,15 @@ class WoflanTest(unittest.TestCase):
         net, i_m, f_m = inductive_miner.apply(log)
         self.assertTrue(woflan.apply(net, i_m, f_m, parameters={"print_diagnostics": False}))
 
+    def test_running_example_max_states(self):
+        path = os.path.join("input_data", "running-example.xes")
+        log = xes_import.apply(path)
+        net, i_m, f_m = inductive_miner.apply(log)
+        # the reachability graph would be truncated: no verdict is given
+        with self.assertRaises(Exception):
+            woflan.apply(net, i_m, f_m, parameters={"print_diagnostics": False, "max_states": 2})
+        self.assertTrue(woflan.apply(net, i_m, f_m, parameters={"print_diagnostics": False, "max_states": 100000}))
+
     def test_figure415(self):
         net = PetriNet("figure_4_15")
         p_1 = PetriNet.Place("p_1")
@@ -51,6 +51,92 @@ class XesImportExportTest(unittest.TestCase):
         log = xes_importer.apply(os.path.join(COMPRESSED_INPUT_DATA, "01_running-example.xes.gz"))
         del log
 
+    def test_importXES_1pass(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        log_1pass = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"),
+                                       variant=xes_importer.Variants.ITERPARSE_1PASS)
+        self.assertEqual(len(log), len(log_1pass))
+        self.assertEqual(sum(len(t) for t in log), sum(len(t) for t in log_1pass))
+
+    def test_importXESfromGZIP_1pass(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(COMPRESSED_INPUT_DATA, "01_running-example.xes.gz"),
+                                 variant=xes_importer.Variants.ITERPARSE_1PASS)
+        self.assertEqual(len(log), 6)
+
+    def test_importXESfromFileObject_1pass(self):
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        with open(os.path.join(COMPRESSED_INPUT_DATA, "01_running-example.xes.gz"), "rb") as f:
+            log = xes_importer.apply(f, variant=xes_importer.Variants.ITERPARSE_1PASS,
+                                     parameters={xes_importer.Variants.ITERPARSE_1PASS.value.Parameters.MAX_TRACES: 3})
+        self.assertEqual(len(log), 3)
+
+    def test_compact_events(self):
+        import copy
+        import pickle
+        from pm4py.objects.log.log import Event
+        for variant in [xes_importer.Variants.ITERPARSE, xes_importer.Variants.LINE_BY_LINE]:
+            log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"), variant=variant)
+            events = [event for trace in log for event in trace]
+            # the events share the keys and the (interned) string values
+            self.assertIs(events[0]._keys, events[1]._keys)
+            self.assertIs(list(events[0])[0], list(events[-1])[0])
+            activities = {}
+            for event in events:
+                self.assertIs(activities.setdefault(event["concept:name"], event["concept:name"]),
+                              event["concept:name"])
+            self.assertIs(events[0]["time:timestamp"].tzinfo, events[-1]["time:timestamp"].tzinfo)
+            h = hash(log[0])
+            self.assertEqual(hash(log[0]), h)
+            log[0][0]["concept:name"] = "changed"
+            self.assertNotEqual(hash(log[0]), h)
+        event = Event({"a": 1, "b": 2})
+        event2 = copy.copy(event)
+        event["c"] = 3
+        del event["a"]
+        event["a"] = 4
+        self.assertEqual(list(event.items()), [("b", 2), ("c", 3), ("a", 4)])
+        self.assertEqual(dict(event2), {"a": 1, "b": 2})
+        self.assertEqual(event.get("d", 5), 5)
+        self.assertTrue("c" in event and "d" not in event)
+        self.assertEqual(dict(pickle.loads(pickle.dumps(event))), dict(event))
+        self.assertEqual(dict(copy.deepcopy(event)), dict(event))
+        with self.assertRaises(KeyError):
+            del event["d"]
+
+    def test_exportXES_line_by_line(self):
+        import pandas as pd
+        from pm4py.objects.conversion.log import converter as log_converter
+        from pm4py.objects.log.util import dataframe_utils
+        # to avoid static method warnings in tests,
+        # that by construction of the unittest package have to be expressed in such way
+        self.dummy_variable = "dummy_value"
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        df = dataframe_utils.convert_timestamp_columns_in_df(
+            pd.read_csv(os.path.join(INPUT_DATA_DIR, "running-example.csv")))
+        output_log_path = os.path.join(OUTPUT_DATA_DIR, "running-example-exported.xes.gz")
+        # event log, generator of traces, dataframe (gzip output, inferred from the extension)
+        for obj, expected in [(log, log), ((trace for trace in log), log), (df, log_converter.apply(df))]:
+            xes_exporter.apply(obj, output_log_path, variant=xes_exporter.Variants.LINE_BY_LINE)
+            log_imported_after_export = xes_importer.apply(output_log_path)
+            self.assertEqual([[dict(e) for e in t] for t in expected],
+                             [[dict(e) for e in t] for t in log_imported_after_export])
+            os.remove(output_log_path)
+        xes_exporter.apply(log, os.path.join(OUTPUT_DATA_DIR, "running-example-exported.xes"),
+                           variant=xes_exporter.Variants.LINE_BY_LINE)
+        log_imported_after_export = xes_importer.apply(os.path.join(OUTPUT_DATA_DIR, "running-example-exported.xes"))
+        self.assertEqual(log.extensions, log_imported_after_export.extensions)
+        self.assertEqual(log.classifiers, log_imported_after_export.classifiers)
+        self.assertEqual([t.attributes for t in log], [t.attributes for t in log_imported_after_export])
+        os.remove(os.path.join(OUTPUT_DATA_DIR, "running-example-exported.xes"))
+
 
 if __name__ == "__main__":
     unittest.main()